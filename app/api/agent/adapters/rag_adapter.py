@@ -44,14 +44,14 @@ class QueryServiceAdapter:
         Returns:
             Tuple of (context_string, list_of_citations)
         """
-        # QueryService.retrieve() returns list of scored chunks (from vector store)
-        chunks = self._query_service.retrieve(
+        # Retrieval (federated across collections when configured) + a single rerank
+        chunks = self._query_service.retrieve_and_rerank(
             text=query,
             domain=domain,
             topic=topic
         )
         
-        # Limit to top_k after retrieval (reranking happens inside retrieve)
+        # Limit to top_k after reranking
         top_chunks = chunks[:top_k]
         
         # Build context string: "[1]\n{text}\n\n[2]\n{text}..."
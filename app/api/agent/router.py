@@ -1,4 +1,3 @@
-import shutil
 import uuid
 from pathlib import Path
 
@@ -7,6 +6,7 @@ from starlette.responses import StreamingResponse
 
 from .schemas import QueryAgentRequest
 from .runtime import create_runtimer
+from ..retrieval_engine.upload_registry import get_upload_registry, save_upload
 
 router = APIRouter(prefix="/agent", tags=["Agent"])
 
@@ -41,7 +41,8 @@ async def upload_agent_file(file: UploadFile = File(...)):
 
     Saves the file with a UUID name in the shared uploads directory.
     Returns the UUID and original filename so the frontend can include
-    them in the next agent query.
+    them in the next agent query. The file's content hash is kept for the
+    ingest tool, which skips files that are already ingested unchanged.
     """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         return {"status": "error", "message": "File must be a PDF"}
@@ -52,9 +53,11 @@ async def upload_agent_file(file: UploadFile = File(...)):
     upload_dir.mkdir(parents=True, exist_ok=True)
     upload_path = upload_dir / f"{file_uuid}.pdf"
 
-    # Save file to disk
-    with upload_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file to disk, hashing it on the way
+    content_hash = save_upload(file, upload_path)
+    registry = get_upload_registry()
+    if registry:
+        registry.remember_upload(file_uuid, content_hash)
 
     return {"file_uuid": file_uuid, "filename": file.filename}
 
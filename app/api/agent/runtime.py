@@ -11,6 +11,9 @@ from .tool_runner import ToolRunner
 from ..llamaindex_adapter.orchestrator import LlamaIndexOrchestrator
 from ..retrieval_engine.ingestion_service import IngestionService
 from ..retrieval_engine.service import get_rag_service
+from ..retrieval_engine.source_catalog import get_versioning_catalog
+from ..retrieval_engine.domain_index import get_domain_index
+from ..retrieval_engine.summary_index import get_summary_index
 from ...application.llm.client import LLMClient, get_llm_client
 from .session_memory import Message, get_session_memory, SessionMemory
 from ...infrastructure.storage.qdrant_client import get_qdrant_store
@@ -29,12 +32,24 @@ class Runtime:
 
         vs = vector_store or get_qdrant_store()
         embed_svc = get_hybrid_embedding_service()
-        ing_svc = ingestion_service or IngestionService(vector_store=vs, embed_service=embed_svc)
+        catalog = get_versioning_catalog()
+        domain_index = get_domain_index()
+        summary_index = get_summary_index()
+        ing_svc = ingestion_service or IngestionService(
+            vector_store=vs,
+            embed_service=embed_svc,
+            catalog=catalog,
+            domain_index=domain_index,
+            summary_index=summary_index,
+        )
         self.tool_runner = ToolRunner(deps={
             "rag_orchestrator": rag,
             "llm_client": llm,
             "vector_store": vs,
             "ingestion_service": ing_svc,
+            "source_catalog": catalog,
+            "domain_index": domain_index,
+            "summary_index": summary_index,
         })
         self.session_memory: SessionMemory = get_session_memory()
         self.agent = Agent(llm)
@@ -9,6 +9,11 @@ import structlog
 
 from .tools_registry import ToolRegistry, ToolExecutionResult
 from ....infrastructure.storage.interfaces import VectorStoreInterface
+from ...retrieval_engine.source_catalog import SourceCatalog
+from ...retrieval_engine.domain_index import DomainCentroidIndex
+from ...retrieval_engine.summary_index import SourceSummaryIndex
+from ...retrieval_engine.jobs.index_write_gate import get_write_gate
+from ...retrieval_engine.near_duplicates import get_near_duplicate_detector
 
 logger = structlog.get_logger()
 
@@ -16,6 +21,9 @@ logger = structlog.get_logger()
 def _delete_document_handler(
     source: str,
     vector_store: Optional[VectorStoreInterface] = None,
+    source_catalog: Optional[SourceCatalog] = None,
+    domain_index: Optional[DomainCentroidIndex] = None,
+    summary_index: Optional[SourceSummaryIndex] = None,
     **kwargs
 ) -> ToolExecutionResult:
 
@@ -28,7 +36,24 @@ def _delete_document_handler(
         )
 
     try:
+        # The rebuild may already have copied the source into the new collection
+        if get_write_gate().rebuilding():
+            return ToolExecutionResult.fail(
+                tool_name="delete_document",
+                output="Error: the index is being rebuilt, try again when it finishes",
+                metadata={"error": "rebuild_in_progress"},
+            )
+
         vector_store.delete_by_filter({"source": source})
+        detector = get_near_duplicate_detector(vector_store)
+        if detector is not None:
+            detector.index.forget_source(source)
+        if source_catalog is not None:
+            source_catalog.remove(source)
+        if domain_index is not None:
+            domain_index.remove_source(source)
+        if summary_index is not None:
+            summary_index.remove(source)
         msg = f"Document '{source}' deleted successfully."
         logger.info("tool_delete_document", source=source)
         return ToolExecutionResult.ok(
@@ -61,5 +86,5 @@ def register_delete_document_tool() -> None:
             "required": ["source"],
         },
         handler=_delete_document_handler,
-        dependencies=["vector_store"],
+        dependencies=["vector_store", "source_catalog", "domain_index", "summary_index"],
     )
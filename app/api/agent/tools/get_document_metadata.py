@@ -9,6 +9,7 @@ import structlog
 
 from .tools_registry import ToolExecutionResult, ToolRegistry
 from ....infrastructure.storage.interfaces import VectorStoreInterface
+from ...retrieval_engine.source_catalog import SourceCatalog
 
 logger = structlog.get_logger()
 
@@ -16,6 +17,7 @@ logger = structlog.get_logger()
 def _get_document_metadata_handler(
     source: str,
     vector_store: Optional[VectorStoreInterface] = None,
+    source_catalog: Optional[SourceCatalog] = None,
     **kwargs
 ) -> ToolExecutionResult:
 
@@ -28,7 +30,10 @@ def _get_document_metadata_handler(
         )
 
     try:
-        metadata = vector_store.get_source_metadata(source)
+        metadata = vector_store.get_source_metadata(
+            source,
+            hidden_versions=source_catalog.hidden_versions() if source_catalog else None,
+        )
         if metadata is None:
             return ToolExecutionResult.fail(
             tool_name="get_document_metadata",
@@ -73,5 +78,5 @@ def register_get_document_metadata_tool() -> None:
             "required": ["source"],
         },
         handler=_get_document_metadata_handler,
-        dependencies=["vector_store"],
+        dependencies=["vector_store", "source_catalog"],
     )
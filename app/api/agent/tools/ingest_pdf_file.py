@@ -2,14 +2,17 @@
 Ingest PDF File Tool.
 
 Dispara una tarea de Celery para ingestar un archivo PDF subido por el usuario.
-Si el archivo ya existe en el vector store (mismo source), se re-indexa automáticamente.
+Si el archivo ya existe en el vector store (mismo source), se re-indexa automáticamente;
+si además su contenido es idéntico al ingestado, el job termina sin ingestar nada.
 """
 
 from pathlib import Path
 import structlog
 
 from .tools_registry import ToolRegistry, ToolExecutionResult
+from ...extraction.source.pdf_source import resolve_backend
 from ...retrieval_engine.jobs.celery_tasks import ingest_file_job
+from ...retrieval_engine.upload_registry import get_upload_registry
 
 logger = structlog.get_logger()
 
@@ -67,9 +70,30 @@ def _ingest_pdf_file_handler(
     try:
         # 1. Crear job_id usando JobService (Redis)
         from ...retrieval_engine.jobs.job_service import JobService
+        from ...retrieval_engine.jobs.schemas import JobStatus
         job_serv = JobService()
         job_id = job_serv.create()
 
+        # Hash taken when the file was uploaded (None if it expired)
+        registry = get_upload_registry()
+        content_hash = registry.upload_hash(file_uuid) if registry else None
+        # The job below extracts with the default backend
+        backend = resolve_backend(None)
+        if content_hash and registry.find(content_hash, filename, domain, topic, backend):
+            file_path.unlink(missing_ok=True)
+            job_serv.update_progress(job_id, 100, "No changes")
+            job_serv.update_status(job_id, JobStatus.completed)
+            logger.info("tool_ingest_pdf_unchanged", filename=filename, job_id=job_id)
+            return ToolExecutionResult.ok(
+                tool_name="ingest_pdf_file",
+                output=f"'{filename}' is already ingested with this exact content; nothing changed.",
+                metadata={
+                    "task_id": job_id,
+                    "status": "unchanged",
+                    "source": filename,
+                },
+            )
+
         logger.info(
             "tool_ingest_pdf_start",
             filename=filename,
@@ -81,7 +105,9 @@ def _ingest_pdf_file_handler(
 
         # 2. Dispatch Celery task (reusa ingest_file_job existente)
         # ingest_file_job recibe: job_id, file_path, source, domain, topic
-        ingest_file_job.delay(job_id, str(file_path), filename, domain, topic)
+        ingest_file_job.delay(
+            job_id, str(file_path), filename, domain, topic, content_hash=content_hash
+        )
 
         msg = (
             f"Ingestion started for '{filename}'. "
@@ -9,6 +9,7 @@ import structlog
 
 from .tools_registry import ToolRegistry, ToolExecutionResult
 from ....infrastructure.storage.interfaces import VectorStoreInterface
+from ...retrieval_engine.source_catalog import SourceCatalog
 
 logger = structlog.get_logger()
 
@@ -16,6 +17,7 @@ logger = structlog.get_logger()
 def _list_documents_handler(
     domain: Optional[str] = None,
     vector_store: Optional[VectorStoreInterface] = None,
+    source_catalog: Optional[SourceCatalog] = None,
     **kwargs
 ) -> ToolExecutionResult:
 
@@ -28,7 +30,10 @@ def _list_documents_handler(
         )
 
     try:
-        sources = vector_store.list_sources(domain=domain)
+        sources = vector_store.list_sources(
+            domain=domain,
+            hidden_versions=source_catalog.hidden_versions() if source_catalog else None,
+        )
         if not sources:
             return ToolExecutionResult.fail(
                 tool_name="list_documents",
@@ -71,5 +76,5 @@ def register_list_documents_tool() -> None:
             },
         },
         handler=_list_documents_handler,
-        dependencies=["vector_store"],
+        dependencies=["vector_store", "source_catalog"],
     )
@@ -1,68 +1,159 @@
-from bs4 import BeautifulSoup
+"""
+Limpieza y chunking de páginas HTML con un solo parseo (lxml, en C).
+
+`clean` parsea la página, quita navegación/scripts, elige el contenido
+principal y extrae de una vez las secciones h2/h3. Devuelve el texto del
+contenido principal como `CleanHTML`, un str que además lleva las secciones,
+así `chunk` no vuelve a parsear nada.
+"""
+
+from dataclasses import dataclass
+
+from lxml import etree
+from lxml import html as lxml_html
 
 from app.api.extraction.schema import ChunkWithMetadata
 from app.api.extraction.interface import CleanerInterface
 
 
+_DROP_TAGS = ("nav", "footer", "header", "script", "style")
+_HEADER_TAGS = ("h2", "h3")
+_PARSER = lxml_html.HTMLParser(encoding="utf-8", remove_comments=False)
+
+
+@dataclass(slots=True)
+class HTMLSection:
+    heading: str
+    # stripped text of every node between this header and the next one
+    content: list[str]
+
+
+class CleanHTML(str):
+    """Text of the page's main content, with its h2/h3 sections already extracted."""
+
+    sections: list[HTMLSection]
+
+    def __new__(cls, text: str, sections: list[HTMLSection]) -> "CleanHTML":
+        obj = super().__new__(cls, text)
+        obj.sections = sections
+        return obj
+
+
+def _strip_text(node) -> str:
+    """Stripped strings of the node joined together, like bs4 get_text(strip=True)."""
+    return "".join(s.strip() for s in node.itertext()).replace("¶", "")
+
+
+def _sections(main) -> list[HTMLSection]:
+    headers = list(main.iter(*_HEADER_TAGS))
+    # keyed by the element: lxml proxies are only kept alive (and their
+    # id() stable) while something references them
+    node_texts: dict = {}
+
+    def text_of(node) -> str:
+        # When headers are not siblings the walks overlap; extract each node once
+        text = node_texts.get(node)
+        if text is None:
+            text = _strip_text(node)
+            node_texts[node] = text
+        return text
+
+    def is_stop(node, next_header) -> bool:
+        if node is next_header:
+            return True
+        # an identical header element also ends the section
+        return (
+            next_header is not None
+            and node.tag == next_header.tag
+            and etree.tostring(node, with_tail=False)
+            == etree.tostring(next_header, with_tail=False)
+        )
+
+    sections = []
+    for i, header in enumerate(headers):
+        next_header = headers[i + 1] if i + 1 < len(headers) else None
+        content = []
+
+        # Contenido ENTRE este header y el siguiente: nodos hermanos y el
+        # texto suelto entre ellos (los tails de lxml)
+        tail = (header.tail or "").strip()
+        if tail:
+            content.append(tail.replace("¶", ""))
+        for node in header.itersiblings():
+            if is_stop(node, next_header):
+                break
+            if isinstance(node.tag, str):
+                text = text_of(node)
+                if text:
+                    content.append(text)
+            tail = (node.tail or "").strip()
+            if tail:
+                content.append(tail.replace("¶", ""))
+
+        sections.append(HTMLSection(heading=_strip_text(header), content=content))
+    return sections
+
+
 class HTMLCleaner(CleanerInterface):
-    def clean(self, raw_content: str) -> str:
-        soup = BeautifulSoup(raw_content, "html.parser")
+    def clean(self, raw_content: str) -> CleanHTML:
+        if not raw_content.strip():
+            return CleanHTML("", [])
 
-        for tag in soup(["nav", "footer", "header", "script", "style"]):
-            tag.decompose()
+        try:
+            root = lxml_html.document_fromstring(raw_content.encode("utf-8"), parser=_PARSER)
+        except etree.ParserError:
+            # e.g. nothing but comments
+            return CleanHTML("", [])
+        etree.strip_elements(root, *_DROP_TAGS, with_tail=False)
 
-        main = soup.find("main") or soup.find("article") or soup
+        main = root.find(".//main")
+        if main is None:
+            main = root.find(".//article")
+        if main is None:
+            main = root
 
-        return str(main)
+        return CleanHTML("".join(main.itertext()), _sections(main))
 
     def _split_by_length(
         self, clean_text: str, max_chars: int = 300
     ) -> list[ChunkWithMetadata]:
         overlap = 100
-        chunks = []
-        start = 0
-
-        while start < len(clean_text):
-            end = start + max_chars
-            chunk = clean_text[start:end]
-            chunks.append(ChunkWithMetadata(text=chunk, section=None))
-            start = end - overlap
-
-        return chunks
+        return [
+            ChunkWithMetadata(text=clean_text[start : start + max_chars], section=None)
+            for start in range(0, len(clean_text), max_chars - overlap)
+        ]
+
+    def units(self, clean_text: str) -> list[ChunkWithMetadata]:
+        if not isinstance(clean_text, CleanHTML):
+            clean_text = self.clean(clean_text)
+
+        if not clean_text.sections:
+            text = str(clean_text).strip()
+            return [ChunkWithMetadata(text=text, section=None)] if text else []
+
+        return [
+            ChunkWithMetadata(
+                text=f"{section.heading}\n" + "\n".join(section.content),
+                section=section.heading,
+            )
+            for section in clean_text.sections
+        ]
 
     def chunk(self, clean_text: str) -> list[ChunkWithMetadata]:
-        soup = BeautifulSoup(clean_text, "html.parser")
-        chunks: list[ChunkWithMetadata] = []
-
-        # 1. Identificar encabezados como puntos de anclaje
-        headers = soup.find_all(["h2", "h3"])
-
-        if not headers:
-            return self._split_by_length(soup.get_text(), 1000)
+        if not isinstance(clean_text, CleanHTML):
+            clean_text = self.clean(clean_text)
 
-        # 2. Procesar cada sección
-        for i, header in enumerate(headers):
-            header_text = header.get_text(strip=True).replace("¶", "")
-            content = []
+        if not clean_text.sections:
+            return self._split_by_length(str(clean_text), 1000)
 
-            # Buscamos el contenido que hay ENTRE este header y el siguiente
-            curr = header.next_sibling
-            next_header = headers[i + 1] if i + 1 < len(headers) else None
-
-            while curr and curr != next_header:
-                # Si el elemento tiene texto, lo extraemos limpiamente
-                if hasattr(curr, "get_text"):
-                    text = curr.get_text(strip=True).replace("¶", "")
-                    if text:
-                        content.append(text)
-                curr = curr.next_sibling
-
-            full_section = f"{header_text}\n" + "\n".join(content)
+        chunks: list[ChunkWithMetadata] = []
+        for section in clean_text.sections:
+            full_section = f"{section.heading}\n" + "\n".join(section.content)
 
-            # 3. Control de tamaño (Tu lógica de Colab)
+            # Control de tamaño
             if len(full_section) > 1500:
                 chunks.extend(self._split_by_length(full_section, 1000))
             else:
-                chunks.append(ChunkWithMetadata(text=full_section, section=header_text))
+                chunks.append(ChunkWithMetadata(text=full_section, section=section.heading))
 
         return chunks
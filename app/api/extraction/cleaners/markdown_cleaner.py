@@ -3,6 +3,10 @@ from app.api.extraction.interface import CleanerInterface
 from app.api.extraction.schema import ChunkWithMetadata
 
 
+_SECTION_START = re.compile(r"(?=^#{1,3} )", re.MULTILINE)
+_HEADING_MARKS = re.compile(r"^#+\s*")
+
+
 class MarkdownCleaner(CleanerInterface):
     MAX_CHARS = 1500
     OVERLAP = 250
@@ -10,45 +14,65 @@ class MarkdownCleaner(CleanerInterface):
     def clean(self, raw_content: str) -> str:
         return raw_content
 
+    def units(self, clean_text: str) -> list[ChunkWithMetadata]:
+        result = []
+        for section in _SECTION_START.split(clean_text):
+            section = section.strip()
+            if not section:
+                continue
+            heading_line, _, body = section.partition("\n")
+            heading_line = heading_line.strip()
+            section_name = _HEADING_MARKS.sub("", heading_line)
+            result.append(ChunkWithMetadata(text=heading_line, section=section_name))
+            result.extend(
+                ChunkWithMetadata(text=para.strip(), section=section_name)
+                for para in body.split("\n\n")
+                if para.strip()
+            )
+        return result
+
     def chunk(self, clean_text: str) -> list[ChunkWithMetadata]:
         # Separar por ## o ###
-        sections = re.split(r"(?=^#{1,3} )", clean_text, flags=re.MULTILINE)
+        sections = _SECTION_START.split(clean_text)
         sections = [s.strip() for s in sections if s.strip()]
 
         result: list[ChunkWithMetadata] = []
 
         for section in sections:
             # Extraer el heading de la primera línea
-            lines = section.split("\n", 1)
-            heading_line = lines[0].strip()
-            section_name = re.sub(r"^#+\s*", "", heading_line)
-            body = lines[1].strip() if len(lines) > 1 else ""
+            heading_line, _, body = section.partition("\n")
+            heading_line = heading_line.strip()
+            section_name = _HEADING_MARKS.sub("", heading_line)
+            body = body.strip()
 
-            full = f"{heading_line}\n{body}" if body else heading_line
-
-            if len(full) <= self.MAX_CHARS:
+            if len(heading_line) + 1 + len(body) <= self.MAX_CHARS or not body:
+                full = f"{heading_line}\n{body}" if body else heading_line
                 result.append(ChunkWithMetadata(text=full, section=section_name))
-            else:
-                # Partir por párrafos manteniendo el section
-                paragraphs = body.split("\n\n")
-                current = heading_line
-                for para in paragraphs:
-                    para = para.strip()
-                    if not para:
-                        continue
-                    if len(current) + len(para) + 2 <= self.MAX_CHARS:
-                        current = current + "\n\n" + para
-                    else:
-                        result.append(
-                            ChunkWithMetadata(
-                                text=current.strip(), section=section_name
-                            )
-                        )
-                        overlap_seed = current[-self.OVERLAP :]
-                        current = overlap_seed + "\n\n" + para
-                if current:
+                continue
+
+            # Partir por párrafos manteniendo el section; el chunk actual se
+            # arma como lista de partes y se une una sola vez al emitirlo
+            parts = [heading_line]
+            size = len(heading_line)
+            for para in body.split("\n\n"):
+                para = para.strip()
+                if not para:
+                    continue
+                if size + len(para) + 2 <= self.MAX_CHARS:
+                    parts.append(para)
+                    size += len(para) + 2
+                else:
+                    current = "\n\n".join(parts)
                     result.append(
                         ChunkWithMetadata(text=current.strip(), section=section_name)
                     )
+                    parts = [current[-self.OVERLAP :], para]
+                    size = len(parts[0]) + 2 + len(para)
+            if size:
+                result.append(
+                    ChunkWithMetadata(
+                        text="\n\n".join(parts).strip(), section=section_name
+                    )
+                )
 
         return result
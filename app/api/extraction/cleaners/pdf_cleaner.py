@@ -1,53 +1,82 @@
 import re
+from collections.abc import Iterator
 from ..schema import ChunkWithMetadata
 from ..interface import CleanerInterface
 
 
+# Character-level passes as one translate() each
+_DASHES = str.maketrans({chr(c): "-" for c in range(0x2010, 0x2016)})
+_CONTROL_CHARS = str.maketrans(
+    dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+)
+_INST = re.compile(r"<s>\[INST\].*?\[/INST\]", re.DOTALL)
+# Were (\w+)-...: that backtracks over every long word, quadratic on runs of
+# \w. A \w run only matches when followed by "-", so it always ends at the
+# run's last character; matching that one character finds the same joins.
+_CUT_WORD = re.compile(r"(\w)-\n(\w+)")
+_CUT_WORD_SPACED = re.compile(r"(\w)-\s*\n\s*(\w+)")
+
+_BLANK_LINES = re.compile(r"\n{2,}")
+_TOC_PAGE = re.compile(r"\|\s*(v{1,3}i{0,3}|ix|x{1,3}|\d+)\s*$")
+_NUMBERED_HEADING = re.compile(r"^[0-9]+\.(?:[0-9]+\.?)?\s+[A-Z]")
+_DIGIT = re.compile(r"\d")
+
+# Ordered regex passes. The guard is a literal every match contains (None =
+# always run); when it is absent the pass cannot change the text and the
+# copy of the whole document is skipped. Several patterns let \s span line
+# breaks, so the order and the passes themselves must stay as they are for
+# the output to remain identical.
+_BEFORE_CONTROL_CHARS = (
+    # putting together cut words
+    ("-\n", _CUT_WORD, r"\1\2"),
+    # protect headers before hanging new lines
+    ("\n", re.compile(r"\n([A-Z][a-zA-Z ]{2,40})\n"), r"\n\n\1\n\n"),
+    ("|", re.compile(r"\|\s*\d+\s*$"), ""),
+    ("[INST]", _INST, ""),
+    (".....", re.compile(r"\.{5,}\s*\d+$", re.MULTILINE), ""),
+    # Remove index-like lines
+    ("Index", re.compile(r"^Index\s+\|\s+\d+.*$", re.MULTILINE), ""),
+    # Remove lines with many numbers separated by commas
+    (
+        None,
+        re.compile(
+            r"^[A-Za-z ,\-]+\s\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*$", re.MULTILINE
+        ),
+        "",
+    ),
+)
+_AFTER_CONTROL_CHARS = (
+    (None, re.compile(r"[ \t]+"), " "),
+    ("-", _CUT_WORD_SPACED, r"\1\2"),
+    ("\n\n\n", re.compile(r"\n{3,}"), "\n\n"),
+    ("|", re.compile(r"^[A-Z][^\n]{0,80}\|\s*\d+\s*$", re.MULTILINE), ""),
+    (None, re.compile(r"^\s*\d+\s*$", re.MULTILINE), ""),
+    ("[INST]", _INST, ""),
+)
+
+
+def _run(passes, content: str) -> str:
+    for guard, pattern, repl in passes:
+        if guard is None or guard in content:
+            content = pattern.sub(repl, content)
+    return content
+
+
 class PDFCleaner(CleanerInterface):
     def clean(self, raw_content: str) -> str:
         if not raw_content:
             return ""
 
-        content = re.sub(r"[\u2010-\u2015]", "-", raw_content)
-        # putting together cut words
-        content = re.sub(r"(\w+)-\n(\w+)", r"\1\2", content)
-
-        # protect headers before hanging new lines
-        content = re.sub(r"\n([A-Z][a-zA-Z ]{2,40})\n", r"\n\n\1\n\n", content)
-
-        # content = re.sub(r"\n(?=[a-z])", " ", content)
-        content = re.sub(r"\|\s*\d+\s*$", "", content)
-        content = re.sub(r"<s>\[INST\].*?\[/INST\]", "", content, flags=re.DOTALL)
-
-        content = re.sub(r"\.{5,}\s*\d+$", "", content, flags=re.MULTILINE)
-
-        # Remove index-like lines
-        content = re.sub(r"^Index\s+\|\s+\d+.*$", "", content, flags=re.MULTILINE)
-
-        # Remove lines with many numbers separated by commas
-        content = re.sub(
-            r"^[A-Za-z ,\-]+\s\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*$",
-            "",
-            content,
-            flags=re.MULTILINE,
-        )
-
-        content = re.sub(r"[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]", "", content)
-        content = re.sub(r"[ \t]+", " ", content)
-        content = re.sub(r"(\w+)-\s*\n\s*(\w+)", r"\1\2", content)
-        content = re.sub(r"\n{3,}", "\n\n", content)
-
-        content = re.sub(
-            r"^[A-Z][^\n]{0,80}\|\s*\d+\s*$", "", content, flags=re.MULTILINE
-        )
-        content = re.sub(r"^\s*\d+\s*$", "", content, flags=re.MULTILINE)
-        content = re.sub(r"<s>\[INST\].*?\[/INST\]", "", content, flags=re.DOTALL)
-
-        lines = [line.strip() for line in content.split("\n")]
+        content = raw_content.translate(_DASHES)
+        content = _run(_BEFORE_CONTROL_CHARS, content)
+        content = content.translate(_CONTROL_CHARS)
+        content = _run(_AFTER_CONTROL_CHARS, content)
 
+        # strip lines and keep at most one empty line in a row
         clean_lines = []
         prev_empty = False
-        for line in lines:
+        for line in content.split("\n"):
+            line = line.strip()
             if line:
                 clean_lines.append(line)
                 prev_empty = False
@@ -62,13 +91,13 @@ class PDFCleaner(CleanerInterface):
             return False
 
         # Excluir líneas de índice/TOC (tienen puntos suspensivos o número de página al final)
-        if re.search(r"\.{3,}", line):
+        if "..." in line:
             return False
-        if re.search(r"\|\s*(v{1,3}i{0,3}|ix|x{1,3}|\d+)\s*$", line):
+        if _TOC_PAGE.search(line):
             return False
 
         # Heading numerado tipo "1.2 Algo"
-        if re.match(r"^[0-9]+\.(?:[0-9]+\.?)?\s+[A-Z]", line):
+        if _NUMBERED_HEADING.match(line):
             return True
 
         # Todo mayúsculas
@@ -80,7 +109,7 @@ class PDFCleaner(CleanerInterface):
         if (
             len(line) < 60
             and not line.endswith(".")
-            and not re.search(r"\d", line)  # sin números
+            and not _DIGIT.search(line)  # sin números
             and len(words) >= 2
             and all(w[0].isupper() for w in words if len(w) > 3)
         ):
@@ -93,50 +122,35 @@ class PDFCleaner(CleanerInterface):
     ) -> list[str]:
         chunks = []
         start = 0
+        size = len(text)
 
-        while start < len(text):
+        while start < size:
             end = start + max_chars
-            chunk = text[start:end]
-
-            if end < len(text):
-                last_period = chunk.rfind(". ")
-                last_newline = chunk.rfind("\n")
-                cut = max(last_period, last_newline)
 
-                if cut > max_chars * 0.7:
-                    chunk = chunk[: cut + 1]
-                    end = start + len(chunk)
+            if end < size:
+                # search the cut inside text[start:end] without slicing it first
+                cut = max(text.rfind(". ", start, end), text.rfind("\n", start, end))
+                if cut - start > max_chars * 0.7:
+                    end = cut + 1
 
-            chunks.append(chunk.strip())
+            chunks.append(text[start:end].strip())
             start = end - overlap
 
         return chunks
 
-    def chunk(
-        self, clean_text: str, max_chars: int = 1500, overlap: int = 250
-    ) -> list[ChunkWithMetadata]:
-        if overlap >= max_chars:
-            raise ValueError("overlap must be smaller than max_chars")
-        if not clean_text.strip():
-            return []
-
-        text = re.sub(r"\n{2,}", "\n\n", clean_text)
+    def _blocks(self, clean_text: str) -> Iterator[tuple[str, bool]]:
+        """(block, is_heading) for every paragraph outside the table of contents."""
+        text = _BLANK_LINES.sub("\n\n", clean_text)
         # text = re.sub(r"(?<!\n)\n(?!\n)", " ", text)
 
         in_toc = False
-        blocks = text.split("\n\n")
-
-        result: list[ChunkWithMetadata] = []
-        current_text = ""
-        current_section = None
-
-        for block in blocks:
+        for block in text.split("\n\n"):
             block = block.strip()
             if not block:
                 continue
 
-            if "Table of Contents" in block or re.match(
-                r"^(Table of Contents|Contents)$", block
+            if "Contents" in block and (
+                "Table of Contents" in block or block == "Contents"
             ):
                 in_toc = True
                 continue
@@ -147,38 +161,68 @@ class PDFCleaner(CleanerInterface):
                 else:
                     continue
 
-            if self._is_heading(block):
+            yield block, self._is_heading(block)
+
+    def units(self, clean_text: str) -> list[ChunkWithMetadata]:
+        result = []
+        section = None
+        for block, is_heading in self._blocks(clean_text):
+            if is_heading:
+                section = block
+            else:
+                result.append(ChunkWithMetadata(text=block, section=section))
+        return result
+
+    def chunk(
+        self, clean_text: str, max_chars: int = 1500, overlap: int = 250
+    ) -> list[ChunkWithMetadata]:
+        if overlap >= max_chars:
+            raise ValueError("overlap must be smaller than max_chars")
+        if not clean_text.strip():
+            return []
+
+        result: list[ChunkWithMetadata] = []
+        # Current chunk as its blocks; joined once, when it is emitted.
+        # `size` is the length the joined text would have.
+        parts: list[str] = []
+        size = 0
+        current_section = None
+
+        def emit() -> None:
+            result.append(
+                ChunkWithMetadata(text="\n\n".join(parts).strip(), section=current_section)
+            )
+
+        for block, is_heading in self._blocks(clean_text):
+            if is_heading:
                 current_section = block
                 continue
 
             if len(block) > max_chars:
-                if current_text:
-                    result.append(
-                        ChunkWithMetadata(
-                            text=current_text.strip(), section=current_section
-                        )
-                    )
+                if size:
+                    emit()
                 sub_chunks = self._split_by_length(block, max_chars, overlap)
                 for sc in sub_chunks:
                     result.append(ChunkWithMetadata(text=sc, section=current_section))
-                current_text = sub_chunks[-1][-overlap:] if sub_chunks else ""
+                seed = sub_chunks[-1][-overlap:] if sub_chunks else ""
+                parts, size = ([seed], len(seed)) if seed else ([], 0)
                 continue
 
-            if len(current_text) + len(block) + 2 <= max_chars:
-                current_text = current_text + "\n\n" + block if current_text else block
+            if size + len(block) + 2 <= max_chars:
+                if size:
+                    size += 2
+                parts.append(block)
+                size += len(block)
             else:
-                if current_text:
-                    result.append(
-                        ChunkWithMetadata(
-                            text=current_text.strip(), section=current_section
-                        )
-                    )
+                if size:
+                    emit()
                 overlap_seed = result[-1].text[-overlap:] if result else ""
-                current_text = overlap_seed + "\n\n" + block if overlap_seed else block
+                if overlap_seed:
+                    parts, size = [overlap_seed, block], len(overlap_seed) + 2 + len(block)
+                else:
+                    parts, size = [block], len(block)
 
-        if current_text:
-            result.append(
-                ChunkWithMetadata(text=current_text.strip(), section=current_section)
-            )
+        if size:
+            emit()
 
         return result
@@ -21,6 +21,43 @@ class SourceFetchError(SourceException):
         self.status_code = status_code
 
 
+class UnknownPDFBackendError(SourceException):
+    def __init__(self, backend: str, available: list[str]) -> None:
+        super().__init__(
+            f"Unknown PDF backend '{backend}' (available: {', '.join(available)})"
+        )
+        self.backend = backend
+
+
+class PDFBackendNotInstalledError(SourceException):
+    def __init__(self, backend: str, requirements: str) -> None:
+        super().__init__(
+            f"PDF backend '{backend}' is not installed (pip install -r {requirements})"
+        )
+        self.backend = backend
+
+
+class UnknownChunkingModeError(SourceException):
+    def __init__(self, mode: str, available: list[str]) -> None:
+        super().__init__(
+            f"Unknown chunking mode '{mode}' (available: {', '.join(available)})"
+        )
+        self.mode = mode
+
+
+class SourceTooLargeError(SourceException):
+    def __init__(self, url: str, max_bytes: int) -> None:
+        super().__init__(f"Download of {url} exceeds {max_bytes} bytes")
+        self.url = url
+        self.max_bytes = max_bytes
+
+
+class SourceParseError(SourceException):
+    def __init__(self, name: str, reason: str) -> None:
+        super().__init__(f"Could not parse {name}: {reason}")
+        self.name = name
+
+
 class EmptySourceContentError(SourceException):
     def __init__(self, url: str) -> None:
         super().__init__(f"Empty content for URL: {url}")
@@ -4,17 +4,47 @@ from .cleaners.pdf_cleaner import PDFCleaner
 from .source.html_source import HTMLSource
 from .source.readme_source import READMESource
 from .source.pdf_source import PDFSource
+from .source.csv_source import CSVSource
+from .interface import CleanerInterface
+from .exceptions import UnknownChunkingModeError
+from .token_chunker import (
+    ParentChildCleaner,
+    TokenBudgetCleaner,
+    get_parent_child_chunkers,
+    get_token_chunker,
+)
+from ...core.settings import get_settings
+
+CHUNKING_MODES = ("chars", "tokens", "parent_child")
 
 
 class SourceFactory:
     @staticmethod
     def get_extractor_and_cleaner(url: str):
         if "raw.githubusercontent.com" in url or url.endswith(".md"):
-            return READMESource(), MarkdownCleaner()
+            return READMESource(), SourceFactory.with_chunking(MarkdownCleaner())
+
+        return HTMLSource(), SourceFactory.with_chunking(HTMLCleaner())
 
-        return HTMLSource(), HTMLCleaner()
+    @staticmethod
+    def get_pdf_cleaner(backend: str | None = None):
+        """Para archivos PDF subidos; `backend` elige el extractor (default: settings)"""
+        return PDFSource(backend), SourceFactory.with_chunking(PDFCleaner())
+
+    @staticmethod
+    def get_csv_source():
+        """Para archivos CSV/TSV subidos; la fuente ya devuelve los chunks de filas"""
+        return CSVSource()
 
     @staticmethod
-    def get_pdf_cleaner():  # ← NUEVO
-        """Para archivos PDF subidos"""
-        return PDFSource(), PDFCleaner()
+    def with_chunking(cleaner: CleanerInterface) -> CleanerInterface:
+        """Con chunking_mode='tokens' el cleaner empaqueta sus unidades por tokens del modelo;
+        con 'parent_child' embebe ventanas chicas que apuntan a su sección"""
+        mode = get_settings().chunking_mode
+        if mode == "chars":
+            return cleaner
+        if mode == "tokens":
+            return TokenBudgetCleaner(cleaner, get_token_chunker())
+        if mode == "parent_child":
+            return ParentChildCleaner(cleaner, *get_parent_child_chunkers())
+        raise UnknownChunkingModeError(mode, list(CHUNKING_MODES))
@@ -0,0 +1,87 @@
+"""
+Cliente HTTP async compartido por las sources de extracción.
+
+Un pool de conexiones por proceso (HTTP/2 opcional) detrás de un cache HTTP en
+disco que respeta Cache-Control y revalida con ETag/Last-Modified, así
+re-ingestar un README o una página sin cambios se resuelve con un 304. El
+directorio del cache puede estar en un volumen compartido entre la API y los
+workers de Celery.
+
+httpx.AsyncClient queda atado al event loop en el que abre sus conexiones,
+así que se mantiene un cliente por loop: el de la API, y en los workers de
+Celery un loop de larga vida por proceso en el que corren todas las tasks
+(así el pool se reusa entre tasks). Quien cierra un loop cierra antes sus
+clientes con close_http_clients().
+"""
+
+import asyncio
+import weakref
+from pathlib import Path
+
+import hishel
+import httpx
+
+from app.core.settings import get_settings
+
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[bool, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_client(cached: bool) -> httpx.AsyncClient:
+    settings = get_settings()
+
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        http2=settings.http_client_http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_client_max_connections,
+            max_keepalive_connections=settings.http_client_max_keepalive,
+            keepalive_expiry=settings.http_client_keepalive_expiry,
+        ),
+    )
+
+    if cached and settings.http_cache_dir:
+        transport = hishel.AsyncCacheTransport(
+            transport=transport,
+            storage=hishel.AsyncFileStorage(
+                base_path=Path(settings.http_cache_dir),
+                ttl=settings.http_cache_ttl_seconds,
+            ),
+            controller=hishel.Controller(
+                cacheable_methods=["GET"],
+                cacheable_status_codes=[200, 301, 308],
+                # Docs pages rarely send freshness headers; store them and
+                # revalidate with their validators on every use
+                allow_heuristics=True,
+                always_revalidate=True,
+            ),
+        )
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=settings.http_client_timeout,
+        follow_redirects=True,
+    )
+
+
+def get_http_client(cached: bool = True) -> httpx.AsyncClient:
+    """
+    Get the pooled client of the running event loop.
+
+    `cached=False` skips the response cache, for callers that handle
+    conditional requests themselves (the crawler).
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(cached)
+    if client is None or client.is_closed:
+        client = _build_client(cached)
+        clients[cached] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the clients of the running event loop (API or worker shutdown)."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.aclose() for client in clients.values()))
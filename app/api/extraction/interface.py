@@ -14,3 +14,7 @@ class CleanerInterface(ABC):
 
     @abstractmethod
     def chunk(self, clean_text: str) -> list[ChunkWithMetadata]: ...
+
+    def units(self, clean_text: str) -> list[ChunkWithMetadata]:
+        """Smallest pieces (paragraphs, sections) with their section, for token-budget packing."""
+        return self.chunk(clean_text)
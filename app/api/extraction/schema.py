@@ -1,5 +1,9 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
-class ChunkWithMetadata(BaseModel):
+
+@dataclass(slots=True)
+class ChunkWithMetadata:
     text: str
     section: str | None = None
+    # parent_child chunking: text of the larger passage this window belongs to
+    parent: str | None = None
@@ -0,0 +1,352 @@
+"""
+Crawler de sitios de documentación.
+
+Parte de una URL raíz (siguiendo links dentro de un prefijo de path) o de un
+sitemap.xml, respeta robots.txt, limita el ritmo de requests por host y hace
+GET condicionales con los ETag/Last-Modified guardados de la pasada anterior,
+así un re-crawl solo devuelve contenido de las páginas que cambiaron.
+
+Keys:
+    crawl:page:{url}   -> hash con etag, last_modified, content_hash, size, links
+    crawl:sites        -> hash root -> JSON con los parámetros del crawl
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import structlog
+from bs4 import BeautifulSoup
+from redis import Redis
+
+from app.api.extraction.http_client import get_http_client
+from app.core.redis import decode, get_redis
+from app.infrastructure.metrics import (
+    crawler_bytes_saved_total,
+    crawler_pages_per_second,
+    crawler_pages_total,
+)
+
+
+log = structlog.get_logger()
+
+_DONE = object()
+
+
+@dataclass
+class PageValidators:
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    size: int = 0
+    links: list[str] = field(default_factory=list)
+
+
+@dataclass
+class CrawledPage:
+    url: str
+    # changed / unchanged / failed / skipped
+    status: str
+    html: str | None = None
+    links: list[str] = field(default_factory=list)
+    error: str | None = None
+    # Validators to persist once the page has been ingested
+    validators: PageValidators | None = None
+
+
+class CrawlStateStore:
+    """Per-URL validators and registered sites, in Redis."""
+
+    PREFIX = "crawl"
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        self._redis = redis or get_redis()
+
+    def _page_key(self, url: str) -> str:
+        return f"{self.PREFIX}:page:{url}"
+
+    def get(self, url: str) -> PageValidators:
+        raw = self._redis.hgetall(self._page_key(url))
+        if not raw:
+            return PageValidators()
+        data = {decode(k): decode(v) for k, v in raw.items()}
+        return PageValidators(
+            etag=data.get("etag") or None,
+            last_modified=data.get("last_modified") or None,
+            content_hash=data.get("content_hash") or None,
+            size=int(data.get("size", 0)),
+            links=json.loads(data.get("links", "[]")),
+        )
+
+    def save(self, url: str, validators: PageValidators) -> None:
+        self._redis.hset(
+            self._page_key(url),
+            mapping={
+                "etag": validators.etag or "",
+                "last_modified": validators.last_modified or "",
+                "content_hash": validators.content_hash or "",
+                "size": validators.size,
+                "links": json.dumps(validators.links),
+            },
+        )
+
+    def register_site(self, root: str, params: dict) -> None:
+        self._redis.hset(f"{self.PREFIX}:sites", root, json.dumps(params))
+
+    def list_sites(self) -> dict[str, dict]:
+        raw = self._redis.hgetall(f"{self.PREFIX}:sites")
+        return {decode(k): json.loads(v) for k, v in raw.items()}
+
+
+class HostRateLimiter:
+    """Minimum interval between requests to the same host (in-process)."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._intervals: dict[str, float] = {}
+        self._next: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def set_delay(self, host: str, seconds: float) -> None:
+        """Honour a robots.txt Crawl-delay if it is slower than our own rate."""
+        self._intervals[host] = max(self.interval, seconds)
+
+    async def wait(self, host: str) -> None:
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            if start > now:
+                await asyncio.sleep(start - now)
+            self._next[host] = start + self._intervals.get(host, self.interval)
+
+
+def extract_links(html: str, base_url: str) -> list[str]:
+    """Absolute, fragment-less http(s) links of a page."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        url, _ = urldefrag(urljoin(base_url, anchor["href"]))
+        if url.startswith(("http://", "https://")):
+            links.append(url)
+    return list(dict.fromkeys(links))
+
+
+def parse_sitemap(xml_text: str) -> tuple[list[str], list[str]]:
+    """Return (page urls, nested sitemap urls) of a sitemap or sitemap index."""
+    root = ET.fromstring(xml_text)
+    locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+    if root.tag.endswith("sitemapindex"):
+        return [], locs
+    return locs, []
+
+
+class CrawlerSource:
+    """
+    Concurrent, polite crawler that yields pages as they are fetched.
+    """
+
+    def __init__(
+        self,
+        state: CrawlStateStore | None = None,
+        concurrency: int = 8,
+        requests_per_second: float = 2.0,
+        max_pages: int = 500,
+        user_agent: str = "ai-toolkit-crawler",
+        is_indexed: Callable[[str], bool] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        self.state = state or CrawlStateStore()
+        # Defaults to the shared per-loop client, without the response cache:
+        # the crawler sends its own conditional requests
+        self._client = client
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.user_agent = user_agent
+        # Pages missing from the index are always fetched in full
+        self.is_indexed = is_indexed
+        self.rate = HostRateLimiter(requests_per_second)
+        self._robots: dict[str, RobotFileParser] = {}
+
+    def _http(self) -> httpx.AsyncClient:
+        return self._client or get_http_client(cached=False)
+
+    # ------------------------------------------------------------------
+    # Scope and politeness
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def default_prefix(root: str) -> str:
+        path = urlparse(root).path
+        if path.endswith("sitemap.xml"):
+            return "/"
+        return path if path.endswith("/") else path.rsplit("/", 1)[0] + "/"
+
+    @staticmethod
+    def in_scope(url: str, root: str, prefix: str) -> bool:
+        parsed, base = urlparse(url), urlparse(root)
+        return parsed.netloc == base.netloc and parsed.path.startswith(prefix)
+
+    async def _robots_for(self, url: str) -> RobotFileParser:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin in self._robots:
+            return self._robots[origin]
+
+        parser = RobotFileParser()
+        try:
+            response = await self._http().get(
+                f"{origin}/robots.txt", headers={"User-Agent": self.user_agent}
+            )
+            lines = response.text.splitlines() if response.status_code == 200 else []
+        except httpx.HTTPError:
+            lines = []
+        parser.parse(lines)
+
+        delay = parser.crawl_delay(self.user_agent)
+        if delay:
+            self.rate.set_delay(parsed.netloc, float(delay))
+        self._robots[origin] = parser
+        return parser
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    async def _get(self, url: str, headers: dict | None = None) -> httpx.Response:
+        await self.rate.wait(urlparse(url).netloc)
+        return await self._http().get(
+            url, headers={"User-Agent": self.user_agent, **(headers or {})}
+        )
+
+    async def _seeds(self, root: str) -> list[str]:
+        if not urlparse(root).path.endswith(".xml"):
+            return [root]
+
+        pages: list[str] = []
+        sitemaps = [root]
+        while sitemaps and len(pages) < self.max_pages:
+            response = await self._get(sitemaps.pop())
+            response.raise_for_status()
+            found, nested = parse_sitemap(response.text)
+            pages.extend(found)
+            sitemaps.extend(nested)
+        return pages
+
+    async def _visit(self, url: str) -> CrawledPage:
+        robots = await self._robots_for(url)
+        if not robots.can_fetch(self.user_agent, url):
+            return CrawledPage(url=url, status="skipped", error="robots.txt")
+
+        previous = await asyncio.to_thread(self.state.get, url)
+        conditional = self.is_indexed is None or await asyncio.to_thread(self.is_indexed, url)
+
+        headers = {}
+        if conditional and previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if conditional and previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+
+        response = await self._get(url, headers)
+
+        if response.status_code == 304:
+            crawler_bytes_saved_total.inc(previous.size)
+            return CrawledPage(url=url, status="unchanged", links=previous.links)
+
+        if response.status_code >= 400:
+            return CrawledPage(url=url, status="failed", error=f"HTTP {response.status_code}")
+
+        if "html" not in response.headers.get("content-type", "text/html"):
+            return CrawledPage(url=url, status="skipped", error="not html")
+
+        html = response.text
+        validators = PageValidators(
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            content_hash=hashlib.sha256(response.content).hexdigest(),
+            size=len(response.content),
+            links=extract_links(html, str(response.url)),
+        )
+
+        # Servers without validators: fall back to comparing content
+        if conditional and validators.content_hash == previous.content_hash:
+            await asyncio.to_thread(self.state.save, url, validators)
+            return CrawledPage(url=url, status="unchanged", links=validators.links)
+
+        return CrawledPage(
+            url=url, status="changed", html=html, links=validators.links, validators=validators
+        )
+
+    def commit(self, page: CrawledPage) -> None:
+        """Persist a page's validators once its content has been ingested."""
+        if page.validators is not None:
+            self.state.save(page.url, page.validators)
+
+    # ------------------------------------------------------------------
+
+    async def crawl(self, root: str, path_prefix: str | None = None) -> AsyncIterator[CrawledPage]:
+        """Yield every in-scope page of the site as soon as it is fetched."""
+        prefix = path_prefix or self.default_prefix(root)
+        started = time.perf_counter()
+
+        frontier: asyncio.Queue = asyncio.Queue()
+        out: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        seen: set[str] = set()
+
+        def enqueue(url: str) -> None:
+            if url in seen or len(seen) >= self.max_pages:
+                return
+            seen.add(url)
+            frontier.put_nowait(url)
+
+        for seed in await self._seeds(root):
+            if self.in_scope(seed, root, prefix) or seed == root:
+                enqueue(seed)
+
+        async def worker() -> None:
+            while True:
+                url = await frontier.get()
+                try:
+                    # Any error is this page's failure: a dead worker would
+                    # leave frontier.join() waiting forever
+                    try:
+                        page = await self._visit(url)
+                    except Exception as e:
+                        log.warning("crawl_page_failed", url=url, error=str(e))
+                        page = CrawledPage(url=url, status="failed", error=str(e))
+                    for link in page.links:
+                        if self.in_scope(link, root, prefix):
+                            enqueue(link)
+                    crawler_pages_total.labels(outcome=page.status).inc()
+                    await out.put(page)
+                finally:
+                    frontier.task_done()
+
+        async def close_when_drained() -> None:
+            await frontier.join()
+            await out.put(_DONE)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.create_task(close_when_drained()))
+
+        pages = 0
+        try:
+            while (page := await out.get()) is not _DONE:
+                pages += 1
+                yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            elapsed = time.perf_counter() - started
+            if elapsed > 0:
+                crawler_pages_per_second.set(pages / elapsed)
+            log.info("crawl_finished", root=root, pages=pages, seconds=round(elapsed, 2))
@@ -1,37 +1,166 @@
-from io import StringIO
-import chardet
-from fastapi import HTTPException, UploadFile
+"""
+Ingesta de archivos tabulares (CSV/TSV) por bloques, con memoria acotada.
+
+La codificación se detecta con chardet sobre un prefijo del archivo y el
+separador con csv.Sniffer sobre el mismo prefijo. pandas lee el archivo en
+bloques de filas; cada bloque se agrupa en chunks de texto que repiten la
+fila de encabezados, así cada chunk se entiende sin el resto de la tabla.
+"""
+
+import asyncio
+import csv
+import os
+from collections.abc import AsyncIterator, Iterator
+
+from chardet.universaldetector import UniversalDetector
+from fastapi import UploadFile
 import pandas as pd
 
+from app.api.extraction.exceptions import EmptySourceContentError, SourceParseError
+from app.api.extraction.interface import SourceInterface
+from app.api.extraction.schema import ChunkWithMetadata
+from app.api.extraction.source.spool import spool_upload
+from app.core.settings import get_settings
+
+
+CSV_SUFFIXES = (".csv", ".tsv")
+_DELIMITERS = ",;\t|"
+_READ_BLOCK = 64 * 1024
+
+
+def sniff_encoding(path: str, max_bytes: int) -> str:
+    """Encoding guessed from at most `max_bytes` of the file."""
+    detector = UniversalDetector()
+    read = 0
+    with open(path, "rb") as f:
+        while read < max_bytes and not detector.done:
+            block = f.read(min(_READ_BLOCK, max_bytes - read))
+            if not block:
+                break
+            detector.feed(block)
+            read += len(block)
+    detector.close()
+    return detector.result["encoding"] or "iso-8859-1"
+
+
+def sniff_delimiter(path: str, encoding: str) -> str:
+    if path.lower().endswith(".tsv"):
+        return "\t"
+    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+        sample = f.read(_READ_BLOCK)
+    # only whole lines, the last one may be cut
+    if "\n" in sample:
+        sample = sample[: sample.rfind("\n")]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=_DELIMITERS).delimiter
+    except csv.Error:
+        # previous default
+        return ";"
 
-class CSVSource:
-    async def extract_data_from_csv(self, file: UploadFile) -> str:
-        # Read file
-        file_content = await file.read()
 
-        # Detect encoding automatically
-        detector = chardet.universaldetector.UniversalDetector()
-        detector.reset()
-        detector.feed(file_content)
-        detector.close()
-        detected = detector.result
-        encoding = detected["encoding"] or "iso-8859-1"
+def _cell(value: str) -> str:
+    return " ".join(value.split())
 
-        # Decode file
+
+def iter_row_chunks(
+    path: str, name: str, rows_per_read: int, max_chars: int, sniff_bytes: int
+) -> Iterator[list[ChunkWithMetadata]]:
+    """
+    Chunks of every block of rows read from the file.
+
+    Rows are grouped until `max_chars`; a row longer than that is a chunk on
+    its own. The section is the range of data rows (1-based) in the chunk.
+    """
+    encoding = sniff_encoding(path, sniff_bytes)
+    try:
+        reader = pd.read_csv(
+            path,
+            sep=sniff_delimiter(path, encoding),
+            encoding=encoding,
+            encoding_errors="replace",
+            on_bad_lines="skip",
+            dtype=str,
+            keep_default_na=False,
+            chunksize=rows_per_read,
+        )
+    except pd.errors.EmptyDataError:
+        return
+    except (pd.errors.ParserError, ValueError) as e:
+        raise SourceParseError(name, str(e)) from e
+
+    row_number = 0
+    with reader:
         try:
-            text = file_content.decode(encoding)
-        except UnicodeDecodeError:
-            text = file_content.decode("utf-8", errors="replace")
+            for frame in reader:
+                header = " | ".join(_cell(str(c)) for c in frame.columns)
+                chunks: list[ChunkWithMetadata] = []
+                lines: list[str] = []
+                size = len(header)
+                first = row_number + 1
+
+                for values in frame.itertuples(index=False, name=None):
+                    line = " | ".join(_cell(v) for v in values)
+                    if not line.replace("|", "").strip():
+                        row_number += 1
+                        continue
+                    if lines and size + 1 + len(line) > max_chars:
+                        chunks.append(
+                            ChunkWithMetadata(
+                                text="\n".join([header, *lines]),
+                                section=f"rows {first}-{row_number}",
+                            )
+                        )
+                        lines, size, first = [], len(header), row_number + 1
+                    lines.append(line)
+                    size += 1 + len(line)
+                    row_number += 1
 
-        # Convert file to dataframe
+                if lines:
+                    chunks.append(
+                        ChunkWithMetadata(
+                            text="\n".join([header, *lines]),
+                            section=f"rows {first}-{row_number}",
+                        )
+                    )
+                yield chunks
+        except pd.errors.ParserError as e:
+            raise SourceParseError(name, str(e)) from e
+
+
+class CSVSource(SourceInterface):
+    async def extract(self, file: UploadFile) -> str:
+        """Whole table as text; meant for small files, use `iter_chunks` to ingest."""
+        return "\n\n".join([c.text async for c in self.iter_chunks(file)])
+
+    async def iter_chunks(self, file: UploadFile) -> AsyncIterator[ChunkWithMetadata]:
+        path, temporary = await asyncio.to_thread(spool_upload, file, ".csv")
         try:
-            df = pd.read_csv(StringIO(text), sep=";", on_bad_lines="skip")
-        except Exception as e:
-            raise HTTPException(
-                status_code=400, detail=f"Error procesando CSV: {str(e)}"
-            )
+            async for chunk in self.iter_chunks_from_path(path, file.filename or path):
+                yield chunk
+        finally:
+            if temporary:
+                os.remove(path)
 
-        if df.empty:
-            raise ValueError("El CSV está vacío o no se pudo parsear")
+    async def iter_chunks_from_path(
+        self, path: str, name: str
+    ) -> AsyncIterator[ChunkWithMetadata]:
+        settings = get_settings()
+        blocks = iter_row_chunks(
+            path,
+            name,
+            settings.csv_rows_per_read,
+            settings.csv_chunk_max_chars,
+            settings.csv_sniff_bytes,
+        )
+        produced = 0
+        try:
+            # Parse each block in a thread; only one block of rows is in memory
+            while (chunks := await asyncio.to_thread(next, blocks, None)) is not None:
+                for chunk in chunks:
+                    produced += 1
+                    yield chunk
+        finally:
+            blocks.close()
 
-        return df.head(5).to_string(index=False)
+        if not produced:
+            raise EmptySourceContentError(name)
@@ -1,17 +1,248 @@
-from io import BytesIO
+"""
+Extracción de texto de PDFs repartiendo rangos de páginas en un pool de procesos.
+
+pdfplumber es CPU-bound y lento; cada proceso abre el archivo y extrae su
+rango de páginas una sola vez. Los textos vuelven en orden de página a medida
+que terminan los rangos, así el consumidor puede empezar antes de la última.
+
+El backend de extracción es intercambiable: pypdfium2 y PyMuPDF leen solo el
+texto y son mucho más rápidos; pdfplumber hace análisis de layout y queda para
+documentos con muchas tablas. Las librerías se importan dentro de cada proceso
+del pool, solo la del backend elegido.
+
+PyMuPDF es AGPL, así que no está en requirements.txt: se instala aparte desde
+requirements-pymupdf.txt y pedir ese backend sin tenerlo instalado falla con
+un error claro antes de encolar nada.
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 from fastapi import UploadFile
-import pdfplumber
+import structlog
+
+from app.api.extraction.exceptions import PDFBackendNotInstalledError, UnknownPDFBackendError
 from app.api.extraction.interface import SourceInterface
+from app.api.extraction.source.spool import spool_upload
+from app.core.settings import get_settings
+
+
+log = structlog.get_logger()
+
+_pool: Executor | None = None
+
+
+def _pdfplumber_count(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _pdfplumber_range(path: str, start: int, end: int) -> list[str]:
+    import pdfplumber
+
+    with pdfplumber.open(path, pages=list(range(start + 1, end + 1))) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+def _pdfium_count(path: str) -> int:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdfium_range(path: str, start: int, end: int) -> list[str]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    texts = []
+    try:
+        for i in range(start, end):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            # pdfium separates lines with \r\n
+            texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return texts
+
+
+def _pymupdf_count(path: str) -> int:
+    import pymupdf
+
+    with pymupdf.open(path) as pdf:
+        return pdf.page_count
+
+
+def _pymupdf_range(path: str, start: int, end: int) -> list[str]:
+    import pymupdf
+
+    with pymupdf.open(path) as pdf:
+        return [pdf[i].get_text("text", sort=True) for i in range(start, end)]
+
+
+# name -> (page count, text of pages [start, end))
+PDF_BACKENDS = {
+    "pdfplumber": (_pdfplumber_count, _pdfplumber_range),
+    "pdfium": (_pdfium_count, _pdfium_range),
+    "pymupdf": (_pymupdf_count, _pymupdf_range),
+}
+
+# Backends whose library is an optional install: name -> (module, requirements file)
+OPTIONAL_BACKENDS = {
+    "pymupdf": ("pymupdf", "requirements-pymupdf.txt"),
+}
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def resolve_backend(name: str | None) -> str:
+    """Backend to use: `name` if given, else the configured default."""
+    backend = (name or get_settings().pdf_backend).lower().strip()
+    if backend not in PDF_BACKENDS:
+        raise UnknownPDFBackendError(backend, list(PDF_BACKENDS))
+    if backend in OPTIONAL_BACKENDS:
+        module, requirements = OPTIONAL_BACKENDS[backend]
+        if not _installed(module):
+            raise PDFBackendNotInstalledError(backend, requirements)
+    return backend
+
+
+def extract_page_range(path: str, start: int, end: int, backend: str = "pdfplumber") -> list[str]:
+    """Text of pages [start, end) (0-based); runs in a pool process."""
+    return PDF_BACKENDS[backend][1](path, start, end)
+
+
+def page_count(path: str, backend: str = "pdfplumber") -> int:
+    return PDF_BACKENDS[backend][0](path)
+
+
+def get_pdf_pool() -> Executor:
+    """Process pool shared by every PDF extraction of this process."""
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        workers = settings.pdf_extract_workers or min(4, os.cpu_count() or 1)
+        # spawn: forking a process that already runs threads can deadlock
+        _pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+# Raised by a pool that cannot run tasks: a worker died (BrokenProcessPool),
+# processes could not be started (OSError), or this process is a daemon
+# that may not have children (AssertionError, e.g. a Celery prefork worker)
+_POOL_ERRORS = (BrokenProcessPool, OSError, AssertionError)
+
+
+def _discard_pool(pool: Executor, error: Exception) -> None:
+    """Drop a pool that failed; the next extraction starts a fresh one."""
+    global _pool
+    log.warning("pdf_process_pool_unavailable", error=repr(error))
+    if _pool is pool:
+        _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
 
 
 class PDFSource(SourceInterface):
+    def __init__(self, backend: str | None = None) -> None:
+        self.backend = resolve_backend(backend)
+
     async def extract(self, file: UploadFile) -> str:
-        # Read file
-        file_content = await file.read()
+        """Whole text of the PDF; ingestion uses `iter_pages` to avoid holding it."""
+        return "\n".join([text async for text in self.iter_pages(file) if text])
+
+    async def iter_pages(self, file: UploadFile) -> AsyncIterator[str]:
+        """Yield the text of every page, in order, as soon as it is available."""
+        path, temporary = await asyncio.to_thread(spool_upload, file, ".pdf")
+        try:
+            async for text in self.iter_pages_from_path(path):
+                yield text
+        finally:
+            if temporary:
+                os.remove(path)
 
-        # Open file
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
-            full_text = "\n".join(
-                page.extract_text() for page in pdf.pages if page.extract_text()
+    async def iter_pages_from_path(self, path: str) -> AsyncIterator[str]:
+        settings = get_settings()
+        total = await asyncio.to_thread(page_count, path, self.backend)
+
+        if total < settings.pdf_parallel_min_pages:
+            for text in await asyncio.to_thread(
+                extract_page_range, path, 0, total, self.backend
+            ):
+                yield text
+            return
+
+        loop = asyncio.get_running_loop()
+        pool: Executor | None = get_pdf_pool()
+        step = settings.pdf_pages_per_task
+        starts = iter(range(0, total, step))
+        # Only a few ranges ahead of the consumer, so a slow consumer does
+        # not pile up the text of the whole book in memory
+        pending: deque[tuple[int, int, asyncio.Future, bool]] = deque()
+
+        def in_process(start: int, end: int) -> asyncio.Future:
+            return asyncio.ensure_future(
+                asyncio.to_thread(extract_page_range, path, start, end, self.backend)
             )
-            return full_text
+
+        def fall_back(error: Exception) -> None:
+            nonlocal pool
+            if pool is not None:
+                _discard_pool(pool, error)
+                pool = None
+
+        def submit() -> None:
+            start = next(starts, None)
+            if start is None:
+                return
+            end = min(start + step, total)
+            future = None
+            if pool is not None:
+                try:
+                    future = loop.run_in_executor(
+                        pool, extract_page_range, path, start, end, self.backend
+                    )
+                except _POOL_ERRORS as e:
+                    fall_back(e)
+            if future is not None:
+                pending.append((start, end, future, True))
+            else:
+                pending.append((start, end, in_process(start, end), False))
+
+        for _ in range(settings.pdf_prefetch_tasks):
+            submit()
+        try:
+            while pending:
+                start, end, future, pooled = pending.popleft()
+                try:
+                    texts = await future
+                except _POOL_ERRORS as e:
+                    if not pooled:
+                        raise
+                    # The range is redone here; a real error of the file
+                    # raises again from the in-process extraction
+                    fall_back(e)
+                    texts = await in_process(start, end)
+                submit()
+                for text in texts:
+                    yield text
+        finally:
+            for _, _, future, _ in pending:
+                future.cancel()
@@ -3,6 +3,7 @@ from app.api.extraction.exceptions import (
     SourceInvalidURLError,
     SourceTimeoutError,
 )
+from app.api.extraction.http_client import get_http_client
 from app.api.extraction.interface import SourceInterface
 import httpx
 
@@ -10,9 +11,8 @@ import httpx
 class READMESource(SourceInterface):
     async def extract(self, url: str) -> str:
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            response = await get_http_client().get(url)
+            response.raise_for_status()
 
             return response.text
         except httpx.InvalidURL:
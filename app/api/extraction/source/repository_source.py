@@ -0,0 +1,227 @@
+"""
+Ingesta de la documentación de un repositorio completo desde un solo archivo.
+
+En lugar de un request por archivo a raw.githubusercontent.com, descarga un
+tarball/zip de un ref (codeload de GitHub o la URL de un archivo) y recorre
+sus miembros sin extraerlos: solo los que cumplen los globs se leen, uno a la
+vez, en memoria. La descarga se guarda en un único archivo temporal porque zip
+necesita acceso aleatorio.
+
+Cada archivo es su propia fuente (su URL en GitHub). Se guarda el hash de blob
+de git de cada archivo ingestado, así una nueva pasada salta los que no
+cambiaron sin limpiarlos ni embeberlos.
+
+Keys:
+    repo:blobs:{repo}  -> hash path -> sha1 del blob de git
+"""
+
+import asyncio
+import hashlib
+import os
+import tarfile
+import tempfile
+import zipfile
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+import httpx
+import structlog
+from redis import Redis
+
+from app.api.extraction.exceptions import (
+    SourceFetchError,
+    SourceInvalidURLError,
+    SourceTimeoutError,
+    SourceTooLargeError,
+)
+from app.api.extraction.http_client import get_http_client
+from app.core.redis import decode, get_redis
+
+
+log = structlog.get_logger()
+
+_ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar", ".zip")
+_DOWNLOAD_BLOCK = 256 * 1024
+
+
+def blob_sha(data: bytes) -> str:
+    """Same hash `git hash-object` gives the file."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+@dataclass
+class RepoArchive:
+    # key the blob hashes are stored under, e.g. "github.com/owner/name"
+    key: str
+    archive_url: str
+    # per-file source id: prefix + path inside the repository
+    source_prefix: str
+    # GitHub archives wrap everything in a "{name}-{ref}/" directory
+    strip_root: bool
+
+
+@dataclass
+class RepoFile:
+    path: str
+    source: str
+    blob_sha: str
+    # changed / unchanged
+    status: str
+    text: str | None = None
+
+
+def resolve_repository(repo: str, ref: str = "HEAD") -> RepoArchive:
+    """Accept "owner/name", a github.com repository URL or the URL of an archive."""
+    repo = repo.strip().rstrip("/")
+    if repo.lower().endswith(_ARCHIVE_SUFFIXES):
+        if urlparse(repo).scheme not in ("http", "https"):
+            raise SourceInvalidURLError(repo)
+        return RepoArchive(
+            key=repo, archive_url=repo, source_prefix=f"{repo}#", strip_root=False
+        )
+
+    parsed = urlparse(repo if "://" in repo else f"https://github.com/{repo}")
+    parts = [p for p in parsed.path.split("/") if p]
+    if parsed.netloc != "github.com" or len(parts) < 2:
+        raise SourceInvalidURLError(repo)
+    owner, name = parts[0], parts[1].removesuffix(".git")
+
+    return RepoArchive(
+        key=f"github.com/{owner}/{name}",
+        archive_url=f"https://codeload.github.com/{owner}/{name}/tar.gz/{ref}",
+        source_prefix=f"https://github.com/{owner}/{name}/blob/{ref}/",
+        strip_root=True,
+    )
+
+
+def iter_archive(
+    path: str, include: list[str], max_file_bytes: int, strip_root: bool
+) -> Iterator[tuple[str, bytes]]:
+    """(path, content) of the archive's regular files matching `include`, one at a time."""
+
+    def selected(name: str, size: int) -> str | None:
+        if strip_root:
+            name = name.split("/", 1)[1] if "/" in name else ""
+        if not name or size > max_file_bytes:
+            return None
+        return name if any(fnmatch(name, pattern) for pattern in include) else None
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.is_dir():
+                    continue
+                name = selected(member.filename, member.file_size)
+                if name:
+                    yield name, archive.read(member)
+        return
+
+    # "r|*": members are read in order, as a stream, without seeking back
+    with tarfile.open(path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            name = selected(member.name, member.size)
+            if name:
+                yield name, archive.extractfile(member).read()
+
+
+class RepoStateStore:
+    """Blob hash of every file ingested from a repository, in Redis."""
+
+    PREFIX = "repo"
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        self._redis = redis or get_redis()
+
+    def _key(self, repo: str) -> str:
+        return f"{self.PREFIX}:blobs:{repo}"
+
+    def get_all(self, repo: str) -> dict[str, str]:
+        raw = self._redis.hgetall(self._key(repo))
+        return {decode(k): decode(v) for k, v in raw.items()}
+
+    def save(self, repo: str, path: str, sha: str) -> None:
+        self._redis.hset(self._key(repo), path, sha)
+
+
+class RepositorySource:
+    def __init__(
+        self,
+        state: RepoStateStore | None = None,
+        max_archive_bytes: int = 512 * 1024 * 1024,
+        max_file_bytes: int = 2 * 1024 * 1024,
+        is_indexed: Callable[[str], bool] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        self.state = state or RepoStateStore()
+        self.max_archive_bytes = max_archive_bytes
+        self.max_file_bytes = max_file_bytes
+        # Files dropped from the index are ingested again even if unchanged
+        self.is_indexed = is_indexed
+        self._client = client
+
+    async def _download(self, url: str, target) -> None:
+        """Stream the archive into `target`, refusing archives over the size limit."""
+        try:
+            # not through the response cache: archives are large and read once
+            client = self._client or get_http_client(cached=False)
+            async with client.stream(
+                "GET", url, follow_redirects=True
+            ) as response:
+                response.raise_for_status()
+                size = 0
+                async for block in response.aiter_bytes(_DOWNLOAD_BLOCK):
+                    size += len(block)
+                    if size > self.max_archive_bytes:
+                        raise SourceTooLargeError(url, self.max_archive_bytes)
+                    await asyncio.to_thread(target.write, block)
+        except httpx.InvalidURL:
+            raise SourceInvalidURLError(url)
+        except httpx.TimeoutException:
+            raise SourceTimeoutError(url)
+        except httpx.HTTPStatusError as e:
+            raise SourceFetchError(url, e.response.status_code)
+
+    async def files(
+        self, repo: RepoArchive, include: list[str]
+    ) -> AsyncIterator[RepoFile]:
+        """Yield every selected file of the archive; unchanged ones come without text."""
+        known = await asyncio.to_thread(self.state.get_all, repo.key)
+
+        with tempfile.NamedTemporaryFile(suffix=".archive", delete=False) as tmp:
+            path = tmp.name
+        try:
+            with open(path, "wb") as target:
+                await self._download(repo.archive_url, target)
+
+            members = iter_archive(path, include, self.max_file_bytes, repo.strip_root)
+            try:
+                while (member := await asyncio.to_thread(next, members, None)) is not None:
+                    name, data = member
+                    sha = blob_sha(data)
+                    source = f"{repo.source_prefix}{name}"
+
+                    unchanged = known.get(name) == sha and (
+                        self.is_indexed is None or self.is_indexed(source)
+                    )
+                    if unchanged:
+                        yield RepoFile(path=name, source=source, blob_sha=sha, status="unchanged")
+                    else:
+                        yield RepoFile(
+                            path=name,
+                            source=source,
+                            blob_sha=sha,
+                            status="changed",
+                            text=data.decode("utf-8", errors="replace"),
+                        )
+            finally:
+                members.close()
+        finally:
+            os.remove(path)
+
+    def commit(self, repo: RepoArchive, file: RepoFile) -> None:
+        """Persist a file's blob hash once its content has been ingested."""
+        self.state.save(repo.key, file.path, file.blob_sha)
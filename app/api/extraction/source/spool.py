@@ -0,0 +1,26 @@
+"""
+Acceso a un upload como archivo en disco.
+
+Las fuentes que leen por bloques o desde otros procesos (PDF, CSV) necesitan
+un path. Si el upload ya está en disco se usa directo; si no, se copia a un
+temporal sin cargarlo entero en memoria.
+"""
+
+import os
+import shutil
+import tempfile
+
+from fastapi import UploadFile
+
+
+def spool_upload(file: UploadFile, default_suffix: str) -> tuple[str, bool]:
+    """Path of the upload on disk and whether it is a temporary copy to remove."""
+    name = getattr(file.file, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name, False
+
+    file.file.seek(0)
+    suffix = os.path.splitext(getattr(file, "filename", None) or "")[1] or default_suffix
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(file.file, tmp)
+    return tmp.name, True
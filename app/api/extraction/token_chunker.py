@@ -0,0 +1,186 @@
+"""
+Chunking por tokens del modelo de embeddings en lugar de por caracteres.
+
+all-MiniLM-L6-v2 trunca en 256 word pieces: con chunks de 1.500 caracteres
+buena parte del texto se embebe y se descarta sin que el modelo lo vea.
+`TokenBudgetChunker` mide las unidades de un cleaner (párrafos, secciones) con
+el tokenizer real, en una sola llamada por lotes, y las empaqueta hasta el
+presupuesto de tokens con solapamiento también en tokens.
+
+En modo "parent_child" se usan dos presupuestos: las unidades se empaquetan en
+padres grandes (una sección o un bloque de heading, cortado al presupuesto del
+reranker) y cada padre se corta en ventanas hijas chicas que son las que se
+embeben. Cada hija lleva el texto de su padre para que la ingesta lo guarde y
+la búsqueda devuelva el padre en lugar de la ventana.
+"""
+
+from functools import lru_cache
+
+from .interface import CleanerInterface
+from .schema import ChunkWithMetadata
+from ...core.settings import get_settings
+
+
+class TokenBudgetChunker:
+    def __init__(self, tokenizer, max_tokens: int, overlap_tokens: int = 32):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be in [0, max_tokens)")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def _offsets(self, texts: list[str]) -> list[list[tuple[int, int]]]:
+        # One batched call of the (fast) tokenizer; offsets map tokens back to the text
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+        )
+        return encoded["offset_mapping"]
+
+    def _tail(self, text: str, offsets: list[tuple[int, int]]) -> tuple[str, int]:
+        """Last `overlap_tokens` tokens of the text and how many they are."""
+        if not self.overlap_tokens or not offsets:
+            return "", 0
+        tail = offsets[-self.overlap_tokens :]
+        return text[tail[0][0] :], len(tail)
+
+    def pack(self, units: list[ChunkWithMetadata]) -> list[ChunkWithMetadata]:
+        """
+        Join consecutive units of the same section up to `max_tokens`.
+
+        A unit longer than the budget is cut into token windows. Every chunk
+        after the first of a section starts with the last `overlap_tokens`
+        tokens of the previous unit. Units are joined with blank lines, which
+        the WordPiece tokenizer does not count.
+        """
+        units = [u for u in units if u.text.strip()]
+        if not units:
+            return []
+
+        chunks: list[ChunkWithMetadata] = []
+        parts: list[str] = []
+        used = 0
+        section = units[0].section
+        # overlap seed for the next chunk: (text, tokens)
+        seed = ("", 0)
+
+        def flush() -> None:
+            nonlocal parts, used
+            if parts:
+                chunks.append(ChunkWithMetadata(text="\n\n".join(parts), section=section))
+            parts, used = [], 0
+
+        for unit, offsets in zip(units, self._offsets([u.text for u in units])):
+            tokens = len(offsets)
+
+            if unit.section != section:
+                flush()
+                section, seed = unit.section, ("", 0)
+            elif used and used + tokens > self.max_tokens:
+                flush()
+
+            if tokens > self.max_tokens:
+                flush()
+                step = self.max_tokens - self.overlap_tokens
+                for start in range(0, tokens, step):
+                    window = offsets[start : start + self.max_tokens]
+                    chunks.append(
+                        ChunkWithMetadata(
+                            text=unit.text[window[0][0] : window[-1][1]], section=section
+                        )
+                    )
+                    if start + self.max_tokens >= tokens:
+                        break
+                seed = self._tail(unit.text, offsets)
+                continue
+
+            if not parts and seed[1] and seed[1] + tokens <= self.max_tokens:
+                parts, used = [seed[0]], seed[1]
+            parts.append(unit.text)
+            used += tokens
+            seed = self._tail(unit.text, offsets)
+
+        flush()
+        return chunks
+
+
+class TokenBudgetCleaner(CleanerInterface):
+    """Cleaner that keeps `cleaner`'s cleaning and units but packs them by tokens."""
+
+    def __init__(self, cleaner: CleanerInterface, chunker: TokenBudgetChunker):
+        self.cleaner = cleaner
+        self.chunker = chunker
+
+    def clean(self, raw_content: str) -> str:
+        return self.cleaner.clean(raw_content)
+
+    def units(self, clean_text: str) -> list[ChunkWithMetadata]:
+        return self.cleaner.units(clean_text)
+
+    def chunk(self, clean_text: str) -> list[ChunkWithMetadata]:
+        return self.chunker.pack(self.cleaner.units(clean_text))
+
+
+class ParentChildCleaner(CleanerInterface):
+    """Cleaner whose chunks are small windows pointing to a larger parent passage."""
+
+    def __init__(
+        self,
+        cleaner: CleanerInterface,
+        parents: TokenBudgetChunker,
+        children: TokenBudgetChunker,
+    ):
+        self.cleaner = cleaner
+        self.parents = parents
+        self.children = children
+
+    def clean(self, raw_content: str) -> str:
+        return self.cleaner.clean(raw_content)
+
+    def units(self, clean_text: str) -> list[ChunkWithMetadata]:
+        return self.cleaner.units(clean_text)
+
+    def chunk(self, clean_text: str) -> list[ChunkWithMetadata]:
+        result: list[ChunkWithMetadata] = []
+        for parent in self.parents.pack(self.cleaner.units(clean_text)):
+            # one pack per parent: windows never straddle two parents
+            for child in self.children.pack([parent]):
+                child.parent = parent.text
+                result.append(child)
+        return result
+
+
+def _dense_tokenizer():
+    """Tokenizer of the dense model and the tokens a passage can use."""
+    from ...infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+
+    model = get_hybrid_embeddign_service().dense_model
+    tokenizer = model.tokenizer
+    prefix = len(tokenizer("passage: ", add_special_tokens=False)["input_ids"])
+    return tokenizer, model.max_seq_length - prefix - tokenizer.num_special_tokens_to_add()
+
+
+@lru_cache
+def get_token_chunker() -> TokenBudgetChunker:
+    """Chunker sized to the dense model's window (minus the passage prefix and special tokens)."""
+    settings = get_settings()
+    tokenizer, window = _dense_tokenizer()
+    return TokenBudgetChunker(
+        tokenizer, settings.chunk_max_tokens or window, settings.chunk_overlap_tokens
+    )
+
+
+@lru_cache
+def get_parent_child_chunkers() -> tuple[TokenBudgetChunker, TokenBudgetChunker]:
+    """(parent, child) chunkers; children never exceed the dense model's window."""
+    settings = get_settings()
+    tokenizer, window = _dense_tokenizer()
+    parents = TokenBudgetChunker(tokenizer, settings.parent_max_tokens, overlap_tokens=0)
+    children = TokenBudgetChunker(
+        tokenizer, min(settings.child_max_tokens, window), settings.child_overlap_tokens
+    )
+    return parents, children
@@ -2,15 +2,20 @@ import json
 
 from llama_index.core import QueryBundle, VectorStoreIndex
 from llama_index.core.postprocessor.types import BaseNodePostprocessor
-from llama_index.core.schema import NodeWithScore
+from llama_index.core.schema import NodeWithScore, TextNode
 from llama_index.core.vector_stores.types import MetadataFilter, MetadataFilters
 
 from .ingestion import LlamaIngester
 from .indexing import LlamaIndexer
 from .config import setup_llamaindex
+from ..retrieval_engine.federated_retriever import FederatedRetriever, create_federated_retriever
 from ..retrieval_engine.prompt import PROMPT_TEMPLATE_CHAT
 from ..retrieval_engine.schemas import Citation, Metadata, QueryResponse
+from ..retrieval_engine.source_catalog import SourceCatalog, get_versioning_catalog
 from ...infrastructure.embedding import get_rerank_model
+from ...infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+from ...infrastructure.storage.interfaces import FilterContext
+from ...infrastructure.storage.qdrant_client import get_qdrant_store
 from ...application.llm.client import LLMClient, get_llm_client
 
 setup_llamaindex()
@@ -43,7 +48,11 @@ class CustomReranker(BaseNodePostprocessor):
 
 
 class LlamaIndexOrchestrator:
-    def __init__(self):
+    def __init__(
+        self,
+        federated: FederatedRetriever | None = None,
+        catalog: SourceCatalog | None = None,
+    ):
         self.indexer = LlamaIndexer()
         self.ingester = LlamaIngester()
         self.index = VectorStoreIndex.from_vector_store(
@@ -51,6 +60,10 @@ class LlamaIndexOrchestrator:
         )
         self.rerank = CustomReranker()
         self.llm_client: LLMClient = get_llm_client()
+        # When set, retrieval searches `documents` and the configured
+        # secondary collections instead of only this index's collection
+        self.federated = federated
+        self.catalog = catalog
 
     def _update_index(self):
         self.index = VectorStoreIndex.from_vector_store(
@@ -70,6 +83,44 @@ class LlamaIndexOrchestrator:
 
         return MetadataFilters(filters=filters) if filters else None
 
+    def _federated_nodes(
+        self, query: str, top_k: int, domain: str | None, topic: str | None
+    ) -> list[NodeWithScore]:
+        context = FilterContext(
+            domain=domain.lower() if domain else None,
+            topic=topic.lower() if topic else None,
+        )
+        if self.catalog:
+            # Hide in-flight and retired versions of reindexed sources
+            context.hidden_versions = self.catalog.hidden_versions()
+
+        vector = get_hybrid_embeddign_service().embed(query, query=True)
+        points = self.federated.query(vector, limit=top_k, filter_context=context)
+        return [
+            NodeWithScore(
+                node=TextNode(
+                    text=p.payload.get("text", ""),
+                    metadata={"filename": p.payload.get("source", "unknown")},
+                ),
+                score=p.score,
+            )
+            for p in points
+        ]
+
+    def _retrieve(
+        self, query: str, top_k: int, domain: str | None, topic: str | None
+    ) -> list[NodeWithScore]:
+        """Candidates for `query`: federated when configured, else from this index."""
+        if self.federated is not None:
+            return self._federated_nodes(query, top_k, domain, topic)
+
+        retriever = self.index.as_retriever(
+            similarity_top_k=top_k,
+            vector_store_query_mode="hybrid",
+            filters=self._query_filters(domain, topic),
+        )
+        return retriever.retrieve(query)
+
     def _translate_to_english(self, text: str) -> str:
         response = self.llm_client.generate_content(
             f"Translate the following question to English. Return only the translated question, nothing else:\n\n{text}"
@@ -113,22 +164,16 @@ class LlamaIndexOrchestrator:
     def get_context(
         self, query: str, top_k: int, domain: str | None = None, topic: str | None = None,
     ) -> tuple[str, list[Citation]]:
-        # 1. Create filters
-        query_filters = self._query_filters(domain, topic)
-
-        # 2. Translate query if needed
+        # 1. Translate query if needed
         retrieval_query = (
             self._translate_to_english(query) if domain == "libros" else query
         )
 
-        # 3. Retrieval + Rerank
-        retriever = self.index.as_retriever(
-            similarity_top_k=top_k, vector_store_query_mode="hybrid", filters=query_filters
-        )
-        nodes = retriever.retrieve(retrieval_query)
+        # 2. Retrieval + Rerank
+        nodes = self._retrieve(retrieval_query, top_k, domain, topic)
         nodes = self.rerank._postprocess_nodes(nodes, query_bundle=QueryBundle(query))
 
-        # 4. Create Context and Citations
+        # 3. Create Context and Citations
         context_str = "\n\n".join([n.get_content() for n in nodes])
 
         citations = []
@@ -146,17 +191,12 @@ class LlamaIndexOrchestrator:
     def custom_query(
         self, query: str, domain: str | None = None, topic: str | None = None
     ) -> QueryResponse:
-        query_filters = self._query_filters(domain, topic)
-
         retrieval_query = (
             self._translate_to_english(query) if domain == "libros" else query
         )
 
         # 1. Retrieval + Rerank
-        retriever = self.index.as_retriever(
-            similarity_top_k=8, vector_store_query_mode="hybrid", filters=query_filters
-        )
-        nodes = retriever.retrieve(retrieval_query)
+        nodes = self._retrieve(retrieval_query, 8, domain, topic)
         nodes = self.rerank._postprocess_nodes(nodes, query_bundle=QueryBundle(query))
 
         # 2. Create Context and call LLM
@@ -205,5 +245,9 @@ _orchestrator_instance = None
 def get_orchestrator():
     global _orchestrator_instance
     if _orchestrator_instance is None:
-        _orchestrator_instance = LlamaIndexOrchestrator()
+        federated = create_federated_retriever(get_qdrant_store())
+        _orchestrator_instance = LlamaIndexOrchestrator(
+            federated=federated,
+            catalog=get_versioning_catalog() if federated else None,
+        )
     return _orchestrator_instance
@@ -0,0 +1,56 @@
+"""
+Manifest de chunks por source.
+
+El manifest guarda, en orden, el hash de cada chunk y el id del punto que lo
+contiene, junto con la versión del modelo de embeddings. Al re-ingestar, cada
+chunk nuevo busca por hash el punto de la versión activa que ya tiene su
+vector: se copia a la versión nueva en lugar de volver a embeberlo.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from uuid import NAMESPACE_DNS, uuid5
+
+from ...api.extraction.schema import ChunkWithMetadata
+
+
+def chunk_hash(chunk: ChunkWithMetadata) -> str:
+    """Content hash of a chunk (the section and parent are part of its payload, so they count)."""
+    content = f"{chunk.section or ''}\x00{chunk.text}"
+    if chunk.parent is not None:
+        content += f"\x00{chunk.parent}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def parent_id(parent: str, source: str, version: str | None = None) -> str:
+    """Point id of a parent passage, scoped like its children's."""
+    digest = hashlib.sha256(f"parent\x00{source}\x00{version or ''}\x00{parent}".encode())
+    return str(uuid5(NAMESPACE_DNS, digest.hexdigest()))
+
+
+@dataclass
+class Manifest:
+    model: str
+    version: str
+    # (chunk hash, point id) in chunk order
+    chunks: list[tuple[str, str]]
+
+    def to_dict(self) -> dict:
+        return {"model": self.model, "version": self.version, "chunks": self.chunks}
+
+    def digest(self) -> str:
+        """Fingerprint of what the version holds: changes with any added, moved or removed chunk."""
+        return hashlib.sha256(json.dumps([self.model, self.chunks]).encode()).hexdigest()
+
+    def points_by_hash(self) -> dict[str, str]:
+        """Point id holding each chunk hash (identical chunks share their vector)."""
+        return {h: point_id for h, point_id in self.chunks if point_id}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Manifest":
+        return cls(
+            model=data["model"],
+            version=data["version"],
+            chunks=[tuple(entry) for entry in data["chunks"]],
+        )
@@ -0,0 +1,207 @@
+"""
+Filtro de chunks de poca información antes de embeberlos.
+
+Índices, páginas de copyright, listados de código sueltos y restos de
+navegación cuestan un forward denso y uno sparse cada uno y después compiten
+en el rerank. Cada chunk se describe con unas pocas proporciones baratas
+(letras, dígitos, símbolos, stop-words, líneas repetidas, líneas de
+boilerplate); las features de un lote se evalúan juntas contra los umbrales
+con numpy y los chunks que fallan alguno se descartan (modo "drop") o solo se
+reportan (modo "flag", el default, para calibrar umbrales sin tocar el índice).
+
+Ser corto no alcanza para descartar un chunk: respuestas de FAQ, definiciones
+y celdas de tabla son cortas y útiles. "too_short" solo se reporta junto con
+otro check fallado (un "12, 45-47" suelto, un "© 2024 Example Press").
+"""
+
+import asyncio
+import re
+from collections import Counter
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from ...api.extraction.schema import ChunkWithMetadata
+from ...core.settings import get_settings
+from ...infrastructure.metrics import ingestion_chunks_filtered_total
+from .ingestion_pipeline import aiter_chunks
+
+
+# Frequent English and Spanish function words: prose is full of them,
+# indexes, listings and navigation are not
+STOP_WORDS = frozenset(
+    """
+    a about after all also an and any are as at be because been but by can could did
+    do does for from had has have he her his how i if in into is it its more most my
+    no not of on one or other our out she should so some such than that the their
+    them then there these they this those through to up us was we were what when
+    where which while who will with would you your
+    al algo como con cual cuando de del desde donde el ella ellos en entre era es
+    esa ese esta este esto fue ha hay la las le les lo los mas más muy no nos o para
+    pero por porque puede que se ser si sin sobre son su sus también tiene todo un
+    una uno y ya
+    """.split()
+)
+
+_LETTER = re.compile(r"[^\W\d_]")
+_DIGIT = re.compile(r"\d")
+_SPACE = re.compile(r"\s")
+_WORD = re.compile(r"[^\W\d_]+")
+_BOILERPLATE = re.compile(
+    r"copyright|©|all rights reserved|todos los derechos reservados|\bisbn\b|"
+    r"printed in|library of congress|no part of this (?:book|publication)|"
+    r"licensed under|cookie|privacy policy|terms of (?:use|service)|skip to (?:main )?content",
+    re.IGNORECASE,
+)
+
+# feature columns
+FEATURES = (
+    "words",
+    "letter_ratio",
+    "digit_ratio",
+    "symbol_ratio",
+    "stopword_ratio",
+    "duplicate_line_ratio",
+    "boilerplate_ratio",
+)
+
+
+def features(text: str) -> tuple[float, ...]:
+    """The FEATURES of one chunk; every count is a C-level regex or set operation."""
+    visible = len(_SPACE.sub("", text)) or 1
+    letters = len(_LETTER.findall(text))
+    digits = len(_DIGIT.findall(text))
+
+    words = _WORD.findall(text.lower())
+    stop = sum(map(STOP_WORDS.__contains__, words))
+
+    lines = [line for line in map(str.strip, text.splitlines()) if line]
+    n_lines = len(lines) or 1
+    boilerplate = sum(1 for line in lines if _BOILERPLATE.search(line))
+
+    return (
+        len(words),
+        letters / visible,
+        digits / visible,
+        (visible - letters - digits) / visible,
+        stop / (len(words) or 1),
+        1 - len(set(lines)) / n_lines,
+        boilerplate / n_lines,
+    )
+
+
+@dataclass
+class DroppedChunks:
+    """What the filter rejected for one source."""
+
+    total: int = 0
+    reasons: Counter = field(default_factory=Counter)
+    # a few rejected texts, trimmed, to tune the thresholds
+    samples: list[dict] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {"total": self.total, "reasons": dict(self.reasons), "samples": self.samples}
+
+
+class ChunkQualityFilter:
+    def __init__(
+        self,
+        min_words: int = 5,
+        min_letter_ratio: float = 0.45,
+        max_digit_ratio: float = 0.3,
+        max_symbol_ratio: float = 0.35,
+        min_stopword_ratio: float = 0.05,
+        stopword_min_words: int = 20,
+        max_duplicate_line_ratio: float = 0.5,
+        max_boilerplate_ratio: float = 0.5,
+        drop: bool = True,
+        batch_size: int = 64,
+        max_samples: int = 5,
+    ) -> None:
+        self.min_words = min_words
+        self.min_letter_ratio = min_letter_ratio
+        self.max_digit_ratio = max_digit_ratio
+        self.max_symbol_ratio = max_symbol_ratio
+        self.min_stopword_ratio = min_stopword_ratio
+        self.stopword_min_words = stopword_min_words
+        self.max_duplicate_line_ratio = max_duplicate_line_ratio
+        self.max_boilerplate_ratio = max_boilerplate_ratio
+        self.drop = drop
+        self.batch_size = batch_size
+        self.max_samples = max_samples
+
+    def reasons(self, texts: list[str]) -> list[list[str]]:
+        """Failed checks of every text (empty list = keep)."""
+        if not texts:
+            return []
+        f = np.array([features(t) for t in texts], dtype=np.float64)
+        words, letters, digits, symbols, stop, duplicates, boilerplate = f.T
+
+        checks = {
+            "too_short": words < self.min_words,
+            "few_letters": letters < self.min_letter_ratio,
+            "numeric": digits > self.max_digit_ratio,
+            "symbols": symbols > self.max_symbol_ratio,
+            # short chunks have too few words for the ratio to mean anything
+            "no_prose": (words >= self.stopword_min_words) & (stop < self.min_stopword_ratio),
+            "repeated_lines": duplicates > self.max_duplicate_line_ratio,
+            "boilerplate": boilerplate > self.max_boilerplate_ratio,
+        }
+        # a short chunk is only rejected when something else is wrong with it too
+        other = np.logical_or.reduce([v for name, v in checks.items() if name != "too_short"])
+        checks["too_short"] &= other
+        names = list(checks)
+        failed = np.column_stack(list(checks.values()))
+        return [[names[j] for j in np.flatnonzero(row)] for row in failed]
+
+    def _record(self, dropped: DroppedChunks, chunk: ChunkWithMetadata, reasons: list[str]) -> None:
+        dropped.total += 1
+        dropped.reasons.update(reasons)
+        for reason in reasons:
+            ingestion_chunks_filtered_total.labels(reason=reason).inc()
+        if len(dropped.samples) < self.max_samples:
+            dropped.samples.append(
+                {"section": chunk.section, "reasons": reasons, "text": chunk.text[:200]}
+            )
+
+    async def filter(self, chunks, dropped: DroppedChunks) -> AsyncIterator[ChunkWithMetadata]:
+        """Score the chunk stream in batches; rejected chunks are recorded in `dropped`."""
+        batch: list[ChunkWithMetadata] = []
+
+        async def flush():
+            scored = await asyncio.to_thread(self.reasons, [c.text for c in batch])
+            for chunk, reasons in zip(batch, scored):
+                if reasons:
+                    self._record(dropped, chunk, reasons)
+                    if self.drop:
+                        continue
+                yield chunk
+            batch.clear()
+
+        async for chunk in aiter_chunks(chunks):
+            batch.append(chunk)
+            if len(batch) >= self.batch_size:
+                async for kept in flush():
+                    yield kept
+        async for kept in flush():
+            yield kept
+
+
+@lru_cache
+def get_chunk_quality_filter() -> ChunkQualityFilter | None:
+    """Filter configured from settings; None when chunk_quality_mode is 'off'."""
+    settings = get_settings()
+    if settings.chunk_quality_mode == "off":
+        return None
+    return ChunkQualityFilter(
+        min_words=settings.chunk_quality_min_words,
+        min_letter_ratio=settings.chunk_quality_min_letter_ratio,
+        max_digit_ratio=settings.chunk_quality_max_digit_ratio,
+        max_symbol_ratio=settings.chunk_quality_max_symbol_ratio,
+        min_stopword_ratio=settings.chunk_quality_min_stopword_ratio,
+        max_duplicate_line_ratio=settings.chunk_quality_max_duplicate_line_ratio,
+        max_boilerplate_ratio=settings.chunk_quality_max_boilerplate_ratio,
+        drop=settings.chunk_quality_mode == "drop",
+    )
@@ -0,0 +1,273 @@
+"""
+Índice de centroides densos por dominio para auto-detectar el dominio de una query.
+
+Cada ingestión guarda en Redis la suma de los vectores densos de sus chunks y
+la cantidad de chunks, por source. El centroide de un dominio es la suma de
+sus sources dividida por el total de chunks, así re-ingestar un source
+reemplaza su contribución en lugar de sumarla dos veces.
+
+El API mantiene una copia en memoria de la matriz de centroides y la recarga
+cuando cambia el contador de versión del índice.
+
+Los sources ingestados antes de que el índice existiera no tienen entrada:
+backfill() los agrega recorriendo los vectores de la colección. Hasta que
+el backfill corrió una vez, classify() no detecta ningún dominio (los
+centroides estarían sesgados hacia lo ingestado después).
+
+Keys:
+    domain_index:sums        -> hash source -> suma float32 de los vectores densos
+    domain_index:meta        -> hash source -> {"domain": ..., "count": ...}
+    domain_index:version     -> contador que se incrementa en cada escritura
+    domain_index:backfilled  -> timestamp del último backfill completo
+"""
+
+import json
+import threading
+import time
+
+import numpy as np
+import structlog
+from qdrant_client import QdrantClient, models
+from redis import Redis
+
+from ...core.redis import decode, get_redis
+from ...core.settings import get_settings
+
+
+log = structlog.get_logger()
+
+
+class CentroidAccumulator:
+    """Running sum of the dense vectors of one ingestion."""
+
+    def __init__(self) -> None:
+        self.sum: np.ndarray | None = None
+        self.count = 0
+
+    def add(self, dense) -> None:
+        vector = np.asarray(dense, dtype=np.float32)
+        if self.sum is None:
+            self.sum = np.zeros_like(vector)
+        self.sum += vector
+        self.count += 1
+
+
+_SCROLL_BATCH = 256
+
+
+def accumulate_sources(
+    client: QdrantClient, collection: str, hidden_versions: list[str]
+) -> dict[str, tuple[str, str, CentroidAccumulator]]:
+    """
+    Sum the dense vectors of every visible chunk in `collection` per source:
+    source -> (domain, topic, accumulator). Parent passages are skipped.
+    """
+    accumulators: dict[str, tuple[str, str, CentroidAccumulator]] = {}
+    offset = None
+    scroll_filter = None
+    if hidden_versions:
+        scroll_filter = models.Filter(
+            must_not=[
+                models.FieldCondition(key="version", match=models.MatchAny(any=hidden_versions))
+            ]
+        )
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=_SCROLL_BATCH,
+            offset=offset,
+            with_payload=["source", "domain", "topic", "kind"],
+            with_vectors=["dense"],
+        )
+        for point in points:
+            payload = point.payload or {}
+            dense = (point.vector or {}).get("dense")
+            if dense is None or payload.get("kind") == "parent" or not payload.get("source"):
+                continue
+            entry = accumulators.setdefault(
+                payload["source"],
+                (payload.get("domain", ""), payload.get("topic", ""), CentroidAccumulator()),
+            )
+            entry[2].add(dense)
+        if offset is None:
+            return accumulators
+
+
+class DomainCentroidIndex:
+    """
+    Per-domain dense centroids, persisted per source in Redis and cached in memory.
+    """
+
+    PREFIX = "domain_index"
+
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        min_similarity: float = 0.35,
+        min_margin: float = 0.05,
+        refresh_interval: float = 30.0,
+    ) -> None:
+        self._redis = redis or get_redis()
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._domains: list[str] = []
+        self._centroids: np.ndarray | None = None
+        self._loaded_version: int | None = None
+        self._checked_at = 0.0
+        self._backfilled = False
+
+    @property
+    def _sums_key(self) -> str:
+        return f"{self.PREFIX}:sums"
+
+    @property
+    def _meta_key(self) -> str:
+        return f"{self.PREFIX}:meta"
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.PREFIX}:version"
+
+    @property
+    def _backfilled_key(self) -> str:
+        return f"{self.PREFIX}:backfilled"
+
+    # ------------------------------------------------------------------
+    # Writes (ingestion)
+    # ------------------------------------------------------------------
+
+    def put_source(self, source: str, domain: str, acc: CentroidAccumulator) -> None:
+        """Replace the contribution of a source with the vectors of its latest ingestion."""
+        if acc.sum is None or not domain:
+            return
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(self._sums_key, source, acc.sum.astype(np.float32).tobytes())
+        pipe.hset(self._meta_key, source, json.dumps({"domain": domain.lower(), "count": acc.count}))
+        pipe.incr(self._version_key)
+        pipe.execute()
+
+    def remove_source(self, source: str) -> None:
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hdel(self._sums_key, source)
+        pipe.hdel(self._meta_key, source)
+        pipe.incr(self._version_key)
+        pipe.execute()
+
+    def backfill(self, client: QdrantClient, collection: str, hidden_versions: list[str]) -> int:
+        """
+        Add the sources of `collection` that have no entry yet (ingested before
+        the index existed) and mark the index as complete. Sources written by
+        an ingestion are left alone: that entry is at least as recent.
+        """
+        known = {decode(s) for s in self._redis.hkeys(self._meta_key)}
+        added = 0
+        pipe = self._redis.pipeline(transaction=True)
+        for source, (domain, _, acc) in accumulate_sources(client, collection, hidden_versions).items():
+            if source in known or acc.sum is None or not domain:
+                continue
+            pipe.hset(self._sums_key, source, acc.sum.astype(np.float32).tobytes())
+            pipe.hset(self._meta_key, source, json.dumps({"domain": domain.lower(), "count": acc.count}))
+            added += 1
+        pipe.set(self._backfilled_key, str(int(time.time())))
+        pipe.incr(self._version_key)
+        pipe.execute()
+
+        log.info("domain_index_backfilled", collection=collection, added=added)
+        return added
+
+    def is_backfilled(self) -> bool:
+        return bool(self._redis.exists(self._backfilled_key))
+
+    # ------------------------------------------------------------------
+    # Reads (queries)
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        sums = self._redis.hgetall(self._sums_key)
+        meta = self._redis.hgetall(self._meta_key)
+
+        totals: dict[str, np.ndarray] = {}
+        counts: dict[str, int] = {}
+        for source, raw in sums.items():
+            info = meta.get(source)
+            if info is None:
+                continue
+            info = json.loads(info)
+            vector = np.frombuffer(raw, dtype=np.float32)
+            domain = info["domain"]
+            totals[domain] = totals.get(domain, 0) + vector
+            counts[domain] = counts.get(domain, 0) + info["count"]
+
+        domains = sorted(totals)
+        if domains:
+            centroids = np.stack([totals[d] / counts[d] for d in domains])
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids = centroids / np.maximum(norms, 1e-12)
+        else:
+            centroids = None
+
+        self._domains = domains
+        self._centroids = centroids
+        self._backfilled = self.is_backfilled()
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload the centroids if the index changed (checked at most every refresh_interval)."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            self._checked_at = now
+            version = int(self._redis.get(self._version_key) or 0)
+            if force or version != self._loaded_version:
+                self._load()
+                self._loaded_version = version
+                log.info("domain_index_loaded", domains=self._domains, version=version)
+
+    def scores(self, dense) -> dict[str, float]:
+        """Cosine similarity of a query vector against every domain centroid."""
+        self.refresh()
+        if self._centroids is None:
+            return {}
+
+        query = np.asarray(dense, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        similarities = self._centroids @ query
+        return {d: float(s) for d, s in zip(self._domains, similarities)}
+
+    def classify(self, dense) -> str | None:
+        """The query's domain when the best centroid wins clearly, else None."""
+        self.refresh()
+        if not self._backfilled:
+            return None
+
+        ranked = sorted(self.scores(dense).items(), key=lambda item: item[1], reverse=True)
+        if len(ranked) < 2:
+            return None
+
+        (best, top1), (_, top2) = ranked[0], ranked[1]
+        if top1 < self.min_similarity or top1 - top2 < self.min_margin:
+            return None
+        return best
+
+
+_domain_index: DomainCentroidIndex | None = None
+
+
+def get_domain_index() -> DomainCentroidIndex | None:
+    """Get the domain index singleton, or None when auto-detection is disabled."""
+    global _domain_index
+    settings = get_settings()
+    if not settings.domain_autofilter:
+        return None
+    if _domain_index is None:
+        _domain_index = DomainCentroidIndex(
+            min_similarity=settings.domain_autofilter_min_similarity,
+            min_margin=settings.domain_autofilter_margin,
+        )
+    return _domain_index
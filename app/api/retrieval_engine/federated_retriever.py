@@ -0,0 +1,232 @@
+"""
+Búsqueda híbrida federada sobre varias colecciones de Qdrant.
+
+Consulta en paralelo la colección principal (`documents`, vía QdrantStore) y
+las colecciones secundarias (p. ej. `documents_llama`, escrita por LlamaIndex)
+con el mismo vector de query, normaliza los scores RRF de cada colección,
+fusiona los resultados y elimina chunks solapados. El rerank se hace una sola
+vez, aguas abajo, sobre la lista fusionada.
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import structlog
+from qdrant_client import models
+
+from app.core.settings import get_settings
+from app.infrastructure.storage.interfaces import FilterContext, HybridVector
+
+
+log = structlog.get_logger()
+
+_WORD = re.compile(r"\w+")
+
+# Word-set overlap (relative to the shorter chunk) above which two chunks are the same
+OVERLAP_THRESHOLD = 0.9
+
+
+@dataclass
+class CollectionSpec:
+    """A secondary collection and how to read it.
+
+    Vector names left as None are detected from the collection config on first use.
+    """
+
+    name: str
+    weight: float = 1.0
+    dense_name: str | None = None
+    sparse_name: str | None = None
+
+
+def parse_collection_specs(value: str) -> list[CollectionSpec]:
+    """Parse "name[:weight],name[:weight]" into collection specs."""
+    specs = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, weight = item.partition(":")
+        specs.append(CollectionSpec(name=name.strip(), weight=float(weight) if weight else 1.0))
+    return specs
+
+
+def payload_text(payload: dict) -> str:
+    """Chunk text of a payload written either by QdrantStore or by LlamaIndex."""
+    if "text" in payload:
+        return payload["text"]
+    node_content = payload.get("_node_content")
+    if node_content:
+        try:
+            return json.loads(node_content).get("text", "")
+        except (TypeError, ValueError):
+            return ""
+    return ""
+
+
+def normalize_scores(points: list) -> list[float]:
+    """Min-max normalize the scores of one result list to [0, 1]."""
+    if not points:
+        return []
+    scores = [p.score or 0.0 for p in points]
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(s - low) / (high - low) for s in scores]
+
+
+def _words(text: str) -> frozenset[str]:
+    return frozenset(_WORD.findall(text.lower()))
+
+
+def _overlaps(a: frozenset[str], b: frozenset[str]) -> bool:
+    if not a or not b:
+        return a == b
+    return len(a & b) / min(len(a), len(b)) >= OVERLAP_THRESHOLD
+
+
+def fuse_results(result_lists: list[list], weights: list[float], limit: int) -> list:
+    """
+    Fuse per-collection result lists into one ranking.
+
+    Scores are min-max normalized per list and scaled by the collection weight.
+    Chunks whose word sets overlap are collapsed into the best-scoring one.
+    Every point must carry payload["text"].
+    """
+    candidates = []
+    for points, weight in zip(result_lists, weights):
+        for point, score in zip(points, normalize_scores(points)):
+            candidates.append((score * weight, point))
+
+    candidates.sort(key=lambda item: item[0], reverse=True)
+
+    fused: list = []
+    kept_words: list[frozenset[str]] = []
+    for score, point in candidates:
+        words = _words(point.payload.get("text", ""))
+        if any(_overlaps(words, other) for other in kept_words):
+            continue
+        point.score = score
+        fused.append(point)
+        kept_words.append(words)
+        if len(fused) >= limit:
+            break
+
+    return fused
+
+
+class FederatedRetriever:
+    """
+    Runs the same hybrid query against the primary store and secondary collections
+    concurrently and fuses the results.
+    """
+
+    def __init__(self, vector_store, collections: list[CollectionSpec]) -> None:
+        # vector_store is the QdrantStore of the primary collection; its client
+        # is reused for the secondary collections
+        self.vector_store = vector_store
+        self.client = vector_store.client
+        self.collections = collections
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(collections) + 1, thread_name_prefix="federated"
+        )
+
+    def _resolve_vector_names(self, spec: CollectionSpec) -> None:
+        if spec.dense_name and spec.sparse_name:
+            return
+
+        params = self.client.get_collection(spec.name).config.params
+        if not spec.dense_name:
+            vectors = params.vectors
+            spec.dense_name = next(iter(vectors)) if isinstance(vectors, dict) else ""
+        if not spec.sparse_name:
+            # LlamaIndex names it "text-sparse" or "text-sparse-new" depending on its version
+            sparse = params.sparse_vectors or {}
+            spec.sparse_name = next(iter(sparse), "")
+
+    def _query_secondary(
+        self, spec: CollectionSpec, query_vector: HybridVector, limit: int, filter_context
+    ) -> list:
+        self._resolve_vector_names(spec)
+
+        prefetch = [
+            models.Prefetch(query=query_vector.dense, using=spec.dense_name or None, limit=limit)
+        ]
+        if spec.sparse_name:
+            prefetch.append(
+                models.Prefetch(
+                    query=models.SparseVector(
+                        indices=query_vector.sparse["indices"],
+                        values=query_vector.sparse["values"],
+                    ),
+                    using=spec.sparse_name,
+                    limit=limit,
+                )
+            )
+
+        # Version tags only exist in the primary collection
+        query_filter = self.vector_store.build_filter(
+            FilterContext(domain=filter_context.domain, topic=filter_context.topic)
+        )
+
+        points = self.client.query_points(
+            collection_name=spec.name,
+            prefetch=prefetch,
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            query_filter=query_filter,
+            with_payload=True,
+            limit=limit,
+        ).points
+
+        for point in points:
+            payload = point.payload or {}
+            point.payload = {
+                "text": payload_text(payload),
+                "source": payload.get("source") or payload.get("filename", "unknown"),
+                "chunk_index": payload.get("chunk_index", 0),
+                "domain": payload.get("domain"),
+                "topic": payload.get("topic"),
+                "collection": spec.name,
+            }
+        return points
+
+    def query(self, query_vector: HybridVector, limit: int, filter_context) -> list:
+        """Query every collection concurrently and return the fused top `limit` hits."""
+        futures = [
+            self._executor.submit(
+                self.vector_store.query, query_vector, limit=limit, filter_context=filter_context
+            )
+        ]
+        futures += [
+            self._executor.submit(self._query_secondary, spec, query_vector, limit, filter_context)
+            for spec in self.collections
+        ]
+
+        result_lists = [futures[0].result()]
+        for spec, future in zip(self.collections, futures[1:]):
+            try:
+                result_lists.append(future.result())
+            except Exception as e:
+                # A missing or broken secondary collection must not take search down
+                log.warning("federated_collection_failed", collection=spec.name, error=str(e))
+                result_lists.append([])
+
+        weights = [1.0] + [spec.weight for spec in self.collections]
+        fused = fuse_results(result_lists, weights, limit)
+
+        log.info(
+            "federated_query",
+            per_collection=[len(r) for r in result_lists],
+            fused=len(fused),
+        )
+        return fused
+
+
+def create_federated_retriever(vector_store) -> FederatedRetriever | None:
+    """Build the federated retriever from settings, or None when federation is off."""
+    specs = parse_collection_specs(get_settings().federated_collections)
+    if not specs:
+        return None
+    return FederatedRetriever(vector_store, specs)
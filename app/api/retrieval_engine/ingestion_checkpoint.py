@@ -0,0 +1,218 @@
+"""
+Checkpoints de ingestión para reanudar jobs interrumpidos.
+
+Mientras un job de Celery ingesta un documento, cada vez que crece el prefijo
+de chunks ya escritos en Qdrant se guarda en Redis el checkpoint: la versión
+en la que se escribe, el ingested_at de los payloads y el manifest (hash de
+chunk, id de punto) de ese prefijo. Si el worker muere o el job falla, el
+reintento del mismo job sobre el mismo contenido retoma esa versión y ese
+timestamp, recorre los chunks del prefijo sin embeberlos ni escribirlos (solo
+lee sus vectores, para el centroide) y sigue desde el primer chunk sin
+confirmar.
+
+Un chunk del prefijo solo se saltea si su hash coincide y su punto sigue en
+Qdrant; en el primero que no, el resto del prefijo se borra y se ingesta
+normalmente.
+
+Keys:
+    ingest:checkpoint:{job_id} -> hash {content_hash: JSON del checkpoint} (con TTL)
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+
+import structlog
+from redis import Redis
+
+from ...api.retrieval_engine.chunk_manifest import chunk_hash
+from ...api.retrieval_engine.domain_index import CentroidAccumulator
+from ...api.retrieval_engine.ingestion_pipeline import Resolver
+from ...core.redis import decode, get_redis
+from ...core.settings import get_settings
+from ...infrastructure.storage.interfaces import VectorStoreInterface
+
+
+log = structlog.get_logger()
+
+
+@dataclass
+class Checkpoint:
+    version: str | None
+    ingested_at: int
+    # (chunk hash, point id) of the committed prefix; the id is None for
+    # chunks that were skipped as near-duplicates
+    chunks: list[tuple[str, str | None]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"version": self.version, "ingested_at": self.ingested_at, "chunks": self.chunks}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Checkpoint":
+        return cls(
+            version=data["version"],
+            ingested_at=data["ingested_at"],
+            chunks=[tuple(entry) for entry in data["chunks"]],
+        )
+
+
+class CheckpointStore:
+    """Redis-backed checkpoints of in-flight ingestion jobs."""
+
+    PREFIX = "ingest:checkpoint"
+
+    def __init__(self, redis: Redis | None = None, ttl_seconds: int = 2 * 86400) -> None:
+        self._redis = redis or get_redis()
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.PREFIX}:{job_id}"
+
+    def load(self, job_id: str) -> dict[str, Checkpoint]:
+        """Checkpoints of a job by content hash (a retried URL may have changed)."""
+        raw = self._redis.hgetall(self._key(job_id))
+        return {
+            decode(content_hash): Checkpoint.from_dict(json.loads(value))
+            for content_hash, value in raw.items()
+        }
+
+    def save(self, job_id: str, content_hash: str, checkpoint: Checkpoint) -> None:
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(self._key(job_id), content_hash, json.dumps(checkpoint.to_dict()))
+        pipe.expire(self._key(job_id), self.ttl_seconds)
+        pipe.execute()
+
+    def drop(self, job_id: str, content_hash: str | None = None) -> None:
+        """Forget one checkpoint of a job, or all of them."""
+        if content_hash is None:
+            self._redis.delete(self._key(job_id))
+        else:
+            self._redis.hdel(self._key(job_id), content_hash)
+
+
+class ResumableRun:
+    """
+    Checkpoints one ingestion run and skips what an earlier run already wrote.
+
+    `resolver` wraps the run's resolver and `upserted` is the pipeline's
+    on_upsert hook. Both run in pipeline threads, hence the lock. The
+    committed prefix only grows when every chunk before it is written, so
+    the checkpoint never covers a chunk that is not in Qdrant.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        job_id: str,
+        content_hash: str,
+        checkpoint: Checkpoint,
+        vector_store: VectorStoreInterface,
+        centroid: CentroidAccumulator | None = None,
+    ) -> None:
+        self.store = store
+        self.job_id = job_id
+        self.content_hash = content_hash
+        self.checkpoint = checkpoint
+        self.vector_store = vector_store
+        self.centroid = centroid
+        self.resumed = 0
+
+        # Entries left by the earlier run, not yet matched against this one
+        self._previous = list(checkpoint.chunks)
+        # index -> hash of chunks sent on, and -> entry of chunks written
+        # past the end of the committed prefix
+        self._pending: dict[int, str] = {}
+        self._done: dict[int, tuple[str, str | None]] = {}
+        self._lock = threading.Lock()
+
+    def save(self) -> None:
+        self.store.save(self.job_id, self.content_hash, self.checkpoint)
+
+    def clear(self) -> None:
+        self.store.drop(self.job_id, self.content_hash)
+
+    def _diverge(self, index: int) -> None:
+        """The earlier run's entries from `index` on do not apply: delete their points."""
+        kept = {point_id for _, point_id in self._previous[:index] if point_id}
+        stale = {point_id for _, point_id in self._previous[index:] if point_id} - kept
+        del self._previous[index:]
+        del self.checkpoint.chunks[index:]
+        if stale:
+            self.vector_store.delete_points(sorted(stale))
+        self.save()
+        log.warning("ingest_checkpoint_diverged", job_id=self.job_id, index=index, deleted=len(stale))
+
+    def _advance(self) -> bool:
+        chunks = self.checkpoint.chunks
+        start = len(chunks)
+        while len(chunks) in self._done:
+            chunks.append(self._done.pop(len(chunks)))
+        return len(chunks) > start
+
+    def resolver(self, resolve: Resolver) -> Resolver:
+        def resolve_resumable(batch):
+            hashes = [chunk_hash(chunk) for _, chunk in batch]
+
+            # The batch's head that the earlier run wrote, as long as it matches
+            candidates = []
+            for (i, _), h in zip(batch, hashes):
+                if i >= len(self._previous) or self._previous[i][0] != h:
+                    break
+                candidates.append((i, self._previous[i][1]))
+
+            ids = sorted({point_id for _, point_id in candidates if point_id})
+            vectors = {str(p.id): p.vector for p in self.vector_store.retrieve(ids)} if ids else {}
+            resumed = 0
+            for i, point_id in candidates:
+                if point_id and point_id not in vectors:
+                    break
+                if point_id and self.centroid is not None:
+                    self.centroid.add(vectors[point_id]["dense"])
+                resumed += 1
+            self.resumed += resumed
+
+            fresh = batch[resumed:]
+            if fresh and fresh[0][0] < len(self._previous):
+                with self._lock:
+                    self._diverge(fresh[0][0])
+            if not fresh:
+                return [], []
+
+            reused, news = resolve(fresh)
+
+            sent = {p.payload["chunk_index"] for p in reused} | {i for _, _, i in news}
+            with self._lock:
+                for (i, _), h in zip(fresh, hashes[resumed:]):
+                    if i in sent:
+                        self._pending[i] = h
+                    else:
+                        self._done[i] = (h, None)
+                self._advance()
+            return reused, news
+
+        return resolve_resumable
+
+    def upserted(self, points: list) -> None:
+        with self._lock:
+            for point in points:
+                i = (point.payload or {}).get("chunk_index")
+                if i in self._pending:
+                    self._done[i] = (self._pending.pop(i), str(point.id))
+            if not self._advance():
+                return
+            self.save()
+
+
+# Module-level singleton
+_checkpoint_store: CheckpointStore | None = None
+
+
+def get_checkpoint_store() -> CheckpointStore | None:
+    """Checkpoint store from settings, or None when ingest_checkpoints is off."""
+    global _checkpoint_store
+    settings = get_settings()
+    if not settings.ingest_checkpoints:
+        return None
+    if _checkpoint_store is None:
+        _checkpoint_store = CheckpointStore(ttl_seconds=settings.ingest_checkpoint_ttl_seconds)
+    return _checkpoint_store
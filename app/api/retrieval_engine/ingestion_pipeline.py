@@ -0,0 +1,238 @@
+"""
+Pipeline de ingestión por etapas concurrentes conectadas con colas acotadas.
+
+    chunks → resolve (hash/dedupe) → embed → upsert
+
+Cada etapa es una task de asyncio; el trabajo bloqueante (lookups en Qdrant,
+embeddings, upserts) corre en threads, así la red, el modelo y las escrituras
+se solapan. Las colas acotadas limitan la memoria: si el upsert se atrasa, el
+embedding espera, y así hacia atrás hasta el productor de chunks.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+import structlog
+
+from ...api.extraction.schema import ChunkWithMetadata
+from ...api.retrieval_engine.chunk_manifest import parent_id
+from ...api.retrieval_engine.domain_index import CentroidAccumulator
+from ...infrastructure.storage.interfaces import HybridEmbeddingInterface, VectorStoreInterface
+from ...infrastructure.metrics import (
+    ingestion_stage_items_total,
+    ingestion_stage_duration_seconds,
+)
+
+
+log = structlog.get_logger()
+
+# (point id, chunk, chunk index) of a chunk that still needs an embedding
+NewChunk = tuple[str, ChunkWithMetadata, int]
+
+# Splits a batch of (index, chunk) into points to re-upsert as-is and chunks to embed
+Resolver = Callable[[list[tuple[int, ChunkWithMetadata]]], tuple[list, list[NewChunk]]]
+
+_DONE = object()
+
+
+@dataclass
+class StageCounters:
+    """Items that went through each stage so far."""
+
+    chunked: int = 0
+    reused: int = 0
+    embedded: int = 0
+    upserted: int = 0
+    chunking_done: bool = False
+
+
+async def aiter_chunks(
+    chunks: Iterable[ChunkWithMetadata] | AsyncIterable[ChunkWithMetadata],
+):
+    """Iterate sync or async chunk sources uniformly."""
+    if isinstance(chunks, AsyncIterable):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+def chunk_payload(base_payload: dict, chunk: ChunkWithMetadata, index: int) -> dict:
+    """Payload of a chunk's point; windows of parent_child chunking point to their parent."""
+    payload = {
+        **base_payload,
+        "text": chunk.text,
+        "section": chunk.section,
+        "chunk_index": index,
+    }
+    if chunk.parent is not None:
+        payload["parent_id"] = parent_id(
+            chunk.parent, base_payload["source"], base_payload.get("version")
+        )
+    return payload
+
+
+class IngestionPipeline:
+    """
+    Runs one document's chunks through resolve → embed → upsert concurrently.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStoreInterface,
+        embed_service: HybridEmbeddingInterface,
+        resolve: Resolver,
+        base_payload: dict,
+        progress: Callable[[int, str], Awaitable[None]] | None = None,
+        centroid: CentroidAccumulator | None = None,
+        batch_size: int = 20,
+        queue_size: int = 4,
+        on_upsert: Callable[[list], None] | None = None,
+    ) -> None:
+        self.vector_store = vector_store
+        self.embed_service = embed_service
+        self.resolve = resolve
+        self.base_payload = base_payload
+        self.progress = progress
+        self.centroid = centroid
+        self.batch_size = batch_size
+        # Called (in a thread) with every batch of points once it is written
+        self.on_upsert = on_upsert
+        self.counters = StageCounters()
+
+        self._to_resolve: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._to_embed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._to_upsert: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    @staticmethod
+    def _observe(stage: str, items: int, started: float) -> None:
+        ingestion_stage_items_total.labels(stage=stage).inc(items)
+        ingestion_stage_duration_seconds.labels(stage=stage).observe(
+            time.perf_counter() - started
+        )
+
+    async def _report(self) -> None:
+        if not self.progress:
+            return
+        c = self.counters
+        total = c.chunked if c.chunking_done else max(c.chunked, 1) * 2
+        percent = 50 + int(45 * c.upserted / max(total, 1))
+        await self.progress(
+            min(percent, 95),
+            f"Stored {c.upserted} of {c.chunked}{'' if c.chunking_done else '+'} chunks "
+            f"({c.embedded} embedded, {c.reused} reused)",
+        )
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _chunk_stage(self, chunks) -> None:
+        batch: list[tuple[int, ChunkWithMetadata]] = []
+        started = time.perf_counter()
+        async for chunk in aiter_chunks(chunks):
+            batch.append((self.counters.chunked, chunk))
+            self.counters.chunked += 1
+            if len(batch) >= self.batch_size:
+                self._observe("chunk", len(batch), started)
+                await self._to_resolve.put(batch)
+                batch, started = [], time.perf_counter()
+
+        if batch:
+            self._observe("chunk", len(batch), started)
+            await self._to_resolve.put(batch)
+        self.counters.chunking_done = True
+        await self._to_resolve.put(_DONE)
+
+    async def _resolve_stage(self) -> None:
+        while (batch := await self._to_resolve.get()) is not _DONE:
+            started = time.perf_counter()
+            reused, news = await asyncio.to_thread(self.resolve, batch)
+            self._observe("resolve", len(batch), started)
+
+            if reused:
+                self.counters.reused += len(reused)
+                await self._to_upsert.put(reused)
+            if news:
+                await self._to_embed.put(news)
+
+        # Reused points are queued before this, so upsert sees them before _DONE
+        await self._to_embed.put(_DONE)
+
+    async def _embed_stage(self) -> None:
+        while (news := await self._to_embed.get()) is not _DONE:
+            texts = [chunk.text for _, chunk, _ in news]
+            timeout = max(60, len(texts))
+
+            started = time.perf_counter()
+            try:
+                vectors = await asyncio.wait_for(
+                    asyncio.to_thread(self.embed_service.batch_embed, texts),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"Embedding timed out after {timeout / 60:.1f} minutes")
+
+            if len(vectors) != len(texts):
+                raise RuntimeError(
+                    f"Vector mismatch: expected {len(texts)}, got {len(vectors)}"
+                )
+            self._observe("embed", len(texts), started)
+
+            points = []
+            for (h_id, chunk, index), vector in zip(news, vectors):
+                if self.centroid is not None:
+                    self.centroid.add(vector.dense)
+                points.append(
+                    self.vector_store.create_point(
+                        hash_id=h_id,
+                        vector={"dense": vector.dense, "sparse": vector.sparse},
+                        payload=chunk_payload(self.base_payload, chunk, index),
+                    )
+                )
+            self.counters.embedded += len(points)
+            await self._to_upsert.put(points)
+
+        await self._to_upsert.put(_DONE)
+
+    async def _upsert_stage(self) -> None:
+        while (points := await self._to_upsert.get()) is not _DONE:
+            started = time.perf_counter()
+            await asyncio.to_thread(self.vector_store.insert_vector, points)
+            self._observe("upsert", len(points), started)
+            if self.on_upsert is not None:
+                await asyncio.to_thread(self.on_upsert, points)
+
+            self.counters.upserted += len(points)
+            await self._report()
+
+    # ------------------------------------------------------------------
+
+    async def run(
+        self, chunks: Iterable[ChunkWithMetadata] | AsyncIterable[ChunkWithMetadata]
+    ) -> StageCounters:
+        """Run all stages to completion; the first failing stage cancels the others."""
+        tasks = [
+            asyncio.create_task(self._chunk_stage(chunks), name="ingest-chunk"),
+            asyncio.create_task(self._resolve_stage(), name="ingest-resolve"),
+            asyncio.create_task(self._embed_stage(), name="ingest-embed"),
+            asyncio.create_task(self._upsert_stage(), name="ingest-upsert"),
+        ]
+
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((t for t in done if t.exception() is not None), None)
+        if failed is not None:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            log.warning(
+                "ingestion_pipeline_failed",
+                stage=failed.get_name(),
+                error=str(failed.exception()),
+            )
+            raise failed.exception()
+
+        return self.counters
@@ -3,7 +3,7 @@ Servicio para la ingestión de documentos en el vector store.
 """
 
 import asyncio
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Iterable
 from datetime import datetime, UTC
 import hashlib
 from typing import Callable
@@ -15,7 +15,30 @@ import structlog
 from ...api.extraction.schema import ChunkWithMetadata
 from ...api.extraction.factory import SourceFactory
 from ...api.extraction.exceptions import EmptySourceContentError
+from ...api.extraction.cleaners.html_cleaner import HTMLCleaner
+from ...api.extraction.cleaners.markdown_cleaner import MarkdownCleaner
+from ...api.extraction.source.crawler_source import CrawlerSource
+from ...api.extraction.source.repository_source import RepoArchive, RepositorySource
 from ...api.retrieval_engine.exceptions import ChunkingError
+from ...api.retrieval_engine.source_catalog import SourceCatalog
+from ...api.retrieval_engine.domain_index import CentroidAccumulator, DomainCentroidIndex
+from ...api.retrieval_engine.ingestion_pipeline import (
+    IngestionPipeline,
+    NewChunk,
+    chunk_payload,
+)
+from ...api.retrieval_engine.ingestion_checkpoint import (
+    Checkpoint,
+    ResumableRun,
+    get_checkpoint_store,
+)
+from ...api.retrieval_engine.parent_chunks import write_parents
+from ...api.retrieval_engine.summary_index import SourceSummaryIndex
+from ...api.retrieval_engine.upload_registry import get_upload_registry
+from ...api.retrieval_engine.chunk_manifest import Manifest, chunk_hash
+from ...api.retrieval_engine.chunk_quality import DroppedChunks, get_chunk_quality_filter
+from ...api.retrieval_engine.near_duplicates import DuplicateStats, get_near_duplicate_detector
+from ...core.settings import get_settings
 from ...infrastructure.storage.interfaces import VectorStoreInterface
 from ...infrastructure.storage.hybrid_ai import HybridEmbeddingService
 from ...infrastructure.metrics import (
@@ -25,6 +48,7 @@ from ...infrastructure.metrics import (
 
 
 ProgressCallback = Callable[[int, str], None]
+ChunkStream = Iterable[ChunkWithMetadata] | AsyncIterable[ChunkWithMetadata]
 
 
 class IngestionService:
@@ -36,139 +60,527 @@ class IngestionService:
         self,
         vector_store: VectorStoreInterface,
         embed_service: HybridEmbeddingService,
+        catalog: SourceCatalog | None = None,
+        domain_index: DomainCentroidIndex | None = None,
+        summary_index: SourceSummaryIndex | None = None,
     ) -> None:
         self.vector_store = vector_store
         self.embed_service = embed_service
+        # With a catalog, ingestion is versioned: new chunks become visible atomically
+        self.catalog = catalog
+        self.domain_index = domain_index
+        self.summary_index = summary_index
+        self.chunk_filter = get_chunk_quality_filter()
+        self.dedup = get_near_duplicate_detector(vector_store)
+        self.checkpoints = get_checkpoint_store()
+        self.uploads = get_upload_registry()
         self.logger = structlog.get_logger()
 
     def _generate_deterministic_ids(
-        self, chunks: list[ChunkWithMetadata], source: str
+        self,
+        chunks: list[ChunkWithMetadata],
+        source: str,
+        version: str | None = None,
     ) -> list[str]:
-        """Generate deterministic UUIDs for chunks."""
+        """Generate deterministic UUIDs for chunks (scoped to a version if given)."""
         hash_ids = [
-            hashlib.sha256((chunk.text + source).encode()).hexdigest()
+            hashlib.sha256((chunk.text + source + (version or "")).encode()).hexdigest()
             for chunk in chunks
         ]
         return [str(uuid5(NAMESPACE_DNS, h_id)) for h_id in hash_ids]
 
+    async def _extract_chunks(
+        self, extraction: Awaitable[str], cleaner, name: str
+    ) -> AsyncIterator[ChunkWithMetadata]:
+        """Extract → clean → chunk stage feeding the ingestion pipeline."""
+        raw_data = await extraction
+
+        content = await asyncio.to_thread(cleaner.clean, raw_data)
+        if not content.strip():
+            raise EmptySourceContentError(name)
+
+        chunks = await asyncio.to_thread(cleaner.chunk, content)
+        if not chunks:
+            raise ChunkingError("No chunks generated")
+
+        for chunk in chunks:
+            yield chunk
+
+    async def _extract_page_chunks(
+        self, pages: AsyncIterator[str], cleaner, name: str, window: int
+    ) -> AsyncIterator[ChunkWithMetadata]:
+        """Clean and chunk every `window` pages while later pages are still extracted."""
+        buffer: list[str] = []
+        produced = 0
+
+        async def flush() -> AsyncIterator[ChunkWithMetadata]:
+            nonlocal produced
+            raw_data = "\n".join(buffer)
+            buffer.clear()
+            content = await asyncio.to_thread(cleaner.clean, raw_data)
+            if not content.strip():
+                return
+            for chunk in await asyncio.to_thread(cleaner.chunk, content):
+                produced += 1
+                yield chunk
+
+        async for text in pages:
+            if text:
+                buffer.append(text)
+            if len(buffer) >= window:
+                async for chunk in flush():
+                    yield chunk
+        if buffer:
+            async for chunk in flush():
+                yield chunk
+
+        if not produced:
+            raise EmptySourceContentError(name)
+
+    def _update_source_indexes(
+        self, source: str, domain: str, topic: str, centroid: CentroidAccumulator
+    ) -> None:
+        """Replace the source's contribution to its domain centroid and its summary vector."""
+        # Both indexes are optimizations; never fail an ingestion for them
+        if self.domain_index is not None:
+            try:
+                self.domain_index.put_source(source, domain, centroid)
+            except Exception as e:
+                self.logger.warning("domain_index_update_failed", source=source, error=str(e))
+        if self.summary_index is not None:
+            try:
+                self.summary_index.put(source, domain, topic, centroid)
+            except Exception as e:
+                self.logger.warning("summary_index_update_failed", source=source, error=str(e))
+
+    # ------------------------------------------------------------------
+    # Job checkpoints
+    # ------------------------------------------------------------------
+
+    def _abandon_checkpoint(self, source: str, checkpoint: Checkpoint) -> None:
+        if checkpoint.version and self.catalog is not None:
+            # Killed between activation and cleanup: that version is live
+            if checkpoint.version != self.catalog.active_version(source):
+                self.catalog.abandon(source, checkpoint.version)
+
+    def _saved_checkpoint(
+        self, checkpoint_key: tuple[str, str] | None, source: str, versioned: bool
+    ) -> Checkpoint | None:
+        """
+        The checkpoint an earlier attempt of this job left for the same content.
+
+        Checkpoints of other content (the document changed between attempts)
+        are dropped and their versions abandoned, and so is a checkpoint that
+        can no longer be resumed: its version is no longer in flight (it was
+        abandoned or swept meanwhile) or it was written with versioning
+        switched the other way.
+        """
+        if checkpoint_key is None or self.checkpoints is None:
+            return None
+        job_id, content_hash = checkpoint_key
+
+        saved = None
+        for key_hash, checkpoint in self.checkpoints.load(job_id).items():
+            usable = (
+                key_hash == content_hash
+                and (checkpoint.version is not None) == versioned
+                and not (
+                    versioned and not self.catalog.is_in_flight(source, checkpoint.version)
+                )
+            )
+            if usable:
+                saved = checkpoint
+                continue
+            self._abandon_checkpoint(source, checkpoint)
+            self.checkpoints.drop(job_id, key_hash)
+
+        if saved is not None:
+            self.logger.info(
+                "ingest_resuming",
+                job_id=job_id,
+                source=source,
+                version=saved.version,
+                committed=len(saved.chunks),
+            )
+        return saved
+
+    def _start_run(
+        self,
+        checkpoint_key: tuple[str, str] | None,
+        checkpoint: Checkpoint,
+        centroid: CentroidAccumulator,
+    ) -> ResumableRun | None:
+        """Checkpoint this run; saved right away so its version is known before any write."""
+        if checkpoint_key is None or self.checkpoints is None:
+            return None
+        job_id, content_hash = checkpoint_key
+        run = ResumableRun(
+            self.checkpoints, job_id, content_hash, checkpoint, self.vector_store, centroid
+        )
+        run.save()
+        return run
+
+    def _record_upload(
+        self,
+        content_hash: str | None,
+        source: str,
+        result: dict,
+        pdf_backend: str | None = None,
+    ) -> None:
+        """Register the uploaded content the source's active version now holds."""
+        if not content_hash or self.uploads is None or self.catalog is None:
+            return
+        if not result.get("version"):
+            return
+        manifest = self.catalog.get_manifest(source)
+        if manifest is not None:
+            self.uploads.record(content_hash, source, manifest, pdf_backend)
+
+    def discard_checkpoints(self, job_id: str, source: str) -> None:
+        """Give up on a job for good: abandon the versions its checkpoints were writing."""
+        if self.checkpoints is None:
+            return
+        for checkpoint in self.checkpoints.load(job_id).values():
+            self._abandon_checkpoint(source, checkpoint)
+        self.checkpoints.drop(job_id)
+
     async def _process_ingestion(
         self,
-        chunks: list[ChunkWithMetadata],
+        chunks: ChunkStream,
         source: str,
         domain: str,
         topic: str,
         progress_callback: ProgressCallback | None = None,
+        url: str | None = None,
+        version: str | None = None,
+        filter_chunks: bool = True,
+        checkpoint_key: tuple[str, str] | None = None,
     ) -> dict:
-        """Process ingestion with optional progress reporting."""
+        """
+        Process ingestion with optional progress reporting.
+
+        With a checkpoint key (job id, content hash) the run is checkpointed
+        and resumes whatever an earlier attempt of the same job committed.
+        """
 
         async def report(percent: int, msg: str) -> None:
             if progress_callback:
                 await progress_callback(percent, msg)
 
-        await report(50, "Analyzing chunks...")
+        # Low-information chunks never reach the embedder (nor the manifest)
+        dropped = None
+        if filter_chunks and self.chunk_filter is not None:
+            dropped = DroppedChunks()
+            chunks = self.chunk_filter.filter(chunks, dropped)
+
+        near_dups = DuplicateStats()
+        if self.catalog is not None or version is not None:
+            result = await self._process_versioned(
+                chunks,
+                source,
+                domain,
+                topic,
+                report,
+                near_dups,
+                url=url,
+                version=version,
+                checkpoint_key=checkpoint_key,
+            )
+        else:
+            result = await self._process_unversioned(
+                chunks, source, domain, topic, report, near_dups, checkpoint_key
+            )
 
-        # Generate IDs
-        hash_ids = self._generate_deterministic_ids(chunks, source)
+        if dropped is not None and dropped.total:
+            result["low_quality"] = dropped.as_dict()
+            self.logger.info(
+                "low_quality_chunks",
+                source=source,
+                dropped=self.chunk_filter.drop,
+                total=dropped.total,
+                reasons=dict(dropped.reasons),
+            )
+        if near_dups.aliased or near_dups.skipped:
+            result["near_duplicates"] = near_dups.as_dict()
+        return result
 
-        # Check existing
-        chunks_in_db = self.vector_store.retrieve(hash_ids)
-        ids_in_db = {chunk.id for chunk in chunks_in_db}
+    def _with_near_duplicates(
+        self,
+        resolve,
+        source: str,
+        base_payload: dict,
+        stats: DuplicateStats,
+        centroid: CentroidAccumulator | None = None,
+        allow_skip: bool = False,
+    ):
+        """Wrap a resolver so near-duplicates of other sources' chunks are not embedded."""
+        if self.dedup is None:
+            return resolve
+
+        def resolve_with_duplicates(batch):
+            reused, news = resolve(batch)
+            aliased, news, _ = self.dedup.resolve(
+                news, source, base_payload, stats, allow_skip=allow_skip
+            )
+            if centroid is not None:
+                for point in aliased:
+                    centroid.add(point.vector["dense"])
+            return reused + aliased, news
 
-        # Separate new vs existing
-        news = [
-            (hash_ids[i], c, i)
-            for i, c in enumerate(chunks)
-            if hash_ids[i] not in ids_in_db
-        ]
+        return resolve_with_duplicates
 
-        await report(55, f"Found {len(news)} new, {len(chunks_in_db)} existing chunks")
+    async def _process_unversioned(
+        self,
+        chunks: ChunkStream,
+        source: str,
+        domain: str,
+        topic: str,
+        report,
+        near_dups: DuplicateStats,
+        checkpoint_key: tuple[str, str] | None = None,
+    ) -> dict:
+        """Upsert the chunks in place and delete whatever older runs left behind."""
+        await report(50, "Analyzing chunks...")
 
-        timestamp = int(datetime.now(UTC).timestamp())
-        old_points_to_upsert: list = []
+        # A resumed run keeps the timestamp of the chunks it already wrote
+        saved = self._saved_checkpoint(checkpoint_key, source, versioned=False)
+        timestamp = saved.ingested_at if saved else int(datetime.now(UTC).timestamp())
+        base_payload = {
+            "source": source,
+            "domain": domain.lower(),
+            "topic": topic.lower(),
+            "ingested_at": timestamp,
+        }
+        centroid = CentroidAccumulator()
+        existing_seen = 0
+        run = self._start_run(checkpoint_key, saved or Checkpoint(None, timestamp), centroid)
+
+        def resolve(batch):
+            nonlocal existing_seen
+            hash_ids = self._generate_deterministic_ids([c for _, c in batch], source)
+            chunks_in_db = self.vector_store.retrieve(hash_ids)
+            ids_in_db = {chunk.id for chunk in chunks_in_db}
+            existing_seen += len(chunks_in_db)
+
+            # Existing chunks are re-upserted with the new timestamp so the
+            # final cleanup of older points keeps them (their parent may have changed)
+            positions = {h_id: item for h_id, item in zip(hash_ids, batch)}
+            refreshed = []
+            for chunk_db in chunks_in_db:
+                centroid.add(chunk_db.vector["dense"])
+                i, chunk = positions[str(chunk_db.id)]
+                refreshed.append(
+                    self.vector_store.create_point(
+                        hash_id=chunk_db.id,
+                        vector=chunk_db.vector,
+                        payload={**chunk_db.payload, **chunk_payload(base_payload, chunk, i)},
+                    )
+                )
 
-        # Clean old data
-        if chunks_in_db:
+            news = [
+                (h_id, chunk, i)
+                for h_id, (i, chunk) in zip(hash_ids, batch)
+                if h_id not in ids_in_db
+            ]
+            return refreshed, news
+
+        resolve = self._with_near_duplicates(
+            resolve, source, base_payload, near_dups, centroid, allow_skip=True
+        )
+        pipeline = IngestionPipeline(
+            vector_store=self.vector_store,
+            embed_service=self.embed_service,
+            resolve=run.resolver(resolve) if run else resolve,
+            base_payload=base_payload,
+            progress=report,
+            centroid=centroid,
+            on_upsert=run.upserted if run else None,
+        )
+        counters = await pipeline.run(write_parents(chunks, self.vector_store, base_payload))
+
+        # Clean old data (everything not written by this run or the attempt it resumed)
+        if existing_seen or saved is not None:
+            await report(95, "Removing stale chunks...")
             self.vector_store.delete_old_data(source=source, timestamp=timestamp)
 
-        # Process new chunks
-        if news:
-            await report(60, "Generating embeddings...")
+        self._update_source_indexes(source, domain, topic, centroid)
+        if run:
+            run.clear()
 
-            # Timeout calculation
-            estimated_time = len(news) * 0.5
-            timeout = max(60, estimated_time * 2)
+        result = {
+            "chunks_processed": counters.chunked,
+            "new": counters.embedded,
+            "updated": counters.reused,
+        }
+        if run and run.resumed:
+            result["resumed"] = run.resumed
+        return result
 
-            BATCH_SIZE = 20
+    async def _process_versioned(
+        self,
+        chunks: ChunkStream,
+        source: str,
+        domain: str,
+        topic: str,
+        report,
+        near_dups: DuplicateStats,
+        url: str | None = None,
+        version: str | None = None,
+        checkpoint_key: tuple[str, str] | None = None,
+    ) -> dict:
+        """
+        Write the chunks under a new hidden version and publish it atomically.
+
+        Vectors of chunks that already exist in the visible version (found by
+        hash through its manifest, or by id) are copied into the new version,
+        so only changed text is embedded. The replaced version is not deleted
+        here: it is hidden by the catalog switch and garbage-collected later.
+        When `version` is given (full rebuilds) the chunks are written under that
+        tag and nothing is published.
+
+        A checkpointed run is not abandoned when it fails: the job's retry
+        resumes the same version.
+        """
+        publish = version is None
+        previous = self.catalog.active_version(source) if self.catalog else None
+        saved = (
+            self._saved_checkpoint(checkpoint_key, source, versioned=True) if publish else None
+        )
 
-            for i in range(0, len(news), BATCH_SIZE):
-                batch = news[i : i + BATCH_SIZE]
-                texts_to_process = [item[1].text for item in batch]
+        # Points of the active version by chunk hash; ids written by older
+        # in-place diffs are not derived from the active version's tag
+        known_points = self._manifest_points(source, previous) if publish and previous else None
 
-                try:
-                    vectors = await asyncio.wait_for(
-                        asyncio.to_thread(
-                            self.embed_service.batch_embed, texts_to_process
-                        ),
-                        timeout=timeout,
-                    )
-                except asyncio.TimeoutError:
-                    timeout_minutes = timeout / 60
-                    raise RuntimeError(
-                        f"Embedding timed out after {timeout_minutes:.1f} minutes"
-                    )
+        if saved is not None:
+            version = saved.version
+        elif publish:
+            version = self.catalog.begin_version(source)
 
-                if len(vectors) != len(texts_to_process):
-                    raise RuntimeError(
-                        f"Vector mismatch: expected {len(texts_to_process)}, got {len(vectors)}"
-                    )
+        await report(50, "Analyzing chunks...")
 
-                new_points = []
+        timestamp = saved.ingested_at if saved else int(datetime.now(UTC).timestamp())
+        base_payload = {
+            "source": source,
+            "domain": domain.lower(),
+            "topic": topic.lower(),
+            "ingested_at": timestamp,
+            "version": version,
+        }
+        centroid = CentroidAccumulator()
+        manifest_entries: dict[int, tuple[str, str]] = {}
+        run = (
+            self._start_run(checkpoint_key, saved or Checkpoint(version, timestamp), centroid)
+            if publish
+            else None
+        )
 
-                for (h_id, chunk_metadata, original_idx), vector in zip(batch, vectors):
-                    point = self.vector_store.create_point(
+        def resolve(batch):
+            batch_chunks = [c for _, c in batch]
+            hashes = [chunk_hash(chunk) for chunk in batch_chunks]
+            hash_ids = self._generate_deterministic_ids(batch_chunks, source, version)
+            previous_ids = self._generate_deterministic_ids(batch_chunks, source, previous)
+            if known_points:
+                previous_ids = [
+                    known_points.get(h, prev_id) for h, prev_id in zip(hashes, previous_ids)
+                ]
+            existing = {str(p.id): p for p in self.vector_store.retrieve(previous_ids)}
+            for h, h_id, (i, _) in zip(hashes, hash_ids, batch):
+                manifest_entries[i] = (h, h_id)
+
+            reused = []
+            news: list[NewChunk] = []
+            for h_id, prev_id, (i, chunk) in zip(hash_ids, previous_ids, batch):
+                prev = existing.get(prev_id)
+                if prev is None:
+                    news.append((h_id, chunk, i))
+                    continue
+                centroid.add(prev.vector["dense"])
+                reused.append(
+                    self.vector_store.create_point(
                         hash_id=h_id,
-                        vector={"dense": vector.dense, "sparse": vector.sparse},
-                        payload={
-                            "text": chunk_metadata.text,
-                            "section": chunk_metadata.section,
-                            "source": source,
-                            "domain": domain.lower(),
-                            "topic": topic.lower(),
-                            "chunk_index": original_idx,
-                            "ingested_at": timestamp,
-                        },
+                        vector=prev.vector,
+                        payload=chunk_payload(base_payload, chunk, i),
                     )
-                    new_points.append(point)
-
-                self.vector_store.insert_vector(new_points)
-
-                await report(60, f"Ingested {i + BATCH_SIZE} of {len(news)} chunks")
-
-        # Update existing chunks
-        if chunks_in_db:
-            await report(85, "Updating existing chunks...")
-
-            for chunk_db in chunks_in_db:
-                point = self.vector_store.create_point(
-                    hash_id=chunk_db.id,
-                    vector=chunk_db.vector,
-                    payload={
-                        **chunk_db.payload,
-                        "ingested_at": timestamp,
-                    },
                 )
-                old_points_to_upsert.append(point)
+            return reused, news
+
+        # Every chunk keeps its own point: manifests address them by id
+        resolve = self._with_near_duplicates(resolve, source, base_payload, near_dups, centroid)
+        pipeline = IngestionPipeline(
+            vector_store=self.vector_store,
+            embed_service=self.embed_service,
+            resolve=run.resolver(resolve) if run else resolve,
+            base_payload=base_payload,
+            progress=report,
+            centroid=centroid,
+            on_upsert=run.upserted if run else None,
+        )
+        try:
+            counters = await pipeline.run(
+                write_parents(chunks, self.vector_store, base_payload)
+            )
+        except Exception:
+            if publish and run is None:
+                self.catalog.abandon(source, version)
+            raise
 
-        # Insert into vector store
-        if old_points_to_upsert:
-            await report(95, "Storing in vector database...")
-            self.vector_store.insert_vector(old_points_to_upsert)
+        if run:
+            # Chunks resumed from the checkpoint were not resolved by this run
+            for i, entry in enumerate(run.checkpoint.chunks):
+                manifest_entries.setdefault(i, entry)
+
+        if publish:
+            self.catalog.save_manifest(
+                source,
+                Manifest(
+                    model=self.embed_service.model_version,
+                    version=version,
+                    chunks=[manifest_entries[i] for i in sorted(manifest_entries)],
+                ),
+            )
+        elif self.catalog:
+            # Rebuilds write into another collection; the manifest's point ids no longer apply
+            self.catalog.drop_manifest(source)
+
+        retired = None
+        if publish:
+            await report(95, "Publishing new version...")
+            retired = self.catalog.activate(
+                source,
+                version,
+                domain=domain.lower(),
+                topic=topic.lower(),
+                url=url,
+                chunk_count=counters.chunked,
+            )
+
+        self._update_source_indexes(source, domain, topic, centroid)
+        if run:
+            run.clear()
 
-        return {
-            "chunks_processed": len(chunks),
-            "new": len(news),
-            "updated": len(chunks_in_db),
+        result = {
+            "chunks_processed": counters.chunked,
+            "new": counters.embedded,
+            "updated": counters.reused,
+            "version": version,
+            "retired_version": retired,
         }
+        if run and run.resumed:
+            result["resumed"] = run.resumed
+        return result
+
+    def _manifest_points(self, source: str, active: str) -> dict[str, str] | None:
+        """
+        Point id per chunk hash of the active version, from its manifest, or
+        None when there is no manifest for it or its vectors come from
+        another embedding model.
+        """
+        manifest = self.catalog.get_manifest(source)
+        if manifest is None:
+            return None
+        if manifest.version != active or manifest.model != self.embed_service.model_version:
+            return None
+        return manifest.points_by_hash()
 
     # ===========================================================================
     # PDF Ingestion
@@ -181,63 +593,56 @@ class IngestionService:
         domain: str,
         topic: str,
         progress_callback: ProgressCallback | None = None,
+        pdf_backend: str | None = None,
+        job_id: str | None = None,
+        content_hash: str | None = None,
     ) -> dict:
-        """Synchronous PDF ingestion."""
-        extractor, cleaner = SourceFactory.get_pdf_cleaner()
+        """
+        Synchronous PDF ingestion.
 
-        raw_data = await extractor.extract(file)
-
-        content = cleaner.clean(raw_data)
-        if not content.strip():
-            raise EmptySourceContentError(file.filename)
-
-        chunks = cleaner.chunk(content)
-        if not chunks:
-            raise ChunkingError("No chunks generated")
+        With the file's hash, a job id makes it resumable and the content is
+        registered so an identical re-upload is not ingested again.
+        """
+        extractor, cleaner = SourceFactory.get_pdf_cleaner(pdf_backend)
+        window = get_settings().pdf_pages_per_task
 
         result = await self._process_ingestion(
-            chunks=chunks,
+            chunks=self._extract_page_chunks(
+                extractor.iter_pages(file), cleaner, file.filename, window
+            ),
             source=source,
             domain=domain,
             topic=topic,
             progress_callback=progress_callback,
+            checkpoint_key=(job_id, content_hash) if job_id and content_hash else None,
         )
+        self._record_upload(content_hash, source, result, extractor.backend)
 
         self._log_ingestion_metrics("pdf", result)
 
         return result
 
     async def ingest_pdf_file_stream(
-        self, file: UploadFile, source: str, domain: str, topic: str
+        self,
+        file: UploadFile,
+        source: str,
+        domain: str,
+        topic: str,
+        pdf_backend: str | None = None,
     ) -> AsyncIterator[dict]:
         """Streaming PDF ingestion with progress reporting."""
 
         yield {"progress": 10, "step": "Extracting text from PDF"}
 
-        extractor, cleaner = SourceFactory.get_pdf_cleaner()
-
-        try:
-            raw_data = await extractor.extract(file)
-        except Exception as e:
-            self.logger.error(
-                "PDF extraction failed", error=str(e), filename=file.filename
-            )
-            raise
-
-        yield {"progress": 30, "step": "Cleaning and processing PDF content"}
-
-        content = cleaner.clean(raw_data)
-        if not content.strip():
-            raise EmptySourceContentError(file.filename)
-
-        chunks = cleaner.chunk(content)
-        if not chunks:
-            raise ChunkingError("No chunks generated")
+        extractor, cleaner = SourceFactory.get_pdf_cleaner(pdf_backend)
+        window = get_settings().pdf_pages_per_task
 
-        yield {"progress": 50, "step": "Processing chunks..."}
+        yield {"progress": 30, "step": "Extracting, cleaning and chunking PDF pages"}
 
         result = await self._process_ingestion(
-            chunks=chunks,
+            chunks=self._extract_page_chunks(
+                extractor.iter_pages(file), cleaner, file.filename, window
+            ),
             source=source,
             domain=domain,
             topic=topic,
@@ -249,6 +654,39 @@ class IngestionService:
         self._log_ingestion_metrics("pdf", result)
         yield {"progress": 100, "step": "Done!", **result}
 
+    # ===========================================================================
+    # Tabular Ingestion
+    # ===========================================================================
+
+    async def ingest_csv_file(
+        self,
+        file: UploadFile,
+        source: str,
+        domain: str,
+        topic: str,
+        progress_callback: ProgressCallback | None = None,
+        job_id: str | None = None,
+        content_hash: str | None = None,
+    ) -> dict:
+        """CSV/TSV ingestion; rows are read and embedded block by block."""
+        extractor = SourceFactory.get_csv_source()
+
+        result = await self._process_ingestion(
+            chunks=extractor.iter_chunks(file),
+            source=source,
+            domain=domain,
+            topic=topic,
+            progress_callback=progress_callback,
+            # rows of numbers are what a table is made of
+            filter_chunks=False,
+            checkpoint_key=(job_id, content_hash) if job_id and content_hash else None,
+        )
+        self._record_upload(content_hash, source, result)
+
+        self._log_ingestion_metrics("csv", result)
+
+        return result
+
     # ===========================================================================
     # URL Ingestion
     # ===========================================================================
@@ -260,34 +698,45 @@ class IngestionService:
         domain: str,
         topic: str,
         progress_callback: ProgressCallback | None = None,
+        version: str | None = None,
+        job_id: str | None = None,
     ) -> dict:
-        """Synchronous URL ingestion."""
+        """Synchronous URL ingestion; with a job id, retries of the job resume it."""
         from ...api.extraction.exceptions import SourceException
 
         extractor, cleaner = SourceFactory.get_extractor_and_cleaner(url)
 
-        try:
-            raw_data = await extractor.extract(url)
-        except SourceException as e:
-            self.logger.warning(
-                "Source extraction failed", error=str(e), url=url, source=source
-            )
-            raise
+        async def extraction() -> str:
+            try:
+                return await extractor.extract(url)
+            except SourceException as e:
+                self.logger.warning(
+                    "Source extraction failed", error=str(e), url=url, source=source
+                )
+                raise
 
-        content = cleaner.clean(raw_data)
-        if not content.strip():
-            raise EmptySourceContentError(url)
+        raw_data = extraction()
+        checkpoint_key = None
+        if job_id is not None:
+            # A checkpoint only applies to the content it was written for,
+            # so the page is fetched before anything else
+            fetched = await raw_data
+            checkpoint_key = (job_id, hashlib.sha256(fetched.encode()).hexdigest())
 
-        chunks = cleaner.chunk(content)
-        if not chunks:
-            raise ChunkingError("No chunks generated")
+            async def text() -> str:
+                return fetched
+
+            raw_data = text()
 
         result = await self._process_ingestion(
-            chunks=chunks,
+            chunks=self._extract_chunks(raw_data, cleaner, url),
             source=source,
             domain=domain,
             topic=topic,
             progress_callback=progress_callback,
+            url=url,
+            version=version,
+            checkpoint_key=checkpoint_key,
         )
 
         self.logger.info(
@@ -337,6 +786,7 @@ class IngestionService:
             domain=domain,
             topic=topic,
             progress_callback=None,
+            url=url,
         )
 
         yield {"progress": 95, "step": "Finalizing..."}
@@ -353,6 +803,164 @@ class IngestionService:
         self._log_ingestion_metrics("url", result)
         yield {"progress": 100, "step": "Done!", **result}
 
+    # ===========================================================================
+    # Site crawling
+    # ===========================================================================
+
+    async def ingest_site(
+        self,
+        crawler: CrawlerSource,
+        root: str,
+        domain: str,
+        topic: str,
+        path_prefix: str | None = None,
+        concurrency: int = 4,
+        progress_callback: ProgressCallback | None = None,
+    ) -> dict:
+        """
+        Crawl a documentation site and ingest the pages that changed.
+
+        Every page is its own source (its URL). Unchanged pages are neither
+        re-chunked nor re-embedded; a page's validators are only stored once
+        its ingestion succeeded, so a failed page is fetched again next time.
+        """
+        cleaner = SourceFactory.with_chunking(HTMLCleaner())
+        semaphore = asyncio.Semaphore(concurrency)
+        counts = {"changed": 0, "unchanged": 0, "failed": 0, "skipped": 0}
+        chunks_processed = 0
+        ingested: list[str] = []
+        pending: set[asyncio.Task] = set()
+
+        async def html_of(page) -> str:
+            return page.html
+
+        async def ingest_page(page) -> None:
+            nonlocal chunks_processed
+            async with semaphore:
+                try:
+                    result = await self._process_ingestion(
+                        chunks=self._extract_chunks(html_of(page), cleaner, page.url),
+                        source=page.url,
+                        domain=domain,
+                        topic=topic,
+                        url=page.url,
+                    )
+                except Exception as e:
+                    counts["failed"] += 1
+                    documents_ingested_total.labels(source_type="url", status="error").inc()
+                    self.logger.warning("crawl_page_failed", url=page.url, error=str(e))
+                    return
+
+            await asyncio.to_thread(crawler.commit, page)
+            ingested.append(page.url)
+            counts["changed"] += 1
+            chunks_processed += result["chunks_processed"]
+            self._log_ingestion_metrics("url", result)
+
+        async for page in crawler.crawl(root, path_prefix):
+            if page.status != "changed":
+                counts[page.status] += 1
+                continue
+
+            # bounded: fetched pages don't pile up (HTML in memory) ahead of the ingestion
+            while len(pending) >= concurrency * 2:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            task = asyncio.create_task(ingest_page(page))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+            if progress_callback:
+                visited = sum(counts.values()) + len(pending)
+                await progress_callback(min(95, 10 + visited), f"Crawled {visited} pages")
+
+        await asyncio.gather(*pending)
+
+        self.logger.info(
+            "crawl_ingest_completed", root=root, domain=domain, pages=counts, chunks_processed=chunks_processed
+        )
+        return {"pages": counts, "chunks_processed": chunks_processed, "ingested": ingested}
+
+    # ===========================================================================
+    # Repository Ingestion
+    # ===========================================================================
+
+    async def ingest_repository(
+        self,
+        repository: RepositorySource,
+        repo: RepoArchive,
+        include: list[str],
+        domain: str,
+        topic: str,
+        concurrency: int = 4,
+        progress_callback: ProgressCallback | None = None,
+    ) -> dict:
+        """
+        Ingest the documentation files of a repository archive.
+
+        Every file is its own source. Files whose blob hash matches the last
+        ingested one are skipped; the hash is only stored once the file's
+        ingestion succeeded.
+        """
+        cleaner = SourceFactory.with_chunking(MarkdownCleaner())
+        semaphore = asyncio.Semaphore(concurrency)
+        counts = {"changed": 0, "unchanged": 0, "failed": 0}
+        chunks_processed = 0
+        ingested: list[str] = []
+        pending: set[asyncio.Task] = set()
+
+        async def text_of(file) -> str:
+            return file.text
+
+        async def ingest_file(file) -> None:
+            nonlocal chunks_processed
+            async with semaphore:
+                try:
+                    result = await self._process_ingestion(
+                        chunks=self._extract_chunks(text_of(file), cleaner, file.source),
+                        source=file.source,
+                        domain=domain,
+                        topic=topic,
+                        # file.source is the blob's HTML page: a rebuild must
+                        # copy these points, not re-ingest that page
+                        url=None,
+                    )
+                except Exception as e:
+                    counts["failed"] += 1
+                    documents_ingested_total.labels(source_type="repository", status="error").inc()
+                    self.logger.warning("repo_file_failed", source=file.source, error=str(e))
+                    return
+
+            await asyncio.to_thread(repository.commit, repo, file)
+            ingested.append(file.source)
+            counts["changed"] += 1
+            chunks_processed += result["chunks_processed"]
+            self._log_ingestion_metrics("repository", result)
+
+        async for file in repository.files(repo, include):
+            if file.status != "changed":
+                counts[file.status] += 1
+                continue
+
+            # bounded: the archive is not read further ahead than the ingestion
+            while len(pending) >= concurrency * 2:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            task = asyncio.create_task(ingest_file(file))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+            if progress_callback:
+                seen = sum(counts.values()) + len(pending)
+                await progress_callback(min(95, 10 + seen), f"Read {seen} files")
+
+        await asyncio.gather(*pending)
+
+        self.logger.info(
+            "repo_ingest_completed", repo=repo.key, domain=domain, files=counts, chunks_processed=chunks_processed
+        )
+        return {"files": counts, "chunks_processed": chunks_processed, "ingested": ingested}
+
     def _log_ingestion_metrics(self, source_type: str, result: dict) -> None:
         """Log ingestion metrics."""
         documents_ingested_total.labels(source_type=source_type, status="success").inc()
@@ -1,16 +1,35 @@
 # celery tasks - wrapper
 
 import asyncio
+import functools
+import hashlib
 import os
+import shutil
+import threading
 import time
 
+from celery import chord
+from celery.exceptions import Ignore
+from celery.signals import worker_process_shutdown
 from fastapi import UploadFile
 import structlog
 
+from app.api.extraction.http_client import close_http_clients
 from app.api.retrieval_engine.jobs.schemas import JobStatus
 from app.api.retrieval_engine.jobs.job_service import JobService
+from app.api.retrieval_engine.jobs.host_limiter import HostConcurrencyLimiter, host_of
+from app.api.retrieval_engine.jobs.index_write_gate import get_write_gate
 from app.api.retrieval_engine.service import RAGService, get_rag_service
+from app.api.retrieval_engine.source_catalog import (
+    get_source_catalog,
+    get_versioning_catalog,
+)
+from app.api.retrieval_engine.domain_index import get_domain_index
+from app.api.retrieval_engine.summary_index import get_summary_index
+from app.api.retrieval_engine.near_duplicates import get_near_duplicate_detector
+from app.api.extraction.source.csv_source import CSV_SUFFIXES
 from app.core.celery_app import celery_app
+from app.core.settings import get_settings
 from app.infrastructure.metrics import (
     celery_task_duration_seconds,
     celery_tasks_total,
@@ -19,8 +38,92 @@ from app.infrastructure.metrics import (
 
 logger = structlog.get_logger()
 
+_worker_loop = threading.local()
 
-@celery_app.task(bind=True)
+
+def _run_async(coro):
+    """
+    Run a coroutine on this worker's long-lived event loop, so the pooled
+    HTTP clients (bound to their loop) keep their connections across tasks
+    instead of leaking one pool per asyncio.run.
+    """
+    runner = getattr(_worker_loop, "runner", None)
+    if runner is None:
+        runner = _worker_loop.runner = asyncio.Runner()
+    return runner.run(coro)
+
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**kwargs) -> None:
+    runner = getattr(_worker_loop, "runner", None)
+    if runner is None:
+        return
+    try:
+        runner.run(close_http_clients())
+    finally:
+        runner.close()
+        _worker_loop.runner = None
+
+
+def _schedule_version_gc(source: str) -> None:
+    """Queue garbage collection of retired/abandoned versions of a source."""
+    if get_versioning_catalog() is None:
+        return
+    gc_source_versions_task.apply_async(
+        args=[source], countdown=get_settings().version_gc_delay_seconds
+    )
+
+
+def _retry_ingestion(task, job_id: str, error: Exception) -> None:
+    """
+    Retry a failed ingestion job while it has retries left; the retry resumes
+    from the job's checkpoint. Returns when the failure is final.
+    """
+    settings = get_settings()
+    if task.request.retries >= settings.ingest_max_retries:
+        return
+    logger.warning(
+        "ingest_job_retrying", job_id=job_id, attempt=task.request.retries + 1, error=str(error)
+    )
+    celery_tasks_total.labels(task.name.rsplit(".", 1)[-1], "retry").inc()
+    JobService().update_progress(job_id, 10, f"Retrying after error: {error}")
+    raise task.retry(
+        exc=error,
+        countdown=settings.ingest_retry_delay_seconds,
+        max_retries=settings.ingest_max_retries,
+    )
+
+
+def _index_writer(task_fn):
+    """
+    Run a task that writes to the index only while no collection rebuild is
+    in progress. During a rebuild the task is put back in the queue as is
+    (same id, retries and chord) and this run is dropped.
+    """
+
+    @functools.wraps(task_fn)
+    def wrapper(self, *args, **kwargs):
+        gate = get_write_gate()
+        if not gate.enter(self.request.id):
+            logger.info("index_write_deferred", task=self.name, rebuild=gate.rebuilding())
+            self.signature_from_request().apply_async(
+                countdown=get_settings().rebuild_defer_seconds
+            )
+            raise Ignore()
+        try:
+            with gate.writing(self.request.id):
+                return task_fn(self, *args, **kwargs)
+        finally:
+            gate.leave(self.request.id)
+
+    return wrapper
+
+
+# Ingestion jobs are acknowledged when they finish: a worker killed mid-job
+# puts the message back in the queue and the next worker resumes from the
+# job's checkpoint instead of starting over.
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True)
+@_index_writer
 def ingest_html_job(self, job_id: str, ingest_data: dict):
     job_service = JobService()
     rag_service: RAGService = get_rag_service()
@@ -39,15 +142,19 @@ def ingest_html_job(self, job_id: str, ingest_data: dict):
             )
             job_service.update_progress(job_id, percent, message)
 
-        asyncio.run(
-            rag_service.ingest_document(
-                url=ingest_data["url"],
-                source=ingest_data["url"],
-                domain=ingest_data["domain"],
-                topic=ingest_data["topic"],
-                progress_callback=tracker,
+        try:
+            _run_async(
+                rag_service.ingest_document(
+                    url=ingest_data["url"],
+                    source=ingest_data["url"],
+                    domain=ingest_data["domain"],
+                    topic=ingest_data["topic"],
+                    progress_callback=tracker,
+                    job_id=job_id,
+                )
             )
-        )
+        finally:
+            _schedule_version_gc(ingest_data["url"])
 
         logger.info("ingest_job_success", job_id=job_id)
 
@@ -57,6 +164,8 @@ def ingest_html_job(self, job_id: str, ingest_data: dict):
         celery_tasks_total.labels("ingest_html_job", "success").inc()
 
     except Exception as e:
+        _retry_ingestion(self, job_id, e)
+        rag_service.discard_checkpoints(job_id, ingest_data["url"])
         celery_tasks_total.labels("ingest_html_job", "error").inc()
         documents_ingested_total.labels(source_type="url", status="error").inc()
         import traceback
@@ -69,12 +178,25 @@ def ingest_html_job(self, job_id: str, ingest_data: dict):
         celery_task_duration_seconds.labels("ingest_html_job").observe(task_end)
 
 
-@celery_app.task(bind=True)
-def ingest_file_job(self, job_id: str, file_path: str, source, domain: str, topic: str):
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True)
+@_index_writer
+def ingest_file_job(
+    self,
+    job_id: str,
+    file_path: str,
+    source,
+    domain: str,
+    topic: str,
+    pdf_backend: str | None = None,
+    content_hash: str | None = None,
+):
     job_service = JobService()
     rag_service: RAGService = get_rag_service()
 
     task_start = time.perf_counter()
+    is_tabular = file_path.lower().endswith(CSV_SUFFIXES)
+    # The upload stays on disk until the job succeeds or fails for good
+    keep_file = False
     logger.info("ingest_job_started", job_id=job_id, file_path=file_path)
 
     try:
@@ -88,17 +210,39 @@ def ingest_file_job(self, job_id: str, file_path: str, source, domain: str, topi
             job_service.update_progress(job_id, percent, message)
 
         with open(file_path, "rb") as f:
+            # Checkpoints of earlier attempts only apply to the same bytes;
+            # uploads are hashed while they are saved
+            if content_hash is None:
+                content_hash = hashlib.file_digest(f, "sha256").hexdigest()
+                f.seek(0)
             fake_upload_file = UploadFile(file=f, filename=os.path.basename(file_path))
 
-            asyncio.run(
-                rag_service.ingest_pdf_file(
+            if is_tabular:
+                ingestion = rag_service.ingest_csv_file(
                     file=fake_upload_file,
                     source=source,
                     domain=domain,
                     topic=topic,
                     progress_callback=tracker,
+                    job_id=job_id,
+                    content_hash=content_hash,
                 )
-            )
+            else:
+                ingestion = rag_service.ingest_pdf_file(
+                    file=fake_upload_file,
+                    source=source,
+                    domain=domain,
+                    topic=topic,
+                    progress_callback=tracker,
+                    pdf_backend=pdf_backend,
+                    job_id=job_id,
+                    content_hash=content_hash,
+                )
+
+            try:
+                _run_async(ingestion)
+            finally:
+                _schedule_version_gc(source)
 
         logger.info("ingest_job_success", job_id=job_id)
 
@@ -108,22 +252,29 @@ def ingest_file_job(self, job_id: str, file_path: str, source, domain: str, topi
         job_service.update_status(job_id, JobStatus.completed)
 
     except Exception as e:
+        keep_file = True
+        _retry_ingestion(self, job_id, e)
+        keep_file = False
+        rag_service.discard_checkpoints(job_id, source)
         import traceback
         tb_str = "".join(traceback.format_exception(type(e), e, e.__traceback__))
         logger.error("ingest_job_failed", job_id=job_id, error=str(e), traceback=tb_str)
         job_service.fail(job_id, str(e))
         celery_tasks_total.labels("ingest_file_job", "error").inc()
-        documents_ingested_total.labels(source_type="pdf", status="error").inc()
+        documents_ingested_total.labels(
+            source_type="csv" if is_tabular else "pdf", status="error"
+        ).inc()
     finally:
-        if os.path.exists(file_path):
+        if not keep_file and os.path.exists(file_path):
             os.remove(file_path)
 
         task_end = time.perf_counter() - task_start
         celery_task_duration_seconds.labels("ingest_file_job").observe(task_end)
 
 
-@celery_app.task()
-def reindex_document_task(job_id: str, source: str, url: str, domain: str, topic: str):
+@celery_app.task(bind=True)
+@_index_writer
+def reindex_document_task(self, job_id: str, source: str, url: str, domain: str, topic: str):
     job_service = JobService()
 
     """Celery task to re-index a document."""
@@ -141,15 +292,27 @@ def reindex_document_task(job_id: str, source: str, url: str, domain: str, topic
         # 1. Initialize dependencies
         vector_store = get_qdrant_store()
         embed_service = get_hybrid_embeddign_service()
-        ingestion_svc = IngestionService(vector_store=vector_store, embed_service=embed_service)
-
-
-        # 2. Delete old data
-        logger.info("reindex_task_deleting", source=source)
-        vector_store.delete_by_filter({"source": source})
-        job_service.update_progress(job_id, 30, "Deleting old data")
+        catalog = get_versioning_catalog()
+        ingestion_svc = IngestionService(
+            vector_store=vector_store,
+            embed_service=embed_service,
+            catalog=catalog,
+            domain_index=get_domain_index(),
+            summary_index=get_summary_index(),
+        )
 
-        # 3. Ingest new data (wrap async in sync for Celery)
+        # 2. Without versioning the only way to replace a document is delete + ingest
+        if catalog is None:
+            logger.info("reindex_task_deleting", source=source)
+            vector_store.delete_by_filter({"source": source})
+            detector = get_near_duplicate_detector(vector_store)
+            if detector is not None:
+                detector.index.forget_source(source)
+            job_service.update_progress(job_id, 30, "Deleting old data")
+
+        # 3. Ingest new data (wrap async in sync for Celery). With versioning the
+        # new chunks stay hidden until they are all written, then replace the old
+        # version atomically; the old version is garbage-collected in background.
         logger.info("reindex_task_ingesting", url=url)
         job_service.update_progress(job_id, 60, "Ingesting new data")
 
@@ -158,7 +321,10 @@ def reindex_document_task(job_id: str, source: str, url: str, domain: str, topic
                 url=url, source=source, domain=domain, topic=topic
             )
 
-        result = asyncio.run(_do_ingest())
+        try:
+            result = _run_async(_do_ingest())
+        finally:
+            _schedule_version_gc(source)
 
         job_service.update_progress(job_id, 100, "Completed")
         job_service.update_status(job_id, JobStatus.completed)
@@ -179,3 +345,611 @@ def reindex_document_task(job_id: str, source: str, url: str, domain: str, topic
     finally:
         task_end = time.perf_counter() - task_start
         celery_task_duration_seconds.labels("reindex_document_task").observe(task_end)
+
+
+@celery_app.task()
+def gc_source_versions_task(source: str):
+    """Delete the points of retired or abandoned versions of a source."""
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+
+    catalog = get_source_catalog()
+    versions = catalog.retired_versions(source)
+    if not versions:
+        return
+
+    try:
+        vector_store = get_qdrant_store()
+        vector_store.delete_versions(source, versions)
+        detector = get_near_duplicate_detector(vector_store)
+        if detector is not None:
+            detector.index.forget_versions(source, versions)
+        catalog.forget_versions(source, versions)
+
+        logger.info("version_gc_success", source=source, versions=versions)
+        celery_tasks_total.labels("gc_source_versions_task", "success").inc()
+    except Exception as e:
+        celery_tasks_total.labels("gc_source_versions_task", "error").inc()
+        logger.error("version_gc_failed", source=source, error=str(e))
+        raise
+
+
+@celery_app.task()
+def sweep_stale_versions_task():
+    """
+    Abandon versions whose ingestion never activated nor abandoned them
+    (the worker died and no retry picked the job up), then GC their points.
+    """
+    catalog = get_versioning_catalog()
+    if catalog is None:
+        return
+
+    stale = catalog.stale_versions(get_settings().version_in_flight_ttl_seconds)
+    for source, version in stale:
+        catalog.abandon(source, version)
+    for source in {source for source, _ in stale}:
+        gc_source_versions_task.delay(source)
+
+    if stale:
+        logger.warning("stale_versions_swept", versions=len(stale))
+    celery_tasks_total.labels("sweep_stale_versions_task", "success").inc()
+
+
+@celery_app.task()
+def prune_near_duplicate_index_task():
+    """Drop near-duplicate index entries whose points were deleted outside GC and source deletes."""
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+
+    detector = get_near_duplicate_detector(get_qdrant_store())
+    # A rebuild indexes points that only exist in its target collection yet
+    if detector is None or get_write_gate().rebuilding():
+        return
+
+    try:
+        dropped = detector.prune()
+        logger.info("near_dup_prune_success", dropped=dropped)
+        celery_tasks_total.labels("prune_near_duplicate_index_task", "success").inc()
+    except Exception as e:
+        celery_tasks_total.labels("prune_near_duplicate_index_task", "error").inc()
+        logger.error("near_dup_prune_failed", error=str(e))
+        raise
+
+
+@celery_app.task()
+def backfill_domain_index_task():
+    """Add the sources ingested before the domain index existed; enables auto-detection."""
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+
+    domain_index = get_domain_index()
+    if domain_index is None:
+        return
+
+    try:
+        store = get_qdrant_store()
+        added = domain_index.backfill(
+            store.client, store.collection_name, get_source_catalog().hidden_versions()
+        )
+        logger.info("domain_index_backfill_success", added=added)
+        celery_tasks_total.labels("backfill_domain_index_task", "success").inc()
+    except Exception as e:
+        celery_tasks_total.labels("backfill_domain_index_task", "error").inc()
+        logger.error("domain_index_backfill_failed", error=str(e))
+        raise
+
+
+@celery_app.task()
+def backfill_summary_index_task():
+    """Summarize the sources ingested before the summary index existed; enables two-stage search."""
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+
+    summary_index = get_summary_index()
+    if summary_index is None:
+        return
+
+    try:
+        store = get_qdrant_store()
+        summarized = summary_index.backfill(
+            store.client, store.collection_name, get_source_catalog().hidden_versions()
+        )
+        logger.info("summary_index_backfill_success", summarized=summarized)
+        celery_tasks_total.labels("backfill_summary_index_task", "success").inc()
+    except Exception as e:
+        celery_tasks_total.labels("backfill_summary_index_task", "error").inc()
+        logger.error("summary_index_backfill_failed", error=str(e))
+        raise
+
+
+@celery_app.task()
+def drop_collection_task(collection_name: str):
+    """Drop a physical collection that is no longer behind the alias."""
+    from app.infrastructure.storage.qdrant_client import get_qdrant_client
+
+    get_qdrant_client().delete_collection(collection_name)
+    logger.info("collection_dropped", collection=collection_name)
+
+
+def _rebuild_source(
+    ingestion_svc, live_store, target_store, entry: dict, catalog_entry: dict, hidden: list[str]
+) -> str:
+    """
+    Write one source into the rebuild's target collection: re-ingest it from
+    the URL it was ingested from, or copy its visible points when there is
+    none (uploads, repository files) or the URL can no longer be fetched.
+    Returns "reingested" or "copied".
+    """
+    source = entry["source"]
+    version = catalog_entry.get("active_version")
+    if catalog_entry.get("url") and version:
+        try:
+            _run_async(
+                ingestion_svc.ingest_document(
+                    url=catalog_entry["url"],
+                    source=source,
+                    domain=catalog_entry.get("domain", entry["domain"]),
+                    topic=catalog_entry.get("topic", entry["topic"]),
+                    version=version,
+                )
+            )
+            return "reingested"
+        except Exception as e:
+            # One dead URL must not abort the rebuild: keep what is indexed.
+            # Filtering by version too leaves the shared text store alone.
+            logger.warning("rebuild_reingest_failed", source=source, error=str(e))
+            target_store.delete_by_filter({"source": source, "version": version})
+
+    live_store.copy_source_points(source, target_store, hidden)
+    return "copied"
+
+
+@celery_app.task()
+def rebuild_collection_task(job_id: str):
+    """
+    Blue/green rebuild of the whole index.
+
+    Writes every source into a fresh physical collection and then swaps the
+    collection alias in a single atomic operation. URL sources are re-ingested
+    under their current active version; uploaded files (whose originals are
+    gone) and repository files are copied point by point.
+
+    Index writes are held off for the whole rebuild: the running ones are
+    waited for, new ones are re-queued until the alias has been swapped.
+    """
+    from app.infrastructure.storage.qdrant_client import (
+        COLLECTION_NAME,
+        QdrantStore,
+        get_qdrant_store,
+    )
+    from app.api.retrieval_engine.ingestion_service import IngestionService
+    from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+
+    job_service = JobService()
+    catalog = get_source_catalog()
+    live_store = get_qdrant_store()
+    gate = get_write_gate()
+
+    task_start = time.perf_counter()
+    target = f"{COLLECTION_NAME}_{int(time.time())}"
+    logger.info("rebuild_task_started", target=target)
+
+    if not gate.begin_rebuild(job_id):
+        job_service.fail(job_id, f"Rebuild {gate.rebuilding()} is already running")
+        return
+
+    # Re-ingesting one large source can take longer than the lock's TTL
+    with gate.holding_rebuild(job_id):
+        try:
+            job_service.update_status(job_id, JobStatus.running)
+            job_service.update_progress(job_id, 2, "Waiting for running ingestions")
+            if not gate.wait_for_writers(job_id, get_settings().rebuild_drain_timeout_seconds):
+                raise RuntimeError("Running ingestions did not finish, rebuild aborted")
+
+            job_service.update_progress(job_id, 5, f"Creating collection {target}")
+
+            target_store = QdrantStore(
+                client=live_store.client,
+                collection_name=target,
+                text_store=live_store.text_store,
+                alias=COLLECTION_NAME,
+            )
+            target_store.create_collection()
+            ingestion_svc = IngestionService(
+                vector_store=target_store,
+                embed_service=get_hybrid_embeddign_service(),
+                catalog=catalog,
+                domain_index=get_domain_index(),
+                summary_index=get_summary_index(),
+            )
+
+            hidden = catalog.hidden_versions()
+            sources = live_store.list_sources(hidden_versions=hidden)
+
+            outcomes = {"reingested": 0, "copied": 0}
+            for i, entry in enumerate(sources):
+                catalog_entry = catalog.get(entry["source"]) or {}
+                outcome = _rebuild_source(
+                    ingestion_svc, live_store, target_store, entry, catalog_entry, hidden
+                )
+                outcomes[outcome] += 1
+                progress = 5 + int(90 * (i + 1) / max(len(sources), 1))
+                job_service.update_progress(
+                    job_id, progress, f"Rebuilt {i + 1} of {len(sources)} sources"
+                )
+
+            previous = live_store.swap_alias(COLLECTION_NAME, target)
+            for old in previous:
+                drop_collection_task.apply_async(
+                    args=[old], countdown=get_settings().version_gc_delay_seconds
+                )
+
+            job_service.update_progress(job_id, 100, "Completed")
+            job_service.update_status(job_id, JobStatus.completed)
+
+            logger.info("rebuild_task_success", target=target, sources=len(sources), **outcomes)
+            celery_tasks_total.labels("rebuild_collection_task", "success").inc()
+
+        except Exception as e:
+            celery_tasks_total.labels("rebuild_collection_task", "error").inc()
+            import traceback
+            tb_str = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+            logger.error("rebuild_task_failed", target=target, error=str(e), traceback=tb_str)
+            job_service.fail(job_id, str(e))
+            raise
+        finally:
+            gate.end_rebuild(job_id)
+            task_end = time.perf_counter() - task_start
+            celery_task_duration_seconds.labels("rebuild_collection_task").observe(task_end)
+
+
+# =============================================================================
+# Bulk ingestion
+# =============================================================================
+
+
+def dispatch_bulk_ingestion(
+    parent_id: str, items: list[dict], cleanup_dir: str | None = None
+) -> None:
+    """
+    Fan a bulk job out as a chord: batches of documents in parallel, then a
+    callback that closes the parent job. If a batch task crashes anyway, the
+    errback fails the parent job instead of leaving it running forever.
+
+    Each item is {"job_id", "type": "url"|"pdf", "source", "domain", "topic"}
+    plus "url" or "path".
+    """
+    size = get_settings().bulk_batch_size
+    batches = [items[i : i + size] for i in range(0, len(items), size)]
+
+    chord(ingest_bulk_batch_task.s(parent_id, batch) for batch in batches)(
+        finalize_bulk_job_task.s(parent_id, cleanup_dir).on_error(
+            fail_bulk_job_task.s(parent_id, cleanup_dir)
+        )
+    )
+    logger.info("bulk_job_dispatched", job_id=parent_id, documents=len(items), tasks=len(batches))
+
+
+@celery_app.task(bind=True)
+@_index_writer
+def ingest_bulk_batch_task(self, parent_id: str, items: list[dict]) -> list[dict]:
+    """
+    Ingest one batch of a bulk job.
+
+    Documents run concurrently in one event loop and share a coalescing
+    embedder, so their chunks are embedded together. URL documents hold a
+    per-host slot while they are ingested. Failures are recorded on the child
+    job and never raised, so the chord callback always runs.
+    """
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+    from app.api.retrieval_engine.ingestion_service import IngestionService
+    from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+    from app.infrastructure.storage.coalescing_embedder import CoalescingEmbedService
+
+    settings = get_settings()
+    job_service = JobService()
+    task_start = time.perf_counter()
+
+    try:
+        embedder = CoalescingEmbedService(
+            get_hybrid_embeddign_service(),
+            max_batch=settings.embed_coalesce_max_batch,
+            max_wait_ms=settings.embed_coalesce_wait_ms,
+        )
+        ingestion_svc = IngestionService(
+            vector_store=get_qdrant_store(),
+            embed_service=embedder,
+            catalog=get_versioning_catalog(),
+            domain_index=get_domain_index(),
+            summary_index=get_summary_index(),
+        )
+    except Exception as e:
+        # Nothing of the batch can run; its documents fail, the chord goes on
+        logger.error("bulk_batch_setup_failed", job_id=parent_id, error=str(e))
+        celery_tasks_total.labels("ingest_bulk_batch_task", "error").inc()
+        for item in items:
+            job_service.fail(item["job_id"], str(e))
+            if item["type"] == "pdf" and os.path.exists(item["path"]):
+                os.remove(item["path"])
+        return [{"job_id": item["job_id"], "status": "failed", "error": str(e)} for item in items]
+    limiter = HostConcurrencyLimiter(limit=settings.bulk_host_concurrency)
+
+    async def run_item(item: dict) -> dict:
+        job_id = item["job_id"]
+
+        async def tracker(percent, message):
+            job_service.update_progress(job_id, percent, message)
+
+        try:
+            job_service.update_status(job_id, JobStatus.running)
+            if item["type"] == "url":
+                async with limiter.hold(host_of(item["url"])):
+                    result = await ingestion_svc.ingest_document(
+                        url=item["url"],
+                        source=item["source"],
+                        domain=item["domain"],
+                        topic=item["topic"],
+                        progress_callback=tracker,
+                    )
+            else:
+                with open(item["path"], "rb") as f:
+                    upload = UploadFile(file=f, filename=os.path.basename(item["path"]))
+                    result = await ingestion_svc.ingest_pdf_file(
+                        file=upload,
+                        source=item["source"],
+                        domain=item["domain"],
+                        topic=item["topic"],
+                        progress_callback=tracker,
+                        pdf_backend=item.get("pdf_backend"),
+                    )
+
+            job_service.update_progress(job_id, 100, "completed")
+            job_service.update_status(job_id, JobStatus.completed)
+            return {"job_id": job_id, "status": "completed", "chunks": result["chunks_processed"]}
+
+        except Exception as e:
+            logger.warning("bulk_item_failed", job_id=job_id, source=item["source"], error=str(e))
+            documents_ingested_total.labels(source_type=item["type"], status="error").inc()
+            job_service.fail(job_id, str(e))
+            return {"job_id": job_id, "status": "failed", "error": str(e)}
+
+        finally:
+            _schedule_version_gc(item["source"])
+            if item["type"] == "pdf" and os.path.exists(item["path"]):
+                os.remove(item["path"])
+
+    async def run_all() -> list[dict]:
+        return await asyncio.gather(*(run_item(item) for item in items))
+
+    try:
+        job_service.update_status(parent_id, JobStatus.running)
+        results = _run_async(run_all())
+        celery_tasks_total.labels("ingest_bulk_batch_task", "success").inc()
+        return results
+    finally:
+        embedder.close()
+        celery_task_duration_seconds.labels("ingest_bulk_batch_task").observe(
+            time.perf_counter() - task_start
+        )
+
+
+@celery_app.task()
+def finalize_bulk_job_task(results: list[list[dict]], parent_id: str, cleanup_dir: str | None):
+    """Chord callback: close the parent job with the outcome of every document."""
+    job_service = JobService()
+    flat = [r for batch in results for r in batch]
+    failed = sum(1 for r in flat if r["status"] == "failed")
+    completed = len(flat) - failed
+
+    job_service.update_progress(parent_id, 100, f"{completed} completed, {failed} failed")
+    if completed:
+        job_service.update_status(parent_id, JobStatus.completed)
+    else:
+        job_service.fail(parent_id, "All documents failed")
+
+    if cleanup_dir:
+        shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+    logger.info("bulk_job_finished", job_id=parent_id, completed=completed, failed=failed)
+
+
+@celery_app.task()
+def fail_bulk_job_task(request, exc, traceback, parent_id: str, cleanup_dir: str | None):
+    """Chord errback: a batch task crashed, so the callback will never run."""
+    logger.error("bulk_job_crashed", job_id=parent_id, task_id=request.id, error=str(exc))
+    JobService().fail(parent_id, f"Bulk ingestion crashed: {exc}")
+    if cleanup_dir:
+        shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+
+# =============================================================================
+# Site crawling
+# =============================================================================
+
+
+@celery_app.task(bind=True)
+@_index_writer
+def crawl_site_task(self, job_id: str, crawl_data: dict):
+    """
+    Crawl a documentation site and ingest its changed pages.
+
+    Page validators (ETag/Last-Modified) from earlier crawls make the fetches
+    conditional, so a re-crawl of an unchanged site downloads and embeds
+    almost nothing.
+    """
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+    from app.api.retrieval_engine.ingestion_service import IngestionService
+    from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+    from app.infrastructure.storage.coalescing_embedder import CoalescingEmbedService
+    from app.api.extraction.source.crawler_source import CrawlerSource, CrawlStateStore
+
+    settings = get_settings()
+    job_service = JobService()
+    task_start = time.perf_counter()
+    root = crawl_data["url"]
+
+    logger.info("crawl_job_started", job_id=job_id, url=root)
+
+    catalog = get_versioning_catalog()
+    state = CrawlStateStore()
+    if crawl_data.get("recrawl", True):
+        state.register_site(root, crawl_data)
+
+    crawler = CrawlerSource(
+        state=state,
+        concurrency=settings.crawler_concurrency,
+        requests_per_second=settings.crawler_requests_per_second,
+        max_pages=crawl_data.get("max_pages") or settings.crawler_max_pages,
+        user_agent=settings.crawler_user_agent,
+        # Pages dropped from the index must be fetched in full again
+        is_indexed=(lambda url: catalog.active_version(url) is not None) if catalog else None,
+    )
+    embedder = CoalescingEmbedService(
+        get_hybrid_embeddign_service(),
+        max_batch=settings.embed_coalesce_max_batch,
+        max_wait_ms=settings.embed_coalesce_wait_ms,
+    )
+    ingestion_svc = IngestionService(
+        vector_store=get_qdrant_store(),
+        embed_service=embedder,
+        catalog=catalog,
+        domain_index=get_domain_index(),
+        summary_index=get_summary_index(),
+    )
+
+    async def tracker(percent, message):
+        job_service.update_progress(job_id, percent, message)
+
+    try:
+        job_service.update_status(job_id, JobStatus.running)
+        job_service.update_progress(job_id, 5, "Starting crawl")
+
+        result = _run_async(
+            ingestion_svc.ingest_site(
+                crawler=crawler,
+                root=root,
+                domain=crawl_data["domain"],
+                topic=crawl_data["topic"],
+                path_prefix=crawl_data.get("path_prefix"),
+                concurrency=settings.crawler_ingest_concurrency,
+                progress_callback=tracker,
+            )
+        )
+        for source in result.pop("ingested"):
+            _schedule_version_gc(source)
+
+        pages = result["pages"]
+        job_service.update_progress(
+            job_id, 100, f"{pages['changed']} changed, {pages['unchanged']} unchanged, {pages['failed']} failed"
+        )
+        job_service.update_status(job_id, JobStatus.completed)
+
+        logger.info("crawl_job_success", job_id=job_id, url=root, **result)
+        celery_tasks_total.labels("crawl_site_task", "success").inc()
+
+    except Exception as e:
+        celery_tasks_total.labels("crawl_site_task", "error").inc()
+        logger.error("crawl_job_failed", job_id=job_id, url=root, error=str(e))
+        job_service.fail(job_id, str(e))
+        raise
+    finally:
+        embedder.close()
+        celery_task_duration_seconds.labels("crawl_site_task").observe(
+            time.perf_counter() - task_start
+        )
+
+
+@celery_app.task(bind=True)
+@_index_writer
+def ingest_repository_task(self, job_id: str, repo_data: dict):
+    """
+    Ingest the documentation of a repository from one archive download.
+
+    All files share one embedder, so their chunks are embedded in coalesced
+    batches; files whose blob hash did not change since the last run are
+    skipped.
+    """
+    from app.infrastructure.storage.qdrant_client import get_qdrant_store
+    from app.api.retrieval_engine.ingestion_service import IngestionService
+    from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+    from app.infrastructure.storage.coalescing_embedder import CoalescingEmbedService
+    from app.api.extraction.source.repository_source import (
+        RepositorySource,
+        resolve_repository,
+    )
+
+    settings = get_settings()
+    job_service = JobService()
+    task_start = time.perf_counter()
+
+    logger.info("repo_job_started", job_id=job_id, repo=repo_data["repo"], ref=repo_data["ref"])
+
+    catalog = get_versioning_catalog()
+    repository = RepositorySource(
+        max_archive_bytes=settings.repo_archive_max_bytes,
+        max_file_bytes=settings.repo_max_file_bytes,
+        is_indexed=(lambda source: catalog.active_version(source) is not None) if catalog else None,
+    )
+    include = repo_data.get("include") or [
+        g.strip() for g in settings.repo_include.split(",") if g.strip()
+    ]
+    embedder = CoalescingEmbedService(
+        get_hybrid_embeddign_service(),
+        max_batch=settings.embed_coalesce_max_batch,
+        max_wait_ms=settings.embed_coalesce_wait_ms,
+    )
+    ingestion_svc = IngestionService(
+        vector_store=get_qdrant_store(),
+        embed_service=embedder,
+        catalog=catalog,
+        domain_index=get_domain_index(),
+        summary_index=get_summary_index(),
+    )
+
+    async def tracker(percent, message):
+        job_service.update_progress(job_id, percent, message)
+
+    try:
+        job_service.update_status(job_id, JobStatus.running)
+        job_service.update_progress(job_id, 5, "Downloading repository archive")
+
+        result = _run_async(
+            ingestion_svc.ingest_repository(
+                repository=repository,
+                repo=resolve_repository(repo_data["repo"], repo_data["ref"]),
+                include=include,
+                domain=repo_data["domain"],
+                topic=repo_data["topic"],
+                concurrency=settings.crawler_ingest_concurrency,
+                progress_callback=tracker,
+            )
+        )
+        for source in result.pop("ingested"):
+            _schedule_version_gc(source)
+
+        files = result["files"]
+        job_service.update_progress(
+            job_id, 100, f"{files['changed']} changed, {files['unchanged']} unchanged, {files['failed']} failed"
+        )
+        job_service.update_status(job_id, JobStatus.completed)
+
+        logger.info("repo_job_success", job_id=job_id, repo=repo_data["repo"], **result)
+        celery_tasks_total.labels("ingest_repository_task", "success").inc()
+
+    except Exception as e:
+        celery_tasks_total.labels("ingest_repository_task", "error").inc()
+        logger.error("repo_job_failed", job_id=job_id, repo=repo_data["repo"], error=str(e))
+        job_service.fail(job_id, str(e))
+        raise
+    finally:
+        embedder.close()
+        celery_task_duration_seconds.labels("ingest_repository_task").observe(
+            time.perf_counter() - task_start
+        )
+
+
+@celery_app.task()
+def recrawl_sites_task():
+    """Beat entry point: queue a crawl of every registered site."""
+    from app.api.extraction.source.crawler_source import CrawlStateStore
+
+    job_service = JobService()
+    for root, crawl_data in CrawlStateStore().list_sites().items():
+        crawl_site_task.delay(job_service.create(), crawl_data)
+        logger.info("recrawl_queued", url=root)
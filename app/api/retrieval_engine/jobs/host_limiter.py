@@ -0,0 +1,110 @@
+"""
+Semáforo distribuido por host, en Redis, para limitar la concurrencia de
+ingestiones contra un mismo sitio entre todos los workers de Celery.
+
+Cada slot es un token en un sorted set con el timestamp de su último latido.
+Mientras el holder está vivo renueva el token cada tercio del lease, así una
+ingestión larga no pierde su slot; los tokens que pasan un lease sin latido
+se consideran perdidos (worker caído) y se liberan solos.
+
+Keys:
+    host_slots:{host}   -> zset token -> timestamp del último latido
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import structlog
+from redis import Redis
+
+from ....core.redis import get_redis
+
+
+log = structlog.get_logger()
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostConcurrencyLimiter:
+    """At most `limit` concurrent holders per host across all processes."""
+
+    PREFIX = "host_slots"
+
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        limit: int = 4,
+        lease_seconds: float = 900,
+        poll_interval: float = 0.5,
+    ) -> None:
+        self._redis = redis or get_redis()
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+    def _key(self, host: str) -> str:
+        return f"{self.PREFIX}:{host}"
+
+    def try_acquire(self, host: str) -> str | None:
+        """Take a slot for `host`; returns its token, or None if the host is saturated."""
+        key = self._key(host)
+        now = time.time()
+        token = uuid4().hex
+
+        # Reclaim slots of holders that died without releasing
+        self._redis.zremrangebyscore(key, 0, now - self.lease_seconds)
+
+        def _acquire(pipe) -> str | None:
+            if pipe.zcard(key) >= self.limit:
+                return None
+            pipe.multi()
+            pipe.zadd(key, {token: now})
+            pipe.pexpire(key, int(self.lease_seconds * 1000))
+            return token
+
+        return self._redis.transaction(_acquire, key, value_from_callable=True)
+
+    def renew(self, host: str, token: str) -> bool:
+        """Extend the lease of a held slot; False if it was already reclaimed."""
+        key = self._key(host)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zadd(key, {token: time.time()}, xx=True, ch=True)
+        pipe.pexpire(key, int(self.lease_seconds * 1000))
+        renewed, _ = pipe.execute()
+        return bool(renewed)
+
+    def release(self, host: str, token: str) -> None:
+        self._redis.zrem(self._key(host), token)
+
+    async def _keep_alive(self, host: str, token: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await asyncio.to_thread(self.renew, host, token):
+                    log.warning("host_slot_lost", host=host)
+            except Exception as e:
+                log.warning("host_slot_renew_failed", host=host, error=str(e))
+
+    @asynccontextmanager
+    async def hold(self, host: str):
+        """
+        Wait for a free slot on `host` and hold it for the duration of the
+        block, renewing its lease however long the block runs.
+        """
+        token = await asyncio.to_thread(self.try_acquire, host)
+        while token is None:
+            await asyncio.sleep(self.poll_interval)
+            token = await asyncio.to_thread(self.try_acquire, host)
+
+        heartbeat = asyncio.create_task(self._keep_alive(host, token))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            await asyncio.to_thread(self.release, host, token)
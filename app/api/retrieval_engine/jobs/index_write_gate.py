@@ -0,0 +1,170 @@
+"""
+Exclusión entre escrituras al índice y la reconstrucción de la colección.
+
+El rebuild copia cada source a una colección nueva y al final mueve el alias;
+lo que se escriba en la colección vieja mientras tanto se perdería con ella.
+Por eso el rebuild toma un lock y espera a que terminen los writers en curso
+antes de copiar, y las tareas que escriben al índice se registran como
+writers y se re-encolan mientras el lock esté tomado.
+
+El writer se registra antes de mirar el lock y el rebuild toma el lock antes
+de mirar los writers: con ese orden ninguno de los dos puede pasar sin ver
+al otro.
+
+Mientras corren, el rebuild y cada writer renuevan su entrada desde un thread
+de latido cada tercio de su TTL, así ni un source lento de re-ingestar libera
+el lock ni un writer largo deja de contar. Un lock o un writer sin latido
+durante su TTL se considera caído.
+
+Keys:
+    ingest:rebuild_lock  -> job_id del rebuild en curso (con TTL, renovado por latido)
+    ingest:writers       -> zset task_id -> timestamp del último latido
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import structlog
+from redis import Redis
+
+from ....core.redis import decode, get_redis
+from ....core.settings import get_settings
+
+
+log = structlog.get_logger()
+
+# A dead rebuild frees the lock this long after its last heartbeat
+_LOCK_TTL_SECONDS = 900
+
+
+class IndexWriteGate:
+    """Rebuild lock plus the registry of running index writers it waits for."""
+
+    PREFIX = "ingest"
+
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        lease_seconds: float = 12 * 3600,
+        poll_interval: float = 2.0,
+        lock_ttl_seconds: float = _LOCK_TTL_SECONDS,
+    ) -> None:
+        self._redis = redis or get_redis()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.lock_ttl_seconds = lock_ttl_seconds
+
+    @property
+    def _lock_key(self) -> str:
+        return f"{self.PREFIX}:rebuild_lock"
+
+    @property
+    def _writers_key(self) -> str:
+        return f"{self.PREFIX}:writers"
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    def enter(self, task_id: str) -> bool:
+        """Register a writer; False (and not registered) while a rebuild runs."""
+        self._redis.zadd(self._writers_key, {task_id: time.time()})
+        if self.rebuilding() is None:
+            return True
+        self.leave(task_id)
+        return False
+
+    def leave(self, task_id: str) -> None:
+        self._redis.zrem(self._writers_key, task_id)
+
+    def touch(self, task_id: str) -> None:
+        """Mark a registered writer as still running."""
+        self._redis.zadd(self._writers_key, {task_id: time.time()}, xx=True)
+
+    @contextmanager
+    def writing(self, task_id: str) -> Iterator[None]:
+        """Keep a registered writer alive for the duration of the block."""
+        with self._heartbeat(lambda: self.touch(task_id), self.lease_seconds / 3):
+            yield
+
+    def active_writers(self) -> int:
+        # Reclaim entries of writers that died without leaving
+        self._redis.zremrangebyscore(self._writers_key, 0, time.time() - self.lease_seconds)
+        return self._redis.zcard(self._writers_key)
+
+    # ------------------------------------------------------------------
+    # Rebuild
+    # ------------------------------------------------------------------
+
+    def rebuilding(self) -> str | None:
+        """Job id of the rebuild in progress, if any."""
+        value = self._redis.get(self._lock_key)
+        return decode(value) if value else None
+
+    def begin_rebuild(self, job_id: str) -> bool:
+        """Take the rebuild lock; False if another rebuild holds it."""
+        return bool(
+            self._redis.set(self._lock_key, job_id, nx=True, px=int(self.lock_ttl_seconds * 1000))
+        )
+
+    def renew(self, job_id: str) -> None:
+        if self.rebuilding() == job_id:
+            self._redis.pexpire(self._lock_key, int(self.lock_ttl_seconds * 1000))
+
+    @contextmanager
+    def holding_rebuild(self, job_id: str) -> Iterator[None]:
+        """Keep the rebuild lock of `job_id` from expiring for the duration of the block."""
+        with self._heartbeat(lambda: self.renew(job_id), self.lock_ttl_seconds / 3):
+            yield
+
+    def wait_for_writers(self, job_id: str, timeout: float) -> bool:
+        """Block until no writer is running; False if they did not drain within `timeout`."""
+        deadline = time.monotonic() + timeout
+        while (writers := self.active_writers()) > 0:
+            if time.monotonic() >= deadline:
+                log.warning("rebuild_writers_not_drained", job_id=job_id, writers=writers)
+                return False
+            self.renew(job_id)
+            time.sleep(self.poll_interval)
+        return True
+
+    def end_rebuild(self, job_id: str) -> None:
+        if self.rebuilding() == job_id:
+            self._redis.delete(self._lock_key)
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    @contextmanager
+    def _heartbeat(beat: Callable[[], None], interval: float) -> Iterator[None]:
+        """Call `beat` every `interval` seconds in a thread until the block exits."""
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    beat()
+                except Exception as e:
+                    log.warning("index_write_gate_heartbeat_failed", error=str(e))
+
+        thread = threading.Thread(target=run, name="index-write-gate", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+
+# Module-level singleton
+_write_gate: IndexWriteGate | None = None
+
+
+def get_write_gate() -> IndexWriteGate:
+    """Get or create the index write gate singleton."""
+    global _write_gate
+    if _write_gate is None:
+        _write_gate = IndexWriteGate(lease_seconds=get_settings().version_in_flight_ttl_seconds)
+    return _write_gate
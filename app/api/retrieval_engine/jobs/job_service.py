@@ -1,3 +1,4 @@
+from collections import Counter
 from datetime import datetime
 from uuid import uuid4
 
@@ -13,15 +14,33 @@ class JobService:
             raise ValueError(f"Job {job_id} not found")
 
         state = JobState.model_validate_json(json_data_from_redis)
+        if state.children:
+            self._aggregate(state)
         return state
 
+    def _aggregate(self, state: JobState) -> None:
+        """Fill a parent job's summary and progress from its children."""
+        raw_children = redis_client.mget([f"job:{c}" for c in state.children])
+        children = [JobState.model_validate_json(raw) for raw in raw_children if raw]
+
+        counts = Counter(child.status for child in children)
+        state.summary = {"total": len(state.children)}
+        state.summary.update({status.value: counts[status] for status in JobStatus})
+
+        if state.status not in (JobStatus.completed, JobStatus.failed):
+            done = sum(
+                100 if child.status in (JobStatus.completed, JobStatus.failed) else child.progress or 0
+                for child in children
+            )
+            state.progress = done // max(len(state.children), 1)
+
     def _set_state(self, job_id: str, state: str):
         redis_client.set(f"job:{job_id}", value=state, ex=48200)
 
     def generate_id(self) -> str:
         return str(uuid4())
 
-    def create(self) -> str:
+    def create(self, children: list[str] | None = None) -> str:
         job_id = self.generate_id()
         state = JobState(
             job_id=job_id,
@@ -30,6 +49,7 @@ class JobService:
             created_at=datetime.now(),
             updated_at=datetime.now(),
             step="queued",
+            children=children or [],
         )
         self._set_state(job_id, state.model_dump_json())
         return job_id
@@ -22,3 +22,6 @@ class JobState(BaseModel):
     error: str | None = None
     created_at: datetime
     updated_at: datetime
+    # Bulk jobs: child job ids and per-status counts aggregated on read
+    children: list[str] = []
+    summary: dict[str, int] | None = None
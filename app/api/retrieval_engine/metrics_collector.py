@@ -10,6 +10,10 @@ from app.infrastructure.metrics import (
     rag_vector_search_duration_seconds,
     rag_pipeline_duration_seconds,
     rag_chunks_retrieved,
+    rag_domain_autofilter_total,
+    rag_domain_autofilter_search_seconds,
+    rag_source_preselection_total,
+    rag_source_preselection_seconds,
     llm_total_cost_dollars,
     llm_tokens_used_total,
 )
@@ -40,6 +44,31 @@ class MetricsCollector:
             domain=domain or "all", topic=topic or "all"
         ).observe(chunks_found)
 
+    def log_domain_autofilter(
+        self,
+        outcome: str,
+        domain: str | None,
+        duration_seconds: float,
+    ) -> None:
+        """Log the outcome and search latency of domain auto-detection."""
+        rag_domain_autofilter_total.labels(outcome=outcome).inc()
+        rag_domain_autofilter_search_seconds.labels(
+            scope="auto" if outcome == "applied" else "unfiltered"
+        ).observe(duration_seconds)
+
+        if outcome != "skipped":
+            self.logger.info("domain_autofilter", outcome=outcome, domain=domain)
+
+    def log_source_preselection(
+        self, outcome: str, sources: int, duration_seconds: float
+    ) -> None:
+        """Log the outcome and latency of the two-stage source selection."""
+        rag_source_preselection_total.labels(outcome=outcome).inc()
+        rag_source_preselection_seconds.observe(duration_seconds)
+
+        if outcome != "applied":
+            self.logger.info("source_preselection", outcome=outcome, sources=sources)
+
     def log_pipeline_duration(
         self,
         operation: str,
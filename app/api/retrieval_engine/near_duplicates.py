@@ -0,0 +1,349 @@
+"""
+Detección de chunks casi duplicados al ingestar (MinHash + LSH).
+
+Los ids determinísticos hashean `texto + source`, así que el mismo boilerplate
+(licencias, navegación repetida, ediciones solapadas de un libro) se embebe
+otra vez por cada source. Cada chunk nuevo se resume en una firma MinHash de
+sus shingles de palabras; un índice LSH por bandas, persistido en Redis junto
+a la colección, encuentra en O(bandas) los chunks ya indexados que se le
+parecen, y la similitud estimada por las firmas confirma el duplicado.
+
+Un duplicado no se embebe: en modo "alias" se escribe su punto con los
+vectores del chunk canónico y en modo "skip" no se escribe. Solo los chunks
+canónicos (los que se embebieron) entran al índice.
+
+"alias" ahorra el forward del modelo, no espacio: sigue habiendo un punto en
+Qdrant por chunk y por source, así filtros, versiones y borrados no cambian.
+"skip" solo se aplica a la ingesta sin versionado; una versión necesita todos
+sus puntos (el manifest los direcciona por id y el catálogo la publica entera),
+así que ahí los duplicados se escriben como alias.
+
+Las entradas se borran junto con los puntos que describen: el GC de versiones
+y el borrado de un source llaman a `forget_versions` / `forget_source`. Un
+candidato cuyo punto ya no existe se descarta al encontrarlo, y el barrido
+periódico (`prune`) descarta los que se borraron por otros caminos.
+
+El namespace es el alias de la colección, no la colección física: el rebuild
+escribe en una colección nueva con los mismos point ids, y después del cambio
+de alias las entradas siguen valiendo.
+
+Keys:
+    lsh:{alias}:b{band}:{hash}   -> set de point ids con esa banda
+    lsh:{alias}:sig              -> hash point id -> firma MinHash (uint32)
+    lsh:{alias}:src              -> hash point id -> source que lo escribió
+    lsh:{alias}:owned:{source}   -> hash point id -> versión que lo escribió
+"""
+
+import hashlib
+import re
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from redis import Redis
+
+from ...api.extraction.schema import ChunkWithMetadata
+from ...api.retrieval_engine.ingestion_pipeline import chunk_payload
+from ...api.retrieval_engine.source_catalog import LEGACY_VERSION
+from ...core.redis import decode, get_redis
+from ...core.settings import get_settings
+from ...infrastructure.storage.interfaces import VectorStoreInterface
+
+_WORD = re.compile(r"\w+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+class MinHasher:
+    """MinHash over word shingles with multiply-shift hashing, vectorized with numpy."""
+
+    def __init__(self, num_perm: int = 128, shingle: int = 3, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        # odd 64-bit multipliers: (a * x + b) >> 32 is a universal family
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.shingle = shingle
+
+    def _shingles(self, text: str) -> np.ndarray:
+        words = np.fromiter(
+            (zlib.crc32(w.encode()) for w in _WORD.findall(text.lower())), dtype=np.uint64
+        )
+        if len(words) < self.shingle:
+            return words[:0]
+        # combine the word hashes of every window into one 32-bit value
+        h = np.zeros(len(words) - self.shingle + 1, dtype=np.uint64)
+        for k in range(self.shingle):
+            h = h * np.uint64(1_000_003) + words[k : len(words) - self.shingle + 1 + k]
+        return np.unique(h & _MASK32)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """uint32 signature, or None when the text has no shingle."""
+        x = self._shingles(text)
+        if not len(x):
+            return None
+        with np.errstate(over="ignore"):
+            hashed = (np.outer(self._a, x) + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard similarity estimated from two signatures."""
+    return float(np.mean(a == b))
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures, in Redis."""
+
+    PREFIX = "lsh"
+
+    def __init__(self, namespace: str, bands: int, rows: int, redis: Redis | None = None) -> None:
+        self._redis = redis or get_redis()
+        self.namespace = namespace
+        self.bands = bands
+        self.rows = rows
+
+    def _key(self, suffix: str) -> str:
+        return f"{self.PREFIX}:{self.namespace}:{suffix}"
+
+    def _band_keys(self, signature: np.ndarray) -> list[str]:
+        return [
+            self._key(
+                f"b{i}:"
+                + hashlib.blake2b(
+                    signature[i * self.rows : (i + 1) * self.rows].tobytes(), digest_size=8
+                ).hexdigest()
+            )
+            for i in range(self.bands)
+        ]
+
+    def candidates(self, signatures: list[np.ndarray]) -> list[set[str]]:
+        """Point ids sharing at least one band with each signature (one round trip)."""
+        pipe = self._redis.pipeline(transaction=False)
+        for signature in signatures:
+            for key in self._band_keys(signature):
+                pipe.smembers(key)
+        members = pipe.execute()
+
+        result = []
+        for i in range(len(signatures)):
+            ids: set[str] = set()
+            for band in members[i * self.bands : (i + 1) * self.bands]:
+                ids.update(map(decode, band))
+            result.append(ids)
+        return result
+
+    def entries(self, point_ids: list[str]) -> dict[str, tuple[np.ndarray, str]]:
+        """(signature, source) of the indexed points among `point_ids`."""
+        if not point_ids:
+            return {}
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hmget(self._key("sig"), point_ids)
+        pipe.hmget(self._key("src"), point_ids)
+        signatures, sources = pipe.execute()
+        return {
+            pid: (
+                np.frombuffer(sig, dtype=np.uint32),
+                decode(src or ""),
+            )
+            for pid, sig, src in zip(point_ids, signatures, sources)
+            if sig is not None
+        }
+
+    def add(self, entries: list[tuple[str, np.ndarray, str]], version: str = LEGACY_VERSION) -> None:
+        """Index (point id, signature, source) entries written under `version`."""
+        if not entries:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for point_id, signature, source in entries:
+            for key in self._band_keys(signature):
+                pipe.sadd(key, point_id)
+            pipe.hset(self._key("sig"), point_id, signature.tobytes())
+            pipe.hset(self._key("src"), point_id, source)
+            pipe.hset(self._key(f"owned:{source}"), point_id, version)
+        pipe.execute()
+
+    def forget(self, point_ids: list[str]) -> None:
+        """Drop points that no longer exist; their band entries go with them."""
+        entries = self.entries(point_ids)
+        if not entries:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for point_id, (signature, source) in entries.items():
+            for key in self._band_keys(signature):
+                pipe.srem(key, point_id)
+            pipe.hdel(self._key("sig"), point_id)
+            pipe.hdel(self._key("src"), point_id)
+            pipe.hdel(self._key(f"owned:{source}"), point_id)
+        pipe.execute()
+
+    def forget_versions(self, source: str, versions: list[str]) -> None:
+        """Drop the points a source indexed under `versions` (version GC)."""
+        owned = self._redis.hgetall(self._key(f"owned:{source}"))
+        wanted = set(versions)
+        self.forget(
+            sorted(
+                decode(pid) for pid, version in owned.items() if decode(version) in wanted
+            )
+        )
+
+    def forget_source(self, source: str) -> None:
+        """Drop every point of a deleted source."""
+        owned = self._key(f"owned:{source}")
+        self.forget(sorted(decode(pid) for pid in self._redis.hkeys(owned)))
+        self._redis.delete(owned)
+
+    def prune(self, existing: Callable[[list[str]], set[str]], batch_size: int = 500) -> int:
+        """
+        Drop the entries whose point is gone, whatever deleted it; `existing`
+        returns which of the given ids still exist. Returns the entries dropped.
+        """
+        dropped = 0
+        batch: list[str] = []
+        for point_id in self._redis.hscan_iter(self._key("src"), count=batch_size):
+            batch.append(decode(point_id[0]))
+            if len(batch) >= batch_size:
+                dropped += self._prune_batch(batch, existing)
+                batch = []
+        if batch:
+            dropped += self._prune_batch(batch, existing)
+        return dropped
+
+    def _prune_batch(self, point_ids: list[str], existing: Callable[[list[str]], set[str]]) -> int:
+        alive = existing(point_ids)
+        missing = [pid for pid in point_ids if pid not in alive]
+        self.forget(missing)
+        return len(missing)
+
+
+@dataclass
+class DuplicateStats:
+    aliased: int = 0
+    skipped: int = 0
+
+    def as_dict(self) -> dict:
+        return {"aliased": self.aliased, "skipped": self.skipped}
+
+
+class NearDuplicateDetector:
+    def __init__(
+        self,
+        vector_store: VectorStoreInterface,
+        index: LSHIndex,
+        hasher: MinHasher,
+        threshold: float = 0.9,
+        skip: bool = False,
+    ) -> None:
+        self.vector_store = vector_store
+        self.index = index
+        self.hasher = hasher
+        self.threshold = threshold
+        self.skip = skip
+
+    def resolve(
+        self,
+        news: list[tuple[str, ChunkWithMetadata, int]],
+        source: str,
+        base_payload: dict,
+        stats: DuplicateStats,
+        allow_skip: bool = True,
+    ) -> tuple[list, list, list]:
+        """
+        Split chunks that need an embedding into (alias points, still new, skipped).
+
+        Only chunks of other sources count as duplicates.
+        Chunks that are not duplicates are indexed as canonical right away, so
+        a later batch can match them once they are written. A candidate whose
+        point is gone (deleted source) is dropped from the index and the chunk
+        is embedded as usual.
+        """
+        signed = [(item, self.hasher.signature(item[1].text)) for item in news]
+        with_sig = [(item, sig) for item, sig in signed if sig is not None]
+        remaining = [item for item, sig in signed if sig is None]
+
+        # position in with_sig -> best matching point id
+        best: dict[int, str] = {}
+        if with_sig:
+            candidates = self.index.candidates([sig for _, sig in with_sig])
+            known = self.index.entries(sorted(set().union(*candidates)))
+            for pos, ((item, sig), ids) in enumerate(zip(with_sig, candidates)):
+                # Only other sources: an edited chunk of this same source must
+                # get its own embedding, not the one of its previous text
+                scored = [
+                    (similarity(sig, known[pid][0]), pid)
+                    for pid in ids
+                    if pid in known and known[pid][1] != source
+                ]
+                match = max(scored, default=None)
+                if match and match[0] >= self.threshold:
+                    best[pos] = match[1]
+
+        canonical = {}
+        if best:
+            canonical = {
+                str(p.id): p for p in self.vector_store.retrieve(sorted(set(best.values())))
+            }
+        stale = {pid for pid in best.values() if pid not in canonical}
+        if stale:
+            self.index.forget(sorted(stale))
+
+        aliased, skipped, new_entries = [], [], []
+        skip = self.skip and allow_skip
+        for pos, (item, sig) in enumerate(with_sig):
+            h_id, chunk, index = item
+            point = canonical.get(best.get(pos))
+            if point is None:
+                remaining.append(item)
+                new_entries.append((h_id, sig, source))
+                continue
+
+            if skip:
+                stats.skipped += 1
+                skipped.append(item)
+                continue
+            stats.aliased += 1
+            aliased.append(
+                self.vector_store.create_point(
+                    hash_id=h_id,
+                    vector=point.vector,
+                    payload={
+                        **chunk_payload(base_payload, chunk, index),
+                        "duplicate_of": str(point.id),
+                    },
+                )
+            )
+
+        self.index.add(new_entries, base_payload.get("version") or LEGACY_VERSION)
+        # keep the pipeline's order
+        remaining.sort(key=lambda item: item[2])
+        return aliased, remaining, skipped
+
+    def prune(self) -> int:
+        """Drop the index entries whose point no longer exists in the store."""
+        return self.index.prune(self.vector_store.existing_ids)
+
+
+@lru_cache
+def _hasher(num_perm: int, shingle: int) -> MinHasher:
+    return MinHasher(num_perm=num_perm, shingle=shingle)
+
+
+def get_near_duplicate_detector(vector_store: VectorStoreInterface) -> NearDuplicateDetector | None:
+    """Detector for the store's collection alias from settings; None when near_dup_mode is 'off'."""
+    settings = get_settings()
+    if settings.near_dup_mode == "off":
+        return None
+    bands = settings.near_dup_bands
+    return NearDuplicateDetector(
+        vector_store=vector_store,
+        index=LSHIndex(
+            namespace=getattr(vector_store, "alias", None)
+            or getattr(vector_store, "collection_name", "documents"),
+            bands=bands,
+            rows=settings.near_dup_num_perm // bands,
+        ),
+        hasher=_hasher(settings.near_dup_num_perm, settings.near_dup_shingle),
+        threshold=settings.near_dup_threshold,
+        skip=settings.near_dup_mode == "skip",
+    )
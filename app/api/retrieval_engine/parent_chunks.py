@@ -0,0 +1,108 @@
+"""
+Índice padre/hijo: se embeben ventanas chicas, se devuelven secciones enteras.
+
+Con chunking_mode="parent_child" cada chunk es una ventana de pocos tokens que
+lleva el texto de su padre (la sección del PDF o el bloque de un heading de
+Markdown). Al ingestar, cada padre se guarda una vez como un punto sin
+vectores en la misma colección, con el mismo source/version/ingested_at que
+sus hijas: la búsqueda no lo ve, pero borrados, versiones, GC y el text store
+lo tratan igual que a cualquier chunk del source. Las hijas guardan
+`parent_id` en el payload.
+
+Al consultar se buscan hijas, se agrupan por padre conservando la mejor hija
+de cada grupo, y los padres reemplazan el texto de esos hits antes del rerank:
+el contexto del LLM es coherente y el reranker ve pocos candidatos.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+from ...api.extraction.schema import ChunkWithMetadata
+from ...api.retrieval_engine.chunk_manifest import parent_id
+from ...api.retrieval_engine.ingestion_pipeline import aiter_chunks
+from ...infrastructure.storage.interfaces import VectorStoreInterface
+
+
+async def write_parents(
+    chunks,
+    vector_store: VectorStoreInterface,
+    base_payload: dict,
+    batch_size: int = 32,
+) -> AsyncIterator[ChunkWithMetadata]:
+    """
+    Pass the chunk stream through, writing each child's parent point once.
+
+    Consecutive windows share their parent, so only a change of parent
+    creates a point. Parent points carry the base payload, which keeps them in
+    the same version and ingestion run as their children.
+    """
+    pending: list = []
+    last_parent = None
+    ordinal = 0
+
+    async def flush():
+        if pending:
+            await asyncio.to_thread(vector_store.insert_vector, list(pending))
+            pending.clear()
+
+    async for chunk in aiter_chunks(chunks):
+        if chunk.parent is not None and chunk.parent is not last_parent:
+            last_parent = chunk.parent
+            pending.append(
+                vector_store.create_point(
+                    hash_id=parent_id(
+                        chunk.parent, base_payload["source"], base_payload.get("version")
+                    ),
+                    vector={},
+                    payload={
+                        **base_payload,
+                        "text": chunk.parent,
+                        "section": chunk.section,
+                        "parent_index": ordinal,
+                        "kind": "parent",
+                    },
+                )
+            )
+            ordinal += 1
+            if len(pending) >= batch_size:
+                await flush()
+        yield chunk
+    await flush()
+
+
+def group_by_parent(
+    hits: list, fetch_parents: Callable[[list[str]], dict[str, dict]], limit: int
+) -> list:
+    """
+    Collapse child hits into their parents, best child first.
+
+    Keeps the `limit` best groups. Each kept hit is the best child of its
+    group with the parent's text in payload["text"]; the window that matched
+    stays in payload["child_text"]. Hits without a parent (other chunking
+    modes, other collections) are groups of their own, and children whose
+    parent is missing are returned as they are.
+    """
+    groups: dict = {}
+    for hit in hits:
+        key = hit.payload.get("parent_id") or ("point", hit.id)
+        if key in groups:
+            groups[key][1] += 1
+        elif len(groups) < limit:
+            groups[key] = [hit, 1]
+
+    parent_ids = [key for key in groups if isinstance(key, str)]
+    parents = fetch_parents(parent_ids) if parent_ids else {}
+
+    result = []
+    for key, (hit, matched) in groups.items():
+        parent = parents.get(key) if isinstance(key, str) else None
+        if parent is not None:
+            hit.payload = {
+                **hit.payload,
+                "text": parent.get("text", ""),
+                "section": parent.get("section"),
+                "child_text": hit.payload.get("text", ""),
+                "matched_children": matched,
+            }
+        result.append(hit)
+    return result
@@ -15,6 +15,12 @@ from app.api.retrieval_engine.schemas import Citation, LLMAnswer, Metadata, Quer
 from app.api.retrieval_engine.prompt import PROMPT_TEMPLATE, PROMPT_TEMPLATE_CHAT
 from app.api.retrieval_engine.reranker import Reranker
 from app.api.retrieval_engine.metrics_collector import MetricsCollector
+from app.api.retrieval_engine.source_catalog import SourceCatalog
+from app.api.retrieval_engine.federated_retriever import FederatedRetriever
+from app.api.retrieval_engine.domain_index import DomainCentroidIndex
+from app.api.retrieval_engine.parent_chunks import group_by_parent
+from app.api.retrieval_engine.summary_index import SourceSummaryIndex
+from app.core.settings import get_settings
 from app.infrastructure.storage.interfaces import FilterContext, VectorStoreInterface
 from app.infrastructure.storage.hybrid_ai import HybridEmbeddingService
 from app.application.llm.client import LLMClient
@@ -32,14 +38,50 @@ class QueryService:
         embed_service: HybridEmbeddingService,
         reranker: Reranker,
         metrics: MetricsCollector,
+        catalog: SourceCatalog | None = None,
+        federated: FederatedRetriever | None = None,
+        domain_index: DomainCentroidIndex | None = None,
+        summary_index: SourceSummaryIndex | None = None,
     ) -> None:
         self.llm_client = llm_client
         self.vector_store = vector_store
         self.embed_service = embed_service
         self.reranker = reranker
         self.metrics = metrics
+        self.catalog = catalog
+        self.federated = federated
+        self.domain_index = domain_index
+        self.summary_index = summary_index
+        self.settings = get_settings()
         self.logger = structlog.get_logger()
 
+    def _restrict_sources(self, dense, context: FilterContext) -> None:
+        """
+        Two-stage retrieval: keep the sources whose summary vector is closest.
+
+        Any failure, or a summary index that does not cover every source yet
+        (not backfilled), leaves the search unrestricted.
+        """
+        context.sources = []
+        if self.summary_index is None or self.settings.retrieval_mode != "two_stage":
+            return
+
+        start = time.perf_counter()
+        try:
+            if not self.summary_index.is_complete(self.catalog):
+                outcome = "incomplete"
+            else:
+                context.sources = self.summary_index.top_sources(
+                    dense, self.settings.two_stage_sources, context
+                )
+                outcome = "applied" if context.sources else "empty"
+        except Exception as e:
+            self.logger.warning("source_preselection_failed", error=str(e))
+            outcome = "error"
+        self.metrics.log_source_preselection(
+            outcome, len(context.sources), time.perf_counter() - start
+        )
+
     def retrieve(self, text: str, domain: str | None, topic: str | None) -> list:
         """Retrieve relevant chunks from vector store."""
         # Generate query embedding
@@ -51,13 +93,43 @@ class QueryService:
             context.domain = domain.lower()
         if topic:
             context.topic = topic.lower()
-
-        # Search
+        if self.catalog:
+            # Hide in-flight and retired versions of reindexed sources
+            context.hidden_versions = self.catalog.hidden_versions()
+
+        # Detect the domain from the query when none was given
+        auto_domain = None
+        if not domain and self.domain_index:
+            auto_domain = self.domain_index.classify(vector_query.dense)
+            context.domain = auto_domain
+
+        # Search (small child windows are many per section: fetch more of them)
+        parent_child = self.settings.chunking_mode == "parent_child"
+        limit = self.settings.child_search_limit if parent_child else 20
+        searcher = self.federated or self.vector_store
         start_search = time.perf_counter()
-        result = self.vector_store.query(vector_query, limit=20, filter_context=context)
+        self._restrict_sources(vector_query.dense, context)
+        result = searcher.query(vector_query, limit=limit, filter_context=context)
+
+        if auto_domain and len(result) < self.settings.domain_autofilter_min_results:
+            # Misclassified or sparse domain: fall back to the whole collection
+            context.domain = None
+            self._restrict_sources(vector_query.dense, context)
+            result = searcher.query(vector_query, limit=limit, filter_context=context)
+            outcome = "fallback"
+        else:
+            outcome = "applied" if auto_domain else "skipped"
+
+        if any(hit.payload.get("parent_id") for hit in result):
+            # Rerank and answer over whole sections, not the windows that matched
+            result = group_by_parent(
+                result, self.vector_store.get_payloads, self.settings.parent_limit
+            )
         duration = time.perf_counter() - start_search
 
         # Log metrics
+        if not domain and self.domain_index:
+            self.metrics.log_domain_autofilter(outcome, auto_domain, duration)
         self.metrics.log_vector_search(
             query=text,
             domain=domain,
@@ -68,6 +140,10 @@ class QueryService:
 
         return result
 
+    def retrieve_and_rerank(self, text: str, domain: str | None, topic: str | None) -> list:
+        """Retrieve chunks and rerank them once with the cross-encoder."""
+        return self.reranker.rerank(text, self.retrieve(text, domain, topic))
+
     def _build_citations(self, query_result: list) -> list[Citation]:
         """Build citations from query results."""
         seen = set()
@@ -14,6 +14,10 @@ from app.api.retrieval_engine.query_service import QueryService
 from app.api.retrieval_engine.reranker import Reranker
 from app.api.retrieval_engine.metrics_collector import MetricsCollector
 from app.api.retrieval_engine.schemas import QueryResponse
+from app.api.retrieval_engine.source_catalog import SourceCatalog
+from app.api.retrieval_engine.federated_retriever import FederatedRetriever
+from app.api.retrieval_engine.domain_index import DomainCentroidIndex
+from app.api.retrieval_engine.summary_index import SourceSummaryIndex
 from app.infrastructure.storage.interfaces import VectorStoreInterface
 from app.infrastructure.storage.hybrid_ai import HybridEmbeddingService
 from app.application.llm.client import LLMClient
@@ -29,9 +33,14 @@ class RAGService:
         llm_client: LLMClient,
         vector_store: VectorStoreInterface,
         embed_service: HybridEmbeddingService,
+        catalog: SourceCatalog | None = None,
+        federated: FederatedRetriever | None = None,
+        domain_index: DomainCentroidIndex | None = None,
+        summary_index: SourceSummaryIndex | None = None,
     ) -> None:
         self.vector_store = vector_store
         self.embed_service = embed_service
+        self.catalog = catalog
 
         # Initialize components
         self.metrics = MetricsCollector()
@@ -41,6 +50,9 @@ class RAGService:
         self.ingestion = IngestionService(
             vector_store=vector_store,
             embed_service=embed_service,
+            catalog=catalog,
+            domain_index=domain_index,
+            summary_index=summary_index,
         )
         self.query = QueryService(
             llm_client=llm_client,
@@ -48,6 +60,10 @@ class RAGService:
             embed_service=embed_service,
             reranker=self.reranker,
             metrics=self.metrics,
+            catalog=catalog,
+            federated=federated,
+            domain_index=domain_index,
+            summary_index=summary_index,
         )
 
     # ===========================================================================
@@ -61,6 +77,9 @@ class RAGService:
         domain: str,
         topic: str,
         progress_callback=None,
+        pdf_backend: str | None = None,
+        job_id: str | None = None,
+        content_hash: str | None = None,
     ):
         """Synchronous PDF ingestion."""
         return await self.ingestion.ingest_pdf_file(
@@ -69,10 +88,18 @@ class RAGService:
             domain=domain,
             topic=topic,
             progress_callback=progress_callback,
+            pdf_backend=pdf_backend,
+            job_id=job_id,
+            content_hash=content_hash,
         )
 
     async def ingest_pdf_file_stream(
-        self, file: UploadFile, source: str, domain: str, topic: str
+        self,
+        file: UploadFile,
+        source: str,
+        domain: str,
+        topic: str,
+        pdf_backend: str | None = None,
     ) -> AsyncIterator[dict]:
         """Streaming PDF ingestion."""
         async for progress in self.ingestion.ingest_pdf_file_stream(
@@ -80,9 +107,31 @@ class RAGService:
             source=source,
             domain=domain,
             topic=topic,
+            pdf_backend=pdf_backend,
         ):
             yield progress
 
+    async def ingest_csv_file(
+        self,
+        file: UploadFile,
+        source: str,
+        domain: str,
+        topic: str,
+        progress_callback=None,
+        job_id: str | None = None,
+        content_hash: str | None = None,
+    ):
+        """CSV/TSV ingestion."""
+        return await self.ingestion.ingest_csv_file(
+            file=file,
+            source=source,
+            domain=domain,
+            topic=topic,
+            progress_callback=progress_callback,
+            job_id=job_id,
+            content_hash=content_hash,
+        )
+
     async def ingest_document(
         self,
         url: str,
@@ -90,6 +139,7 @@ class RAGService:
         domain: str,
         topic: str,
         progress_callback=None,
+        job_id: str | None = None,
     ):
         """Synchronous URL ingestion."""
         return await self.ingestion.ingest_document(
@@ -98,8 +148,13 @@ class RAGService:
             domain=domain,
             topic=topic,
             progress_callback=progress_callback,
+            job_id=job_id,
         )
 
+    def discard_checkpoints(self, job_id: str, source: str) -> None:
+        """Drop a job's ingestion checkpoints once it will not be retried."""
+        self.ingestion.discard_checkpoints(job_id, source)
+
     async def ingest_document_stream(
         self, url: str, source: str, domain: str, topic: str
     ) -> AsyncIterator[dict]:
@@ -152,10 +207,18 @@ def create_rag_service(
     llm_client: LLMClient,
     vector_store: VectorStoreInterface,
     embed_service: HybridEmbeddingService,
+    catalog: SourceCatalog | None = None,
+    federated: FederatedRetriever | None = None,
+    domain_index: DomainCentroidIndex | None = None,
+    summary_index: SourceSummaryIndex | None = None,
 ) -> RAGService:
     """Factory function for RAGService."""
     return RAGService(
         llm_client=llm_client,
         vector_store=vector_store,
         embed_service=embed_service,
+        catalog=catalog,
+        federated=federated,
+        domain_index=domain_index,
+        summary_index=summary_index,
     )
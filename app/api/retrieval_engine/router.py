@@ -1,11 +1,32 @@
+import asyncio
 import shutil
+import zipfile
 from pathlib import Path
+from uuid import uuid4
 from fastapi import APIRouter, Depends, File, Form, UploadFile
 import structlog
 
-from .jobs.celery_tasks import ingest_file_job, ingest_html_job
+from .jobs.celery_tasks import (
+    backfill_domain_index_task,
+    backfill_summary_index_task,
+    crawl_site_task,
+    dispatch_bulk_ingestion,
+    ingest_file_job,
+    ingest_html_job,
+    ingest_repository_task,
+    rebuild_collection_task,
+)
 from .jobs.job_service import JobService
-from .schemas import IngestRequest
+from .jobs.schemas import JobStatus
+from ..extraction.source.csv_source import CSV_SUFFIXES
+from ..extraction.exceptions import SourceException, SourceInvalidURLError
+from ..extraction.source.pdf_source import resolve_backend
+from ..extraction.source.repository_source import resolve_repository
+from .domain_index import get_domain_index
+from .summary_index import get_summary_index
+from .schemas import BulkIngestRequest, CrawlRequest, IngestRequest, RepositoryRequest
+from .upload_registry import get_upload_registry, save_upload
+from ...core.settings import get_settings
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
@@ -33,29 +54,233 @@ async def ingest_file_job_endpoint(
     source: str = Form(...),
     domain: str = Form(...),
     topic: str = Form(...),
+    pdf_backend: str | None = Form(None),
     job_serv: JobService = Depends(JobService),
 ):
-    if not file.filename.lower().endswith(".pdf"):
-        return {"status": "error", "message": "File must be a PDF"}
+    suffix = Path(file.filename.lower()).suffix
+    if suffix != ".pdf" and suffix not in CSV_SUFFIXES:
+        return {"status": "error", "message": "File must be a PDF, CSV or TSV"}
+    # Unknown or not installed backends are rejected before anything is queued
+    try:
+        backend = resolve_backend(pdf_backend) if suffix == ".pdf" else None
+    except SourceException as e:
+        return {"status": "error", "message": str(e)}
 
     # create job_id
     job_id = job_serv.create()
 
-    # Define route in shared volume
-    upload_path = Path("/backend/api_data") / f"{job_id}.pdf"
+    # Define route in shared volume; the extension selects the ingestion path
+    upload_path = Path("/backend/api_data") / f"{job_id}{suffix}"
     upload_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Save file
-    with upload_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file, hashing it on the way
+    content_hash = save_upload(file, upload_path)
+
+    # The same content is already what this source serves: nothing to ingest
+    registry = get_upload_registry()
+    existing = (
+        registry.find(content_hash, file.filename, domain, topic, backend) if registry else None
+    )
+    if existing:
+        upload_path.unlink(missing_ok=True)
+        job_serv.update_progress(job_id, 100, "No changes")
+        job_serv.update_status(job_id, JobStatus.completed)
+        logger.info("ingest_file_unchanged", job_id=job_id, source=file.filename)
+        return {"status": "unchanged", "job_id": job_id, "ingested_at": int(existing["ingested_at"])}
 
     # create task
-    ingest_file_job.delay(job_id, str(upload_path), file.filename, domain, topic)
+    ingest_file_job.delay(
+        job_id,
+        str(upload_path),
+        file.filename,
+        domain,
+        topic,
+        pdf_backend,
+        content_hash=content_hash,
+    )
 
     # return status and job_id
     return {"status": "queued", "job_id": job_id}
 
 
+@router.post(
+    "/ingest/bulk/job",
+)
+async def ingest_bulk_job(
+    ingest: BulkIngestRequest, job_serv: JobService = Depends(JobService)
+):
+    """Ingest many URLs under one parent job; progress is aggregated from its children."""
+    children = [job_serv.create() for _ in ingest.urls]
+    job_id = job_serv.create(children=children)
+
+    items = [
+        {
+            "job_id": child,
+            "type": "url",
+            "url": url,
+            "source": url,
+            "domain": ingest.domain,
+            "topic": ingest.topic,
+        }
+        for child, url in zip(children, ingest.urls)
+    ]
+    dispatch_bulk_ingestion(job_id, items)
+
+    return {"status": "queued", "job_id": job_id, "documents": len(items)}
+
+
+@router.post(
+    "/crawl/job",
+)
+async def crawl_site_job(
+    crawl: CrawlRequest, job_serv: JobService = Depends(JobService)
+):
+    """Crawl a documentation site; re-crawls only re-ingest pages that changed."""
+    job_id = job_serv.create()
+
+    crawl_site_task.delay(job_id, crawl.model_dump())
+
+    return {"status": "queued", "url": crawl.url, "job_id": job_id}
+
+
+@router.post(
+    "/repository/job",
+)
+async def ingest_repository_job(
+    repo: RepositoryRequest, job_serv: JobService = Depends(JobService)
+):
+    """Ingest a repository's docs from one archive; re-runs skip unchanged files."""
+    try:
+        resolve_repository(repo.repo, repo.ref)
+    except SourceInvalidURLError as e:
+        return {"status": "error", "message": str(e)}
+
+    job_id = job_serv.create()
+
+    ingest_repository_task.delay(job_id, repo.model_dump())
+
+    return {"status": "queued", "repo": repo.repo, "ref": repo.ref, "job_id": job_id}
+
+
+def _unpack_pdfs(archive_path: Path, target_dir: Path, max_bytes: int) -> list[tuple[str, Path]]:
+    """Stream the PDFs of a zip archive to disk; returns (original name, path) pairs."""
+    pdfs = []
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [
+            m for m in archive.infolist()
+            if not m.is_dir() and m.filename.lower().endswith(".pdf")
+        ]
+        if sum(m.file_size for m in members) > max_bytes:
+            raise ValueError("Archive is too large once uncompressed")
+
+        for i, member in enumerate(members):
+            # Never trust archive paths: keep only the file name
+            name = Path(member.filename).name
+            path = target_dir / f"{i}_{name}"
+            with archive.open(member) as src, path.open("wb") as dst:
+                shutil.copyfileobj(src, dst)
+            pdfs.append((name, path))
+    return pdfs
+
+
+@router.post(
+    "/ingest-file/bulk/job",
+)
+async def ingest_archive_job(
+    file: UploadFile = File(...),
+    domain: str = Form(...),
+    topic: str = Form(...),
+    pdf_backend: str | None = Form(None),
+    job_serv: JobService = Depends(JobService),
+):
+    """Ingest every PDF of a zip archive under one parent job."""
+    if not file.filename.lower().endswith(".zip"):
+        return {"status": "error", "message": "File must be a ZIP archive of PDFs"}
+    try:
+        resolve_backend(pdf_backend)
+    except SourceException as e:
+        return {"status": "error", "message": str(e)}
+
+    # Define route in shared volume
+    bulk_dir = Path("/backend/api_data") / f"bulk_{uuid4()}"
+    bulk_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = bulk_dir / "archive.zip"
+
+    with archive_path.open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    try:
+        pdfs = await asyncio.to_thread(
+            _unpack_pdfs, archive_path, bulk_dir, get_settings().bulk_archive_max_bytes
+        )
+    except (zipfile.BadZipFile, ValueError) as e:
+        shutil.rmtree(bulk_dir, ignore_errors=True)
+        return {"status": "error", "message": str(e)}
+    finally:
+        archive_path.unlink(missing_ok=True)
+
+    if not pdfs:
+        shutil.rmtree(bulk_dir, ignore_errors=True)
+        return {"status": "error", "message": "Archive contains no PDFs"}
+
+    children = [job_serv.create() for _ in pdfs]
+    job_id = job_serv.create(children=children)
+
+    items = [
+        {
+            "job_id": child,
+            "type": "pdf",
+            "path": str(path),
+            "source": name,
+            "domain": domain.lower().strip(),
+            "topic": topic.lower().strip(),
+            "pdf_backend": pdf_backend,
+        }
+        for child, (name, path) in zip(children, pdfs)
+    ]
+    dispatch_bulk_ingestion(job_id, items, cleanup_dir=str(bulk_dir))
+
+    return {"status": "queued", "job_id": job_id, "documents": len(items)}
+
+
+@router.post(
+    "/rebuild/job",
+)
+async def rebuild_collection_job(job_serv: JobService = Depends(JobService)):
+    """Rebuild the whole index into a new collection and swap the alias when done."""
+    job_id = job_serv.create()
+
+    rebuild_collection_task.delay(job_id)
+
+    return {"status": "queued", "job_id": job_id}
+
+
+@router.post(
+    "/domain-index/backfill",
+)
+async def backfill_domain_index():
+    """Index the domains of sources ingested before the domain index existed."""
+    if get_domain_index() is None:
+        return {"status": "error", "message": "domain_autofilter is disabled"}
+
+    backfill_domain_index_task.delay()
+
+    return {"status": "queued"}
+
+
+@router.post(
+    "/summary-index/backfill",
+)
+async def backfill_summary_index():
+    """Summarize sources ingested before the summary index existed (two-stage retrieval)."""
+    if get_summary_index() is None:
+        return {"status": "error", "message": "source_summaries is disabled"}
+
+    backfill_summary_index_task.delay()
+
+    return {"status": "queued"}
+
+
 @router.get(
     "/job/{job_id}",
 )
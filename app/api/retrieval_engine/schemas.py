@@ -13,6 +13,53 @@ class IngestRequest(BaseModel):
         return v.lower().strip()
 
 
+class BulkIngestRequest(BaseModel):
+    urls: list[str] = Field(min_length=1, max_length=2000)
+    domain: str = Field(default="general", min_length=1, max_length=50)
+    topic: str = Field(default="unknown", min_length=1, max_length=50)
+
+    @field_validator("domain", "topic")
+    @classmethod
+    def normalize_lowercase(cls, v: str) -> str:
+        """Normalize to lowercase"""
+        return v.lower().strip()
+
+    @field_validator("urls")
+    @classmethod
+    def deduplicate_urls(cls, v: list[str]) -> list[str]:
+        """Drop blanks and repeated URLs, keeping order"""
+        return list(dict.fromkeys(u.strip() for u in v if u.strip()))
+
+
+class CrawlRequest(BaseModel):
+    url: str = Field(description="Site root or sitemap.xml")
+    path_prefix: str | None = Field(default=None, description="Only follow links under this path")
+    max_pages: int | None = Field(default=None, ge=1, le=10000)
+    domain: str = Field(default="general", min_length=1, max_length=50)
+    topic: str = Field(default="unknown", min_length=1, max_length=50)
+    recrawl: bool = Field(default=True, description="Include the site in scheduled re-crawls")
+
+    @field_validator("domain", "topic")
+    @classmethod
+    def normalize_lowercase(cls, v: str) -> str:
+        """Normalize to lowercase"""
+        return v.lower().strip()
+
+
+class RepositoryRequest(BaseModel):
+    repo: str = Field(description="'owner/name', a github.com URL or the URL of a .tar.gz/.zip archive")
+    ref: str = Field(default="HEAD", min_length=1, max_length=200, description="Branch, tag or commit")
+    include: list[str] | None = Field(default=None, description="Globs of the files to ingest (default: settings)")
+    domain: str = Field(default="general", min_length=1, max_length=50)
+    topic: str = Field(default="unknown", min_length=1, max_length=50)
+
+    @field_validator("domain", "topic")
+    @classmethod
+    def normalize_lowercase(cls, v: str) -> str:
+        """Normalize to lowercase"""
+        return v.lower().strip()
+
+
 class QueryRequest(BaseModel):
     text: str = Field(min_length=5, max_length=1000)
     domain: str | None = Field(None, max_length=50)
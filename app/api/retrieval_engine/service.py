@@ -19,11 +19,21 @@ def get_rag_service() -> RAGService:
     from app.infrastructure.storage.qdrant_client import get_qdrant_store
     from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
     from app.application.llm.client import get_llm_client
+    from app.api.retrieval_engine.source_catalog import get_versioning_catalog
+    from app.api.retrieval_engine.federated_retriever import create_federated_retriever
+    from app.api.retrieval_engine.domain_index import get_domain_index
+    from app.api.retrieval_engine.summary_index import get_summary_index
+
+    vector_store = get_qdrant_store()
 
     return create_rag_service(
         llm_client=get_llm_client(),
-        vector_store=get_qdrant_store(),
+        vector_store=vector_store,
         embed_service=get_hybrid_embeddign_service(),
+        catalog=get_versioning_catalog(),
+        federated=create_federated_retriever(vector_store),
+        domain_index=get_domain_index(),
+        summary_index=get_summary_index(),
     )
 
 
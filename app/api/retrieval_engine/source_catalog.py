@@ -0,0 +1,265 @@
+"""
+Catálogo de fuentes ingestadas, persistido en Redis.
+
+Guarda por cada source la versión activa de sus chunks y la metadata de
+ingestión. Las versiones que todavía se están escribiendo (o que ya fueron
+reemplazadas) quedan en un set de versiones ocultas que QueryService excluye
+de las búsquedas, así el cambio de versión es un único paso atómico.
+
+Una versión en curso figura en catalog:in_flight hasta que se activa o se
+abandona. Si el worker muere antes de hacer cualquiera de las dos cosas (y
+ningún reintento la retoma), el barrido periódico la abandona pasado
+version_in_flight_ttl_seconds para que el GC borre sus puntos.
+
+Keys:
+    catalog:sources              -> set con todos los sources
+    catalog:source:{source}      -> hash con active_version, domain, topic, url...
+    catalog:hidden_versions      -> set de versiones que no deben verse en queries
+    catalog:retired:{source}     -> set de versiones pendientes de garbage collection
+    catalog:in_flight            -> zset "{version}:{source}" -> inicio, versiones aún sin activar
+    catalog:manifest:{source}    -> JSON con los hashes/ids de chunks de la versión activa
+"""
+
+import json
+from datetime import datetime, UTC
+from uuid import uuid4
+
+import structlog
+from redis import Redis
+
+from ...core.redis import decode, get_redis
+from .chunk_manifest import Manifest
+from ...core.settings import get_settings
+
+
+log = structlog.get_logger()
+
+# Version tag for points ingested before versioning existed (no "version" payload)
+LEGACY_VERSION = "legacy"
+
+
+class SourceCatalog:
+    """
+    Redis-backed catalog of sources and their active chunk versions.
+    """
+
+    PREFIX = "catalog"
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        self._redis = redis or get_redis()
+
+    def _source_key(self, source: str) -> str:
+        return f"{self.PREFIX}:source:{source}"
+
+    def _retired_key(self, source: str) -> str:
+        return f"{self.PREFIX}:retired:{source}"
+
+    def _manifest_key(self, source: str) -> str:
+        return f"{self.PREFIX}:manifest:{source}"
+
+    @property
+    def _sources_key(self) -> str:
+        return f"{self.PREFIX}:sources"
+
+    @property
+    def _hidden_key(self) -> str:
+        return f"{self.PREFIX}:hidden_versions"
+
+    @property
+    def _in_flight_key(self) -> str:
+        return f"{self.PREFIX}:in_flight"
+
+    @staticmethod
+    def _in_flight_member(source: str, version: str) -> str:
+        # Versions are hex, so the first ":" always ends the version
+        return f"{version}:{source}"
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, source: str) -> dict | None:
+        """Catalog entry for a source, or None if it was never ingested."""
+        raw = self._redis.hgetall(self._source_key(source))
+        if not raw:
+            return None
+        return {decode(k): decode(v) for k, v in raw.items()}
+
+    def active_version(self, source: str) -> str | None:
+        value = self._redis.hget(self._source_key(source), "active_version")
+        return decode(value) if value else None
+
+    def hidden_versions(self) -> list[str]:
+        """Versions that readers must not see (in-flight or retired)."""
+        return sorted(decode(v) for v in self._redis.smembers(self._hidden_key))
+
+    def retired_versions(self, source: str) -> list[str]:
+        return sorted(decode(v) for v in self._redis.smembers(self._retired_key(source)))
+
+    def in_flight_versions(self, source: str) -> list[str]:
+        """Versions of a source that were begun but not yet activated or abandoned."""
+        versions = []
+        for member in self._redis.zrange(self._in_flight_key, 0, -1):
+            version, _, member_source = decode(member).partition(":")
+            if member_source == source:
+                versions.append(version)
+        return sorted(versions)
+
+    def is_in_flight(self, source: str, version: str) -> bool:
+        member = self._in_flight_member(source, version)
+        return self._redis.zscore(self._in_flight_key, member) is not None
+
+    def stale_versions(self, max_age_seconds: int) -> list[tuple[str, str]]:
+        """(source, version) pairs begun more than `max_age_seconds` ago and never finished."""
+        cutoff = datetime.now(UTC).timestamp() - max_age_seconds
+        stale = []
+        for member in self._redis.zrangebyscore(self._in_flight_key, "-inf", cutoff):
+            version, _, source = decode(member).partition(":")
+            stale.append((source, version))
+        return stale
+
+    def source_count(self) -> int:
+        return self._redis.scard(self._sources_key)
+
+    def list_sources(self) -> list[dict]:
+        entries = []
+        for source in sorted(decode(s) for s in self._redis.smembers(self._sources_key)):
+            entry = self.get(source)
+            if entry:
+                entries.append({"source": source, **entry})
+        return entries
+
+    def get_manifest(self, source: str) -> Manifest | None:
+        raw = self._redis.get(self._manifest_key(source))
+        return Manifest.from_dict(json.loads(raw)) if raw else None
+
+    def save_manifest(self, source: str, manifest: Manifest) -> None:
+        self._redis.set(self._manifest_key(source), json.dumps(manifest.to_dict()))
+
+    def drop_manifest(self, source: str) -> None:
+        """Forget the manifest so the next ingestion of the source is a full one."""
+        self._redis.delete(self._manifest_key(source))
+
+    # ------------------------------------------------------------------
+    # Version lifecycle
+    # ------------------------------------------------------------------
+
+    def begin_version(self, source: str) -> str:
+        """Reserve a new hidden version for a source that is about to be (re)ingested."""
+        version = uuid4().hex[:16]
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.sadd(self._hidden_key, version)
+        pipe.zadd(
+            self._in_flight_key,
+            {self._in_flight_member(source, version): datetime.now(UTC).timestamp()},
+        )
+        pipe.execute()
+        log.info("catalog_version_started", source=source, version=version)
+        return version
+
+    def activate(self, source: str, version: str, **metadata) -> str | None:
+        """
+        Atomically make `version` the visible version of `source`.
+
+        The previous version (if any) is hidden and queued for garbage
+        collection in the same transaction. Metadata given as None is cleared.
+        Returns the retired version.
+        """
+        key = self._source_key(source)
+        fields = {
+            **{k: str(v) for k, v in metadata.items() if v is not None},
+            "active_version": version,
+            "updated_at": str(int(datetime.now(UTC).timestamp())),
+        }
+        cleared = [k for k, v in metadata.items() if v is None]
+
+        def _swap(pipe) -> str | None:
+            previous = pipe.hget(key, "active_version")
+            previous = decode(previous) if previous else None
+
+            pipe.multi()
+            pipe.hset(key, mapping=fields)
+            if cleared:
+                pipe.hdel(key, *cleared)
+            pipe.sadd(self._sources_key, source)
+            pipe.srem(self._hidden_key, version)
+            pipe.zrem(self._in_flight_key, self._in_flight_member(source, version))
+
+            retired = previous if previous and previous != version else None
+            if retired:
+                pipe.sadd(self._hidden_key, retired)
+                pipe.sadd(self._retired_key(source), retired)
+            elif previous is None:
+                # Points written before versioning can't be hidden by tag,
+                # they stay visible until GC removes them.
+                retired = LEGACY_VERSION
+                pipe.sadd(self._retired_key(source), LEGACY_VERSION)
+            return retired
+
+        retired = self._redis.transaction(_swap, key, value_from_callable=True)
+        log.info(
+            "catalog_version_activated",
+            source=source,
+            version=version,
+            retired=retired,
+        )
+        return retired
+
+    def abandon(self, source: str, version: str) -> None:
+        """Queue a failed in-flight version for garbage collection. It stays hidden."""
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.sadd(self._retired_key(source), version)
+        pipe.zrem(self._in_flight_key, self._in_flight_member(source, version))
+        pipe.execute()
+        log.warning("catalog_version_abandoned", source=source, version=version)
+
+    def forget_versions(self, source: str, versions: list[str]) -> None:
+        """Drop versions whose points have already been garbage-collected."""
+        if not versions:
+            return
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.srem(self._retired_key(source), *versions)
+        pipe.srem(self._hidden_key, *versions)
+        pipe.zrem(self._in_flight_key, *(self._in_flight_member(source, v) for v in versions))
+        pipe.execute()
+
+    def remove(self, source: str) -> None:
+        """
+        Remove a source from the catalog (after its points were deleted),
+        including every version of it still listed as hidden.
+        """
+        active = self.active_version(source)
+        in_flight = self.in_flight_versions(source)
+        versions = set(self.retired_versions(source)) | set(in_flight)
+        if active:
+            versions.add(active)
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(
+            self._source_key(source), self._retired_key(source), self._manifest_key(source)
+        )
+        pipe.srem(self._sources_key, source)
+        if versions:
+            pipe.srem(self._hidden_key, *versions)
+        if in_flight:
+            pipe.zrem(self._in_flight_key, *(self._in_flight_member(source, v) for v in in_flight))
+        pipe.execute()
+
+
+# Module-level singleton
+_source_catalog: SourceCatalog | None = None
+
+
+def get_source_catalog() -> SourceCatalog:
+    """Get or create the source catalog singleton."""
+    global _source_catalog
+    if _source_catalog is None:
+        _source_catalog = SourceCatalog()
+    return _source_catalog
+
+
+def get_versioning_catalog() -> SourceCatalog | None:
+    """Catalog to version ingestion with, or None when versioning is disabled."""
+    if not get_settings().versioned_ingestion:
+        return None
+    return get_source_catalog()
@@ -0,0 +1,189 @@
+"""
+Índice de resúmenes por source para la búsqueda en dos etapas.
+
+Cada source publicado guarda un único vector denso en una colección chica
+aparte (`documents_summaries`): el promedio normalizado de los vectores de
+sus chunks, el mismo acumulador que alimenta los centroides de dominio, así
+resumirlo no cuesta ni un embedding ni una llamada a un LLM.
+
+Con retrieval_mode="two_stage" la query se compara primero contra esa
+colección (cientos de puntos en lugar de cientos de miles) para elegir los M
+sources más parecidos, y la búsqueda híbrida de chunks corre restringida a
+ellos con un filtro MatchAny sobre `source`.
+
+Los sources ingestados antes de que existiera el índice no tienen resumen
+hasta que corre backfill() (tarea de Celery, encolada al arrancar y desde
+POST /rag/summary-index/backfill). Mientras la colección no exista o tenga
+menos puntos que sources el catálogo, la búsqueda no se restringe: dejaría
+afuera justo los sources sin resumen. Sin catálogo (ingesta sin versionado)
+no hay con qué comparar y la búsqueda tampoco se restringe.
+"""
+
+import threading
+import time
+from functools import lru_cache
+from uuid import NAMESPACE_URL, uuid5
+
+import numpy as np
+import structlog
+from qdrant_client import QdrantClient, models
+
+from ...api.retrieval_engine.domain_index import CentroidAccumulator, accumulate_sources
+from ...api.retrieval_engine.source_catalog import SourceCatalog
+from ...core.settings import get_settings
+from ...infrastructure.storage.interfaces import FilterContext
+
+
+log = structlog.get_logger()
+
+_UPSERT_BATCH = 256
+
+
+class SourceSummaryIndex:
+    """One normalized mean vector per source, in a side Qdrant collection."""
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        collection_name: str,
+        size: int = 384,
+        refresh_interval: float = 30.0,
+    ) -> None:
+        self.client = client
+        self.collection_name = collection_name
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._ready = False
+
+        self._lock = threading.Lock()
+        self._complete = False
+        self._checked_at: float | None = None
+
+    def create_collection(self) -> None:
+        """Create the collection (vectors in RAM: it is small) unless it exists."""
+        if self._ready:
+            return
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=self.size, distance=models.Distance.COSINE),
+            )
+            for field in ("source", "domain", "topic"):
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            log.info("summary_collection_created", collection=self.collection_name)
+        self._ready = True
+
+    @staticmethod
+    def _point_id(source: str) -> str:
+        return str(uuid5(NAMESPACE_URL, source))
+
+    def _points(self, entries: list[tuple[str, str, str, CentroidAccumulator]]) -> list:
+        points = []
+        for source, domain, topic, acc in entries:
+            if acc.sum is None:
+                continue
+            vector = acc.sum / max(float(np.linalg.norm(acc.sum)), 1e-12)
+            points.append(
+                models.PointStruct(
+                    id=self._point_id(source),
+                    vector=vector.tolist(),
+                    payload={
+                        "source": source,
+                        "domain": domain.lower(),
+                        "topic": topic.lower(),
+                        "chunk_count": acc.count,
+                    },
+                )
+            )
+        return points
+
+    def put(self, source: str, domain: str, topic: str, acc: CentroidAccumulator) -> None:
+        """Replace the summary of a source with the vectors of its latest ingestion."""
+        points = self._points([(source, domain, topic, acc)])
+        if not points:
+            return
+        self.create_collection()
+        self.client.upsert(collection_name=self.collection_name, points=points)
+
+    def remove(self, source: str) -> None:
+        self.create_collection()
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=[self._point_id(source)]),
+        )
+
+    def top_sources(self, dense, limit: int, filter_context: FilterContext) -> list[str]:
+        """The `limit` sources whose summary is closest to the query, best first."""
+        conditions = [
+            models.FieldCondition(key=key, match=models.MatchValue(value=value))
+            for key, value in (("domain", filter_context.domain), ("topic", filter_context.topic))
+            if value
+        ]
+        points = self.client.query_points(
+            collection_name=self.collection_name,
+            query=list(dense),
+            query_filter=models.Filter(must=conditions) if conditions else None,
+            limit=limit,
+            with_payload=["source"],
+        ).points
+        return [p.payload["source"] for p in points]
+
+    def is_complete(self, catalog: SourceCatalog | None = None) -> bool:
+        """
+        Whether every source has a summary: the collection exists and holds at
+        least as many points as the catalog has sources (checked at most every
+        refresh_interval). Without a catalog coverage can't be known: False.
+        """
+        if catalog is None:
+            return False
+
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+            return self._complete
+
+        with self._lock:
+            self._checked_at = now
+            if not self.client.collection_exists(self.collection_name):
+                self._complete = False
+                return False
+            summaries = self.client.count(collection_name=self.collection_name, exact=True).count
+            self._complete = summaries > 0 and summaries >= catalog.source_count()
+            return self._complete
+
+    def backfill(self, client: QdrantClient, collection: str, hidden_versions: list[str]) -> int:
+        """
+        Summarize every source already in `collection` (sources ingested before
+        the index existed). Hidden versions and parent passages are skipped.
+        """
+        points = self._points(
+            [
+                (source, domain, topic, acc)
+                for source, (domain, topic, acc) in accumulate_sources(
+                    client, collection, hidden_versions
+                ).items()
+            ]
+        )
+        self.create_collection()
+        for i in range(0, len(points), _UPSERT_BATCH):
+            self.client.upsert(
+                collection_name=self.collection_name, points=points[i : i + _UPSERT_BATCH]
+            )
+        # the next query checks the coverage again
+        self._checked_at = None
+
+        log.info("summary_index_backfilled", collection=collection, sources=len(points))
+        return len(points)
+
+
+@lru_cache
+def get_summary_index() -> SourceSummaryIndex | None:
+    """Summary index next to the main collection, or None when source_summaries is off."""
+    from ...infrastructure.storage.qdrant_client import COLLECTION_NAME, get_qdrant_client
+
+    if not get_settings().source_summaries:
+        return None
+    return SourceSummaryIndex(get_qdrant_client(), f"{COLLECTION_NAME}_summaries")
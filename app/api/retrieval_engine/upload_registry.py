@@ -0,0 +1,136 @@
+"""
+Registro de archivos subidos por hash de contenido.
+
+Cada upload se hashea (SHA-256) mientras se escribe a disco. Cuando un
+archivo termina de ingestarse se registra su hash con el source, el momento
+de la ingestión y el digest del manifest que quedó publicado. Si el mismo
+archivo vuelve a subirse para el mismo source, y ese manifest sigue siendo el
+de la versión activa (nadie lo borró ni lo re-ingestó), el job termina en el
+acto con "No changes": no se extrae, limpia ni chunkea nada. Un PDF solo
+cuenta como el mismo si además se pide el mismo backend de extracción: otro
+backend produce otro texto. Un archivo distinto sigue el camino normal, que
+reusa los vectores de los chunks que no cambiaron.
+
+Keys:
+    ingest:content:{sha256}  -> hash con source, ingested_at, version, manifest (digest),
+                                pdf_backend (vacío si no es un PDF)
+    ingest:upload:{file_id}  -> sha256 de un upload del agente aún no ingestado (con TTL)
+"""
+
+import hashlib
+from datetime import datetime, UTC
+from pathlib import Path
+
+from fastapi import UploadFile
+from redis import Redis
+
+from ...api.retrieval_engine.chunk_manifest import Manifest
+from ...api.retrieval_engine.source_catalog import SourceCatalog, get_versioning_catalog
+from ...core.redis import decode, get_redis
+from ...core.settings import get_settings
+
+
+_COPY_BUFFER = 1024 * 1024
+# Agent uploads are ingested by a later tool call, usually within minutes
+_UPLOAD_TTL_SECONDS = 86400
+
+
+def save_upload(file: UploadFile, path: Path) -> str:
+    """Copy an upload to `path`, hashing it on the way; returns the SHA-256."""
+    digest = hashlib.sha256()
+    with path.open("wb") as buffer:
+        while block := file.file.read(_COPY_BUFFER):
+            digest.update(block)
+            buffer.write(block)
+    return digest.hexdigest()
+
+
+class UploadRegistry:
+    """Content hash → last ingestion of that content, checked against the catalog."""
+
+    PREFIX = "ingest"
+
+    def __init__(self, catalog: SourceCatalog, redis: Redis | None = None) -> None:
+        self.catalog = catalog
+        self._redis = redis or get_redis()
+
+    def _content_key(self, content_hash: str) -> str:
+        return f"{self.PREFIX}:content:{content_hash}"
+
+    def _upload_key(self, file_id: str) -> str:
+        return f"{self.PREFIX}:upload:{file_id}"
+
+    def record(
+        self, content_hash: str, source: str, manifest: Manifest, pdf_backend: str | None = None
+    ) -> None:
+        """Register the content a source's active version was just built from."""
+        self._redis.hset(
+            self._content_key(content_hash),
+            mapping={
+                "source": source,
+                "ingested_at": str(int(datetime.now(UTC).timestamp())),
+                "version": manifest.version,
+                "manifest": manifest.digest(),
+                "pdf_backend": pdf_backend or "",
+            },
+        )
+
+    def find(
+        self,
+        content_hash: str,
+        source: str,
+        domain: str,
+        topic: str,
+        pdf_backend: str | None = None,
+    ) -> dict | None:
+        """
+        The registered ingestion of this content if it is what `source`
+        serves right now, under the same domain and topic and extracted with
+        the same PDF backend (None for other files); else None.
+        """
+        raw = self._redis.hgetall(self._content_key(content_hash))
+        entry = {decode(k): decode(v) for k, v in raw.items()}
+        if entry.get("source") != source:
+            return None
+        if entry.get("pdf_backend") != (pdf_backend or ""):
+            return None
+
+        live = self.catalog.get(source) or {}
+        if (
+            live.get("active_version") != entry["version"]
+            or live.get("domain") != domain.lower()
+            or live.get("topic") != topic.lower()
+        ):
+            return None
+
+        # A manifest rewritten under the same version no longer matches
+        manifest = self.catalog.get_manifest(source)
+        if manifest is None or manifest.version != entry["version"]:
+            return None
+        if manifest.digest() != entry["manifest"]:
+            return None
+        return entry
+
+    def remember_upload(self, file_id: str, content_hash: str) -> None:
+        self._redis.set(self._upload_key(file_id), content_hash, ex=_UPLOAD_TTL_SECONDS)
+
+    def upload_hash(self, file_id: str) -> str | None:
+        value = self._redis.get(self._upload_key(file_id))
+        return decode(value) if value else None
+
+
+# Module-level singleton
+_upload_registry: UploadRegistry | None = None
+
+
+def get_upload_registry() -> UploadRegistry | None:
+    """Registry of uploaded contents, or None when upload_dedup or versioning is off."""
+    global _upload_registry
+    if not get_settings().upload_dedup:
+        return None
+    catalog = get_versioning_catalog()
+    if catalog is None:
+        return None
+    if _upload_registry is None:
+        _upload_registry = UploadRegistry(catalog)
+    return _upload_registry
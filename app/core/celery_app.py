@@ -29,3 +29,29 @@ celery_app = Celery(
 celery_app.conf.result_expires = 3600
 
 celery_app.autodiscover_tasks(["app.api.retrieval_engine.jobs.celery_tasks"])
+
+# Periodic tasks (need celery beat)
+beat_schedule = {}
+
+# Scheduled re-crawl of registered documentation sites
+if settings.crawler_recrawl_hours > 0:
+    beat_schedule["recrawl-sites"] = {
+        "task": "app.api.retrieval_engine.jobs.celery_tasks.recrawl_sites_task",
+        "schedule": settings.crawler_recrawl_hours * 3600,
+    }
+
+# Abandon in-flight versions left behind by dead workers
+if settings.versioned_ingestion and settings.version_sweep_minutes > 0:
+    beat_schedule["sweep-stale-versions"] = {
+        "task": "app.api.retrieval_engine.jobs.celery_tasks.sweep_stale_versions_task",
+        "schedule": settings.version_sweep_minutes * 60,
+    }
+
+# Drop near-duplicate index entries of points deleted by other paths
+if settings.near_dup_mode != "off" and settings.near_dup_prune_hours > 0:
+    beat_schedule["prune-near-duplicate-index"] = {
+        "task": "app.api.retrieval_engine.jobs.celery_tasks.prune_near_duplicate_index_task",
+        "schedule": settings.near_dup_prune_hours * 3600,
+    }
+
+celery_app.conf.beat_schedule = beat_schedule
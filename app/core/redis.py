@@ -27,6 +27,11 @@ def get_redis_client() -> Redis:
     )
 
 
+def decode(value) -> str:
+    """A value read from Redis as str; the client returns bytes unless decode_responses is set."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
 # Singleton instance
 _redis_client: Redis | None = None
 
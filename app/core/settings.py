@@ -7,7 +7,7 @@ Incluye carga de proveedores y modelos desde YAML.
 
 import os
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 import yaml
 from pydantic import BaseModel, Field, ValidationError, field_validator
@@ -131,6 +131,166 @@ class AppSettings(BaseSettings):
     # Qdrant
     qdrant_host: str = Field(default="qdrant")
     qdrant_port: int = Field(default=6333)
+    qdrant_quantization: Literal["none", "scalar", "binary"] = Field(
+        default="scalar",
+        description="Dense vector quantization mode: 'none', 'scalar' (INT8, on disk) or 'binary' (kept in RAM)",
+    )
+    qdrant_oversampling: float = Field(default=2.0, ge=1.0)
+    qdrant_rescore: bool = Field(default=True)
+    chunk_text_store_path: str | None = Field(
+        default=None,
+        description="SQLite file for zstd-compressed chunk texts (keeps them out of Qdrant payloads)",
+    )
+    federated_collections: str = Field(
+        default="",
+        description="Comma-separated extra collections searched with `documents`, e.g. 'documents_llama:0.8'",
+    )
+
+    # Retrieval
+    domain_autofilter: bool = Field(
+        default=False,
+        description="Filter by the query's domain, detected from per-domain centroids, when none is given (needs a domain index backfill)",
+    )
+    domain_autofilter_min_similarity: float = Field(default=0.35)
+    domain_autofilter_margin: float = Field(default=0.05, ge=0.0)
+    domain_autofilter_min_results: int = Field(
+        default=3, ge=0, description="Retry unfiltered when the auto-filtered search returns fewer hits"
+    )
+    retrieval_mode: Literal["flat", "two_stage"] = Field(
+        default="flat",
+        description=(
+            "'flat' (hybrid search over every chunk) or 'two_stage' (pick sources by summary vector first; "
+            "needs versioned_ingestion, searches flat until every source has a summary)"
+        ),
+    )
+    two_stage_sources: int = Field(default=10, ge=1, description="Sources kept by the summary stage in 'two_stage' mode")
+    source_summaries: bool = Field(
+        default=True,
+        description="Keep one mean dense vector per source in `documents_summaries` (used by 'two_stage' retrieval)",
+    )
+
+    # Ingestion
+    versioned_ingestion: bool = Field(
+        default=True,
+        description="Write re-ingested chunks under a hidden version and publish them atomically",
+    )
+    version_gc_delay_seconds: int = Field(default=30, ge=0)
+    version_in_flight_ttl_seconds: int = Field(
+        default=12 * 3600,
+        ge=600,
+        description="Abandon versions begun this long ago and never activated (worker died); must outlast the slowest ingestion",
+    )
+    version_sweep_minutes: float = Field(default=60, ge=0, description="How often to sweep stale in-flight versions (0 = off)")
+    rebuild_defer_seconds: int = Field(default=60, ge=1, description="Re-queue delay of index writes that arrive during a collection rebuild")
+    rebuild_drain_timeout_seconds: int = Field(
+        default=3600, ge=0, description="How long a rebuild waits for running ingestions to finish before giving up"
+    )
+    ingest_checkpoints: bool = Field(
+        default=True,
+        description="Checkpoint ingestion jobs in Redis so a retried job resumes from its last committed batch",
+    )
+    ingest_checkpoint_ttl_seconds: int = Field(default=2 * 86400, ge=60)
+    ingest_max_retries: int = Field(default=3, ge=0, description="Retries of a failed document ingestion job")
+    ingest_retry_delay_seconds: int = Field(default=30, ge=0)
+    upload_dedup: bool = Field(
+        default=True,
+        description="Finish uploads whose content is already the live version of their source without ingesting them",
+    )
+
+    # Bulk ingestion
+    bulk_batch_size: int = Field(default=8, ge=1, description="Documents per Celery task in a bulk job")
+    bulk_host_concurrency: int = Field(default=4, ge=1, description="Concurrent ingestions per host across workers")
+    bulk_archive_max_bytes: int = Field(default=2 * 1024**3, description="Max uncompressed size of a PDF archive")
+    embed_coalesce_max_batch: int = Field(default=64, ge=1)
+    embed_coalesce_wait_ms: int = Field(default=20, ge=0)
+
+    # PDF extraction
+    pdf_backend: Literal["pdfium", "pymupdf", "pdfplumber"] = Field(
+        default="pdfplumber",
+        description=(
+            "Default PDF text extractor: 'pdfplumber' (keeps table layout), or the faster "
+            "'pdfium' / 'pymupdf' (AGPL, installed separately from requirements-pymupdf.txt)"
+        ),
+    )
+    pdf_extract_workers: int = Field(default=0, ge=0, description="Processes extracting PDF pages (0 = min(4, CPUs))")
+    pdf_pages_per_task: int = Field(default=32, ge=1, description="Pages extracted per pool task and chunked together")
+    pdf_prefetch_tasks: int = Field(default=8, ge=1, description="Page ranges extracted ahead of the consumer")
+    pdf_parallel_min_pages: int = Field(default=64, ge=1, description="Smaller PDFs are extracted in a single thread")
+
+    # Chunk quality filter (before embedding)
+    chunk_quality_mode: Literal["drop", "flag", "off"] = Field(
+        default="flag",
+        description="'flag' low-information chunks (report only), 'drop' them before embedding or 'off'",
+    )
+    chunk_quality_min_words: int = Field(default=5, ge=0, description="Shorter chunks are dropped only if another check fails too")
+    chunk_quality_min_letter_ratio: float = Field(default=0.45, ge=0.0, le=1.0, description="Letters / non-space characters")
+    chunk_quality_max_digit_ratio: float = Field(default=0.3, ge=0.0, le=1.0)
+    chunk_quality_max_symbol_ratio: float = Field(default=0.35, ge=0.0, le=1.0)
+    chunk_quality_min_stopword_ratio: float = Field(default=0.05, ge=0.0, le=1.0, description="Stop-words / words, for chunks of 20+ words")
+    chunk_quality_max_duplicate_line_ratio: float = Field(default=0.5, ge=0.0, le=1.0)
+    chunk_quality_max_boilerplate_ratio: float = Field(default=0.5, ge=0.0, le=1.0, description="Lines with copyright/legal/cookie text")
+
+    # Near-duplicate chunks across sources (MinHash + LSH)
+    near_dup_mode: Literal["alias", "skip", "off"] = Field(
+        default="alias",
+        description=(
+            "'alias' skips the embedding but still stores a point per duplicate, 'skip' stores no point "
+            "(unversioned ingestion only; versioned ingestion falls back to 'alias') or 'off'"
+        ),
+    )
+    near_dup_threshold: float = Field(default=0.9, ge=0.0, le=1.0, description="Estimated Jaccard similarity of word shingles")
+    near_dup_num_perm: int = Field(default=128, ge=16, description="MinHash signature length")
+    near_dup_bands: int = Field(default=16, ge=1, description="LSH bands; must divide near_dup_num_perm")
+    near_dup_shingle: int = Field(default=3, ge=1, description="Words per shingle")
+    near_dup_prune_hours: float = Field(default=24, ge=0, description="Drop index entries of deleted points every N hours (0 = off)")
+
+    # Tabular files (CSV/TSV)
+    csv_rows_per_read: int = Field(default=10_000, ge=1, description="Rows parsed per block; bounds memory on large files")
+    csv_chunk_max_chars: int = Field(default=1500, ge=100, description="Max characters of rows (plus header) per chunk")
+    csv_sniff_bytes: int = Field(default=1024 * 1024, ge=1024, description="Prefix used to detect the encoding")
+
+    # Repository archives
+    repo_archive_max_bytes: int = Field(default=512 * 1024**2, description="Max size of a downloaded repository archive")
+    repo_max_file_bytes: int = Field(default=2 * 1024**2, description="Larger files in the archive are skipped")
+    repo_include: str = Field(
+        default="*.md,*.mdx,*.rst",
+        description="Comma-separated globs of the repository files to ingest (paths relative to the repo root)",
+    )
+
+    # Chunking
+    chunking_mode: Literal["chars", "tokens", "parent_child"] = Field(
+        default="chars",
+        description="'chars' (fixed character sizes per cleaner), 'tokens' (packed to the embedding model's window) "
+        "or 'parent_child' (small embedded windows, whole sections returned)",
+    )
+    chunk_max_tokens: int = Field(default=0, ge=0, description="Token budget per chunk in 'tokens' mode (0 = derive from the dense model)")
+    chunk_overlap_tokens: int = Field(default=32, ge=0, description="Tokens repeated between consecutive chunks in 'tokens' mode")
+    # 512 is the cross-encoder's window: parents are what gets reranked
+    parent_max_tokens: int = Field(default=512, ge=16, description="Token budget of a parent passage in 'parent_child' mode")
+    child_max_tokens: int = Field(default=128, ge=8, description="Token budget of an embedded child window (capped at the dense model's window)")
+    child_overlap_tokens: int = Field(default=16, ge=0, description="Tokens repeated between consecutive child windows")
+    child_search_limit: int = Field(default=40, ge=1, description="Child hits fetched per query in 'parent_child' mode before grouping by parent")
+    parent_limit: int = Field(default=8, ge=1, description="Parents kept (best child first) and passed to the reranker")
+
+    # HTTP client (extraction sources)
+    http_client_timeout: float = Field(default=10.0, gt=0)
+    http_client_http2: bool = Field(default=True)
+    http_client_max_connections: int = Field(default=100, ge=1)
+    http_client_max_keepalive: int = Field(default=20, ge=0)
+    http_client_keepalive_expiry: float = Field(default=30.0, ge=0)
+    http_cache_dir: str | None = Field(
+        default="/backend/api_data/http_cache",
+        description="On-disk HTTP response cache, shared by API and workers (empty = disabled)",
+    )
+    http_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, ge=1)
+
+    # Crawler
+    crawler_concurrency: int = Field(default=8, ge=1, description="Concurrent page fetches per crawl")
+    crawler_requests_per_second: float = Field(default=2.0, gt=0, description="Per-host request rate")
+    crawler_max_pages: int = Field(default=500, ge=1)
+    crawler_user_agent: str = Field(default="ai-toolkit-crawler")
+    crawler_ingest_concurrency: int = Field(default=4, ge=1, description="Changed pages ingested at once")
+    crawler_recrawl_hours: float = Field(default=0, ge=0, description="Re-crawl registered sites every N hours (0 = off)")
 
     # YAML config (no se expone como variable de entorno)
     _yaml_config: Optional[YamlAppConfig] = None
@@ -0,0 +1,79 @@
+"""
+Microbenchmark de los cleaners: MB/s de `clean` y `chunk`.
+
+Por defecto usa el corpus golden de los tests (tests/golden), repetido hasta
+tener un documento del tamaño de un libro, para PDFCleaner, MarkdownCleaner y
+HTMLCleaner. También acepta archivos de texto propios, p. ej. el texto
+extraído de un PDF (solo PDFCleaner).
+
+Uso:
+    python -m app.evaluation.benchmarks.bench_cleaners
+    python -m app.evaluation.benchmarks.bench_cleaners libro.txt --rounds 5
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from app.api.extraction.cleaners.html_cleaner import HTMLCleaner
+from app.api.extraction.cleaners.markdown_cleaner import MarkdownCleaner
+from app.api.extraction.cleaners.pdf_cleaner import PDFCleaner
+
+GOLDEN = Path("tests/golden")
+TARGET_BYTES = 4 * 1024 * 1024
+
+
+def golden_corpus(kind: str, pattern: str) -> str:
+    texts = [
+        p.read_text(encoding="utf-8")
+        for p in sorted((GOLDEN / kind).glob(pattern))
+        if ".clean" not in p.suffixes
+    ]
+    text = "\n".join(texts)
+    return text * max(1, TARGET_BYTES // max(1, len(text.encode())))
+
+
+def measure(cleaner, text: str, rounds: int) -> dict:
+    clean_text = cleaner.clean(text)
+    return {
+        "input_mb": round(len(text.encode()) / 1e6, 2),
+        "clean_mb_per_s": throughput(cleaner.clean, text, rounds),
+        "chunk_mb_per_s": throughput(cleaner.chunk, clean_text, rounds),
+    }
+
+
+def throughput(fn, text: str, rounds: int) -> float:
+    """Best MB/s over `rounds` runs."""
+    size = len(text.encode()) / 1e6
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return round(size / best, 2) if best else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.files:
+        text = "\n".join(Path(f).read_text(encoding="utf-8") for f in args.files)
+        report = {"pdf": measure(PDFCleaner(), text, args.rounds)}
+    else:
+        report = {
+            "pdf": measure(PDFCleaner(), golden_corpus("pdf", "*.txt"), args.rounds),
+            "markdown": measure(
+                MarkdownCleaner(), golden_corpus("markdown", "*.md"), args.rounds
+            ),
+            # clean keeps only the first <main>; chunk MB/s is over its output
+            "html": measure(HTMLCleaner(), golden_corpus("html", "*.html"), args.rounds),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
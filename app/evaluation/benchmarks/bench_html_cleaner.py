@@ -0,0 +1,140 @@
+"""
+Páginas/segundo de HTMLCleaner sobre un corpus guardado de la documentación de FastAPI.
+
+Compara el cleaner anterior (BeautifulSoup con html.parser, `str(main)` y un
+segundo parseo en `chunk`) con el actual (un solo parseo con lxml) y verifica
+que ambos producen los mismos chunks.
+
+Uso:
+    # una vez, con red: guarda las páginas en el directorio del corpus
+    python -m app.evaluation.benchmarks.bench_html_cleaner --fetch
+    python -m app.evaluation.benchmarks.bench_html_cleaner --rounds 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.api.extraction.cleaners.html_cleaner import HTMLCleaner
+from app.api.extraction.http_client import get_http_client
+from app.api.extraction.schema import ChunkWithMetadata
+
+CORPUS_DIR = Path("app/evaluation/datasets/fastapi_pages")
+PAGES = [
+    "https://fastapi.tiangolo.com/tutorial/first-steps/",
+    "https://fastapi.tiangolo.com/tutorial/path-params/",
+    "https://fastapi.tiangolo.com/tutorial/query-params/",
+    "https://fastapi.tiangolo.com/tutorial/body/",
+    "https://fastapi.tiangolo.com/tutorial/dependencies/",
+    "https://fastapi.tiangolo.com/tutorial/security/first-steps/",
+    "https://fastapi.tiangolo.com/tutorial/middleware/",
+    "https://fastapi.tiangolo.com/tutorial/cors/",
+    "https://fastapi.tiangolo.com/tutorial/sql-databases/",
+    "https://fastapi.tiangolo.com/tutorial/bigger-applications/",
+    "https://fastapi.tiangolo.com/tutorial/background-tasks/",
+    "https://fastapi.tiangolo.com/tutorial/testing/",
+    "https://fastapi.tiangolo.com/advanced/websockets/",
+    "https://fastapi.tiangolo.com/async/",
+    "https://fastapi.tiangolo.com/deployment/docker/",
+]
+
+
+def bs4_clean_and_chunk(raw: str) -> list[ChunkWithMetadata]:
+    """HTMLCleaner previo: parsea dos veces con html.parser."""
+    soup = BeautifulSoup(raw, "html.parser")
+    for tag in soup(["nav", "footer", "header", "script", "style"]):
+        tag.decompose()
+    main = str(soup.find("main") or soup.find("article") or soup)
+
+    soup = BeautifulSoup(main, "html.parser")
+    headers = soup.find_all(["h2", "h3"])
+    if not headers:
+        text = soup.get_text()
+        return [
+            ChunkWithMetadata(text=text[s : s + 1000], section=None)
+            for s in range(0, len(text), 900)
+        ]
+
+    chunks = []
+    for i, header in enumerate(headers):
+        header_text = header.get_text(strip=True).replace("¶", "")
+        content = []
+        curr = header.next_sibling
+        next_header = headers[i + 1] if i + 1 < len(headers) else None
+        while curr and curr != next_header:
+            if hasattr(curr, "get_text"):
+                text = curr.get_text(strip=True).replace("¶", "")
+                if text:
+                    content.append(text)
+            curr = curr.next_sibling
+        full = f"{header_text}\n" + "\n".join(content)
+        if len(full) > 1500:
+            chunks.extend(
+                ChunkWithMetadata(text=full[s : s + 1000], section=None)
+                for s in range(0, len(full), 900)
+            )
+        else:
+            chunks.append(ChunkWithMetadata(text=full, section=header_text))
+    return chunks
+
+
+def lxml_clean_and_chunk(raw: str) -> list[ChunkWithMetadata]:
+    cleaner = HTMLCleaner()
+    return cleaner.chunk(cleaner.clean(raw))
+
+
+async def fetch() -> None:
+    CORPUS_DIR.mkdir(parents=True, exist_ok=True)
+    client = get_http_client(cached=False)
+    for url in PAGES:
+        response = await client.get(url)
+        response.raise_for_status()
+        name = url.rstrip("/").split("fastapi.tiangolo.com/")[-1].replace("/", "_") or "index"
+        (CORPUS_DIR / f"{name}.html").write_text(response.text, encoding="utf-8")
+    await client.aclose()
+
+
+def pages_per_second(fn, pages: list[str], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for raw in pages:
+            fn(raw)
+        best = min(best, time.perf_counter() - start)
+    return round(len(pages) / best, 1) if best else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fetch", action="store_true")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fetch:
+        asyncio.run(fetch())
+
+    pages = [p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"No pages in {CORPUS_DIR}; run with --fetch first")
+
+    same = sum(
+        [(c.section, c.text) for c in bs4_clean_and_chunk(raw)]
+        == [(c.section, c.text) for c in lxml_clean_and_chunk(raw)]
+        for raw in pages
+    )
+    report = {
+        "pages": len(pages),
+        "mb": round(sum(len(p.encode()) for p in pages) / 1e6, 2),
+        "bs4_pages_per_second": pages_per_second(bs4_clean_and_chunk, pages, args.rounds),
+        "lxml_pages_per_second": pages_per_second(lxml_clean_and_chunk, pages, args.rounds),
+        "pages_with_identical_chunks": same,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
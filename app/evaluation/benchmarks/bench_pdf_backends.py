@@ -0,0 +1,80 @@
+"""
+Backends de extracción de PDF: velocidad y paridad de chunks frente a pdfplumber.
+
+Para cada PDF y cada backend disponible:
+
+- segundos y páginas/segundo (extracción en un solo proceso, sin el pool)
+- chunks de PDFCleaner idénticos a los de pdfplumber (fracción)
+- similitud de vocabulario del texto limpio (Jaccard de palabras)
+
+Uso (los libros de ejemplo, o cualquier PDF):
+    python -m app.evaluation.benchmarks.bench_pdf_backends libro1.pdf libro2.pdf
+"""
+
+import argparse
+import json
+import re
+import time
+
+from app.api.extraction.cleaners.pdf_cleaner import PDFCleaner
+from app.api.extraction.source.pdf_source import PDF_BACKENDS, extract_page_range, page_count
+
+REFERENCE = "pdfplumber"
+
+
+def run_backend(path: str, backend: str) -> tuple[list[str], float]:
+    start = time.perf_counter()
+    pages = extract_page_range(path, 0, page_count(path, backend), backend)
+    return pages, time.perf_counter() - start
+
+
+def words(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="+")
+    args = parser.parse_args()
+
+    cleaner = PDFCleaner()
+    report = {}
+
+    for path in args.pdfs:
+        results = {}
+        reference_chunks = None
+        reference_words = None
+
+        for backend in [REFERENCE] + [b for b in PDF_BACKENDS if b != REFERENCE]:
+            try:
+                pages, seconds = run_backend(path, backend)
+            except ImportError as e:
+                results[backend] = {"error": str(e)}
+                continue
+
+            content = cleaner.clean("\n".join(p for p in pages if p))
+            chunks = [c.text for c in cleaner.chunk(content)]
+            if backend == REFERENCE:
+                reference_chunks, reference_words = set(chunks), words(content)
+
+            vocabulary = words(content)
+            results[backend] = {
+                "pages": len(pages),
+                "seconds": round(seconds, 2),
+                "pages_per_second": round(len(pages) / seconds, 1) if seconds else 0,
+                "chunks": len(chunks),
+                "identical_chunks": round(
+                    sum(c in reference_chunks for c in chunks) / len(chunks), 3
+                ) if chunks else 0,
+                "word_jaccard": round(
+                    len(vocabulary & reference_words) / len(vocabulary | reference_words), 3
+                ) if vocabulary | reference_words else 0,
+            }
+
+        report[path] = results
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Extracción de texto de un PDF grande: recorrido serial frente al pool de procesos.
+
+Compara el extractor anterior (todo el archivo en memoria, `pdf.pages` en serie
+y `extract_text()` dos veces por página) con `PDFSource.iter_pages_from_path`:
+
+- segundos totales y páginas/segundo
+- tiempo hasta la primera página (cuándo puede empezar la limpieza)
+- que ambos devuelvan el mismo texto
+
+Cualquier libro de dominio público sirve, p. ej. "The Complete Works of
+William Shakespeare" de Project Gutenberg exportado a PDF (~1500 páginas).
+
+Uso:
+    python -m app.evaluation.benchmarks.bench_pdf_extraction libro.pdf
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from io import BytesIO
+
+import pdfplumber
+
+from app.api.extraction.source.pdf_source import PDFSource, get_pdf_pool
+
+
+def serial_extract(path: str) -> str:
+    """Extractor previo, tal cual."""
+    with open(path, "rb") as f:
+        file_content = f.read()
+    with pdfplumber.open(BytesIO(file_content)) as pdf:
+        return "\n".join(
+            page.extract_text() for page in pdf.pages if page.extract_text()
+        )
+
+
+async def parallel_extract(path: str) -> tuple[str, int, float]:
+    start = time.perf_counter()
+    first_page = None
+    pages = []
+    async for text in PDFSource("pdfplumber").iter_pages_from_path(path):
+        if first_page is None:
+            first_page = time.perf_counter() - start
+        pages.append(text)
+    return "\n".join(t for t in pages if t), len(pages), first_page or 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf")
+    args = parser.parse_args()
+
+    # Pool warm-up so process start-up is not billed to the first run
+    get_pdf_pool().submit(len, "").result()
+
+    start = time.perf_counter()
+    serial_text = serial_extract(args.pdf)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel_text, pages, first_page = asyncio.run(parallel_extract(args.pdf))
+    parallel_seconds = time.perf_counter() - start
+
+    report = {
+        "pages": pages,
+        "serial_seconds": round(serial_seconds, 2),
+        "serial_pages_per_second": round(pages / serial_seconds, 1) if serial_seconds else 0,
+        "parallel_seconds": round(parallel_seconds, 2),
+        "parallel_pages_per_second": round(pages / parallel_seconds, 1) if parallel_seconds else 0,
+        "parallel_first_page_seconds": round(first_page, 3),
+        "speedup": round(serial_seconds / parallel_seconds, 2) if parallel_seconds else 0,
+        "same_text": serial_text == parallel_text,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
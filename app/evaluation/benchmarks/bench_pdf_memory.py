@@ -0,0 +1,103 @@
+"""
+Pico de memoria (RSS) al extraer y chunkear un PDF grande.
+
+Cada modo corre en un proceso nuevo para que los picos no se mezclen:
+
+- `bytes`: el camino anterior; el archivo entero en un BytesIO, el texto
+  completo unido en un str y chunkeado de una vez
+- `pages`: `PDFSource.iter_pages_from_path` + limpieza y chunking por ventanas
+  de páginas, como `IngestionService._extract_page_chunks`
+
+Se reporta el max RSS del proceso y el de los procesos del pool de extracción.
+Linux reporta ru_maxrss en KiB.
+
+Uso (p. ej. con un libro escaneado de ~200 MB):
+    python -m app.evaluation.benchmarks.bench_pdf_memory libro.pdf --backend pdfium
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import time
+from io import BytesIO
+
+from app.api.extraction.cleaners.pdf_cleaner import PDFCleaner
+from app.api.extraction.source.pdf_source import PDFSource, get_pdf_pool
+from app.core.settings import get_settings
+
+
+def run_bytes(path: str, backend: str) -> int:
+    import pdfplumber
+
+    with open(path, "rb") as f:
+        file_content = f.read()
+    with pdfplumber.open(BytesIO(file_content)) as pdf:
+        full_text = "\n".join(
+            page.extract_text() for page in pdf.pages if page.extract_text()
+        )
+    cleaner = PDFCleaner()
+    return len(cleaner.chunk(cleaner.clean(full_text)))
+
+
+def run_pages(path: str, backend: str) -> int:
+    cleaner = PDFCleaner()
+    window = get_settings().pdf_pages_per_task
+
+    async def count() -> int:
+        chunks = 0
+        buffer = []
+        async for text in PDFSource(backend).iter_pages_from_path(path):
+            buffer.append(text)
+            if len(buffer) >= window:
+                chunks += len(cleaner.chunk(cleaner.clean("\n".join(buffer))))
+                buffer.clear()
+        if buffer:
+            chunks += len(cleaner.chunk(cleaner.clean("\n".join(buffer))))
+        return chunks
+
+    chunks = asyncio.run(count())
+    # Workers must have exited for RUSAGE_CHILDREN to include them
+    get_pdf_pool().shutdown(wait=True)
+    return chunks
+
+
+MODES = {"bytes": run_bytes, "pages": run_pages}
+
+
+def measure(mode: str, path: str, backend: str, queue) -> None:
+    start = time.perf_counter()
+    chunks = MODES[mode](path, backend)
+    queue.put(
+        {
+            "chunks": chunks,
+            "seconds": round(time.perf_counter() - start, 2),
+            "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "pool_max_rss_mib": round(
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1
+            ),
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf")
+    parser.add_argument("--backend", default=None)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    report = {}
+    for mode in MODES:
+        queue = ctx.Queue()
+        process = ctx.Process(target=measure, args=(mode, args.pdf, args.backend, queue))
+        process.start()
+        report[mode] = queue.get()
+        process.join()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Payload size y latencia de query con el texto de los chunks dentro o fuera de Qdrant.
+
+Copia los textos de la colección a un ChunkTextStore temporal y compara:
+
+- bytes de payload por punto con y sin `text`
+- latencia p50/p95 de la query híbrida con `with_payload=True` frente a
+  excluir `text` del payload + lookup batch en el store
+
+Uso (con Qdrant levantado y la colección poblada):
+    python -m app.evaluation.benchmarks.bench_text_store
+"""
+
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from qdrant_client import models
+
+from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+from app.infrastructure.storage.qdrant_client import COLLECTION_NAME, get_qdrant_client
+from app.infrastructure.storage.text_store import ChunkTextStore
+
+DATASETS = [
+    Path("app/evaluation/datasets/fastapi_docs.json"),
+    Path("app/evaluation/datasets/ai_engineering_book.json"),
+]
+LIMIT = 20
+ROUNDS = 5
+
+
+def fill_store(client, store: ChunkTextStore) -> list[dict]:
+    """Copy every chunk text into the store and return the full payloads."""
+    payloads = []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=COLLECTION_NAME,
+            limit=256,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+        store.put_many(
+            (p.id, p.payload.get("source", ""), p.payload.get("version"), p.payload.get("text", ""))
+            for p in points
+        )
+        payloads.extend(p.payload for p in points)
+        if offset is None:
+            break
+    return payloads
+
+
+def hybrid_query(client, vector, with_payload):
+    return client.query_points(
+        collection_name=COLLECTION_NAME,
+        prefetch=[
+            models.Prefetch(query=vector.dense, using="dense", limit=LIMIT),
+            models.Prefetch(
+                query=models.SparseVector(
+                    indices=vector.sparse["indices"], values=vector.sparse["values"]
+                ),
+                using="sparse",
+                limit=LIMIT,
+            ),
+        ],
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        with_payload=with_payload,
+        limit=LIMIT,
+    ).points
+
+
+def percentile_ms(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+def main() -> None:
+    client = get_qdrant_client()
+    embed = get_hybrid_embeddign_service()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkTextStore(str(Path(tmp) / "chunk_text.sqlite3"))
+        payloads = fill_store(client, store)
+
+        full_sizes = [len(json.dumps(p).encode()) for p in payloads]
+        slim_sizes = [
+            len(json.dumps({k: v for k, v in p.items() if k != "text"}).encode())
+            for p in payloads
+        ]
+
+        questions = []
+        for path in DATASETS:
+            with open(path, "r") as f:
+                questions.extend(item["question"] for item in json.load(f))
+        vectors = [embed.embed(q, query=True) for q in questions]
+
+        inline, out_of_band = [], []
+        for _ in range(ROUNDS):
+            for vector in vectors:
+                start = time.perf_counter()
+                hybrid_query(client, vector, True)
+                inline.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                points = hybrid_query(
+                    client, vector, models.PayloadSelectorExclude(exclude=["text"])
+                )
+                store.hydrate(points)
+                out_of_band.append(time.perf_counter() - start)
+
+        report = {
+            "points": len(payloads),
+            "payload_bytes_mean_inline": statistics.fmean(full_sizes) if full_sizes else 0,
+            "payload_bytes_mean_out_of_band": statistics.fmean(slim_sizes) if slim_sizes else 0,
+            "text_store": store.stats(),
+            "query_inline_p50_ms": percentile_ms(inline, 0.5),
+            "query_inline_p95_ms": percentile_ms(inline, 0.95),
+            "query_out_of_band_p50_ms": percentile_ms(out_of_band, 0.5),
+            "query_out_of_band_p95_ms": percentile_ms(out_of_band, 0.95),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Compara el chunking por caracteres contra el chunking por tokens del modelo.
+
+Ingesta los mismos documentos (URLs y/o PDFs) en una colección temporal por
+modo (`chunking_mode` = chars | tokens | parent_child), ejecuta las preguntas
+de los datasets contra cada una y reporta (en parent_child, el top-k son los
+padres de las mejores ventanas):
+
+- número de chunks y tiempo de ingesta
+- fracción de tokens de los chunks que quedan fuera de la ventana del modelo
+  denso (texto embebido y descartado)
+- recall de palabras del ground truth en el top-k recuperado
+- similitud densa máxima entre el ground truth y los chunks del top-k
+
+Uso (con Qdrant levantado):
+    python -m app.evaluation.compare_chunking \\
+        --url https://fastapi.tiangolo.com/tutorial/middleware/ \\
+        --pdf libro.pdf
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from app.api.retrieval_engine.ingestion_service import IngestionService
+from app.api.retrieval_engine.parent_chunks import group_by_parent
+from app.core.settings import get_settings
+from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+from app.infrastructure.storage.interfaces import FilterContext
+from app.infrastructure.storage.qdrant_client import (
+    COLLECTION_NAME,
+    QdrantStore,
+    get_qdrant_client,
+)
+
+DATASETS = [
+    Path("app/evaluation/datasets/fastapi_docs.json"),
+    Path("app/evaluation/datasets/ai_engineering_book.json"),
+]
+MODES = ["chars", "tokens", "parent_child"]
+RESULTS_PATH = Path("app/evaluation/results/chunking_comparison.json")
+TOP_K = 5
+WORD = re.compile(r"\w{4,}")
+
+
+async def ingest(service: IngestionService, urls: list[str], pdfs: list[str], domain: str) -> int:
+    chunks = 0
+    for url in urls:
+        result = await service.ingest_document(url=url, source=url, domain=domain, topic="eval")
+        chunks += result["chunks_processed"]
+    for path in pdfs:
+        with open(path, "rb") as f:
+            upload = UploadFile(file=f, filename=Path(path).name)
+            result = await service.ingest_pdf_file(
+                upload, source=Path(path).name, domain=domain, topic="eval"
+            )
+        chunks += result["chunks_processed"]
+    return chunks
+
+
+def stored_texts(client, collection: str) -> list[str]:
+    texts = []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection, limit=256, offset=offset, with_payload=["text", "kind"]
+        )
+        # parent passages are not embedded
+        texts.extend(p.payload.get("text", "") for p in points if p.payload.get("kind") != "parent")
+        if offset is None:
+            break
+    return texts
+
+
+def truncated_share(embed, texts: list[str]) -> float:
+    """Share of chunk tokens past the dense model's window."""
+    model = embed.dense_model
+    lengths = [
+        len(ids)
+        for ids in model.tokenizer([f"passage: {t}" for t in texts])["input_ids"]
+    ]
+    total = sum(lengths)
+    dropped = sum(max(0, n - model.max_seq_length) for n in lengths)
+    return dropped / total if total else 0.0
+
+
+def run_dataset(embed, store: QdrantStore, items: list[dict], parent_child: bool = False) -> dict:
+    limit = get_settings().child_search_limit if parent_child else TOP_K
+    recall, similarity = [], []
+    for item in items:
+        vector = embed.embed(item["question"], query=True)
+        hits = store.query(
+            vector, limit=limit, filter_context=FilterContext(domain=item.get("domain"))
+        )
+        if parent_child:
+            hits = group_by_parent(hits, store.get_payloads, TOP_K)
+        hits = hits[:TOP_K]
+        texts = [(p.payload or {}).get("text", "") for p in hits]
+
+        truth = {w.lower() for w in WORD.findall(item["ground_truth"])}
+        found = {w.lower() for w in WORD.findall(" ".join(texts))}
+        recall.append(len(truth & found) / max(len(truth), 1))
+
+        if texts:
+            vectors = embed.dense_model.encode(
+                [item["ground_truth"], *texts], normalize_embeddings=True
+            )
+            similarity.append(float(max(vectors[1:] @ vectors[0])))
+        else:
+            similarity.append(0.0)
+
+    return {
+        f"ground_truth_word_recall@{TOP_K}": statistics.fmean(recall) if recall else None,
+        f"ground_truth_similarity@{TOP_K}": statistics.fmean(similarity) if similarity else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", action="append", default=[])
+    parser.add_argument("--pdf", action="append", default=[])
+    parser.add_argument("--domain", default="fastapi")
+    args = parser.parse_args()
+    if not args.url and not args.pdf:
+        raise SystemExit("Pass at least one --url or --pdf")
+
+    client = get_qdrant_client()
+    embed = get_hybrid_embeddign_service()
+    settings = get_settings()
+    original_mode = settings.chunking_mode
+
+    datasets = {}
+    for path in DATASETS:
+        with open(path, "r") as f:
+            datasets[path.stem] = json.load(f)
+
+    results = {}
+    try:
+        for mode in MODES:
+            collection = f"{COLLECTION_NAME}_eval_chunk_{mode}"
+            if client.collection_exists(collection):
+                client.delete_collection(collection)
+            store = QdrantStore(client=client, collection_name=collection)
+            store.create_collection()
+
+            settings.chunking_mode = mode
+            service = IngestionService(vector_store=store, embed_service=embed)
+            start = time.perf_counter()
+            chunks = asyncio.run(ingest(service, args.url, args.pdf, args.domain))
+            results[mode] = {
+                "chunks": chunks,
+                "ingest_seconds": round(time.perf_counter() - start, 2),
+                "truncated_token_share": truncated_share(
+                    embed, stored_texts(client, collection)
+                ),
+            }
+            for name, items in datasets.items():
+                results[mode][name] = run_dataset(
+                    embed, store, items, parent_child=mode == "parent_child"
+                )
+            print(f"{mode}: {json.dumps(results[mode], indent=2)}")
+    finally:
+        settings.chunking_mode = original_mode
+        for mode in MODES:
+            collection = f"{COLLECTION_NAME}_eval_chunk_{mode}"
+            if client.collection_exists(collection):
+                client.delete_collection(collection)
+
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Compara la cuantización escalar (INT8) contra la binaria sobre los datasets de evaluación.
+
+Copia la colección `documents` a una colección temporal con cuantización binaria,
+ejecuta las preguntas de los datasets contra ambas y reporta:
+
+- recall@k del prefetch denso frente a la búsqueda exacta (sin cuantización)
+- solapamiento del top-k híbrido final con el de la configuración escalar
+- latencia p50/p95 de QdrantStore.query
+
+Uso (con Qdrant levantado y la colección poblada):
+    python -m app.evaluation.compare_quantization
+"""
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+from qdrant_client import models
+
+from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+from app.infrastructure.storage.interfaces import FilterContext
+from app.infrastructure.storage.qdrant_client import (
+    COLLECTION_NAME,
+    QdrantStore,
+    get_qdrant_client,
+)
+
+DATASETS = [
+    Path("app/evaluation/datasets/fastapi_docs.json"),
+    Path("app/evaluation/datasets/ai_engineering_book.json"),
+]
+BINARY_COLLECTION = f"{COLLECTION_NAME}_eval_binary"
+RESULTS_PATH = Path("app/evaluation/results/quantization_comparison.json")
+TOP_K = 10
+LIMIT = 20
+
+# (label, oversampling, rescore)
+BINARY_VARIANTS = [
+    ("binary_os1_norescore", 1.0, False),
+    ("binary_os2_rescore", 2.0, True),
+    ("binary_os4_rescore", 4.0, True),
+]
+
+
+def copy_collection(client, source: str, target: str) -> int:
+    """Copy every point (vectors + payload) into a binary-quantized collection."""
+    if client.collection_exists(target):
+        client.delete_collection(target)
+
+    QdrantStore(client=client, collection_name=target, quantization="binary").create_collection()
+
+    copied = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source,
+            limit=256,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if points:
+            client.upsert(
+                collection_name=target,
+                points=[
+                    models.PointStruct(id=p.id, vector=p.vector, payload=p.payload)
+                    for p in points
+                ],
+            )
+            copied += len(points)
+        if offset is None:
+            break
+
+    return copied
+
+
+def dense_ids(client, collection: str, vector: list[float], params) -> list:
+    return [
+        p.id
+        for p in client.query_points(
+            collection_name=collection,
+            query=vector,
+            using="dense",
+            limit=TOP_K,
+            search_params=params,
+        ).points
+    ]
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_dataset(client, embed, scalar_store, binary_store, items: list[dict]) -> dict:
+    exact = models.SearchParams(exact=True)
+    report = {
+        "scalar": {"recall": [], "latency": []},
+        **{label: {"recall": [], "overlap": [], "latency": []} for label, _, _ in BINARY_VARIANTS},
+    }
+
+    for item in items:
+        vector = embed.embed(item["question"], query=True)
+        context = FilterContext(domain=item.get("domain"))
+
+        truth = set(dense_ids(client, COLLECTION_NAME, vector.dense, exact))
+
+        scalar_dense = dense_ids(client, COLLECTION_NAME, vector.dense, None)
+        report["scalar"]["recall"].append(len(truth & set(scalar_dense)) / max(len(truth), 1))
+
+        start = time.perf_counter()
+        scalar_hits = scalar_store.query(vector, limit=LIMIT, filter_context=context)
+        report["scalar"]["latency"].append(time.perf_counter() - start)
+        scalar_top = {p.id for p in scalar_hits[:TOP_K]}
+
+        for label, oversampling, rescore in BINARY_VARIANTS:
+            params = models.SearchParams(
+                quantization=models.QuantizationSearchParams(
+                    oversampling=oversampling, rescore=rescore
+                )
+            )
+            binary_dense = dense_ids(client, BINARY_COLLECTION, vector.dense, params)
+            report[label]["recall"].append(len(truth & set(binary_dense)) / max(len(truth), 1))
+
+            start = time.perf_counter()
+            hits = binary_store.query(
+                vector,
+                limit=LIMIT,
+                filter_context=context,
+                oversampling=oversampling,
+                rescore=rescore,
+            )
+            report[label]["latency"].append(time.perf_counter() - start)
+            report[label]["overlap"].append(
+                len(scalar_top & {p.id for p in hits[:TOP_K]}) / max(len(scalar_top), 1)
+            )
+
+    summary = {}
+    for label, values in report.items():
+        summary[label] = {
+            f"dense_recall@{TOP_K}": statistics.fmean(values["recall"]) if values["recall"] else None,
+            "latency_p50_ms": percentile(values["latency"], 0.5) * 1000,
+            "latency_p95_ms": percentile(values["latency"], 0.95) * 1000,
+        }
+        if "overlap" in values:
+            summary[label][f"hybrid_overlap@{TOP_K}"] = (
+                statistics.fmean(values["overlap"]) if values["overlap"] else None
+            )
+    return summary
+
+
+def main() -> None:
+    client = get_qdrant_client()
+    embed = get_hybrid_embeddign_service()
+
+    copied = copy_collection(client, COLLECTION_NAME, BINARY_COLLECTION)
+    print(f"Copied {copied} points into {BINARY_COLLECTION}")
+
+    scalar_store = QdrantStore(client=client, quantization="scalar")
+    binary_store = QdrantStore(
+        client=client, collection_name=BINARY_COLLECTION, quantization="binary"
+    )
+
+    results = {"points": copied}
+    try:
+        for path in DATASETS:
+            with open(path, "r") as f:
+                items = json.load(f)
+            results[path.stem] = run_dataset(client, embed, scalar_store, binary_store, items)
+            print(f"{path.stem}: {json.dumps(results[path.stem], indent=2)}")
+    finally:
+        client.delete_collection(BINARY_COLLECTION)
+
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Compara la búsqueda plana contra la búsqueda en dos etapas (resúmenes por source).
+
+Ejecuta las preguntas de los datasets contra la colección `documents` de las
+dos formas, con el mismo vector de query, y reporta para cada M (sources que
+deja pasar la primera etapa):
+
+- recall@k del top-k en dos etapas frente al top-k plano (mismos ids)
+- fracción de queries cuyo mejor source plano sobrevive a la primera etapa
+- recall de palabras del ground truth en el top-k, plano y en dos etapas
+- latencia p50/p95 de la primera etapa y de la búsqueda completa
+
+Uso (con Qdrant levantado y la colección poblada; --backfill resume los
+sources ingestados antes de que existiera el índice):
+    python -m app.evaluation.compare_two_stage --backfill --sources 5 --sources 10
+"""
+
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+
+from app.api.retrieval_engine.source_catalog import get_versioning_catalog
+from app.api.retrieval_engine.summary_index import SourceSummaryIndex
+from app.infrastructure.storage.hybrid_ai import get_hybrid_embeddign_service
+from app.infrastructure.storage.interfaces import FilterContext
+from app.infrastructure.storage.qdrant_client import (
+    COLLECTION_NAME,
+    QdrantStore,
+    get_qdrant_client,
+)
+
+DATASETS = [
+    Path("app/evaluation/datasets/fastapi_docs.json"),
+    Path("app/evaluation/datasets/ai_engineering_book.json"),
+]
+RESULTS_PATH = Path("app/evaluation/results/two_stage_comparison.json")
+TOP_K = 5
+LIMIT = 20
+WORD = re.compile(r"\w{4,}")
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def word_recall(ground_truth: str, hits: list) -> float:
+    truth = {w.lower() for w in WORD.findall(ground_truth)}
+    found = {w.lower() for w in WORD.findall(" ".join(h.payload.get("text", "") for h in hits))}
+    return len(truth & found) / max(len(truth), 1)
+
+
+def run_dataset(
+    embed, store: QdrantStore, summaries: SourceSummaryIndex, items: list[dict], sizes: list[int]
+) -> dict:
+    flat = {"latency": [], "word_recall": []}
+    staged = {
+        m: {"stage1": [], "latency": [], "recall": [], "top_source": [], "word_recall": []}
+        for m in sizes
+    }
+
+    for item in items:
+        vector = embed.embed(item["question"], query=True)
+        context = FilterContext(domain=item.get("domain"))
+
+        start = time.perf_counter()
+        flat_hits = store.query(vector, limit=LIMIT, filter_context=context)[:TOP_K]
+        flat["latency"].append(time.perf_counter() - start)
+        flat["word_recall"].append(word_recall(item["ground_truth"], flat_hits))
+        flat_top = {p.id for p in flat_hits}
+
+        for m, report in staged.items():
+            start = time.perf_counter()
+            sources = summaries.top_sources(vector.dense, m, context)
+            report["stage1"].append(time.perf_counter() - start)
+            hits = store.query(
+                vector,
+                limit=LIMIT,
+                filter_context=FilterContext(domain=context.domain, sources=sources),
+            )[:TOP_K]
+            report["latency"].append(time.perf_counter() - start)
+
+            report["recall"].append(len(flat_top & {p.id for p in hits}) / max(len(flat_top), 1))
+            if flat_hits:
+                report["top_source"].append(float(flat_hits[0].payload["source"] in sources))
+            report["word_recall"].append(word_recall(item["ground_truth"], hits))
+
+    def mean(values):
+        return statistics.fmean(values) if values else None
+
+    summary = {
+        "flat": {
+            f"ground_truth_word_recall@{TOP_K}": mean(flat["word_recall"]),
+            "latency_p50_ms": percentile(flat["latency"], 0.5) * 1000,
+            "latency_p95_ms": percentile(flat["latency"], 0.95) * 1000,
+        }
+    }
+    for m, report in staged.items():
+        summary[f"two_stage_m{m}"] = {
+            f"recall@{TOP_K}_vs_flat": mean(report["recall"]),
+            "flat_top_source_kept": mean(report["top_source"]),
+            f"ground_truth_word_recall@{TOP_K}": mean(report["word_recall"]),
+            "stage1_p50_ms": percentile(report["stage1"], 0.5) * 1000,
+            "latency_p50_ms": percentile(report["latency"], 0.5) * 1000,
+            "latency_p95_ms": percentile(report["latency"], 0.95) * 1000,
+        }
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, action="append", default=[])
+    parser.add_argument("--backfill", action="store_true")
+    args = parser.parse_args()
+    sizes = args.sources or [5, 10, 20]
+
+    client = get_qdrant_client()
+    embed = get_hybrid_embeddign_service()
+    store = QdrantStore(client=client)
+    summaries = SourceSummaryIndex(client, f"{COLLECTION_NAME}_summaries")
+
+    results: dict = {}
+    if args.backfill:
+        catalog = get_versioning_catalog()
+        hidden = catalog.hidden_versions() if catalog else []
+        results["summarized_sources"] = summaries.backfill(client, COLLECTION_NAME, hidden)
+        print(f"Summarized {results['summarized_sources']} sources")
+
+    for path in DATASETS:
+        with open(path, "r") as f:
+            items = json.load(f)
+        results[path.stem] = run_dataset(embed, store, summaries, items, sizes)
+        print(f"{path.stem}: {json.dumps(results[path.stem], indent=2)}")
+
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
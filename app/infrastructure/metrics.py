@@ -58,6 +58,33 @@ rag_chunks_retrieved = Histogram(
     registry=registry
 )
 
+rag_domain_autofilter_total = Counter(
+    "rag_domain_autofilter_total",
+    "Queries without domain by auto-detection outcome",
+    ['outcome'],  # applied/skipped/fallback
+    registry=registry
+)
+
+rag_domain_autofilter_search_seconds = Histogram(
+    "rag_domain_autofilter_search_seconds",
+    "Vector search duration for queries without domain",
+    ['scope'],  # auto/unfiltered
+    registry=registry
+)
+
+rag_source_preselection_total = Counter(
+    "rag_source_preselection_total",
+    "Two-stage queries by outcome of the source summary stage",
+    ['outcome'],  # applied/empty/error
+    registry=registry
+)
+
+rag_source_preselection_seconds = Histogram(
+    "rag_source_preselection_seconds",
+    "Duration of the source summary stage",
+    registry=registry
+)
+
 celery_tasks_total = Counter(
     'celery_tasks_total',
     'Total tasks finally',
@@ -116,6 +143,46 @@ documents_chunks_total = Counter(
     registry=registry
 )
 
+ingestion_stage_items_total = Counter(
+    'ingestion_stage_items_total',
+    'Chunks processed by each ingestion pipeline stage',
+    ['stage'],  # chunk/resolve/embed/upsert
+    registry=registry
+)
+
+ingestion_chunks_filtered_total = Counter(
+    'ingestion_chunks_filtered_total',
+    'Low-information chunks caught by the quality filter before embedding',
+    ['reason'],
+    registry=registry
+)
+
+ingestion_stage_duration_seconds = Histogram(
+    'ingestion_stage_duration_seconds',
+    'Time spent by an ingestion pipeline stage on one batch',
+    ['stage'],
+    registry=registry
+)
+
+crawler_pages_total = Counter(
+    'crawler_pages_total',
+    'Pages visited by the documentation crawler',
+    ['outcome'],  # changed/unchanged/failed/skipped
+    registry=registry
+)
+
+crawler_bytes_saved_total = Counter(
+    'crawler_bytes_saved_total',
+    'Response bytes not downloaded thanks to conditional requests',
+    registry=registry
+)
+
+crawler_pages_per_second = Gauge(
+    'crawler_pages_per_second',
+    'Throughput of the last finished crawl',
+    registry=registry
+)
+
 # ================================
 # Cost & Token Metrics
 # ================================
@@ -0,0 +1,99 @@
+"""
+Embedding service that coalesces concurrent batch_embed calls into one model call.
+
+Used when several documents are ingested at once in the same process: each
+document's pipeline keeps calling batch_embed with its own small batches, and
+a single worker thread merges whatever is waiting into larger batches.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List
+
+import structlog
+
+from .interfaces import HybridEmbeddingInterface, HybridVector
+
+
+log = structlog.get_logger()
+
+
+class CoalescingEmbedService(HybridEmbeddingInterface):
+    """
+    Wraps a HybridEmbeddingInterface and merges concurrent passage batches.
+
+    Query embeddings are passed straight through.
+    """
+
+    def __init__(
+        self,
+        inner: HybridEmbeddingInterface,
+        max_batch: int = 64,
+        max_wait_ms: int = 20,
+    ) -> None:
+        self.inner = inner
+        self.model_version = inner.model_version
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self._requests: queue.Queue[tuple[list[str], Future] | None] = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="embed-coalescer", daemon=True
+        )
+        self._worker.start()
+
+    def embed(self, text: str, query: bool = False) -> HybridVector:
+        return self.inner.embed(text, query=query)
+
+    def batch_embed(self, chunk_list: list[str], query: bool = False) -> List[HybridVector]:
+        if query:
+            return self.inner.batch_embed(chunk_list, query=True)
+
+        future: Future = Future()
+        self._requests.put((list(chunk_list), future))
+        return future.result()
+
+    def close(self) -> None:
+        self._requests.put(None)
+        self._worker.join()
+
+    def _collect(self, first: tuple[list[str], Future]) -> tuple[list, bool]:
+        """Gather pending requests until max_batch texts or max_wait elapses."""
+        pending = [first]
+        size = len(first[0])
+        while size < self.max_batch:
+            try:
+                item = self._requests.get(timeout=self.max_wait)
+            except queue.Empty:
+                break
+            if item is None:
+                return pending, True
+            pending.append(item)
+            size += len(item[0])
+        return pending, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._requests.get()
+            if first is None:
+                return
+
+            pending, closing = self._collect(first)
+            texts = [text for chunk_list, _ in pending for text in chunk_list]
+            try:
+                vectors = self.inner.batch_embed(texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+            else:
+                offset = 0
+                for chunk_list, future in pending:
+                    future.set_result(vectors[offset : offset + len(chunk_list)])
+                    offset += len(chunk_list)
+
+                if len(pending) > 1:
+                    log.debug("embed_coalesced", requests=len(pending), texts=len(texts))
+
+            if closing:
+                return
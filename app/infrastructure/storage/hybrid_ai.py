@@ -81,10 +81,20 @@ def _parse_sparse_output(sparse_output) -> dict:
     raise EmbeddingError(f"Unknown sparse encoder output format: {type(sparse_output)}")
 
 
+DENSE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SPARSE_MODEL = "prithivida/Splade_PP_en_v2"
+
+
 class HybridEmbeddingService(HybridEmbeddingInterface):
-    def __init__(self, dense_model: SentenceTransformer, sparse_model: SparseEncoder):
+    def __init__(
+        self,
+        dense_model: SentenceTransformer,
+        sparse_model: SparseEncoder,
+        model_version: str = "unknown",
+    ):
         self.dense_model = dense_model
         self.sparse_model = sparse_model
+        self.model_version = model_version
 
     @time_response
     def embed(self, text: str, query: bool = False) -> HybridVector:
@@ -170,10 +180,9 @@ class HybridEmbeddingService(HybridEmbeddingInterface):
 
 
 embedding = HybridEmbeddingService(
-    dense_model=SentenceTransformer(
-        "sentence-transformers/all-MiniLM-L6-v2", device="cpu"
-    ),
-    sparse_model=SparseEncoder("prithivida/Splade_PP_en_v2"),
+    dense_model=SentenceTransformer(DENSE_MODEL, device="cpu"),
+    sparse_model=SparseEncoder(SPARSE_MODEL),
+    model_version=f"{DENSE_MODEL}+{SPARSE_MODEL}",
 )
 
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, List, Dict
 from pydantic import BaseModel
 
@@ -8,6 +8,10 @@ from pydantic import BaseModel
 class FilterContext:
     domain: str | None = None
     topic: str | None = None
+    # Chunk versions that must not be visible (in-flight or retired reindexes)
+    hidden_versions: list[str] = field(default_factory=list)
+    # Restrict the search to these sources (two-stage retrieval); empty = all
+    sources: list[str] = field(default_factory=list)
 
 class HybridVector(BaseModel):
     dense: List[float]
@@ -16,9 +20,14 @@ class HybridVector(BaseModel):
 class VectorStoreInterface(ABC):
     @abstractmethod
     def query(
-        self, query_vector: HybridVector, limit: int, filter_context: FilterContext
+        self,
+        query_vector: HybridVector,
+        limit: int,
+        filter_context: FilterContext,
+        oversampling: float | None = None,
+        rescore: bool | None = None,
     ) -> list[Any]:
-        """Search similar vectors"""
+        """Search similar vectors (oversampling/rescore tune quantized search)"""
         pass
 
     @abstractmethod
@@ -35,6 +44,11 @@ class VectorStoreInterface(ABC):
         """Retrieve vectors by their IDs"""
         pass
 
+    @abstractmethod
+    def get_payloads(self, hash_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+        """Payloads of points by id, without vectors (e.g. parent passages)."""
+        pass
+
     @abstractmethod
     def rerank(self, query: str, search_result: list) -> List[Any]:
         """Sort order results"""
@@ -51,12 +65,31 @@ class VectorStoreInterface(ABC):
         pass
 
     @abstractmethod
-    def list_sources(self, domain: str | None = None) -> List[Dict[str, Any]]:
+    def delete_versions(self, source: str, versions: List[str]) -> None:
+        """Delete the points of specific versions of a source (version GC)."""
+        pass
+
+    @abstractmethod
+    def existing_ids(self, hash_ids: List[str]) -> set[str]:
+        """The given point ids that exist in the store."""
+        pass
+
+    @abstractmethod
+    def delete_points(self, hash_ids: List[str]) -> None:
+        """Delete specific points by id."""
+        pass
+
+    @abstractmethod
+    def list_sources(
+        self, domain: str | None = None, hidden_versions: List[str] | None = None
+    ) -> List[Dict[str, Any]]:
         """List unique sources with metadata using scroll (for document management)."""
         pass
 
     @abstractmethod
-    def get_source_metadata(self, source: str) -> Dict[str, Any] | None:
+    def get_source_metadata(
+        self, source: str, hidden_versions: List[str] | None = None
+    ) -> Dict[str, Any] | None:
         """Get aggregated metadata for a specific source (domain, topic, chunks count)."""
         pass
 
@@ -73,6 +106,10 @@ class EmbeddingInterface(ABC):
 
 
 class HybridEmbeddingInterface(ABC):
+    # Identifies the models behind the vectors; stored in chunk manifests so a
+    # model change forces full re-embedding
+    model_version: str = "unknown"
+
     @abstractmethod
     def embed(self, text: str, query: bool = False) -> HybridVector:
         pass
@@ -1,10 +1,12 @@
-from typing import List
+from typing import List, Literal
 from qdrant_client import QdrantClient
 from qdrant_client import models
 import torch
 import structlog
 
-from .interfaces import HybridVector, VectorStoreInterface
+from .interfaces import FilterContext, HybridVector, VectorStoreInterface
+from .text_store import ChunkTextStore, get_chunk_text_store
+from ...api.retrieval_engine.source_catalog import LEGACY_VERSION
 from ...infrastructure.embedding import get_rerank_model
 from ...infrastructure.logging import time_response
 from ...api.retrieval_engine.exceptions import VectorStoreError
@@ -32,25 +34,104 @@ def get_qdrant_client() -> QdrantClient:
 
 class QdrantStore(VectorStoreInterface):
     def __init__(
-        self, client: QdrantClient | None = None, rerank_threshold: float = 0.6
+        self,
+        client: QdrantClient | None = None,
+        rerank_threshold: float = 0.6,
+        collection_name: str = COLLECTION_NAME,
+        quantization: Literal["none", "scalar", "binary"] | None = None,
+        text_store: ChunkTextStore | None = None,
+        alias: str | None = None,
     ) -> None:
+        settings = get_settings()
         self.client = client or get_qdrant_client()
         self.rerank_model = get_rerank_model()
         self.rerank_threshold = rerank_threshold
+        self.collection_name = collection_name
+        # Name the collection is (or will be) served under; a rebuild's target
+        # collection shares it with the live one
+        self.alias = alias or collection_name
+        self.quantization = quantization or settings.qdrant_quantization
+        self.default_oversampling = settings.qdrant_oversampling
+        self.default_rescore = settings.qdrant_rescore
+        # When set, chunk texts live out of band and payloads keep only filter fields
+        self.text_store = text_store
+
+    def _quantization_config(self):
+        """
+        Quantization for the dense vector.
+
+        Binary codes are kept in RAM while the original vectors stay on disk,
+        so only the oversampled candidates pay a disk read during rescoring.
+        """
+        if self.quantization == "none":
+            return None
+        if self.quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=False
+            )
+        )
+
+    def _search_params(
+        self, oversampling: float | None, rescore: bool | None
+    ) -> models.SearchParams | None:
+        """Per-query quantization params. Binary mode always oversamples and rescores."""
+        if self.quantization == "binary":
+            oversampling = oversampling or self.default_oversampling
+            rescore = self.default_rescore if rescore is None else rescore
+
+        if oversampling is None and rescore is None:
+            return None
+
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=rescore, oversampling=oversampling
+            )
+        )
+
+    def _sync_quantization(self) -> None:
+        """Apply the configured quantization to an already existing collection."""
+        info = self.client.get_collection(self.collection_name)
+        current = info.config.quantization_config
+        wanted = {
+            "none": type(None),
+            "scalar": models.ScalarQuantization,
+            "binary": models.BinaryQuantization,
+        }[self.quantization]
+
+        if isinstance(current, wanted):
+            return
+
+        config = self._quantization_config()
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            quantization_config=config if config is not None else models.Disabled.DISABLED,
+        )
+        log.info(
+            "Qdrant quantization updated",
+            collection=self.collection_name,
+            quantization=self.quantization,
+        )
 
     @time_response
     def create_collection(self):
-        log.info("Verifying if Qdrant collection exists", collection=COLLECTION_NAME)
+        log.info("Verifying if Qdrant collection exists", collection=self.collection_name)
 
-        exists = self.client.collection_exists(COLLECTION_NAME)
+        exists = self.client.collection_exists(self.collection_name)
 
         if exists:
-            log.info("Qdrant collection exists", collection=COLLECTION_NAME)
+            log.info("Qdrant collection exists", collection=self.collection_name)
+            self._sync_quantization()
+            self._ensure_payload_indexes()
             return
 
         try:
             self.client.create_collection(
-                collection_name=COLLECTION_NAME,
+                collection_name=self.collection_name,
                 vectors_config={
                     "dense": models.VectorParams(
                         size=384, distance=models.Distance.COSINE, on_disk=True
@@ -61,22 +142,30 @@ class QdrantStore(VectorStoreInterface):
                         index=models.SparseIndexParams(on_disk=True)
                     )
                 },
-                quantization_config=models.ScalarQuantization(
-                    scalar=models.ScalarQuantizationConfig(
-                        type=models.ScalarType.INT8, quantile=0.99, always_ram=False
-                    )
-                ),
+                quantization_config=self._quantization_config(),
             )
 
-            log.info("Qdrant collection created", collection=COLLECTION_NAME)
+            self._ensure_payload_indexes()
+
+            log.info(
+                "Qdrant collection created",
+                collection=self.collection_name,
+                quantization=self.quantization,
+            )
 
         except Exception as e:
             raise VectorStoreError("Failed to create collection") from e
 
-    @time_response
-    def query(
-        self, query_vector: HybridVector, limit: int, filter_context
-    ) -> List[models.ScoredPoint]:
+    def _ensure_payload_indexes(self) -> None:
+        """Keyword indexes for the fields used by version filters and GC deletes."""
+        for field in ("source", "version"):
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field,
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+
+    def build_filter(self, filter_context) -> models.Filter | None:
         conditions = []
         if filter_context.domain:
             conditions.append(
@@ -92,10 +181,40 @@ class QdrantStore(VectorStoreInterface):
                 )
             )
 
-        query_filter = models.Filter(must=conditions) if conditions else None
+        if filter_context.sources:
+            conditions.append(
+                models.FieldCondition(
+                    key="source", match=models.MatchAny(any=filter_context.sources)
+                )
+            )
+
+        must_not = []
+        if filter_context.hidden_versions:
+            must_not.append(
+                models.FieldCondition(
+                    key="version",
+                    match=models.MatchAny(any=filter_context.hidden_versions),
+                )
+            )
+
+        if not conditions and not must_not:
+            return None
+
+        return models.Filter(must=conditions or None, must_not=must_not or None)
+
+    @time_response
+    def query(
+        self,
+        query_vector: HybridVector,
+        limit: int,
+        filter_context,
+        oversampling: float | None = None,
+        rescore: bool | None = None,
+    ) -> List[models.ScoredPoint]:
+        query_filter = self.build_filter(filter_context)
 
         search_result = self.client.query_points(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection_name,
             prefetch=[
                 models.Prefetch(
                     query=models.NearestQuery(
@@ -104,6 +223,7 @@ class QdrantStore(VectorStoreInterface):
                     ),
                     using="dense",
                     limit=limit,
+                    params=self._search_params(oversampling, rescore),
                 ),
                 models.Prefetch(
                     query=models.SparseVector(
@@ -120,6 +240,9 @@ class QdrantStore(VectorStoreInterface):
             limit=limit,
         ).points
 
+        if self.text_store:
+            self.text_store.hydrate(search_result)
+
         return search_result
 
     def create_point(self, hash_id, vector, payload) -> models.PointStruct:
@@ -128,17 +251,54 @@ class QdrantStore(VectorStoreInterface):
     @time_response
     def retrieve(self, hash_ids: List[str]) -> List[models.Record]:
         return self.client.retrieve(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection_name,
             ids=hash_ids,
             with_payload=True,
             with_vectors=True,
         )
 
+    def existing_ids(self, hash_ids: List[str]) -> set[str]:
+        """The given point ids that exist in the collection."""
+        points = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=hash_ids,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return {str(p.id) for p in points}
+
+    @time_response
+    def get_payloads(self, hash_ids: List[str]) -> dict[str, dict]:
+        """Payloads (text included) of the given points, without their vectors."""
+        points = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=hash_ids,
+            with_payload=True,
+            with_vectors=False,
+        )
+        if self.text_store:
+            self.text_store.hydrate(points)
+        return {str(p.id): p.payload for p in points}
+
+    def _store_texts_out_of_band(self, points: List[models.PointStruct]) -> None:
+        """Move payload texts into the text store before the points reach Qdrant."""
+        rows = []
+        for point in points:
+            payload = point.payload or {}
+            if "text" in payload:
+                rows.append(
+                    (point.id, payload.get("source", ""), payload.get("version"), payload.pop("text"))
+                )
+        self.text_store.put_many(rows)
+
     @time_response
     def insert_vector(self, points: List[models.PointStruct], batch_size: int = 64):
+        if self.text_store:
+            self._store_texts_out_of_band(points)
+
         for i in range(0, len(points), batch_size):
             batch = points[i : i + batch_size]
-            self.client.upsert(collection_name=COLLECTION_NAME, points=batch)
+            self.client.upsert(collection_name=self.collection_name, points=batch)
 
     @time_response
     def rerank(self, query: str, search_result: list) -> List[models.ScoredPoint]:
@@ -196,7 +356,7 @@ class QdrantStore(VectorStoreInterface):
         # We keep the old logic here to avoid breaking changes, 
         # but ideally, we refactor this to use delete_by_filter
         deleted = self.client.delete(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection_name,
             points_selector=models.FilterSelector(
                 filter=models.Filter(
                     must=[
@@ -245,50 +405,186 @@ class QdrantStore(VectorStoreInterface):
             return
             
         self.client.delete(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection_name,
             points_selector=models.FilterSelector(
                 filter=models.Filter(must=must_conditions)
             ),
         )
+        if self.text_store and set(filter_conditions) == {"source"}:
+            self.text_store.delete(filter_conditions["source"])
+
         log.info("Deleted points by filter", conditions=filter_conditions)
 
     @time_response
-    def list_sources(self, domain: str | None = None) -> list[dict]:
+    def delete_points(self, hash_ids: List[str]) -> None:
+        if not hash_ids:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=hash_ids),
+        )
+        if self.text_store:
+            self.text_store.delete_ids(hash_ids)
+
+    @time_response
+    def delete_versions(self, source: str, versions: List[str]) -> None:
+        """
+        Delete the points of retired/abandoned versions of a source.
+        The "legacy" version matches points ingested before versioning (no tag).
+        """
+        if not versions:
+            return
+
+        source_condition = models.FieldCondition(
+            key="source", match=models.MatchValue(value=source)
+        )
+        tagged = [v for v in versions if v != LEGACY_VERSION]
+
+        if tagged:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(
+                        must=[
+                            source_condition,
+                            models.FieldCondition(
+                                key="version", match=models.MatchAny(any=tagged)
+                            ),
+                        ]
+                    )
+                ),
+                wait=False,
+            )
+
+        if LEGACY_VERSION in versions:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(
+                        must=[
+                            source_condition,
+                            models.IsEmptyCondition(
+                                is_empty=models.PayloadField(key="version")
+                            ),
+                        ]
+                    )
+                ),
+                wait=False,
+            )
+
+        if self.text_store:
+            self.text_store.delete(
+                source, [None if v == LEGACY_VERSION else v for v in versions]
+            )
+
+        log.info("Deleted source versions", source=source, versions=versions)
+
+    @time_response
+    def copy_source_points(
+        self, source: str, target: "QdrantStore", hidden_versions: List[str] | None = None
+    ) -> int:
+        """Copy the visible points of a source (vectors included) into another store."""
+        scroll_filter = self.build_filter(
+            FilterContext(hidden_versions=hidden_versions or [])
+        ) or models.Filter()
+        scroll_filter.must = [
+            models.FieldCondition(key="source", match=models.MatchValue(value=source))
+        ]
+
+        copied = 0
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if points:
+                target.insert_vector(
+                    [self.create_point(p.id, p.vector, p.payload) for p in points]
+                )
+                copied += len(points)
+            if offset is None:
+                break
+
+        return copied
+
+    @time_response
+    def swap_alias(self, alias: str, target_collection: str) -> list[str]:
+        """
+        Point `alias` to `target_collection` in a single atomic operation.
+
+        Returns the collections the alias pointed to before the swap. If `alias`
+        is still a physical collection (pre-alias deployments), it is dropped
+        first: that one-time migration is the only non-atomic step.
+        """
+        previous = [
+            a.collection_name
+            for a in self.client.get_aliases().aliases
+            if a.alias_name == alias
+        ]
+
+        if not previous and self.client.collection_exists(alias):
+            log.warning("Dropping physical collection to replace it by an alias", collection=alias)
+            self.client.delete_collection(alias)
+
+        operations = []
+        if previous:
+            operations.append(
+                models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=alias)
+                )
+            )
+        operations.append(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=target_collection, alias_name=alias
+                )
+            )
+        )
+
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        log.info("Qdrant alias swapped", alias=alias, target=target_collection, previous=previous)
+        return previous
+
+    @time_response
+    def list_sources(
+        self, domain: str | None = None, hidden_versions: List[str] | None = None
+    ) -> list[dict]:
         """
         List unique sources with chunk counts.
         Uses scroll API to iterate through points (since Qdrant doesn't have DISTINCT).
+        Points of hidden versions (in flight or retired) are not counted, as in query().
         
         Returns:
             [{"source": "...", "domain": "...", "topic": "...", "chunk_count": N}, ...]
         """
         sources_map = {}  # source -> {domain, topic, count}
         
-        # Build filter for domain if provided
-        scroll_filter = None
-        if domain:
-            scroll_filter = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="domain", match=models.MatchValue(value=domain)
-                    )
-                ]
-            )
+        scroll_filter = self.build_filter(
+            FilterContext(domain=domain, hidden_versions=hidden_versions or [])
+        )
         
         # Scroll through all points
         offset = None
         while True:
             points, offset = self.client.scroll(
-                collection_name=COLLECTION_NAME,
+                collection_name=self.collection_name,
                 scroll_filter=scroll_filter,
                 limit=256,
-                with_payload=True,
+                offset=offset,
+                with_payload=["source", "domain", "topic", "kind"],
                 with_vectors=False,
             )
             
             for point in points:
                 payload = point.payload
                 source = payload.get("source")
-                if not source:
+                # parent passages (parent_child chunking) are not chunks
+                if not source or payload.get("kind") == "parent":
                     continue
                     
                 if source not in sources_map:
@@ -306,28 +602,28 @@ class QdrantStore(VectorStoreInterface):
         return list(sources_map.values())
 
     @time_response
-    def get_source_metadata(self, source: str) -> dict | None:
+    def get_source_metadata(
+        self, source: str, hidden_versions: List[str] | None = None
+    ) -> dict | None:
         """
         Get aggregated metadata for a specific source.
+        Points of hidden versions (in flight or retired) are left out, as in query().
         
         Returns:
             {"source": "...", "domain": "...", "topic": "...", 
              "chunk_count": N, "last_ingested": timestamp} or None
         """
-        # Query points with this source
+        # Query the visible points with this source
         points, _ = self.client.scroll(
-            collection_name=COLLECTION_NAME,
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="source", match=models.MatchValue(value=source)
-                    )
-                ]
+            collection_name=self.collection_name,
+            scroll_filter=self.build_filter(
+                FilterContext(sources=[source], hidden_versions=hidden_versions or [])
             ),
             limit=1000,  # Assuming a source won't have more than 1000 chunks
-            with_payload=True,
+            with_payload=["domain", "topic", "ingested_at", "kind"],
             with_vectors=False,
         )
+        points = [p for p in points if p.payload.get("kind") != "parent"]
         
         if not points:
             return None
@@ -362,5 +658,7 @@ def get_qdrant_store() -> QdrantStore:
     """Get or create QdrantStore singleton."""
     global _qdrant_store
     if _qdrant_store is None:
-        _qdrant_store = QdrantStore(client=get_qdrant_client())
+        _qdrant_store = QdrantStore(
+            client=get_qdrant_client(), text_store=get_chunk_text_store()
+        )
     return _qdrant_store
@@ -0,0 +1,153 @@
+"""
+Out-of-band store for chunk texts.
+
+Qdrant payloads only carry ids and filter fields; the chunk text lives here,
+zstd-compressed in a SQLite file keyed by point id, and is fetched in one
+batched lookup for the points a query actually returns.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+import structlog
+import zstandard as zstd
+
+from ...core.settings import get_settings
+
+
+log = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_text (
+    id      TEXT PRIMARY KEY,
+    source  TEXT NOT NULL,
+    version TEXT,
+    body    BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunk_text_source ON chunk_text (source, version);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 900
+
+
+class ChunkTextStore:
+    """
+    SQLite-backed, zstd-compressed chunk text store.
+
+    Safe to share between the API and Celery workers through a shared volume
+    (WAL mode); within a process a lock serializes access to the connection.
+    """
+
+    def __init__(self, path: str, level: int = 3) -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        self._compressor = zstd.ZstdCompressor(level=level)
+        self._decompressor = zstd.ZstdDecompressor()
+
+    def put_many(self, rows: Iterable[tuple[str, str, str | None, str]]) -> int:
+        """Store (id, source, version, text) rows, replacing existing ids."""
+        records = [
+            (str(point_id), source, version, self._compressor.compress(text.encode()))
+            for point_id, source, version, text in rows
+        ]
+        if not records:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunk_text (id, source, version, body) VALUES (?, ?, ?, ?)",
+                records,
+            )
+        return len(records)
+
+    def get_many(self, ids: Iterable) -> dict[str, str]:
+        """Texts for the given point ids (missing ids are simply absent)."""
+        keys = list(dict.fromkeys(str(i) for i in ids))
+        texts: dict[str, str] = {}
+
+        with self._lock:
+            for i in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[i : i + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT id, body FROM chunk_text WHERE id IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for point_id, body in rows:
+                    texts[point_id] = self._decompressor.decompress(body).decode()
+
+        return texts
+
+    def hydrate(self, points: list) -> list:
+        """Fill payload["text"] of points that were stored without it."""
+        missing = [p for p in points if p.payload is not None and "text" not in p.payload]
+        if not missing:
+            return points
+
+        texts = self.get_many(p.id for p in missing)
+        for point in missing:
+            text = texts.get(str(point.id))
+            if text is None:
+                log.warning("chunk_text_missing", point_id=str(point.id))
+                text = ""
+            point.payload["text"] = text
+
+        return points
+
+    def delete(self, source: str, versions: list[str | None] | None = None) -> None:
+        """Delete the texts of a source, optionally only for some versions (None = untagged)."""
+        with self._lock, self._conn:
+            if versions is None:
+                self._conn.execute("DELETE FROM chunk_text WHERE source = ?", (source,))
+                return
+
+            for version in versions:
+                if version is None:
+                    self._conn.execute(
+                        "DELETE FROM chunk_text WHERE source = ? AND version IS NULL",
+                        (source,),
+                    )
+                else:
+                    self._conn.execute(
+                        "DELETE FROM chunk_text WHERE source = ? AND version = ?",
+                        (source, version),
+                    )
+
+    def delete_ids(self, ids: Iterable) -> None:
+        keys = [str(i) for i in ids]
+        with self._lock, self._conn:
+            for i in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[i : i + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                self._conn.execute(f"DELETE FROM chunk_text WHERE id IN ({placeholders})", batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM chunk_text"
+            ).fetchone()
+        return {"chunks": count, "compressed_bytes": size}
+
+
+_text_store: ChunkTextStore | None = None
+
+
+def get_chunk_text_store() -> ChunkTextStore | None:
+    """Get the text store singleton, or None when chunk texts live in Qdrant payloads."""
+    global _text_store
+    path = get_settings().chunk_text_store_path
+    if not path:
+        return None
+    if _text_store is None:
+        _text_store = ChunkTextStore(path)
+    return _text_store
@@ -9,6 +9,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from .infrastructure.logging import register_exceptions_handlers, logger
 from .infrastructure.metrics import http_requests_total, registry
 from .infrastructure.storage.qdrant_client import get_qdrant_store
+from .api.retrieval_engine.summary_index import get_summary_index
+from .api.retrieval_engine.domain_index import get_domain_index
+from .api.retrieval_engine.source_catalog import get_versioning_catalog
+from .api.retrieval_engine.jobs.celery_tasks import (
+    backfill_domain_index_task,
+    backfill_summary_index_task,
+)
+from .api.extraction.http_client import close_http_clients
 from .api.retrieval_engine.router import router as rag_router
 from .api.llamaindex_adapter.router import router as llama_router
 from .api.agent.router import router as agent_router
@@ -22,10 +30,22 @@ async def lifespan(app: FastAPI):
     # Run sync Qdrant operation in thread pool to avoid blocking event loop
     rag_client = await asyncio.to_thread(get_qdrant_store)
     await asyncio.to_thread(rag_client.create_collection)
+    summary_index = get_summary_index()
+    if summary_index is not None:
+        await asyncio.to_thread(summary_index.create_collection)
+        # Two-stage search stays flat until every catalog source has a summary
+        catalog = get_versioning_catalog()
+        if catalog is not None and not await asyncio.to_thread(summary_index.is_complete, catalog):
+            backfill_summary_index_task.delay()
+    # Domain auto-detection stays off until the index covers every source
+    domain_index = get_domain_index()
+    if domain_index is not None and not await asyncio.to_thread(domain_index.is_backfilled):
+        backfill_domain_index_task.delay()
 
     logger.info("application_ready", phase="startup_complete")
     yield
     logger.info("shutdown_application", phase="shutdown")
+    await close_http_clients()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -3,7 +3,9 @@ Test configuration and fixtures.
 """
 
 import os
+import sys
 import tempfile
+from types import SimpleNamespace
 
 import pytest
 from unittest.mock import MagicMock
@@ -11,6 +13,11 @@ from unittest.mock import MagicMock
 # Setup prometheus multiprocess environment before any imports
 os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp())
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.schema import ChunkWithMetadata  # noqa: E402
+from app.infrastructure.storage.interfaces import HybridVector  # noqa: E402
+
 
 @pytest.fixture
 def mock_llm_provider():
@@ -43,3 +50,78 @@ def mock_llm_client():
         provider="test",
     )
     return client
+
+
+class FakeStore:
+    """In-memory vector store: keeps every point and the batches it was written in."""
+
+    collection_name = "documents"
+
+    def __init__(self):
+        self.points = {}
+        self.batches = []
+        self.deleted = []
+
+    def create_point(self, hash_id, vector, payload):
+        return SimpleNamespace(id=hash_id, vector=vector, payload=payload)
+
+    def insert_vector(self, points):
+        self.batches.append(points)
+        self.points.update((p.id, p) for p in points)
+
+    @property
+    def inserted(self):
+        return [p for batch in self.batches for p in batch]
+
+    def insert(self, hash_id, text, source):
+        """Write one point directly, as a previous ingestion would have."""
+        self.points[hash_id] = self.create_point(
+            hash_id, {"dense": [float(len(text))]}, {"source": source, "text": text}
+        )
+
+    def retrieve(self, ids):
+        return [self.points[i] for i in ids if i in self.points]
+
+    def existing_ids(self, ids):
+        return {i for i in ids if i in self.points}
+
+    def delete_points(self, ids):
+        self.deleted.extend(ids)
+        for i in ids:
+            self.points.pop(i, None)
+
+
+class FakeEmbedder:
+    """Embeds everything to the same vector; raises once `fail_after` texts were embedded."""
+
+    def __init__(self, fail_after: int | None = None):
+        self.texts = []
+        self.fail_after = fail_after
+
+    def batch_embed(self, texts):
+        if self.fail_after is not None and len(self.texts) >= self.fail_after:
+            raise RuntimeError("model crashed")
+        self.texts.extend(texts)
+        return [HybridVector(dense=[1.0, 0.0], sparse={"indices": [], "values": []}) for _ in texts]
+
+
+@pytest.fixture
+def fake_store():
+    """Create an empty in-memory vector store."""
+    return FakeStore()
+
+
+@pytest.fixture
+def fake_embedder():
+    """Factory of fake embedders (fail_after=0 fails on the first batch)."""
+    return FakeEmbedder
+
+
+@pytest.fixture
+def make_chunks():
+    """Factory of `n` numbered chunks."""
+
+    def make(n, section=None):
+        return [ChunkWithMetadata(text=f"chunk {i}", section=section) for i in range(n)]
+
+    return make
@@ -0,0 +1,133 @@
+"""
+Tests para las piezas de la ingestión masiva: embedder que agrupa llamadas
+concurrentes y semáforo por host en Redis.
+"""
+
+import asyncio
+import threading
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Try to import fakeredis, skip if not available
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+from app.infrastructure.storage.coalescing_embedder import CoalescingEmbedService
+from app.infrastructure.storage.interfaces import HybridEmbeddingInterface, HybridVector
+
+
+class RecordingEmbedder(HybridEmbeddingInterface):
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, text, query=False):
+        return HybridVector(dense=[0.0], sparse={"indices": [], "values": []})
+
+    def batch_embed(self, chunk_list, query=False):
+        self.calls.append(list(chunk_list))
+        return [
+            HybridVector(dense=[float(len(t))], sparse={"indices": [], "values": []})
+            for t in chunk_list
+        ]
+
+
+class TestCoalescingEmbedService:
+    """Tests para el agrupado de embeddings entre documentos."""
+
+    def test_concurrent_calls_share_model_batches(self):
+        """Llamadas concurrentes deberían resolverse con menos llamadas al modelo."""
+        inner = RecordingEmbedder()
+        embedder = CoalescingEmbedService(inner, max_batch=100, max_wait_ms=200)
+        results = {}
+
+        def call(name, texts):
+            results[name] = embedder.batch_embed(texts)
+
+        threads = [
+            threading.Thread(target=call, args=(f"doc{i}", ["x" * (i + 1)] * 3))
+            for i in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        embedder.close()
+
+        assert len(inner.calls) < 4
+        for i in range(4):
+            assert [v.dense[0] for v in results[f"doc{i}"]] == [float(i + 1)] * 3
+
+    def test_errors_reach_every_caller(self):
+        """Un error del modelo debería propagarse a quien lo llamó."""
+
+        class Broken(RecordingEmbedder):
+            def batch_embed(self, chunk_list, query=False):
+                raise RuntimeError("boom")
+
+        embedder = CoalescingEmbedService(Broken(), max_wait_ms=1)
+        with pytest.raises(RuntimeError, match="boom"):
+            embedder.batch_embed(["a"])
+        embedder.close()
+
+
+@pytest.fixture
+def limiter():
+    if not HAS_FAKEREDIS:
+        pytest.skip("fakeredis not installed")
+    from app.api.retrieval_engine.jobs.host_limiter import HostConcurrencyLimiter
+
+    return HostConcurrencyLimiter(redis=fakeredis.FakeRedis(), limit=2, lease_seconds=60)
+
+
+class TestHostConcurrencyLimiter:
+    """Tests para el semáforo distribuido por host."""
+
+    def test_limit_per_host(self, limiter):
+        """No debería dar más slots que el límite para un mismo host."""
+        first = limiter.try_acquire("docs.example.com")
+        second = limiter.try_acquire("docs.example.com")
+
+        assert first and second
+        assert limiter.try_acquire("docs.example.com") is None
+        assert limiter.try_acquire("other.example.com") is not None
+
+        limiter.release("docs.example.com", first)
+
+        assert limiter.try_acquire("docs.example.com") is not None
+
+    def test_expired_leases_are_reclaimed(self, limiter):
+        """Slots de workers caídos deberían liberarse al vencer el lease."""
+        limiter.try_acquire("docs.example.com")
+        limiter.try_acquire("docs.example.com")
+        limiter.lease_seconds = 0
+
+        assert limiter.try_acquire("docs.example.com") is not None
+
+    def test_held_slot_outlives_its_lease(self, limiter):
+        """Un holder vivo debería renovar su slot aunque la ingestión dure más que el lease."""
+        limiter.limit = 1
+        limiter.lease_seconds = 0.3
+
+        async def long_ingestion():
+            async with limiter.hold("docs.example.com"):
+                await asyncio.sleep(0.8)
+                return limiter.try_acquire("docs.example.com")
+
+        assert asyncio.run(long_ingestion()) is None
+        assert limiter.try_acquire("docs.example.com") is not None
+
+    def test_reclaimed_slot_is_not_renewed(self, limiter):
+        """Un slot ya liberado por vencido no debería revivir al renovarlo."""
+        token = limiter.try_acquire("docs.example.com")
+        limiter.release("docs.example.com", token)
+
+        assert not limiter.renew("docs.example.com", token)
+        assert limiter.try_acquire("docs.example.com") is not None
@@ -0,0 +1,52 @@
+"""
+Tests para el manifest de chunks de un source.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.schema import ChunkWithMetadata
+from app.api.retrieval_engine.chunk_manifest import Manifest, chunk_hash
+
+
+def chunks(*texts):
+    return [ChunkWithMetadata(text=t) for t in texts]
+
+
+def manifest_for(*texts):
+    return Manifest(
+        model="m",
+        version="v1",
+        chunks=[(chunk_hash(c), f"id-{c.text}") for c in chunks(*texts)],
+    )
+
+
+class TestManifest:
+    """Tests para la búsqueda de puntos reutilizables."""
+
+    def test_points_are_found_by_chunk_hash(self):
+        """Cada chunk conocido debería apuntar al punto que tiene su vector."""
+        points = manifest_for("a", "b", "a").points_by_hash()
+
+        assert points == {
+            chunk_hash(ChunkWithMetadata(text="a")): "id-a",
+            chunk_hash(ChunkWithMetadata(text="b")): "id-b",
+        }
+
+    def test_section_change_counts_as_new_chunk(self):
+        """Cambiar la sección cambia el payload, así que el hash ya no coincide."""
+        points = manifest_for("a").points_by_hash()
+
+        assert chunk_hash(ChunkWithMetadata(text="a", section="Intro")) not in points
+
+    def test_roundtrip_keeps_the_digest(self):
+        """Serializar el manifest no debería cambiar su huella."""
+        manifest = manifest_for("a", "b")
+
+        restored = Manifest.from_dict(manifest.to_dict())
+
+        assert restored == manifest
+        assert restored.digest() == manifest.digest()
+        assert manifest_for("b", "a").digest() != manifest.digest()
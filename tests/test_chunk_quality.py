@@ -0,0 +1,85 @@
+"""
+Tests para el filtro de calidad de chunks previo al embedding.
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.schema import ChunkWithMetadata
+from app.api.retrieval_engine.chunk_quality import ChunkQualityFilter, DroppedChunks
+
+
+PROSE = (
+    "Middleware is a function that works with every request before it is processed "
+    "by any specific path operation, and with every response before returning it. "
+    "It can run code, modify the request or the response, and then pass it on."
+)
+PROSA = (
+    "El middleware es una función que se ejecuta con cada request antes de que sea "
+    "procesada por una operación de path, y con cada response antes de devolverla."
+)
+INDEX = "attention, 12, 45-47\nembeddings, 3, 18, 102-110\nretrieval, 7, 88, 91\ntokens, 5, 9"
+COPYRIGHT = (
+    "Copyright © 2024 Example Press. All rights reserved.\n"
+    "ISBN 978-1-0000-0000-0\n"
+    "Printed in the United States of America."
+)
+CODE = (
+    "app = FastAPI()\n\n@app.get('/items/{item_id}')\nasync def read_item(item_id: int, "
+    "q: str | None = None):\n    return {'item_id': item_id, 'q': q}\n\n"
+    "@app.post('/items/')\nasync def create_item(item: Item):\n    return item"
+)
+NAV = "Home » Docs » Tutorial\n" * 4 + "Previous ← Next →"
+
+
+def test_prose_is_kept_and_junk_is_caught():
+    reasons = ChunkQualityFilter().reasons([PROSE, PROSA, INDEX, COPYRIGHT, CODE, NAV, "Contents"])
+
+    assert reasons[0] == [] and reasons[1] == []
+    assert "numeric" in reasons[2]
+    assert "boilerplate" in reasons[3]
+    assert "no_prose" in reasons[4]
+    assert "repeated_lines" in reasons[5]
+    # short on its own is not a reason to drop
+    assert reasons[6] == []
+
+
+def test_short_chunks_are_dropped_only_with_another_failed_check():
+    reasons = ChunkQualityFilter().reasons(["Yes, up to 42 employees.", "12, 45-47", "© 2024 Example Press"])
+
+    assert reasons[0] == []
+    assert reasons[1][0] == "too_short" and "numeric" in reasons[1]
+    assert reasons[2] == ["too_short", "boilerplate"]
+
+
+def _filter(quality: ChunkQualityFilter, texts: list[str]):
+    dropped = DroppedChunks()
+
+    async def run():
+        chunks = (ChunkWithMetadata(text=t, section="s") for t in texts)
+        return [c.text async for c in quality.filter(chunks, dropped)]
+
+    return asyncio.run(run()), dropped
+
+
+def test_stream_is_filtered_in_batches_and_reported():
+    texts = [PROSE, INDEX, PROSA, COPYRIGHT, PROSE]
+
+    kept, dropped = _filter(ChunkQualityFilter(batch_size=2), texts)
+
+    assert kept == [PROSE, PROSA, PROSE]
+    assert dropped.total == 2
+    assert dropped.reasons["numeric"] == 1 and dropped.reasons["boilerplate"] == 1
+    assert [s["text"][:9] for s in dropped.samples] == [INDEX[:9], COPYRIGHT[:9]]
+
+
+def test_flag_mode_keeps_every_chunk():
+    texts = [PROSE, INDEX, NAV]
+
+    kept, dropped = _filter(ChunkQualityFilter(drop=False), texts)
+
+    assert kept == texts
+    assert dropped.total == 2
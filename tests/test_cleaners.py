@@ -0,0 +1,114 @@
+"""
+Tests de los cleaners contra un corpus golden: la limpieza y los chunks deben
+ser idénticos a los de los cleaners originales (generados con ellos y
+guardados en tests/golden).
+"""
+
+import json
+import sys
+import os
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.cleaners.html_cleaner import HTMLCleaner
+from app.api.extraction.cleaners.markdown_cleaner import MarkdownCleaner
+from app.api.extraction.cleaners.pdf_cleaner import PDFCleaner
+
+
+GOLDEN = Path(__file__).parent / "golden"
+PDF_BOOKS = sorted(p for p in (GOLDEN / "pdf").glob("*.txt") if ".clean" not in p.suffixes)
+
+
+def read(path: Path) -> str:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+class TestPDFCleaner:
+    @pytest.mark.parametrize("book", PDF_BOOKS, ids=lambda p: p.stem)
+    def test_clean_matches_golden(self, book):
+        expected = read(book.with_suffix(".clean.txt"))
+
+        assert PDFCleaner().clean(read(book)) == expected
+
+    def test_cut_words_are_joined(self):
+        assert PDFCleaner().clean("re-\ntrie-\nval") == "retrieval"
+
+    def test_long_words_are_cleaned_in_linear_time(self):
+        text = ("x" * 50_000 + "\n") * 20
+
+        assert PDFCleaner().clean(text) == text.strip()
+
+
+def golden_chunks(path: Path) -> list[list]:
+    with open(path.with_suffix(".chunks.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def as_pairs(chunks) -> list[list]:
+    return [[c.section, c.text] for c in chunks]
+
+
+class TestChunkers:
+    @pytest.mark.parametrize("book", PDF_BOOKS, ids=lambda p: p.stem)
+    def test_pdf_chunks_match_golden(self, book):
+        clean = read(book.with_suffix(".clean.txt"))
+
+        assert as_pairs(PDFCleaner().chunk(clean)) == golden_chunks(book)
+
+    @pytest.mark.parametrize(
+        "doc", sorted((GOLDEN / "markdown").glob("*.md")), ids=lambda p: p.stem
+    )
+    def test_markdown_chunks_match_golden(self, doc):
+        cleaner = MarkdownCleaner()
+
+        assert as_pairs(cleaner.chunk(cleaner.clean(read(doc)))) == golden_chunks(doc)
+
+    @pytest.mark.parametrize(
+        "page", sorted((GOLDEN / "html").glob("*.html")), ids=lambda p: p.stem
+    )
+    def test_html_chunks_match_golden(self, page):
+        cleaner = HTMLCleaner()
+
+        assert as_pairs(cleaner.chunk(cleaner.clean(read(page)))) == golden_chunks(page)
+
+    def test_pdf_long_block_is_split_with_overlap(self):
+        block = ". ".join(f"sentence {i} about retrieval" for i in range(200))
+
+        chunks = PDFCleaner().chunk(block, max_chars=500, overlap=50)
+
+        assert all(len(c.text) <= 500 for c in chunks)
+        assert chunks[1].text[:20] in chunks[0].text
+
+
+class TestHTMLCleaner:
+    def test_clean_parses_sections_once(self):
+        cleaner = HTMLCleaner()
+        page = (
+            "<html><body><nav>menu</nav><main><h2>Intro¶</h2>loose text"
+            "<p>First <b>para</b></p><!-- note --><script>x()</script>"
+            "<h3>Details</h3><p>More</p></main><footer>f</footer></body></html>"
+        )
+
+        clean = cleaner.clean(page)
+
+        assert "menu" not in clean and "x()" not in clean
+        assert [(s.heading, s.content) for s in clean.sections] == [
+            ("Intro", ["loose text", "Firstpara"]),
+            ("Details", ["More"]),
+        ]
+        assert [(c.section, c.text) for c in cleaner.chunk(clean)] == [
+            ("Intro", "Intro\nloose text\nFirstpara"),
+            ("Details", "Details\nMore"),
+        ]
+
+    def test_chunk_accepts_raw_html(self):
+        chunks = HTMLCleaner().chunk("<main><h2>A</h2><p>b</p></main>")
+
+        assert [(c.section, c.text) for c in chunks] == [("A", "A\nb")]
+
+    def test_empty_page(self):
+        assert HTMLCleaner().chunk(HTMLCleaner().clean("<!-- nothing -->")) == []
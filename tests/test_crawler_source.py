@@ -0,0 +1,146 @@
+"""
+Tests para el crawler de documentación: alcance por prefijo, sitemaps,
+robots.txt y GET condicionales en el re-crawl.
+"""
+
+import asyncio
+import sys
+import os
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Try to import fakeredis, skip if not available
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+from app.api.extraction.source.crawler_source import (
+    CrawlerSource,
+    CrawlStateStore,
+    extract_links,
+    parse_sitemap,
+)
+
+
+SITE = {
+    "/docs/": '<a href="intro.html">Intro</a><a href="/blog/">Blog</a><a href="guide/#x">Guide</a>',
+    "/docs/intro.html": '<a href="/docs/">Home</a><a href="private.html">Private</a>',
+    "/docs/guide/": "<p>Guide</p>",
+    "/docs/private.html": "<p>Secret</p>",
+    "/blog/": "<p>Out of scope</p>",
+}
+
+
+class FakeSite:
+    """Serves SITE with ETags and answers conditional requests."""
+
+    def __init__(self):
+        self.requests: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /docs/private.html\n")
+
+        self.requests.append(path)
+        if path not in SITE:
+            return httpx.Response(404)
+
+        etag = f'"{abs(hash(SITE[path]))}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, text=SITE[path], headers={"content-type": "text/html", "etag": etag}
+        )
+
+
+def _crawl(crawler: CrawlerSource, root: str) -> list:
+    async def run():
+        return [page async for page in crawler.crawl(root)]
+
+    return asyncio.run(run())
+
+
+def test_extract_links_resolves_and_drops_fragments():
+    links = extract_links('<a href="a.html#top">A</a><a href="mailto:x@y">M</a>', "https://d.io/docs/")
+    assert links == ["https://d.io/docs/a.html"]
+
+
+def test_parse_sitemap_and_sitemap_index():
+    urlset = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>https://d.io/a</loc></url><url><loc>https://d.io/b</loc></url></urlset>"
+    )
+    index = (
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<sitemap><loc>https://d.io/s1.xml</loc></sitemap></sitemapindex>"
+    )
+    assert parse_sitemap(urlset) == (["https://d.io/a", "https://d.io/b"], [])
+    assert parse_sitemap(index) == ([], ["https://d.io/s1.xml"])
+
+
+def test_scope_is_limited_to_host_and_prefix():
+    root = "https://d.io/docs/"
+    assert CrawlerSource.in_scope("https://d.io/docs/x", root, "/docs/")
+    assert not CrawlerSource.in_scope("https://d.io/blog/", root, "/docs/")
+    assert not CrawlerSource.in_scope("https://other.io/docs/x", root, "/docs/")
+    assert CrawlerSource.default_prefix("https://d.io/docs/index.html") == "/docs/"
+
+
+@pytest.mark.skipif(not HAS_FAKEREDIS, reason="fakeredis not installed")
+def test_recrawl_uses_conditional_requests():
+    site = FakeSite()
+    state = CrawlStateStore(fakeredis.FakeRedis())
+
+    def crawler():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(site))
+        return CrawlerSource(state=state, requests_per_second=1000, client=client)
+
+    pages = _crawl(crawler(), "https://d.io/docs/")
+    by_url = {p.url: p for p in pages}
+
+    assert {p.status for p in pages} == {"changed", "skipped"}
+    assert by_url["https://d.io/docs/private.html"].error == "robots.txt"
+    assert "https://d.io/blog/" not in by_url
+    assert "/docs/private.html" not in site.requests
+
+    # Only commit pages that were "ingested"; the guide fails and stays dirty
+    committer = crawler()
+    for page in pages:
+        if page.url != "https://d.io/docs/guide/":
+            committer.commit(page)
+
+    pages = _crawl(crawler(), "https://d.io/docs/")
+    statuses = {p.url: p.status for p in pages}
+    assert statuses["https://d.io/docs/"] == "unchanged"
+    assert statuses["https://d.io/docs/intro.html"] == "unchanged"
+    assert statuses["https://d.io/docs/guide/"] == "changed"
+
+
+@pytest.mark.skipif(not HAS_FAKEREDIS, reason="fakeredis not installed")
+def test_page_errors_do_not_stall_the_crawl():
+    class BrokenState(CrawlStateStore):
+        def get(self, url):
+            if url.endswith("intro.html"):
+                raise ValueError("corrupt state entry")
+            return super().get(url)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(FakeSite()))
+    crawler = CrawlerSource(
+        state=BrokenState(fakeredis.FakeRedis()), requests_per_second=1000, client=client
+    )
+
+    async def run():
+        return [page async for page in crawler.crawl("https://d.io/docs/")]
+
+    pages = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    by_url = {p.url: p for p in pages}
+
+    assert by_url["https://d.io/docs/intro.html"].status == "failed"
+    assert by_url["https://d.io/docs/"].status == "changed"
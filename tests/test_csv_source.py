@@ -0,0 +1,70 @@
+"""
+Tests para CSVSource (ingesta tabular por bloques de filas).
+"""
+
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.exceptions import EmptySourceContentError
+from app.api.extraction.source import csv_source
+from app.api.extraction.source.csv_source import CSVSource, sniff_delimiter, sniff_encoding
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    values = SimpleNamespace(csv_rows_per_read=7, csv_chunk_max_chars=200, csv_sniff_bytes=4096)
+    monkeypatch.setattr(csv_source, "get_settings", lambda: values)
+    return values
+
+
+def collect(path: str) -> list:
+    async def run():
+        return [c async for c in CSVSource().iter_chunks_from_path(str(path), "data.csv")]
+
+    return asyncio.run(run())
+
+
+def test_every_row_is_ingested_with_header(tmp_path, settings):
+    path = tmp_path / "data.csv"
+    rows = [f"{i};ciudad {i};{'ñandú' if i % 2 else 'café'}" for i in range(1, 51)]
+    path.write_bytes(("id;nombre;nota\n" + "\n".join(rows) + "\n").encode("latin-1"))
+
+    chunks = collect(path)
+
+    body = [line for c in chunks for line in c.text.split("\n")[1:]]
+    assert body == [r.replace(";", " | ") for r in rows]
+    assert all(c.text.startswith("id | nombre | nota\n") for c in chunks)
+    assert all(len(c.text) <= settings.csv_chunk_max_chars for c in chunks)
+    assert chunks[0].section.startswith("rows 1-")
+    assert chunks[-1].section.endswith("-50")
+
+
+def test_tsv_and_quoted_cells(tmp_path, settings):
+    path = tmp_path / "data.tsv"
+    path.write_text('a\tb\n1\t"x\ny"\n2\t\n', encoding="utf-8")
+
+    chunks = collect(path)
+
+    assert [c.text for c in chunks] == ["a | b\n1 | x y\n2 | "]
+
+
+def test_empty_file_raises(tmp_path, settings):
+    path = tmp_path / "data.csv"
+    path.write_text("", encoding="utf-8")
+
+    with pytest.raises(EmptySourceContentError):
+        collect(path)
+
+
+def test_sniffing_reads_a_prefix(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes("a,b\n".encode() + "é,1\n".encode("utf-8") * 2000)
+
+    assert sniff_encoding(str(path), 1024).lower() in {"utf-8", "utf8"}
+    assert sniff_delimiter(str(path), "utf-8") == ","
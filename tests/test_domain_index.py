@@ -0,0 +1,134 @@
+"""
+Tests para DomainCentroidIndex (auto-detección de dominio).
+
+Uses fakeredis for testing without a real Redis connection.
+"""
+
+import pytest
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Try to import fakeredis, skip if not available
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+def accumulate(*vectors):
+    from app.api.retrieval_engine.domain_index import CentroidAccumulator
+
+    acc = CentroidAccumulator()
+    for vector in vectors:
+        acc.add(vector)
+    return acc
+
+
+@pytest.fixture
+def index():
+    """Create a DomainCentroidIndex backed by fake Redis."""
+    if not HAS_FAKEREDIS:
+        pytest.skip("fakeredis not installed")
+    from app.api.retrieval_engine.domain_index import DomainCentroidIndex
+
+    index = DomainCentroidIndex(
+        redis=fakeredis.FakeRedis(decode_responses=False),
+        min_similarity=0.5,
+        min_margin=0.1,
+        refresh_interval=0,
+    )
+    index.put_source("fastapi-docs", "FastAPI", accumulate([1.0, 0.0, 0.0], [0.9, 0.1, 0.0]))
+    index.put_source("docker-docs", "docker", accumulate([0.0, 1.0, 0.0]))
+    index.backfill(collection_with(), "documents", [])
+    return index
+
+
+def collection_with(*points):
+    """In-memory collection holding (id, source, domain, dense, version) points."""
+    from qdrant_client import QdrantClient, models
+
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "documents", vectors_config={"dense": models.VectorParams(size=3, distance=models.Distance.COSINE)}
+    )
+    if points:
+        client.upsert(
+            "documents",
+            points=[
+                models.PointStruct(
+                    id=point_id,
+                    vector={"dense": dense},
+                    payload={"source": source, "domain": domain, "version": version},
+                )
+                for point_id, source, domain, dense, version in points
+            ],
+        )
+    return client
+
+
+class TestDomainCentroidIndex:
+    """Tests para la clasificación de queries por dominio."""
+
+    def test_classifies_clear_queries(self, index):
+        """Una query cercana a un único centroide debería clasificarse."""
+        assert index.classify([0.95, 0.05, 0.0]) == "fastapi"
+        assert index.classify([0.1, 0.9, 0.1]) == "docker"
+
+    def test_ambiguous_queries_are_not_classified(self, index):
+        """Sin margen suficiente entre los dos mejores no debería filtrar."""
+        assert index.classify([0.7, 0.7, 0.0]) is None
+        assert index.classify([0.0, 0.0, 1.0]) is None
+
+    def test_reingest_replaces_source_contribution(self, index):
+        """Re-ingestar un source debería reemplazar su contribución, no sumarla."""
+        index.put_source("docker-docs", "docker", accumulate([0.0, 0.0, 1.0]))
+
+        assert index.classify([0.0, 0.0, 1.0]) == "docker"
+        assert index.classify([0.0, 1.0, 0.0]) is None
+
+    def test_remove_source(self, index):
+        """Sin al menos dos dominios no se debería filtrar."""
+        index.remove_source("docker-docs")
+
+        assert index.scores([1.0, 0.0, 0.0]).keys() == {"fastapi"}
+        assert index.classify([1.0, 0.0, 0.0]) is None
+
+    def test_nothing_is_classified_before_the_backfill(self):
+        """Sin backfill los centroides no cubren lo ingestado antes del índice."""
+        if not HAS_FAKEREDIS:
+            pytest.skip("fakeredis not installed")
+        from app.api.retrieval_engine.domain_index import DomainCentroidIndex
+
+        index = DomainCentroidIndex(
+            redis=fakeredis.FakeRedis(), min_similarity=0.5, min_margin=0.1, refresh_interval=0
+        )
+        index.put_source("fastapi-docs", "fastapi", accumulate([1.0, 0.0, 0.0]))
+        index.put_source("docker-docs", "docker", accumulate([0.0, 1.0, 0.0]))
+
+        assert not index.is_backfilled()
+        assert index.classify([1.0, 0.0, 0.0]) is None
+
+        index.backfill(collection_with(), "documents", [])
+
+        assert index.classify([1.0, 0.0, 0.0]) == "fastapi"
+
+    def test_backfill_adds_sources_ingested_before_the_index(self, index):
+        """El backfill debería sumar sources viejos sin pisar los ya indexados."""
+        client = collection_with(
+            (1, "k8s-docs", "Kubernetes", [0.0, 0.0, 1.0], None),
+            (2, "k8s-docs", "Kubernetes", [0.0, 0.1, 0.9], None),
+            (3, "k8s-docs", "Kubernetes", [1.0, 0.0, 0.0], "hidden-v"),
+            (4, "docker-docs", "docker", [1.0, 0.0, 0.0], None),
+        )
+
+        added = index.backfill(client, "documents", ["hidden-v"])
+
+        assert added == 1
+        assert index.classify([0.0, 0.0, 1.0]) == "kubernetes"
+        # docker-docs keeps the vectors of its own ingestion
+        assert index.classify([0.0, 1.0, 0.0]) == "docker"
@@ -0,0 +1,74 @@
+"""
+Tests para la fusión de resultados de la búsqueda federada.
+"""
+
+import sys
+import os
+import json
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.retrieval_engine.federated_retriever import (
+    fuse_results,
+    parse_collection_specs,
+    payload_text,
+)
+
+
+def point(text, score, collection="documents"):
+    return SimpleNamespace(score=score, payload={"text": text, "collection": collection})
+
+
+class TestFuseResults:
+    """Tests para normalización, fusión y deduplicación."""
+
+    def test_scores_are_normalized_per_collection(self):
+        """Los scores de cada colección deberían llevarse a [0, 1] antes de fusionar."""
+        primary = [point("alpha beta", 0.5), point("gamma delta", 0.1)]
+        secondary = [point("epsilon zeta", 40.0, "llama"), point("eta theta", 10.0, "llama")]
+
+        fused = fuse_results([primary, secondary], [1.0, 0.8], limit=10)
+
+        assert [p.payload["text"] for p in fused] == [
+            "alpha beta",
+            "epsilon zeta",
+            "gamma delta",
+            "eta theta",
+        ]
+        assert fused[0].score == 1.0
+        assert fused[1].score == 0.8
+
+    def test_overlapping_chunks_are_collapsed(self):
+        """Un chunk contenido en otro de otra colección debería descartarse."""
+        primary = [point("FastAPI uses Pydantic models for validation", 0.9)]
+        secondary = [
+            point("Validation: FastAPI uses Pydantic models for validation.", 0.7, "llama"),
+            point("Dependency injection in FastAPI", 0.3, "llama"),
+        ]
+
+        fused = fuse_results([primary, secondary], [1.0, 1.0], limit=10)
+
+        assert len(fused) == 2
+        assert fused[0].payload["collection"] == "documents"
+
+    def test_limit(self):
+        """Debería devolver como mucho `limit` resultados."""
+        primary = [point(f"chunk number {i}", 1.0 - i / 10) for i in range(5)]
+
+        assert len(fuse_results([primary, []], [1.0, 1.0], limit=3)) == 3
+
+
+def test_payload_text_reads_llamaindex_nodes():
+    """Debería extraer el texto del `_node_content` de LlamaIndex."""
+    payload = {"_node_content": json.dumps({"text": "node text"}), "source": "doc"}
+
+    assert payload_text(payload) == "node text"
+    assert payload_text({"text": "inline"}) == "inline"
+
+
+def test_parse_collection_specs():
+    """Debería parsear nombres con peso opcional."""
+    specs = parse_collection_specs("documents_llama:0.8, other")
+
+    assert [(s.name, s.weight) for s in specs] == [("documents_llama", 0.8), ("other", 1.0)]
@@ -0,0 +1,100 @@
+"""
+Tests para el lock de rebuild y el registro de writers del índice.
+"""
+
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+from app.api.retrieval_engine.jobs.index_write_gate import IndexWriteGate
+
+pytestmark = pytest.mark.skipif(not HAS_FAKEREDIS, reason="fakeredis not installed")
+
+
+@pytest.fixture
+def gate():
+    return IndexWriteGate(fakeredis.FakeRedis(), poll_interval=0.01)
+
+
+def test_writers_are_turned_away_during_a_rebuild(gate):
+    assert gate.enter("task-1")
+    gate.leave("task-1")
+
+    assert gate.begin_rebuild("rebuild-1")
+    assert not gate.begin_rebuild("rebuild-2")
+    assert gate.rebuilding() == "rebuild-1"
+
+    assert not gate.enter("task-2")
+    # a refused writer does not hold the rebuild back
+    assert gate.active_writers() == 0
+
+    gate.end_rebuild("rebuild-1")
+    assert gate.enter("task-2")
+
+
+def test_rebuild_waits_for_running_writers(gate):
+    assert gate.enter("task-1")
+    assert gate.begin_rebuild("rebuild-1")
+
+    assert not gate.wait_for_writers("rebuild-1", timeout=0.05)
+
+    gate.leave("task-1")
+    assert gate.wait_for_writers("rebuild-1", timeout=0.05)
+
+
+def test_dead_writers_do_not_block_rebuilds_forever():
+    gate = IndexWriteGate(fakeredis.FakeRedis(), lease_seconds=-1, poll_interval=0.01)
+    assert gate.enter("task-killed")
+
+    assert gate.begin_rebuild("rebuild-1")
+    assert gate.wait_for_writers("rebuild-1", timeout=0.05)
+
+
+def test_only_the_holder_releases_the_lock(gate):
+    assert gate.begin_rebuild("rebuild-1")
+
+    gate.end_rebuild("rebuild-2")
+    assert gate.rebuilding() == "rebuild-1"
+
+    gate.end_rebuild("rebuild-1")
+    assert gate.rebuilding() is None
+
+
+def test_rebuild_lock_outlives_its_ttl_while_held():
+    gate = IndexWriteGate(fakeredis.FakeRedis(), lock_ttl_seconds=0.3)
+    assert gate.begin_rebuild("rebuild-1")
+
+    with gate.holding_rebuild("rebuild-1"):
+        # one source taking longer than the lock's TTL
+        time.sleep(0.8)
+        assert gate.rebuilding() == "rebuild-1"
+        assert not gate.enter("task-1")
+
+    # without heartbeats a dead rebuild frees the lock
+    time.sleep(0.4)
+    assert gate.rebuilding() is None
+
+
+def test_long_writer_still_blocks_the_rebuild():
+    gate = IndexWriteGate(fakeredis.FakeRedis(), lease_seconds=0.3, poll_interval=0.01)
+    assert gate.enter("task-1")
+
+    with gate.writing("task-1"):
+        time.sleep(0.8)
+        assert gate.begin_rebuild("rebuild-1")
+        assert not gate.wait_for_writers("rebuild-1", timeout=0.05)
+
+    # a writer that stopped beating counts as dead after its lease
+    time.sleep(0.4)
+    assert gate.wait_for_writers("rebuild-1", timeout=0.05)
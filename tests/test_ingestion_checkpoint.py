@@ -0,0 +1,126 @@
+"""
+Tests para los checkpoints de ingestión (reanudar un job interrumpido).
+"""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+from app.api.retrieval_engine.domain_index import CentroidAccumulator
+from app.api.retrieval_engine.ingestion_checkpoint import (
+    Checkpoint,
+    CheckpointStore,
+    ResumableRun,
+)
+from app.api.retrieval_engine.ingestion_pipeline import IngestionPipeline
+
+pytestmark = pytest.mark.skipif(not HAS_FAKEREDIS, reason="fakeredis not installed")
+
+
+def all_new(batch):
+    return [], [(f"id-{i}", chunk, i) for i, chunk in batch]
+
+
+@pytest.fixture
+def checkpoints():
+    return CheckpointStore(fakeredis.FakeRedis())
+
+
+def attempt(checkpoints, vector_store, embedder, chunks, resolve=all_new):
+    """One worker's attempt at job-1: resume what was saved, checkpoint the rest."""
+    saved = checkpoints.load("job-1").get("content")
+    centroid = CentroidAccumulator()
+    run = ResumableRun(
+        checkpoints, "job-1", "content", saved or Checkpoint("v1", 100), vector_store, centroid
+    )
+    run.save()
+    pipeline = IngestionPipeline(
+        vector_store,
+        embedder,
+        run.resolver(resolve),
+        {"source": "doc.pdf", "version": "v1"},
+        centroid=centroid,
+        batch_size=5,
+        queue_size=1,
+        on_upsert=run.upserted,
+    )
+    asyncio.run(pipeline.run(chunks))
+    return run, centroid
+
+
+def test_killed_job_resumes_from_last_committed_batch(
+    checkpoints, fake_store, fake_embedder, make_chunks
+):
+    chunks = make_chunks(50, section="s")
+    store = fake_store
+
+    with pytest.raises(RuntimeError):
+        attempt(checkpoints, store, fake_embedder(fail_after=20), chunks)
+
+    saved = checkpoints.load("job-1")["content"]
+    committed = len(saved.chunks)
+    assert 0 < committed < 50
+    assert (saved.version, saved.ingested_at) == ("v1", 100)
+    # the checkpoint never covers a chunk that is not written
+    assert all(point_id in store.points for _, point_id in saved.chunks)
+
+    embedder = fake_embedder()
+    run, centroid = attempt(checkpoints, store, embedder, chunks)
+
+    # committed chunks are neither embedded nor written again
+    assert run.resumed == committed
+    assert embedder.texts == [c.text for c in chunks[committed:]]
+    assert sorted(store.points) == sorted(f"id-{i}" for i in range(50))
+    assert all(store.points[f"id-{i}"].payload["chunk_index"] == i for i in range(50))
+    assert [point_id for _, point_id in run.checkpoint.chunks] == [f"id-{i}" for i in range(50)]
+    # resumed vectors still count for the domain centroid / summary
+    assert centroid.count == 50
+
+
+def test_resume_stops_at_the_first_missing_point(
+    checkpoints, fake_store, fake_embedder, make_chunks
+):
+    chunks = make_chunks(20, section="s")
+    store = fake_store
+    with pytest.raises(RuntimeError):
+        attempt(checkpoints, store, fake_embedder(fail_after=15), chunks)
+    committed = len(checkpoints.load("job-1")["content"].chunks)
+    assert committed >= 10
+
+    # the points behind the checkpoint went away meanwhile
+    store.delete_points(["id-3"])
+    embedder = fake_embedder()
+    run, _ = attempt(checkpoints, store, embedder, chunks)
+
+    assert run.resumed == 3
+    assert embedder.texts == [c.text for c in chunks[3:]]
+    assert sorted(store.points) == sorted(f"id-{i}" for i in range(20))
+
+
+def test_skipped_chunks_do_not_hold_the_checkpoint_back(
+    checkpoints, fake_store, fake_embedder, make_chunks
+):
+    def skip_multiples_of_three(batch):
+        return [], [(f"id-{i}", chunk, i) for i, chunk in batch if i % 3]
+
+    run, _ = attempt(
+        checkpoints, fake_store, fake_embedder(), make_chunks(12, section="s"), skip_multiples_of_three
+    )
+
+    assert len(run.checkpoint.chunks) == 12
+    assert [point_id for _, point_id in run.checkpoint.chunks[:4]] == [None, "id-1", "id-2", None]
+
+    # a finished run drops its checkpoint
+    run.clear()
+    assert checkpoints.load("job-1") == {}
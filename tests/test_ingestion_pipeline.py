@@ -0,0 +1,87 @@
+"""
+Tests para IngestionPipeline (etapas concurrentes con colas acotadas).
+"""
+
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.retrieval_engine.ingestion_pipeline import IngestionPipeline
+
+
+def reuse_even_chunks(batch):
+    """Pretend chunks with an even index already exist."""
+    reused, news = [], []
+    for i, chunk in batch:
+        if i % 2 == 0:
+            reused.append(SimpleNamespace(id=f"id-{i}", payload={"chunk_index": i}))
+        else:
+            news.append((f"id-{i}", chunk, i))
+    return reused, news
+
+
+class TestIngestionPipeline:
+    """Tests del flujo completo del pipeline."""
+
+    def test_every_chunk_is_upserted_once(self, fake_store, fake_embedder, make_chunks):
+        """Los reutilizados no deberían embeberse y todos deberían escribirse."""
+        store = fake_store
+        pipeline = IngestionPipeline(
+            store, fake_embedder(), reuse_even_chunks, {"source": "doc"}, batch_size=4, queue_size=1
+        )
+
+        counters = asyncio.run(pipeline.run(make_chunks(10)))
+
+        written = sorted(p.id for batch in store.batches for p in batch)
+        assert written == sorted(f"id-{i}" for i in range(10))
+        assert (counters.chunked, counters.reused, counters.embedded) == (10, 5, 5)
+        embedded = [p for batch in store.batches for p in batch if "source" in p.payload]
+        assert all(p.payload["chunk_index"] % 2 == 1 for p in embedded)
+
+    def test_accepts_async_chunk_sources(self, fake_store, fake_embedder, make_chunks):
+        """Debería consumir generadores async como primera etapa."""
+
+        async def produce():
+            for chunk in make_chunks(3):
+                await asyncio.sleep(0)
+                yield chunk
+
+        pipeline = IngestionPipeline(fake_store, fake_embedder(), lambda b: ([], [(str(i), c, i) for i, c in b]), {})
+
+        counters = asyncio.run(pipeline.run(produce()))
+
+        assert counters.upserted == 3
+
+    def test_progress_comes_from_counters(self, fake_store, fake_embedder, make_chunks):
+        """El progreso debería reflejar los chunks escritos."""
+        updates = []
+
+        async def progress(percent, msg):
+            updates.append((percent, msg))
+
+        pipeline = IngestionPipeline(
+            fake_store, fake_embedder(), reuse_even_chunks, {}, progress=progress, batch_size=5
+        )
+        asyncio.run(pipeline.run(make_chunks(10)))
+
+        assert updates[-1][0] == 95
+        assert updates[-1][1].startswith("Stored 10 of 10 chunks")
+
+    def test_stage_failure_cancels_pipeline(self, fake_store, fake_embedder, make_chunks):
+        """Un error en una etapa debería propagarse sin colgar el resto."""
+        pipeline = IngestionPipeline(
+            fake_store,
+            fake_embedder(fail_after=0),
+            lambda b: ([], [(str(i), c, i) for i, c in b]),
+            {},
+            batch_size=2,
+            queue_size=1,
+        )
+
+        with pytest.raises(RuntimeError, match="model crashed"):
+            asyncio.run(pipeline.run(make_chunks(50)))
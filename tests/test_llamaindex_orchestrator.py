@@ -0,0 +1,53 @@
+"""
+Tests para LlamaIndexOrchestrator (retrieval federado cuando está configurado).
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("llama_index.core")
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from app.api.llamaindex_adapter import orchestrator as orchestrator_module
+from app.api.llamaindex_adapter.orchestrator import LlamaIndexOrchestrator
+from app.infrastructure.storage.interfaces import HybridVector
+
+
+class FakeFederated:
+    def __init__(self):
+        self.calls = []
+
+    def query(self, query_vector, limit, filter_context):
+        self.calls.append((limit, filter_context))
+        return [SimpleNamespace(score=0.9, payload={"text": "fused chunk", "source": "a.md"})]
+
+
+def test_get_context_goes_through_the_federated_retriever(monkeypatch):
+    """Con federación configurada no debería consultarse solo el índice local."""
+    monkeypatch.setattr(
+        orchestrator_module,
+        "get_hybrid_embeddign_service",
+        lambda: SimpleNamespace(
+            embed=lambda text, query: HybridVector(dense=[1.0], sparse={"indices": [], "values": []})
+        ),
+    )
+    orchestrator = LlamaIndexOrchestrator.__new__(LlamaIndexOrchestrator)
+    orchestrator.federated = FakeFederated()
+    orchestrator.catalog = SimpleNamespace(hidden_versions=lambda: ["v0"])
+    # the local index must not be queried
+    orchestrator.index = None
+    orchestrator.rerank = SimpleNamespace(_postprocess_nodes=lambda nodes, query_bundle: nodes)
+
+    context, citations = orchestrator.get_context("what is fused?", 5, domain="Docs")
+
+    assert context == "fused chunk"
+    assert [c.source for c in citations] == ["a.md"]
+    limit, filter_context = orchestrator.federated.calls[0]
+    assert limit == 5
+    assert (filter_context.domain, filter_context.hidden_versions) == ("docs", ["v0"])
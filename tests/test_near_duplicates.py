@@ -0,0 +1,160 @@
+"""
+Tests para la detección de chunks casi duplicados (MinHash + LSH).
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.schema import ChunkWithMetadata
+from app.api.retrieval_engine import near_duplicates
+from app.api.retrieval_engine.near_duplicates import (
+    DuplicateStats,
+    LSHIndex,
+    MinHasher,
+    NearDuplicateDetector,
+    similarity,
+)
+
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+LICENSE = (
+    "Permission is hereby granted, free of charge, to any person obtaining a copy of "
+    "this software and associated documentation files, to deal in the Software without "
+    "restriction, including without limitation the rights to use, copy, modify, merge, "
+    "publish, distribute, sublicense, and sell copies of the Software."
+)
+LICENSE_EDITED = LICENSE.replace("without limitation", "without any limitation")
+OTHER = (
+    "Dependency injection lets a path operation declare the things it needs to work, "
+    "and the framework takes care of providing them for every request it handles."
+)
+
+BACKGROUND = "Background tasks run after the response has been sent to the client."
+
+
+def test_signatures_estimate_similarity():
+    hasher = MinHasher()
+
+    a, b, c = (hasher.signature(t) for t in (LICENSE, LICENSE_EDITED, OTHER))
+
+    assert similarity(a, b) > 0.75
+    assert similarity(a, c) < 0.1
+    assert hasher.signature("two words") is None
+
+
+@pytest.fixture
+def detector(fake_store):
+    if not HAS_FAKEREDIS:
+        pytest.skip("fakeredis not installed")
+    store = fake_store
+    index = LSHIndex("documents", bands=32, rows=4, redis=fakeredis.FakeRedis())
+    return NearDuplicateDetector(store, index, MinHasher(), threshold=0.75)
+
+
+def new(h_id, text, index=0):
+    return (h_id, ChunkWithMetadata(text=text, section="License"), index)
+
+
+def test_duplicate_of_another_source_reuses_the_canonical_vectors(detector):
+    stats = DuplicateStats()
+    aliased, remaining, _ = detector.resolve([new("p1", LICENSE)], "a.md", {"source": "a.md"}, stats)
+    assert aliased == [] and [r[0] for r in remaining] == ["p1"]
+    detector.vector_store.insert("p1", LICENSE, "a.md")
+
+    aliased, remaining, _ = detector.resolve(
+        [new("p2", LICENSE_EDITED, 3), new("p3", OTHER, 4)], "b.md", {"source": "b.md"}, stats
+    )
+
+    assert [r[0] for r in remaining] == ["p3"]
+    (alias,) = aliased
+    assert alias.id == "p2" and alias.vector == {"dense": [float(len(LICENSE))]}
+    assert alias.payload["duplicate_of"] == "p1"
+    assert alias.payload["source"] == "b.md" and alias.payload["chunk_index"] == 3
+    assert alias.payload["text"] == LICENSE_EDITED
+    # only the embedded chunk is indexed
+    assert set(detector.index.entries(["p1", "p2", "p3"])) == {"p1", "p3"}
+    assert stats.as_dict() == {"aliased": 1, "skipped": 0}
+
+
+def test_same_source_and_skip_mode(detector):
+    detector.resolve([new("p1", LICENSE)], "a.md", {}, DuplicateStats())
+    detector.vector_store.insert("p1", LICENSE, "a.md")
+
+    # an edit of the source's own chunk is embedded again
+    aliased, remaining, _ = detector.resolve([new("p2", LICENSE_EDITED)], "a.md", {}, DuplicateStats())
+    assert aliased == [] and len(remaining) == 1
+
+    detector.skip = True
+    stats = DuplicateStats()
+    aliased, remaining, skipped = detector.resolve([new("p3", LICENSE)], "c.md", {}, stats)
+    assert aliased == [] and remaining == [] and [s[0] for s in skipped] == ["p3"]
+    # versioned ingestion needs a point per chunk: skipping is downgraded to aliasing
+    aliased, _, skipped = detector.resolve(
+        [new("p4", LICENSE)], "d.md", {}, stats, allow_skip=False
+    )
+    assert [a.id for a in aliased] == ["p4"] and skipped == []
+    assert stats.as_dict() == {"aliased": 1, "skipped": 1}
+
+
+def test_deleted_canonical_is_forgotten(detector):
+    detector.resolve([new("p1", LICENSE)], "a.md", {}, DuplicateStats())
+    # p1 never reached the store (or its source was deleted)
+
+    aliased, remaining, _ = detector.resolve([new("p2", LICENSE)], "b.md", {}, DuplicateStats())
+
+    assert aliased == [] and [r[0] for r in remaining] == ["p2"]
+    assert "p1" not in detector.index.entries(["p1", "p2"])
+    # the chunk that is embedded becomes the new canonical
+    assert detector.index.entries(["p2"])["p2"][1] == "b.md"
+
+
+def test_gc_and_deleted_sources_are_forgotten(detector):
+    detector.resolve([new("p1", LICENSE)], "a.md", {"version": "v1"}, DuplicateStats())
+    detector.resolve([new("p2", OTHER)], "a.md", {"version": "v2"}, DuplicateStats())
+    detector.resolve([new("p3", BACKGROUND)], "b.md", {}, DuplicateStats())
+
+    detector.index.forget_versions("a.md", ["v1"])
+    assert set(detector.index.entries(["p1", "p2", "p3"])) == {"p2", "p3"}
+
+    detector.index.forget_source("a.md")
+    assert set(detector.index.entries(["p1", "p2", "p3"])) == {"p3"}
+    # nothing is left behind for the deleted source
+    assert not detector.index._redis.exists("lsh:documents:owned:a.md")
+
+
+def test_prune_drops_entries_of_points_deleted_elsewhere(detector):
+    detector.resolve([new("p1", LICENSE), new("p2", OTHER, 1)], "a.md", {}, DuplicateStats())
+    detector.vector_store.insert("p2", OTHER, "a.md")
+
+    assert detector.prune() == 1
+    assert set(detector.index.entries(["p1", "p2"])) == {"p2"}
+
+
+def test_namespace_follows_the_collection_alias(monkeypatch):
+    monkeypatch.setattr(
+        near_duplicates,
+        "get_settings",
+        lambda: SimpleNamespace(
+            near_dup_mode="alias",
+            near_dup_bands=16,
+            near_dup_num_perm=128,
+            near_dup_shingle=3,
+            near_dup_threshold=0.9,
+        ),
+    )
+    rebuild_target = SimpleNamespace(collection_name="documents_1700000000", alias="documents")
+
+    detector = near_duplicates.get_near_duplicate_detector(rebuild_target)
+
+    assert detector.index.namespace == "documents"
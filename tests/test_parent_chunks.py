@@ -0,0 +1,132 @@
+"""
+Tests para el índice padre/hijo (ventanas embebidas, secciones devueltas).
+"""
+
+import asyncio
+import re
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.cleaners.markdown_cleaner import MarkdownCleaner
+from app.api.extraction.schema import ChunkWithMetadata
+from app.api.extraction.token_chunker import ParentChildCleaner, TokenBudgetChunker
+from app.api.retrieval_engine.chunk_manifest import chunk_hash
+from app.api.retrieval_engine.ingestion_pipeline import chunk_payload
+from app.api.retrieval_engine.parent_chunks import group_by_parent, write_parents
+
+
+class WhitespaceTokenizer:
+    def __call__(self, texts, add_special_tokens, return_offsets_mapping, **kwargs):
+        return {
+            "offset_mapping": [[m.span() for m in re.finditer(r"\S+", t)] for t in texts]
+        }
+
+
+def words(n: int, prefix: str) -> str:
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def cleaner(parent_tokens=40, child_tokens=8, overlap=2) -> ParentChildCleaner:
+    tokenizer = WhitespaceTokenizer()
+    return ParentChildCleaner(
+        MarkdownCleaner(),
+        TokenBudgetChunker(tokenizer, parent_tokens, 0),
+        TokenBudgetChunker(tokenizer, child_tokens, overlap),
+    )
+
+
+def test_children_are_small_windows_of_their_section():
+    text = f"## Install\n\n{words(12, 'i')}\n\n{words(6, 'j')}\n\n## Usage\n\n{words(20, 'u')}"
+
+    chunks = cleaner().chunk(text)
+
+    assert all(len(c.text.split()) <= 8 for c in chunks)
+    assert {c.section for c in chunks} == {"Install", "Usage"}
+    for chunk in chunks:
+        assert set(chunk.text.split()) <= set(chunk.parent.split())
+        assert chunk.parent.startswith(f"## {chunk.section}")
+    parents = list(dict.fromkeys(c.parent for c in chunks))
+    assert len(parents) == 2
+    # every word of a parent is in some window
+    for parent in parents:
+        covered = {w for c in chunks if c.parent is parent for w in c.text.split()}
+        assert covered == set(parent.split())
+
+
+def test_long_sections_are_cut_into_several_parents():
+    chunks = cleaner(parent_tokens=10).chunk(f"## Big\n\n{words(30, 'b')}")
+
+    parents = list(dict.fromkeys(c.parent for c in chunks))
+    assert len(parents) > 1
+    assert all(len(p.split()) <= 10 for p in parents)
+
+
+def test_each_parent_is_written_once_with_the_children_scope(fake_store):
+    first, second = "## A\n" + words(10, "a"), "## B\n" + words(10, "b")
+    chunks = [
+        ChunkWithMetadata(text=f"w{i}", section="A" if i < 3 else "B", parent=first if i < 3 else second)
+        for i in range(5)
+    ]
+    store = fake_store
+    base = {"source": "doc.md", "version": "v2", "ingested_at": 1}
+
+    async def run():
+        return [c async for c in write_parents(chunks, store, base, batch_size=1)]
+
+    assert asyncio.run(run()) == chunks
+    assert [p.payload["text"] for p in store.inserted] == [first, second]
+    assert all(p.vector == {} and p.payload["kind"] == "parent" for p in store.inserted)
+    assert store.inserted[1].payload["version"] == "v2"
+    # children point to these ids
+    payloads = [chunk_payload(base, c, i) for i, c in enumerate(chunks)]
+    assert {p["parent_id"] for p in payloads} == {p.id for p in store.inserted}
+    assert "parent_id" not in chunk_payload(base, ChunkWithMetadata(text="x"), 0)
+
+
+def test_parent_is_part_of_the_chunk_hash():
+    a = ChunkWithMetadata(text="same window", section="s", parent="old section")
+    b = ChunkWithMetadata(text="same window", section="s", parent="new section")
+
+    assert chunk_hash(a) != chunk_hash(b)
+    assert chunk_hash(ChunkWithMetadata(text="x", section="s")) == chunk_hash(
+        ChunkWithMetadata(text="x", section="s", parent=None)
+    )
+
+
+def hit(point_id, text, parent_id=None, score=1.0):
+    payload = {"text": text, "source": "doc.md", "chunk_index": 0}
+    if parent_id:
+        payload["parent_id"] = parent_id
+    return SimpleNamespace(id=point_id, score=score, payload=payload)
+
+
+def test_hits_are_grouped_by_parent_best_child_first():
+    hits = [
+        hit(1, "window a1", "pa"),
+        hit(2, "legacy chunk"),
+        hit(3, "window b1", "pb"),
+        hit(4, "window a2", "pa"),
+        hit(5, "window c1", "pc"),
+        hit(6, "window x1", "gone"),
+    ]
+    fetched = []
+
+    def fetch(ids):
+        fetched.append(ids)
+        return {"pa": {"text": "section A", "section": "A"}, "pb": {"text": "section B"}}
+
+    result = group_by_parent(hits, fetch, limit=3)
+
+    assert [h.id for h in result] == [1, 2, 3]
+    assert fetched == [["pa", "pb"]]
+    assert result[0].payload["text"] == "section A"
+    assert result[0].payload["child_text"] == "window a1"
+    assert result[0].payload["matched_children"] == 2
+    assert result[1].payload["text"] == "legacy chunk"
+
+    # a child whose parent is missing is kept as it is
+    (orphan,) = group_by_parent([hit(6, "window x1", "gone")], lambda ids: {}, limit=3)
+    assert orphan.payload["text"] == "window x1"
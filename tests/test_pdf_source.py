@@ -0,0 +1,145 @@
+"""
+Tests para PDFSource (extracción por rangos de páginas en un pool).
+"""
+
+import asyncio
+import sys
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction.exceptions import PDFBackendNotInstalledError, UnknownPDFBackendError
+from app.api.extraction.source import pdf_source
+from app.api.extraction.source.pdf_source import PDFSource
+
+
+TOTAL_PAGES = 10
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """Pretend every file has TOTAL_PAGES pages and record extracted ranges."""
+    calls = []
+
+    def extract_page_range(path, start, end, backend):
+        calls.append((start, end))
+        # later ranges finish first
+        time.sleep(0.01 * (TOTAL_PAGES - start))
+        return [f"page {i}" if i != 3 else "" for i in range(start, end)]
+
+    monkeypatch.setattr(pdf_source, "page_count", lambda path, backend: TOTAL_PAGES)
+    monkeypatch.setattr(pdf_source, "extract_page_range", extract_page_range)
+    monkeypatch.setattr(pdf_source, "_pool", ThreadPoolExecutor(max_workers=4))
+    monkeypatch.setattr(
+        pdf_source,
+        "get_settings",
+        lambda: SimpleNamespace(
+            pdf_backend="pdfplumber",
+            pdf_pages_per_task=3,
+            pdf_parallel_min_pages=4,
+            pdf_prefetch_tasks=2,
+            pdf_extract_workers=4,
+        ),
+    )
+    return calls
+
+
+class BrokenPool(ThreadPoolExecutor):
+    """A pool whose workers died: every submitted range fails."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("a worker died"))
+        return future
+
+
+class ChildlessPool(ThreadPoolExecutor):
+    """A pool that cannot start its processes."""
+
+    def submit(self, fn, *args, **kwargs):
+        raise OSError("cannot fork")
+
+
+async def collect(path):
+    return [text async for text in PDFSource().iter_pages_from_path(path)]
+
+
+class TestPDFSource:
+    def test_pages_come_back_in_order(self, fake_pdf):
+        pages = asyncio.run(collect("book.pdf"))
+
+        assert pages == [f"page {i}" if i != 3 else "" for i in range(TOTAL_PAGES)]
+
+    def test_every_page_is_extracted_once(self, fake_pdf):
+        asyncio.run(collect("book.pdf"))
+
+        assert sorted(fake_pdf) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+    def test_only_a_few_ranges_run_ahead_of_the_consumer(self, fake_pdf):
+        async def first_page():
+            pages = PDFSource().iter_pages_from_path("book.pdf")
+            text = await anext(pages)
+            await pages.aclose()
+            return text
+
+        assert asyncio.run(first_page()) == "page 0"
+        assert len(fake_pdf) <= 3
+
+    def test_small_pdf_is_extracted_in_one_range(self, fake_pdf, monkeypatch):
+        monkeypatch.setattr(pdf_source, "page_count", lambda path, backend: 3)
+
+        asyncio.run(collect("small.pdf"))
+
+        assert fake_pdf == [(0, 3)]
+
+    @pytest.mark.parametrize("pool_class", [BrokenPool, ChildlessPool])
+    def test_failed_pool_falls_back_to_in_process_extraction(
+        self, fake_pdf, monkeypatch, pool_class
+    ):
+        """Si el pool no puede extraer, los rangos se extraen en este proceso."""
+        pool = pool_class(max_workers=1)
+        monkeypatch.setattr(pdf_source, "_pool", pool)
+
+        pages = asyncio.run(collect("book.pdf"))
+
+        assert pages == [f"page {i}" if i != 3 else "" for i in range(TOTAL_PAGES)]
+        assert sorted(fake_pdf) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+        # the next extraction starts a new pool
+        assert pdf_source._pool is None
+
+    def test_extract_skips_empty_pages(self, fake_pdf, tmp_path):
+        path = tmp_path / "book.pdf"
+        path.write_bytes(b"%PDF")
+
+        with open(path, "rb") as f:
+            upload = SimpleNamespace(file=f)
+            text = asyncio.run(PDFSource().extract(upload))
+
+        assert text.split("\n") == [f"page {i}" for i in range(TOTAL_PAGES) if i != 3]
+
+
+class TestPDFBackend:
+    def test_default_backend_comes_from_settings(self, fake_pdf):
+        assert PDFSource().backend == "pdfplumber"
+
+    def test_request_backend_overrides_default(self, fake_pdf, monkeypatch):
+        monkeypatch.setattr(pdf_source, "_installed", lambda module: True)
+
+        assert PDFSource(" PyMuPDF ").backend == "pymupdf"
+
+    def test_optional_backend_must_be_installed(self, fake_pdf, monkeypatch):
+        monkeypatch.setattr(pdf_source, "_installed", lambda module: module != "pymupdf")
+
+        with pytest.raises(PDFBackendNotInstalledError, match="requirements-pymupdf.txt"):
+            PDFSource("pymupdf")
+        assert PDFSource("pdfium").backend == "pdfium"
+
+    def test_unknown_backend_is_rejected(self, fake_pdf):
+        with pytest.raises(UnknownPDFBackendError):
+            PDFSource("tesseract")
@@ -0,0 +1,88 @@
+"""
+Tests para la configuración de cuantización de QdrantStore.
+"""
+
+import sys
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+from qdrant_client import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# qdrant_client.py loads the reranker (torch + sentence_transformers)
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from app.core.settings import AppSettings
+from app.infrastructure.storage import qdrant_client
+from app.infrastructure.storage.interfaces import FilterContext, HybridVector
+
+
+@pytest.fixture
+def make_store(monkeypatch):
+    monkeypatch.setattr(qdrant_client, "get_rerank_model", lambda: None)
+
+    def make(quantization, exists=False):
+        client = MagicMock()
+        client.collection_exists.return_value = exists
+        return qdrant_client.QdrantStore(client=client, quantization=quantization)
+
+    return make
+
+
+@pytest.mark.parametrize(
+    "quantization, expected",
+    [
+        ("none", type(None)),
+        ("scalar", models.ScalarQuantization),
+        ("binary", models.BinaryQuantization),
+    ],
+)
+def test_create_collection_builds_the_configured_quantization(make_store, quantization, expected):
+    store = make_store(quantization)
+
+    store.create_collection()
+
+    config = store.client.create_collection.call_args.kwargs["quantization_config"]
+    assert isinstance(config, expected)
+    if quantization == "binary":
+        assert config.binary.always_ram is True
+    if quantization == "scalar":
+        assert config.scalar.type == models.ScalarType.INT8
+
+
+def test_existing_collection_is_switched_to_the_configured_mode(make_store):
+    store = make_store("binary", exists=True)
+    store.client.get_collection.return_value.config.quantization_config = models.ScalarQuantization(
+        scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8)
+    )
+
+    store.create_collection()
+
+    update = store.client.update_collection.call_args.kwargs
+    assert isinstance(update["quantization_config"], models.BinaryQuantization)
+
+
+def test_binary_search_oversamples_and_rescores(make_store):
+    store = make_store("binary")
+    vector = HybridVector(dense=[0.1] * 384, sparse={"indices": [1], "values": [0.5]})
+
+    store.query(vector, limit=5, filter_context=FilterContext())
+
+    dense = store.client.query_points.call_args.kwargs["prefetch"][0]
+    assert dense.params.quantization == models.QuantizationSearchParams(
+        rescore=True, oversampling=store.default_oversampling
+    )
+
+    # scalar mode leaves Qdrant's defaults alone
+    scalar = make_store("scalar")
+    scalar.query(vector, limit=5, filter_context=FilterContext())
+    assert scalar.client.query_points.call_args.kwargs["prefetch"][0].params is None
+
+
+def test_unknown_quantization_fails_at_startup():
+    with pytest.raises(ValidationError):
+        AppSettings(qdrant_quantization="binray")
@@ -0,0 +1,65 @@
+"""
+Tests para el listado de sources y su metadata: las versiones ocultas no
+deberían verse, igual que en query().
+"""
+
+import sys
+import os
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# qdrant_client.py loads the reranker (torch + sentence_transformers)
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from app.infrastructure.storage import qdrant_client
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(qdrant_client, "get_rerank_model", lambda: None)
+    client = QdrantClient(":memory:")
+    client.create_collection("documents", vectors_config={})
+    rows = [
+        ("a.md", "v1", 100),
+        ("a.md", "v1", 100),
+        ("a.md", "v2", 200),  # reindex in flight
+        ("b.md", "v0", 50),  # retired, waiting for GC
+        ("b.md", None, 10),  # legacy
+    ]
+    client.upsert(
+        "documents",
+        points=[
+            models.PointStruct(
+                id=i,
+                vector={},
+                payload={
+                    "source": source,
+                    "domain": "docs",
+                    "topic": "t",
+                    "ingested_at": ingested_at,
+                    **({"version": version} if version else {}),
+                },
+            )
+            for i, (source, version, ingested_at) in enumerate(rows)
+        ],
+    )
+    return qdrant_client.QdrantStore(client=client, collection_name="documents")
+
+
+def test_list_sources_skips_hidden_versions(store):
+    sources = {s["source"]: s["chunk_count"] for s in store.list_sources(hidden_versions=["v2", "v0"])}
+
+    assert sources == {"a.md": 2, "b.md": 1}
+    assert store.list_sources(domain="other", hidden_versions=["v2"]) == []
+
+
+def test_source_metadata_skips_hidden_versions(store):
+    metadata = store.get_source_metadata("a.md", hidden_versions=["v2", "v0"])
+
+    assert metadata["chunk_count"] == 2
+    assert metadata["last_ingested"] == 100
+    assert store.get_source_metadata("c.md", hidden_versions=["v2"]) is None
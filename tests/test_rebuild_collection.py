@@ -0,0 +1,102 @@
+"""
+Tests para la reconstrucción de la colección: qué sources se re-ingestan
+y cuáles se copian punto por punto.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# celery_tasks loads the RAG service (torch + sentence_transformers)
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from app.api.retrieval_engine.jobs import celery_tasks
+
+
+class FakeIngestion:
+    def __init__(self):
+        self.urls = []
+        self.dead = set()
+
+    async def ingest_document(self, url, source, domain, topic, version):
+        self.urls.append(url)
+        if url in self.dead:
+            raise RuntimeError("404 Not Found")
+        return {"chunks_processed": 1}
+
+
+class FakeTargetStore:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_by_filter(self, filter_conditions):
+        self.deleted.append(filter_conditions)
+
+
+class FakeLiveStore:
+    def __init__(self):
+        self.copied = []
+
+    def copy_source_points(self, source, target, hidden_versions):
+        self.copied.append(source)
+        return 1
+
+
+@pytest.fixture
+def ingestion():
+    return FakeIngestion()
+
+
+@pytest.fixture
+def target():
+    return FakeTargetStore()
+
+
+@pytest.fixture
+def rebuild(ingestion, target):
+    live = FakeLiveStore()
+
+    def run(source, catalog_entry):
+        entry = {"source": source, "domain": "docs", "topic": "t"}
+        outcome = celery_tasks._rebuild_source(
+            ingestion, live, target, entry, catalog_entry, hidden=[]
+        )
+        return outcome, ingestion.urls, live.copied
+
+    return run
+
+
+def test_repository_files_are_copied_not_fetched(rebuild):
+    # ingest_repository publishes its files without a url
+    outcome, fetched, copied = rebuild(
+        "https://github.com/o/r/blob/main/README.md", {"active_version": "v1", "domain": "docs"}
+    )
+
+    assert outcome == "copied"
+    assert fetched == [] and copied == ["https://github.com/o/r/blob/main/README.md"]
+
+
+def test_url_sources_are_reingested(rebuild):
+    outcome, fetched, copied = rebuild(
+        "https://d.io/page", {"url": "https://d.io/page", "active_version": "v1"}
+    )
+
+    assert outcome == "reingested"
+    assert fetched == ["https://d.io/page"] and copied == []
+
+
+def test_unreachable_url_falls_back_to_the_indexed_points(rebuild, ingestion, target):
+    ingestion.dead.add("https://d.io/gone")
+
+    outcome, fetched, copied = rebuild(
+        "https://d.io/gone", {"url": "https://d.io/gone", "active_version": "v1"}
+    )
+
+    assert outcome == "copied"
+    assert fetched == ["https://d.io/gone"] and copied == ["https://d.io/gone"]
+    # whatever the failed attempt wrote is dropped before copying
+    assert target.deleted == [{"source": "https://d.io/gone", "version": "v1"}]
@@ -0,0 +1,130 @@
+"""
+Tests para RepositorySource: selección de archivos de un tarball/zip y
+salto de archivos sin cambios por hash de blob.
+"""
+
+import asyncio
+import io
+import sys
+import os
+import tarfile
+import zipfile
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+from app.api.extraction.exceptions import SourceInvalidURLError, SourceTooLargeError
+from app.api.extraction.source.repository_source import (
+    RepositorySource,
+    RepoStateStore,
+    blob_sha,
+    iter_archive,
+    resolve_repository,
+)
+
+
+FILES = {
+    "README.md": b"# Project\n\nIntro",
+    "docs/guide.md": b"# Guide\n\nSteps",
+    "docs/api.rst": b"API\n===\n",
+    "src/main.py": b"print('hi')",
+}
+
+
+def tarball(files: dict[str, bytes], root: str = "project-main") -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(f"{root}/{name}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_blob_sha_matches_git():
+    # `git hash-object` of an empty file and of "hello\n"
+    assert blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+    assert blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+def test_resolve_repository():
+    repo = resolve_repository("https://github.com/owner/name.git", "v1.0")
+    assert repo.archive_url == "https://codeload.github.com/owner/name/tar.gz/v1.0"
+    assert repo.source_prefix == "https://github.com/owner/name/blob/v1.0/"
+    assert resolve_repository("owner/name").key == "github.com/owner/name"
+    assert not resolve_repository("https://example.com/docs.zip").strip_root
+
+    with pytest.raises(SourceInvalidURLError):
+        resolve_repository("https://gitlab.com/owner/name")
+
+
+def test_iter_archive_selects_by_glob(tmp_path):
+    path = tmp_path / "repo.tar.gz"
+    path.write_bytes(tarball(FILES))
+    files = dict(iter_archive(str(path), ["*.md", "docs/*.rst"], 1024, strip_root=True))
+    assert files == {k: v for k, v in FILES.items() if not k.endswith(".py")}
+
+    zipped = tmp_path / "repo.zip"
+    with zipfile.ZipFile(zipped, "w") as archive:
+        for name, data in FILES.items():
+            archive.writestr(name, data)
+    assert list(dict(iter_archive(str(zipped), ["docs/*"], 10, strip_root=False))) == ["docs/api.rst"]
+
+
+@pytest.mark.skipif(not HAS_FAKEREDIS, reason="fakeredis not installed")
+def test_rerun_skips_unchanged_files():
+    archives = [tarball(FILES)]
+
+    def serve(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=archives[-1])
+
+    state = RepoStateStore(fakeredis.FakeRedis())
+    source = RepositorySource(
+        state=state, client=httpx.AsyncClient(transport=httpx.MockTransport(serve))
+    )
+    repo = resolve_repository("owner/project", "main")
+
+    def run():
+        async def collect():
+            return [f async for f in source.files(repo, ["*.md"])]
+
+        return asyncio.run(collect())
+
+    first = run()
+    assert {f.path: f.status for f in first} == {"README.md": "changed", "docs/guide.md": "changed"}
+    assert first[0].source == "https://github.com/owner/project/blob/main/README.md"
+    for f in first:
+        source.commit(repo, f)
+
+    archives.append(tarball({**FILES, "docs/guide.md": b"# Guide\n\nNew steps"}))
+    second = {f.path: f for f in run()}
+    assert second["README.md"].status == "unchanged"
+    assert second["README.md"].text is None
+    assert second["docs/guide.md"].status == "changed"
+    assert second["docs/guide.md"].text == "# Guide\n\nNew steps"
+
+
+def test_download_size_limit():
+    source = RepositorySource(
+        state=object(),
+        max_archive_bytes=10,
+        client=httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(200, content=b"x" * 100))
+        ),
+    )
+
+    async def run():
+        with io.BytesIO() as target:
+            await source._download("https://example.com/a.tar.gz", target)
+
+    with pytest.raises(SourceTooLargeError):
+        asyncio.run(run())
@@ -0,0 +1,162 @@
+"""
+Tests para SourceCatalog (versionado de ingestión).
+
+Uses fakeredis for testing without a real Redis connection.
+"""
+
+import pytest
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Try to import fakeredis, skip if not available
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+@pytest.fixture
+def catalog():
+    """Create a SourceCatalog backed by fake Redis."""
+    if not HAS_FAKEREDIS:
+        pytest.skip("fakeredis not installed")
+    from app.api.retrieval_engine.source_catalog import SourceCatalog
+
+    return SourceCatalog(redis=fakeredis.FakeRedis(decode_responses=False))
+
+
+class TestSourceCatalog:
+    """Tests para el ciclo de vida de versiones."""
+
+    def test_new_version_is_hidden_until_activated(self, catalog):
+        """Una versión en curso no debería ser visible."""
+        version = catalog.begin_version("doc")
+
+        assert version in catalog.hidden_versions()
+        assert catalog.active_version("doc") is None
+
+        catalog.activate("doc", version, domain="fastapi")
+
+        assert version not in catalog.hidden_versions()
+        assert catalog.active_version("doc") == version
+        assert catalog.get("doc")["domain"] == "fastapi"
+
+    def test_first_activation_retires_legacy_points(self, catalog):
+        """La primera versión debería mandar a GC los puntos sin versión."""
+        from app.api.retrieval_engine.source_catalog import LEGACY_VERSION
+
+        version = catalog.begin_version("doc")
+        retired = catalog.activate("doc", version)
+
+        assert retired == LEGACY_VERSION
+        assert catalog.retired_versions("doc") == [LEGACY_VERSION]
+        # Legacy points have no tag, so hiding them is pointless
+        assert LEGACY_VERSION not in catalog.hidden_versions()
+
+    def test_reindex_swaps_versions_atomically(self, catalog):
+        """Activar una versión nueva debería ocultar y retirar la anterior."""
+        v1 = catalog.begin_version("doc")
+        catalog.activate("doc", v1)
+        catalog.forget_versions("doc", catalog.retired_versions("doc"))
+
+        v2 = catalog.begin_version("doc")
+        retired = catalog.activate("doc", v2)
+
+        assert retired == v1
+        assert catalog.active_version("doc") == v2
+        assert catalog.hidden_versions() == [v1]
+        assert catalog.retired_versions("doc") == [v1]
+
+    def test_metadata_given_as_none_is_cleared(self, catalog):
+        """Un url viejo no debería sobrevivir a una versión publicada sin url."""
+        v1 = catalog.begin_version("doc")
+        catalog.activate("doc", v1, url="https://github.com/o/r/blob/main/doc.md", domain="docs")
+
+        v2 = catalog.begin_version("doc")
+        catalog.activate("doc", v2, url=None, domain="docs")
+
+        entry = catalog.get("doc")
+        assert "url" not in entry
+        assert entry["domain"] == "docs" and entry["active_version"] == v2
+
+    def test_gc_forgets_versions(self, catalog):
+        """Después del GC las versiones no deberían quedar ocultas ni retiradas."""
+        v1 = catalog.begin_version("doc")
+        catalog.activate("doc", v1)
+        v2 = catalog.begin_version("doc")
+        catalog.activate("doc", v2)
+
+        catalog.forget_versions("doc", catalog.retired_versions("doc"))
+
+        assert catalog.retired_versions("doc") == []
+        assert catalog.hidden_versions() == []
+
+    def test_abandoned_version_stays_hidden(self, catalog):
+        """Una ingestión fallida debería quedar oculta hasta el GC."""
+        version = catalog.begin_version("doc")
+        catalog.abandon("doc", version)
+
+        assert version in catalog.hidden_versions()
+        assert version in catalog.retired_versions("doc")
+        assert catalog.active_version("doc") is None
+
+    def test_manifest_roundtrip(self, catalog):
+        """El manifest debería persistirse y borrarse junto con el source."""
+        from app.api.retrieval_engine.chunk_manifest import Manifest
+
+        manifest = Manifest(model="m", version="v1", chunks=[("h1", "id-1"), ("h2", "id-2")])
+        catalog.save_manifest("doc", manifest)
+
+        assert catalog.get_manifest("doc") == manifest
+
+        catalog.remove("doc")
+
+        assert catalog.get_manifest("doc") is None
+
+    def test_remove_source(self, catalog):
+        """Eliminar un source debería limpiar sus keys."""
+        version = catalog.begin_version("doc")
+        catalog.activate("doc", version, url="https://example.com")
+
+        catalog.remove("doc")
+
+        assert catalog.get("doc") is None
+        assert catalog.list_sources() == []
+
+    def test_remove_source_unhides_all_its_versions(self, catalog):
+        """Eliminar un source no debería dejar versiones suyas ocultas."""
+        first = catalog.begin_version("doc")
+        catalog.activate("doc", first)
+        second = catalog.begin_version("doc")
+        catalog.activate("doc", second)
+        failed = catalog.begin_version("doc")
+        catalog.abandon("doc", failed)
+        in_flight = catalog.begin_version("doc")
+        other = catalog.begin_version("other")
+
+        catalog.remove("doc")
+
+        assert catalog.hidden_versions() == [other]
+        assert catalog.in_flight_versions("doc") == []
+        assert catalog.in_flight_versions("other") == [other]
+        assert not catalog.is_in_flight("doc", in_flight)
+
+    def test_unfinished_versions_go_stale(self, catalog):
+        """Una versión nunca activada ni abandonada debería detectarse como huérfana."""
+        done = catalog.begin_version("doc")
+        catalog.activate("doc", done)
+        orphan = catalog.begin_version("https://example.com/a:b")
+
+        assert catalog.stale_versions(3600) == []
+        assert catalog.stale_versions(-1) == [("https://example.com/a:b", orphan)]
+
+        catalog.abandon("https://example.com/a:b", orphan)
+
+        assert catalog.stale_versions(-1) == []
+        assert orphan in catalog.retired_versions("https://example.com/a:b")
+        assert orphan in catalog.hidden_versions()
@@ -0,0 +1,98 @@
+"""
+Tests para el índice de resúmenes por source (búsqueda en dos etapas).
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.retrieval_engine.domain_index import CentroidAccumulator
+from app.api.retrieval_engine.summary_index import SourceSummaryIndex
+from app.infrastructure.storage.interfaces import FilterContext
+
+
+def acc(*vectors) -> CentroidAccumulator:
+    result = CentroidAccumulator()
+    for vector in vectors:
+        result.add(vector)
+    return result
+
+
+@pytest.fixture
+def client():
+    return QdrantClient(":memory:")
+
+
+def test_sources_are_ranked_by_their_mean_vector(client):
+    index = SourceSummaryIndex(client, "summaries", size=4)
+    index.put("cooking.pdf", "Books", "food", acc([1, 0, 0, 0], [0.8, 0.2, 0, 0]))
+    index.put("fastapi.md", "docs", "python", acc([0, 1, 0, 0], [0, 0.9, 0.1, 0]))
+    index.put("django.md", "docs", "python", acc([0, 0.6, 0.4, 0]))
+    index.put("empty.md", "docs", "python", CentroidAccumulator())
+
+    assert index.top_sources([0, 1, 0, 0], 2, FilterContext()) == ["fastapi.md", "django.md"]
+    assert index.top_sources([0, 1, 0, 0], 5, FilterContext(domain="books")) == ["cooking.pdf"]
+
+    # re-ingesting replaces the summary, deleting removes it
+    index.put("django.md", "docs", "python", acc([0, 0, 0, 1]))
+    assert index.top_sources([0, 0, 0, 1], 1, FilterContext()) == ["django.md"]
+    index.remove("django.md")
+    assert "django.md" not in index.top_sources([0, 0, 0, 1], 5, FilterContext())
+
+
+def test_backfill_summarizes_visible_chunks(client):
+    client.create_collection(
+        "documents",
+        vectors_config={"dense": models.VectorParams(size=4, distance=models.Distance.COSINE)},
+    )
+    rows = [
+        ("a.md", "v1", None, [1, 0, 0, 0]),
+        ("a.md", "v1", None, [0.9, 0.1, 0, 0]),
+        ("a.md", "v0", None, [0, 0, 0, 1]),  # retired version
+        ("b.md", None, None, [0, 1, 0, 0]),
+        ("b.md", None, "parent", None),  # parent passage, no vector
+    ]
+    client.upsert(
+        "documents",
+        points=[
+            models.PointStruct(
+                id=i,
+                vector={"dense": vector} if vector else {},
+                payload={
+                    "source": source,
+                    "domain": "docs",
+                    "topic": "t",
+                    **({"version": version} if version else {}),
+                    **({"kind": kind} if kind else {}),
+                },
+            )
+            for i, (source, version, kind, vector) in enumerate(rows)
+        ],
+    )
+    index = SourceSummaryIndex(client, "summaries", size=4)
+
+    assert index.backfill(client, "documents", hidden_versions=["v0"]) == 2
+    assert index.top_sources([1, 0, 0, 0], 1, FilterContext()) == ["a.md"]
+    assert index.top_sources([0, 1, 0, 0], 1, FilterContext()) == ["b.md"]
+    (summary,) = client.retrieve("summaries", [index._point_id("a.md")])
+    assert summary.payload["chunk_count"] == 2
+
+
+def test_index_is_complete_once_every_catalog_source_has_a_summary(client):
+    catalog = SimpleNamespace(source_count=lambda: 3)
+    index = SourceSummaryIndex(client, "summaries", size=4, refresh_interval=0)
+
+    assert not index.is_complete(catalog)
+    index.put("a.md", "docs", "t", acc([1, 0, 0, 0]))
+    index.put("b.md", "docs", "t", acc([0, 1, 0, 0]))
+    assert not index.is_complete(catalog)
+    # without a catalog there is nothing to compare against: search flat
+    assert not index.is_complete()
+
+    catalog.source_count = lambda: 2
+    assert index.is_complete(catalog)
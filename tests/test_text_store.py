@@ -0,0 +1,64 @@
+"""
+Tests para ChunkTextStore (texto de chunks fuera de Qdrant).
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+def store(tmp_path):
+    from app.infrastructure.storage.text_store import ChunkTextStore
+
+    return ChunkTextStore(str(tmp_path / "chunks.sqlite3"))
+
+
+class TestChunkTextStore:
+    """Tests para el store de textos comprimidos."""
+
+    def test_roundtrip(self, store):
+        """Debería devolver exactamente el texto guardado."""
+        text = "FastAPI middleware — ñandú " * 50
+        store.put_many([("id-1", "doc", "v1", text)])
+
+        assert store.get_many(["id-1", "missing"]) == {"id-1": text}
+
+    def test_hydrate_only_fills_missing_text(self, store):
+        """Solo debería completar los payloads que no traen texto."""
+        store.put_many([("id-1", "doc", None, "stored")])
+        points = [
+            SimpleNamespace(id="id-1", payload={"source": "doc"}),
+            SimpleNamespace(id="id-2", payload={"source": "doc", "text": "inline"}),
+        ]
+
+        store.hydrate(points)
+
+        assert points[0].payload["text"] == "stored"
+        assert points[1].payload["text"] == "inline"
+
+    def test_delete_by_version(self, store):
+        """Debería borrar solo las versiones indicadas (None = sin versión)."""
+        store.put_many(
+            [
+                ("a", "doc", "v1", "one"),
+                ("b", "doc", "v2", "two"),
+                ("c", "doc", None, "legacy"),
+            ]
+        )
+
+        store.delete("doc", ["v1", None])
+
+        assert store.get_many(["a", "b", "c"]) == {"b": "two"}
+
+    def test_delete_source(self, store):
+        """Debería borrar todos los textos de un source."""
+        store.put_many([("a", "doc", "v1", "one"), ("b", "other", "v1", "two")])
+
+        store.delete("doc")
+
+        assert store.get_many(["a", "b"]) == {"b": "two"}
@@ -0,0 +1,133 @@
+"""
+Tests para TokenBudgetChunker (chunks empaquetados por tokens del modelo).
+"""
+
+import re
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.extraction import factory
+from app.api.extraction.cleaners.markdown_cleaner import MarkdownCleaner
+from app.api.extraction.cleaners.pdf_cleaner import PDFCleaner
+from app.api.extraction.exceptions import UnknownChunkingModeError
+from app.api.extraction.schema import ChunkWithMetadata
+from app.api.extraction.token_chunker import TokenBudgetChunker, TokenBudgetCleaner
+
+
+class WhitespaceTokenizer:
+    """One token per word, with the offsets a fast tokenizer returns."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts, add_special_tokens, return_offsets_mapping, **kwargs):
+        self.calls += 1
+        return {
+            "offset_mapping": [
+                [m.span() for m in re.finditer(r"\S+", text)] for text in texts
+            ]
+        }
+
+
+def tokens(text: str) -> int:
+    return len(text.split())
+
+
+def words(n: int, prefix: str = "w") -> str:
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def test_packs_units_up_to_budget():
+    tokenizer = WhitespaceTokenizer()
+    chunker = TokenBudgetChunker(tokenizer, max_tokens=20, overlap_tokens=0)
+    units = [ChunkWithMetadata(text=words(6, f"u{i}_"), section="s") for i in range(10)]
+
+    chunks = chunker.pack(units)
+
+    assert tokenizer.calls == 1
+    assert len(chunks) < len(units)
+    assert all(tokens(c.text) <= 20 for c in chunks)
+    # nothing lost or repeated without overlap
+    assert " ".join(c.text for c in chunks).split() == " ".join(u.text for u in units).split()
+
+
+def test_overlap_repeats_last_tokens_of_previous_unit():
+    chunker = TokenBudgetChunker(WhitespaceTokenizer(), max_tokens=10, overlap_tokens=2)
+    units = [ChunkWithMetadata(text=words(6, p), section="s") for p in ("a", "b", "c")]
+
+    chunks = chunker.pack(units)
+
+    assert [c.text for c in chunks] == [
+        "a0 a1 a2 a3 a4 a5",
+        "a4 a5\n\nb0 b1 b2 b3 b4 b5",
+        "b4 b5\n\nc0 c1 c2 c3 c4 c5",
+    ]
+
+
+def test_long_unit_split_into_token_windows():
+    chunker = TokenBudgetChunker(WhitespaceTokenizer(), max_tokens=10, overlap_tokens=3)
+
+    chunks = chunker.pack([ChunkWithMetadata(text=words(25), section="s")])
+
+    assert [tokens(c.text) for c in chunks] == [10, 10, 10, 4]
+    assert chunks[1].text.startswith("w7 ")
+    assert chunks[-1].text.endswith("w24")
+    assert {c.section for c in chunks} == {"s"}
+
+
+def test_sections_are_not_mixed():
+    chunker = TokenBudgetChunker(WhitespaceTokenizer(), max_tokens=100, overlap_tokens=4)
+    units = [
+        ChunkWithMetadata(text=words(5, "a"), section="A"),
+        ChunkWithMetadata(text=words(5, "b"), section="A"),
+        ChunkWithMetadata(text=words(5, "c"), section="B"),
+    ]
+
+    chunks = chunker.pack(units)
+
+    assert [(c.section, tokens(c.text)) for c in chunks] == [("A", 10), ("B", 5)]
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        TokenBudgetChunker(WhitespaceTokenizer(), max_tokens=10, overlap_tokens=10)
+
+
+@pytest.mark.parametrize(
+    "cleaner, text",
+    [
+        (
+            PDFCleaner(),
+            "INTRODUCTION TO SYSTEMS\n\n" + "\n\n".join(words(40, f"p{i}_") for i in range(8)),
+        ),
+        (
+            MarkdownCleaner(),
+            "# Title\n\n" + "\n\n".join(words(40, f"p{i}_") for i in range(8)),
+        ),
+    ],
+)
+def test_cleaner_units_packed_within_budget(cleaner, text):
+    wrapped = TokenBudgetCleaner(cleaner, TokenBudgetChunker(WhitespaceTokenizer(), 128, 16))
+
+    clean = wrapped.clean(text)
+    chunks = wrapped.chunk(clean)
+
+    assert chunks
+    assert len(chunks) < len(cleaner.units(clean))
+    assert all(tokens(c.text) <= 128 for c in chunks)
+    assert "p7_39" in chunks[-1].text
+
+
+def test_unknown_chunking_mode_is_rejected(monkeypatch):
+    cleaner = MarkdownCleaner()
+    monkeypatch.setattr(factory, "get_settings", lambda: SimpleNamespace(chunking_mode="chars"))
+    assert factory.SourceFactory.with_chunking(cleaner) is cleaner
+
+    monkeypatch.setattr(factory, "get_settings", lambda: SimpleNamespace(chunking_mode="token"))
+    with pytest.raises(UnknownChunkingModeError):
+        factory.SourceFactory.with_chunking(cleaner)
@@ -0,0 +1,102 @@
+"""
+Tests para el registro de uploads por hash de contenido.
+"""
+
+import hashlib
+import io
+import sys
+import os
+
+import pytest
+from fastapi import UploadFile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    import fakeredis
+
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+from app.api.retrieval_engine.chunk_manifest import Manifest
+from app.api.retrieval_engine.source_catalog import SourceCatalog
+from app.api.retrieval_engine.upload_registry import UploadRegistry, save_upload
+
+pytestmark = pytest.mark.skipif(not HAS_FAKEREDIS, reason="fakeredis not installed")
+
+
+def test_upload_is_hashed_while_saved(tmp_path):
+    content = os.urandom(3 * 1024 * 1024 + 17)
+    path = tmp_path / "upload.pdf"
+
+    digest = save_upload(UploadFile(file=io.BytesIO(content), filename="a.pdf"), path)
+
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert path.read_bytes() == content
+
+
+@pytest.fixture
+def catalog():
+    return SourceCatalog(fakeredis.FakeRedis())
+
+
+def publish(catalog, source, chunks, version=None):
+    """What a versioned ingestion leaves in the catalog."""
+    version = version or catalog.begin_version(source)
+    manifest = Manifest(model="m", version=version, chunks=chunks)
+    catalog.save_manifest(source, manifest)
+    catalog.activate(source, version, domain="books", topic="ml")
+    return manifest
+
+
+def test_identical_upload_is_found_while_its_version_is_live(catalog):
+    registry = UploadRegistry(catalog, catalog._redis)
+    manifest = publish(catalog, "book.pdf", [("h1", "p1"), ("h2", "p2")])
+    registry.record("sha-a", "book.pdf", manifest)
+
+    entry = registry.find("sha-a", "book.pdf", "Books", "ML")
+    assert entry["version"] == manifest.version
+    assert int(entry["ingested_at"]) > 0
+
+    # other content, other source, other domain: ingest as usual
+    assert registry.find("sha-b", "book.pdf", "books", "ml") is None
+    assert registry.find("sha-a", "copy.pdf", "books", "ml") is None
+    assert registry.find("sha-a", "book.pdf", "papers", "ml") is None
+
+
+def test_registry_entry_goes_stale_when_the_source_changes(catalog):
+    registry = UploadRegistry(catalog, catalog._redis)
+    manifest = publish(catalog, "book.pdf", [("h1", "p1"), ("h2", "p2")])
+    registry.record("sha-a", "book.pdf", manifest)
+
+    # the manifest is rewritten under the same version
+    publish(catalog, "book.pdf", [("h1", "p1"), ("h3", "p3")], version=manifest.version)
+    assert registry.find("sha-a", "book.pdf", "books", "ml") is None
+
+    # uploading the first file again re-registers it
+    restored = publish(catalog, "book.pdf", [("h1", "p1"), ("h2", "p2")])
+    registry.record("sha-a", "book.pdf", restored)
+    assert registry.find("sha-a", "book.pdf", "books", "ml") is not None
+
+    catalog.remove("book.pdf")
+    assert registry.find("sha-a", "book.pdf", "books", "ml") is None
+
+
+def test_pdf_extracted_with_another_backend_is_not_a_match(catalog):
+    registry = UploadRegistry(catalog, catalog._redis)
+    manifest = publish(catalog, "book.pdf", [("h1", "p1")])
+    registry.record("sha-a", "book.pdf", manifest, "pdfium")
+
+    assert registry.find("sha-a", "book.pdf", "books", "ml", "pdfium") is not None
+    assert registry.find("sha-a", "book.pdf", "books", "ml", "pdfplumber") is None
+    assert registry.find("sha-a", "book.pdf", "books", "ml") is None
+
+
+def test_agent_uploads_keep_their_hash_until_ingested(catalog):
+    registry = UploadRegistry(catalog, catalog._redis)
+
+    registry.remember_upload("uuid-1", "sha-a")
+
+    assert registry.upload_hash("uuid-1") == "sha-a"
+    assert registry.upload_hash("uuid-2") is None